@@ -22,10 +22,14 @@ from robust_order_system import RobustOrderSystem, OperationType
 from enhanced_sync_system import EnhancedSyncSystem
 from aiohttp import web
 from error_handler import RobustErrorHandler, with_error_handling, ErrorType, ErrorSeverity
-from enhanced_tick_buffer import EnhancedTickBuffer
+from enhanced_tick_buffer import EnhancedTickBuffer, TickRingBuffer
+from tick_direction_pattern import TickDirectionDetector, XML_ACCU_PATTERN
+from tick_store import get_shared_store
 from websocket_recovery import WebSocketRecoveryManager
 from signal_queue_system import ThreadSafeSignalQueue
 from system_health_monitor import SystemHealthMonitor
+from async_runtime import executar, estatisticas_loop
+from io_offload import executar_io
 
 # Carregar variáveis de ambiente
 load_dotenv()
@@ -56,6 +60,7 @@ GROWTH_RATE = 0.02  # 2% - Valor corrigido conforme solicitação
 WIN_STOP = 1000.0  # Meta de ganho diário
 LOSS_LIMIT = 1000.0  # Limite de perda diária
 KHIZZBOT = 50  # Valor khizzbot conforme XML original
+PADRAO_ENTRADA = XML_ACCU_PATTERN  # Padrão de direção de entrada (R/B/U/.)
 
 # ============================================================================
 # FUNÇÃO DE VALIDAÇÃO DE TOKEN
@@ -146,6 +151,10 @@ class DerivWebSocketNativo:
         self.session_id = None
         self.authorized = False
         
+        # Arquivo de ticks (tick_store): grava (epoch, quote) de cada tick recebido quando TICK_STORE_DIR está definido
+        tick_store_dir = os.getenv('TICK_STORE_DIR')
+        self.tick_store = get_shared_store(tick_store_dir) if tick_store_dir else None
+        
         logger.info(f"🔧 DerivWebSocketNativo inicializado - App ID: {self.app_id}")
     
     async def connect(self):
@@ -441,6 +450,8 @@ class DerivWebSocketNativo:
     async def _process_tick(self, tick_data):
         """Processa tick recebido em tempo real"""
         try:
+            if self.tick_store is not None:
+                self.tick_store.record_tick(tick_data)
             if hasattr(self, 'bot_instance') and self.bot_instance:
                 await self.bot_instance._handle_new_tick(tick_data)
         except Exception as e:
@@ -521,6 +532,9 @@ class DerivWebSocketNativo:
         
         self.ws = None
         self.session_id = None
+        
+        if self.tick_store is not None:
+            self.tick_store.flush()
 
 # ============================================================================
 # CLASSE PRINCIPAL DO BOT ACCUMULATOR
@@ -552,7 +566,8 @@ class AccumulatorScalpingBot:
         self.ciclo = 0
         
         # NOVO: Sistema de tick stream em tempo real
-        self.tick_buffer = []  # Buffer para manter últimos 5 ticks
+        self.tick_buffer = TickRingBuffer(max_size=5, max_age_seconds=None)  # Últimos 5 ticks
+        self.detector_padrao = TickDirectionDetector(PADRAO_ENTRADA)
         self.tick_subscription_active = False  # Flag para controlar subscription
         
         # NOVO: Sistema robusto de execução de ordens
@@ -627,25 +642,22 @@ class AccumulatorScalpingBot:
             # Log detalhado com timestamp preciso
             logger.debug(f"📥 TICK_RECEIVED: {tick_value:.5f} at {tick_timestamp:.6f}")
             
-            # Adicionar ao buffer
-            self.tick_buffer.append(tick_value)
-            
-            # Manter apenas os últimos 5 ticks
-            if len(self.tick_buffer) > 5:
-                self.tick_buffer.pop(0)  # Remove o mais antigo
+            # Adicionar ao anel (mantém apenas os últimos 5 ticks)
+            self.tick_buffer.add_tick(tick_value, tick_timestamp)
+            padrao = self.detector_padrao.add_tick(tick_value)
             
             # Executar análise quando tiver 5 ticks
-            if len(self.tick_buffer) == 5:
-                pattern_detected = self.analisar_padrao_entrada(self.tick_buffer.copy())
+            if self.tick_buffer.is_full():
+                pattern_detected = padrao is not None
                 
                 if pattern_detected:
-                    logger.info(f"🎯 PATTERN_DETECTED at {tick_timestamp:.6f}")
+                    logger.info(f"🎯 PATTERN_DETECTED ({padrao.name}: {self.detector_padrao.describe()}) at {tick_timestamp:.6f}")
                 
                 # Salvar sinal no histórico de debugging
-                self._save_signal_to_history(self.tick_buffer.copy(), pattern_detected)
+                self._save_signal_to_history(self.tick_buffer.to_list(), pattern_detected)
                 
-                # Enviar sinal para queue (sempre, mesmo sem padrão para estatísticas)
-                success = self.sync_system.queue_signal(self.tick_buffer.copy(), pattern_detected)
+                # Padrão vai para a fila de operação; sem padrão só conta nas estatísticas
+                success = self.sync_system.queue_signal(self.tick_buffer.to_list(), pattern_detected)
                 
                 if success:
                     logger.debug(f"📤 SIGNAL_QUEUED: pattern={pattern_detected} at {tick_timestamp:.6f}")
@@ -656,13 +668,13 @@ class AccumulatorScalpingBot:
             logger.error(f"❌ Erro ao processar tick: {e}")
     
     async def _process_signals_from_queue(self):
-        """Processa sinais da queue de forma assíncrona"""
+        """Processa sinais da queue de forma assíncrona (acorda no enfileiramento de um padrão)"""
         while True:
             try:
-                # Obter próximo sinal da queue (não bloqueante)
-                signal = self.sync_system.get_next_signal()
+                # Aguardar próximo sinal com padrão (sem poll)
+                signal = await self.sync_system.aguardar_sinal()
                 
-                if signal and signal.pattern_detected:
+                if signal.pattern_detected:
                     operation_timestamp = time.time()
                     logger.info(f"🚀 OPERATION_QUEUED at {operation_timestamp:.6f}")
                     
@@ -695,9 +707,6 @@ class AccumulatorScalpingBot:
                     else:
                         logger.warning(f"⚠️ Operação rejeitada - limite de operações simultâneas atingido")
                 
-                # Pequeno delay para evitar loop intensivo
-                await asyncio.sleep(0.1)
-                
             except Exception as e:
                 logger.error(f"❌ Erro no processamento de sinais: {e}")
                 await asyncio.sleep(1)
@@ -868,7 +877,8 @@ class AccumulatorScalpingBot:
                 'tick_buffer_size': len(self.tick_buffer),
                 'connection_status': self.api_manager.connected if hasattr(self, 'api_manager') else False,
                 'subscription_active': self.tick_subscription_active,
-                'cached_params_valid': (time.time() - self._params_cache_time) < self._params_cache_ttl if self._cached_params else False
+                'cached_params_valid': (time.time() - self._params_cache_time) < self._params_cache_ttl if self._cached_params else False,
+                'event_loop': estatisticas_loop()
             }
             
             return web.json_response(status_data)
@@ -1015,6 +1025,7 @@ class AccumulatorScalpingBot:
         """Salva sinal no histórico para debugging"""
         try:
             timestamp_precise = time.time()
+            stats = self.sync_system.get_statistics()
             
             signal_record = {
                 'timestamp': timestamp_precise,
@@ -1022,8 +1033,8 @@ class AccumulatorScalpingBot:
                 'ticks': signal_data.copy() if signal_data else [],
                 'pattern_detected': pattern_detected,
                 'operation_result': operation_result,
-                'queue_size_at_time': self.sync_system.get_statistics()['queue_size'],
-                'active_operations_at_time': self.sync_system.get_statistics()['active_operations']
+                'queue_size_at_time': stats['queue_size'],
+                'active_operations_at_time': stats['active_operations']
             }
             
             # Adicionar ao histórico
@@ -1316,54 +1327,24 @@ class AccumulatorScalpingBot:
     def analisar_padrao_entrada(self, ticks: List[float]) -> bool:
         """ 
         Lógica de Padrão XML: single1=Red E single2=Red E single3=Red E single4=Blue 
-        Onde os sinais são atribuídos em ordem cronológica reversa mas verificados individualmente 
+        Verificada por máscara de bits (ver tick_direction_pattern); só registra log quando casa 
         """ 
         if len(ticks) < 5: 
             return False 
      
-        # Atribuições de tick do XML (indexação FROM_END) 
-        tick4 = ticks[-5]  # FROM_END 5 (mais antigo) 
-        tick3 = ticks[-4]  # FROM_END 4  
-        tick2 = ticks[-3]  # FROM_END 3 
-        tick1 = ticks[-2]  # FROM_END 2 
-        tick_atual = ticks[-1]  # FROM_END 1 (atual/mais novo) 
-     
-        # Cálculos de sinal do XML 
-        single4 = "Red" if tick4 > tick3 else "Blue" 
-        single3 = "Red" if tick3 > tick2 else "Blue"  
-        single2 = "Red" if tick2 > tick1 else "Blue" 
-        single1 = "Red" if tick1 > tick_atual else "Blue" 
-     
-        # Condição de entrada XML: todas as quatro condições devem ser True simultaneamente 
-        entrada_xml = (single1 == "Red" and 
-                       single2 == "Red" and 
-                       single3 == "Red" and 
-                       single4 == "Blue") 
-     
-        # Log detalhado para debug 
-        logger.info(f"📊 VERIFICAÇÃO DE PADRÃO XML:") 
-        logger.info(f"   • single1 (tick1 > atual): {single1} ({tick1:.5f} > {tick_atual:.5f})") 
-        logger.info(f"   • single2 (tick2 > tick1): {single2} ({tick2:.5f} > {tick1:.5f})") 
-        logger.info(f"   • single3 (tick3 > tick2): {single3} ({tick3:.5f} > {tick2:.5f})") 
-        logger.info(f"   • single4 (tick4 > tick3): {single4} ({tick4:.5f} > {tick3:.5f})") 
-        logger.info(f"   • Padrão esperado: single1=Red E single2=Red E single3=Red E single4=Blue") 
-        logger.info(f"   • Entrada detectada: {entrada_xml}") 
+        padrao = self.detector_padrao.evaluate(ticks)
+        if padrao is None:
+            return False
      
-        if entrada_xml:
-            logger.info("🎯 PADRÃO DE ENTRADA DETECTADO! (XML MATCH)")
-            logger.info("🚀 EXECUTANDO COMPRA DO CONTRATO ACCUMULATOR...")
-        else:
-            logger.info("⏳ Aguardando padrão correto...")
-            
-        return entrada_xml
+        logger.info(f"🎯 PADRÃO DE ENTRADA DETECTADO! (XML MATCH: {padrao.name} = {self.detector_padrao.describe(ticks)})")
+        logger.info("🚀 EXECUTANDO COMPRA DO CONTRATO ACCUMULATOR...")
+        return True
     
     async def log_to_supabase(self, operation_result: str, profit_percentage: float, stake_value: float):
         """Envia log de operação para Supabase"""
         try:
-            supabase: Client = create_client(
-                os.getenv('SUPABASE_URL'),
-                os.getenv('SUPABASE_KEY')
-            )
+            supabase: Client = await executar_io('supabase:scalping_accumulator_bot_logs', create_client,
+                                                 os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_KEY'))
             
             # Adicionar timestamp fields obrigatórios
             current_time = datetime.now().isoformat()
@@ -1375,7 +1356,7 @@ class AccumulatorScalpingBot:
                 'created_at': current_time
             }
             
-            result = supabase.table('scalping_accumulator_bot_logs').insert(data).execute()
+            await executar_io('supabase:scalping_accumulator_bot_logs', supabase.table('scalping_accumulator_bot_logs').insert(data).execute)
             logger.info(f"📊 Log enviado para Supabase: {operation_result} - {profit_percentage:.2f}% - ${stake_value}")
             
         except Exception as e:
@@ -1872,6 +1853,7 @@ class AccumulatorScalpingBot:
             
             # Limpar buffer de ticks para evitar dados obsoletos
             self.tick_buffer.clear()
+            self.detector_padrao.reset()
             logger.debug("🧹 Buffer de ticks limpo")
             
             # Reconectar com retry
@@ -1952,7 +1934,7 @@ async def main():
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        executar(main())
     except KeyboardInterrupt:
         logger.info("🛑 Accumulator Bot finalizado pelo usuário")
     except Exception as e:
@@ -23,10 +23,15 @@ from robust_order_system import RobustOrderSystem, OperationType
 from enhanced_sync_system import EnhancedSyncSystem
 from aiohttp import web
 from error_handler import RobustErrorHandler, with_error_handling, ErrorType, ErrorSeverity
-from enhanced_tick_buffer import EnhancedTickBuffer
+from enhanced_tick_buffer import EnhancedTickBuffer, TickRingBuffer
 from websocket_recovery import WebSocketRecoveryManager
 from signal_queue_system import ThreadSafeSignalQueue
 from system_health_monitor import SystemHealthMonitor
+from streaming_indicators import StreamingIndicators
+from contract_engine import ativar_modo_papel, modo_papel_solicitado
+from async_runtime import executar, estatisticas_loop
+from io_offload import executar_io
+
 # Carregar variáveis de ambiente
 load_dotenv()
 
@@ -55,8 +60,14 @@ class TechnicalAnalysis:
     
     def __init__(self):
         """Inicializa o analisador técnico"""
+        # Motor incremental alimentado tick a tick via update()
+        self.engine = StreamingIndicators()
         logger.info("🔧 TechnicalAnalysis inicializado")
     
+    def update(self, price: float) -> None:
+        """Adiciona um tick ao motor incremental (custo constante por tick)"""
+        self.engine.add_price(price)
+    
     def calculate_sma(self, prices: List[float], period: int) -> Optional[float]:
         """
         Calcula Simple Moving Average (SMA)
@@ -92,10 +103,11 @@ class TechnicalAnalysis:
         if not prices or len(prices) < period + 1:
             return None
         
-        # Calcular mudanças de preço
+        # Calcular mudanças de preço (apenas as últimas 'period' são usadas)
+        recent_prices = prices[-(period + 1):]
         price_changes = []
-        for i in range(1, len(prices)):
-            change = prices[i] - prices[i-1]
+        for i in range(1, len(recent_prices)):
+            change = recent_prices[i] - recent_prices[i-1]
             price_changes.append(change)
         
         if len(price_changes) < period:
@@ -122,46 +134,56 @@ class TechnicalAnalysis:
         logger.debug(f"📊 RSI({period}): {rsi:.2f} (avg_gain: {avg_gain:.5f}, avg_loss: {avg_loss:.5f})")
         return rsi
     
-    def analyze_entry_signal(self, tick_history: List[float]) -> Optional[str]:
+    def analyze_entry_signal(self, tick_history: Optional[List[float]] = None) -> Optional[str]:
         """
         Analisa sinais de entrada baseado em SMA + RSI
         
         Args:
-            tick_history: Histórico de ticks (preços)
+            tick_history: Histórico de ticks (preços). Se omitido, usa o motor
+                incremental alimentado por update() - O(1) por tick
             
         Returns:
             "RESETCALL", "RESETPUT" ou None
         """
-        if not tick_history or len(tick_history) < 50:
-            logger.debug(f"📊 Histórico insuficiente: {len(tick_history) if tick_history else 0}/50 ticks")
+        total = self.engine.count if tick_history is None else len(tick_history)
+        if total < 50:
+            logger.debug(f"📊 Histórico insuficiente: {total}/50 ticks")
             return None
         
         try:
-            # Calcular SMAs
-            sma5 = self.calculate_sma(tick_history, 5)
-            sma12 = self.calculate_sma(tick_history, 12)
-            sma40 = self.calculate_sma(tick_history, 40)
-            sma50 = self.calculate_sma(tick_history, 50)
-            
-            # Calcular RSIs
-            rsi3 = self.calculate_rsi(tick_history, 3)
-            rsi7 = self.calculate_rsi(tick_history, 7)
-            rsi10 = self.calculate_rsi(tick_history, 10)
+            if tick_history is None:
+                engine = self.engine
+                sma5, sma12, sma40, sma50 = engine.sma(5), engine.sma(12), engine.sma(40), engine.sma(50)
+                rsi3, rsi7, rsi10 = engine.rsi(3), engine.rsi(7), engine.rsi(10)
+                current_price = engine.last_price
+                previous_price = engine.previous_price
+            else:
+                # Calcular SMAs
+                sma5 = self.calculate_sma(tick_history, 5)
+                sma12 = self.calculate_sma(tick_history, 12)
+                sma40 = self.calculate_sma(tick_history, 40)
+                sma50 = self.calculate_sma(tick_history, 50)
+                
+                # Calcular RSIs
+                rsi3 = self.calculate_rsi(tick_history, 3)
+                rsi7 = self.calculate_rsi(tick_history, 7)
+                rsi10 = self.calculate_rsi(tick_history, 10)
+                
+                # Preços atuais para análise de tendência
+                current_price = tick_history[-1]
+                previous_price = tick_history[-2] if len(tick_history) >= 2 else current_price
             
             # Verificar se todos os indicadores foram calculados
             if None in [sma5, sma12, sma40, sma50, rsi3]:
                 logger.debug("📊 Alguns indicadores não puderam ser calculados")
                 return None
             
-            # Preços atuais para análise de tendência
-            current_price = tick_history[-1]
-            previous_price = tick_history[-2] if len(tick_history) >= 2 else current_price
-            
-            logger.debug(f"📊 Indicadores calculados:")
-            logger.debug(f"   SMA5: {sma5:.5f}, SMA12: {sma12:.5f}")
-            logger.debug(f"   SMA40: {sma40:.5f}, SMA50: {sma50:.5f}")
-            logger.debug(f"   RSI3: {rsi3:.2f}, RSI7: {rsi7:.2f}, RSI10: {rsi10:.2f}")
-            logger.debug(f"   Preço atual: {current_price:.5f}, anterior: {previous_price:.5f}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"📊 Indicadores calculados:")
+                logger.debug(f"   SMA5: {sma5:.5f}, SMA12: {sma12:.5f}")
+                logger.debug(f"   SMA40: {sma40:.5f}, SMA50: {sma50:.5f}")
+                logger.debug(f"   RSI3: {rsi3:.2f}, RSI7: {rsi7:.2f}, RSI10: {rsi10:.2f}")
+                logger.debug(f"   Preço atual: {current_price:.5f}, anterior: {previous_price:.5f}")
             
             # === LÓGICA RESETCALL (Sinal de Alta) ===
             # Condição principal: SMA40 > SMA50 AND SMA5 > SMA12 AND 55 < RSI3 < 75
@@ -973,7 +995,7 @@ class ResetScalpingBot:
         self.is_trading_locked = False  # Controle de bloqueio para prevenir condições de corrida
         
         self.ticks_history = []
-        self.tick_history = []  # Histórico de 50 ticks para análise técnica
+        self.tick_history = TickRingBuffer(max_size=50, max_age_seconds=None)  # Histórico de 50 ticks para análise técnica
         self.ciclo = 0
         
         # NOVO: Sistema de análise técnica com SMA + RSI
@@ -1038,6 +1060,10 @@ class ResetScalpingBot:
         self.max_buffer_size = 10  # Máximo de 10 ticks no buffer
         self.pattern_detection_active = False  # Flag para detecção de padrões
         self.last_tick_time = 0  # Timestamp do último tick recebido
+        # Paper trading: ordens liquidadas localmente sobre o stream real
+        self.executor_papel = None
+        if modo_papel_solicitado(account_config):
+            ativar_modo_papel(self)
 
     # ============================================================================
     # SISTEMA MARTINGALE NÍVEL 5
@@ -1134,16 +1160,15 @@ class ResetScalpingBot:
             if tick_value <= 0:
                 return
             
-            # Adicionar ao histórico de ticks
-            self.tick_history.append(tick_value)
+            # Adicionar ao histórico de ticks (anel com os últimos 50)
+            self.tick_history.add_tick(tick_value)
             
-            # Manter últimos 50 ticks para cálculos
-            if len(self.tick_history) > 50:
-                self.tick_history.pop(0)
+            # Indicadores incrementais: custo constante por tick
+            self.technical_analysis.update(tick_value)
             
             # Analisar sinal quando tiver dados suficientes
-            if len(self.tick_history) >= 50:
-                signal = self.technical_analysis.analyze_entry_signal(self.tick_history)
+            if self.technical_analysis.engine.is_ready():
+                signal = self.technical_analysis.analyze_entry_signal()
                 
                 if signal and not self.is_trading_locked:
                     self.is_trading_locked = True
@@ -1586,7 +1611,8 @@ class ResetScalpingBot:
                 'tick_buffer_size': len(self.tick_buffer),
                 'connection_status': self.api_manager.connected if hasattr(self, 'api_manager') else False,
                 'subscription_active': self.tick_subscription_active,
-                'cached_params_valid': (time.time() - self._params_cache_time) < self._params_cache_ttl if self._cached_params else False
+                'cached_params_valid': (time.time() - self._params_cache_time) < self._params_cache_ttl if self._cached_params else False,
+                'event_loop': estatisticas_loop()
             }
             
             return web.json_response(status_data)
@@ -1644,6 +1670,8 @@ class ResetScalpingBot:
             
             # 6. Reinicializar componentes
             self.api_manager = DerivWebSocketNativo()
+            if self.executor_papel:
+                self.api_manager = self.executor_papel.trocar_conexao(self.api_manager)
             self.api_manager.set_bot_instance(self)
             logger.info("✅ API Manager reinicializado")
             
@@ -1733,6 +1761,7 @@ class ResetScalpingBot:
         """Salva sinal no histórico para debugging"""
         try:
             timestamp_precise = time.time()
+            stats = self.sync_system.get_statistics()
             
             signal_record = {
                 'timestamp': timestamp_precise,
@@ -1740,8 +1769,8 @@ class ResetScalpingBot:
                 'ticks': signal_data.copy() if signal_data else [],
                 'pattern_detected': pattern_detected,
                 'operation_result': operation_result,
-                'queue_size_at_time': self.sync_system.get_statistics()['queue_size'],
-                'active_operations_at_time': self.sync_system.get_statistics()['active_operations']
+                'queue_size_at_time': stats['queue_size'],
+                'active_operations_at_time': stats['active_operations']
             }
             
             # Adicionar ao histórico
@@ -1928,10 +1957,8 @@ class ResetScalpingBot:
     async def log_to_supabase(self, operation_result: str, profit_percentage: float, stake_value: float):
         """Envia log detalhado de operação com dados completos do Martingale para Supabase"""
         try:
-            supabase: Client = create_client(
-                os.getenv('SUPABASE_URL'),
-                os.getenv('SUPABASE_KEY')
-            )
+            supabase: Client = await executar_io('supabase:tunder_bot_logs', create_client,
+                                                 os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_KEY'))
             
             # Verificar se precisa iniciar nova sequência Martingale
             if self.martingale_sequence_id is None or (operation_result == "WIN" and self.martingale_level == 0):
@@ -1976,7 +2003,7 @@ class ResetScalpingBot:
                 })
             }
             
-            result = supabase.table('tunder_bot_logs').insert(data).execute()
+            await executar_io('supabase:tunder_bot_logs', supabase.table('tunder_bot_logs').insert(data).execute)
             
             # Log detalhado
             logger.info(f"✅ Log Martingale salvo no Supabase [{self.account_name}]:")
@@ -2316,7 +2343,7 @@ async def main():
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        executar(main())
     except KeyboardInterrupt:
         logger.info("🛑 RESET Strategy Bot finalizado pelo usuário")
     except Exception as e:
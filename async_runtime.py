@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Runtime assíncrono compartilhado pelos pontos de entrada dos bots
+
+- instalar_runtime(): com ASYNC_RUNTIME=uvloop (e o pacote instalado) troca a
+  política de event loop pela do uvloop; sem o pacote segue no asyncio padrão.
+- executar(main()): substitui asyncio.run — instala o runtime e liga o
+  amostrador de atraso do loop durante a execução.
+- AmostradorAtrasoLoop: tarefa que dorme um intervalo fixo e mede quanto acordou
+  atrasada (atraso de agendamento: p50/p99/máximo). Uma thread vigia o loop; se
+  ele fica parado além do limiar (chamada síncrona ao Supabase, escrita de
+  arquivo...), captura a pilha da thread do loop naquele instante e registra a
+  tarefa e a linha responsáveis.
+
+As estatísticas saem em estatisticas_loop(), incluída nos endpoints /status.
+
+Variáveis de ambiente:
+    ASYNC_RUNTIME=asyncio|uvloop     (padrão: asyncio)
+    LOOP_LAG_MONITOR=1|0             (padrão: 1)
+    LOOP_LAG_THRESHOLD_MS=100        (atraso que conta como travamento)
+    IO_GUARD=off|warn|raise          (rede síncrona no loop - ver io_offload)
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import threading
+import traceback
+from collections import deque
+from typing import Any, Dict, Optional
+
+from io_offload import instalar_guarda
+
+logger = logging.getLogger(__name__)
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+
+INTERVALO_AMOSTRA = 0.05  # segundos entre amostras
+LIMIAR_TRAVAMENTO_MS = float(os.getenv('LOOP_LAG_THRESHOLD_MS', '100'))
+JANELA_AMOSTRAS = 2400  # ~2 minutos de amostras para os percentis
+MAX_TRAVAMENTOS = 20  # últimos travamentos mantidos para o /status
+
+_runtime = 'asyncio'
+_amostrador: Optional['AmostradorAtrasoLoop'] = None
+
+def instalar_runtime(runtime: Optional[str] = None) -> str:
+    """Instala a política de event loop pedida; devolve o runtime efetivo"""
+    global _runtime
+    runtime = (runtime or os.getenv('ASYNC_RUNTIME', 'asyncio')).lower()
+    if runtime == 'uvloop':
+        try:
+            import uvloop
+        except ImportError:
+            logger.warning("⚠️ ASYNC_RUNTIME=uvloop, mas o uvloop não está instalado - usando asyncio padrão")
+            runtime = 'asyncio'
+        else:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    elif runtime != 'asyncio':
+        logger.warning(f"⚠️ ASYNC_RUNTIME desconhecido: {runtime} - usando asyncio padrão")
+        runtime = 'asyncio'
+    _runtime = runtime
+    return runtime
+
+class AmostradorAtrasoLoop:
+    """Atraso de agendamento do event loop e atribuição de travamentos"""
+
+    def __init__(self, intervalo: float = INTERVALO_AMOSTRA, limiar_ms: float = LIMIAR_TRAVAMENTO_MS,
+                 janela: int = JANELA_AMOSTRAS, max_travamentos: int = MAX_TRAVAMENTOS):
+        self.intervalo = intervalo
+        self.limiar = limiar_ms / 1000
+        self.atrasos = deque(maxlen=janela)
+        self.atraso_maximo = 0.0
+        self.travamentos = deque(maxlen=max_travamentos)
+        self.total_travamentos = 0
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread_loop: Optional[int] = None
+        self._tarefa: Optional[asyncio.Task] = None
+        self._vigia: Optional[threading.Thread] = None
+        self._parar = threading.Event()
+        self._batimento = time.monotonic()
+        self._travamento_aberto: Optional[Dict[str, Any]] = None
+
+    def iniciar(self):
+        """Chamado de dentro do loop a monitorar"""
+        self._loop = asyncio.get_running_loop()
+        self._thread_loop = threading.get_ident()
+        self._batimento = time.monotonic()
+        self._tarefa = self._loop.create_task(self._amostrar(), name="amostrador_atraso_loop")
+        self._vigia = threading.Thread(target=self._vigiar, name="vigia_atraso_loop", daemon=True)
+        self._vigia.start()
+
+    def parar(self):
+        self._parar.set()
+        if self._tarefa is not None and not self._tarefa.done():
+            self._tarefa.cancel()
+
+    async def _amostrar(self):
+        while True:
+            inicio = time.monotonic()
+            await asyncio.sleep(self.intervalo)
+            agora = time.monotonic()
+            atraso = max(0.0, agora - inicio - self.intervalo)
+            with self._lock:
+                self._batimento = agora
+                self.atrasos.append(atraso)
+                self.atraso_maximo = max(self.atraso_maximo, atraso)
+                travamento, self._travamento_aberto = self._travamento_aberto, None
+                if travamento is not None:
+                    travamento['duracao_ms'] = round(atraso * 1000, 1)
+            if travamento is not None:
+                logger.warning(f"🐢 Loop travado por {atraso*1000:.0f} ms em {travamento['local']} "
+                               f"(tarefa {travamento['tarefa']})")
+
+    def _vigiar(self):
+        """Thread: amostra a pilha do loop enquanto ele está parado além do limiar"""
+        while not self._parar.wait(self.limiar / 2):
+            with self._lock:
+                parado = time.monotonic() - self._batimento - self.intervalo
+                if parado < self.limiar or self._travamento_aberto is not None:
+                    continue
+                frame = sys._current_frames().get(self._thread_loop)
+                if frame is None:
+                    continue
+                self._travamento_aberto = self._registrar_travamento(frame, parado)
+
+    def _registrar_travamento(self, frame, parado: float) -> Dict[str, Any]:
+        pilha = traceback.extract_stack(frame)
+        # Linha do nosso código mais interna: quem fez a chamada bloqueante
+        local = next((f for f in reversed(pilha) if f.filename.startswith(DIRETORIO)), pilha[-1])
+        tarefa = asyncio.current_task(self._loop) if self._loop is not None else None
+        travamento = {
+            'quando': time.time(),
+            'tarefa': tarefa.get_name() if tarefa is not None else None,
+            'corrotina': getattr(tarefa.get_coro(), '__qualname__', None) if tarefa is not None else None,
+            'local': f"{os.path.basename(local.filename)}:{local.lineno} ({local.name})",
+            'pilha': [f"{os.path.basename(f.filename)}:{f.lineno} {f.name}" for f in pilha[-8:]],
+            'detectado_ms': round(parado * 1000, 1),
+            'duracao_ms': None,  # preenchido quando o loop volta
+        }
+        self.travamentos.append(travamento)
+        self.total_travamentos += 1
+        return travamento
+
+    def obter_estatisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            amostras = sorted(self.atrasos)
+            travamentos = [dict(t) for t in self.travamentos]
+            maximo = self.atraso_maximo
+
+        def percentil(q: float) -> float:
+            return round(amostras[min(len(amostras) - 1, int(q * len(amostras)))] * 1000, 2) if amostras else 0.0
+
+        return {
+            'runtime': _runtime,
+            'amostras': len(amostras),
+            'atraso_p50_ms': percentil(0.50),
+            'atraso_p99_ms': percentil(0.99),
+            'atraso_max_ms': round(maximo * 1000, 2),
+            'limiar_travamento_ms': self.limiar * 1000,
+            'travamentos': self.total_travamentos,
+            'ultimos_travamentos': travamentos,
+        }
+
+async def iniciar_monitor_loop(**kwargs) -> Optional[AmostradorAtrasoLoop]:
+    """Liga o amostrador no loop corrente (substitui o de um loop anterior)"""
+    global _amostrador
+    if os.getenv('LOOP_LAG_MONITOR', '1') == '0':
+        return None
+    if _amostrador is not None:
+        _amostrador.parar()
+    _amostrador = AmostradorAtrasoLoop(**kwargs)
+    _amostrador.iniciar()
+    return _amostrador
+
+def estatisticas_loop() -> Dict[str, Any]:
+    """Estatísticas do amostrador do processo, para os endpoints /status"""
+    if _amostrador is None:
+        return {'runtime': _runtime}
+    return _amostrador.obter_estatisticas()
+
+def executar(main, runtime: Optional[str] = None):
+    """asyncio.run(main) com o runtime configurado, o amostrador de atraso e a guarda de I/O ligados"""
+    instalar_runtime(runtime)
+    instalar_guarda()
+
+    async def _monitorado():
+        amostrador = await iniciar_monitor_loop()
+        try:
+            return await main
+        finally:
+            if amostrador is not None:
+                amostrador.parar()
+
+    return asyncio.run(_monitorado())
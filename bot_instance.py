@@ -27,7 +27,6 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 from dotenv import load_dotenv
 from supabase import create_client, Client
-from aiohttp import web
 
 # Carregar variáveis de ambiente
 load_dotenv('.env.accumulator')
@@ -35,6 +34,12 @@ load_dotenv('.env.accumulator')
 # Adicionar o diretório atual ao path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from enhanced_tick_buffer import TickRingBuffer
+from tick_direction_pattern import TickDirectionDetector, RISE_FALL_PATTERN
+from tick_store import get_shared_store
+from async_runtime import executar
+from io_offload import executar_io
+
 try:
     from robust_order_system import RobustOrderSystem, OperationType
     from enhanced_sync_system import EnhancedSyncSystem
@@ -63,6 +68,18 @@ except ImportError:
             except:
                 return None
         
+        async def aguardar_sinal(self, parar=None):
+            if parar is None:
+                return await self.signal_queue.get()
+            obter = asyncio.ensure_future(self.signal_queue.get())
+            parada = asyncio.ensure_future(parar.wait())
+            await asyncio.wait((obter, parada), return_when=asyncio.FIRST_COMPLETED)
+            parada.cancel()
+            if not obter.done():
+                obter.cancel()
+                return None
+            return obter.result()
+        
         def can_execute_operation(self):
             return True
         
@@ -77,10 +94,16 @@ class BotInstance:
     Instância genérica de bot que busca configurações do banco de dados
     """
     
-    def __init__(self, bot_id: str):
+    def __init__(self, bot_id: str, api_manager=None, supabase: Optional[Client] = None):
+        """
+        api_manager/supabase: conexões compartilhadas quando o bot roda dentro de um
+        worker multi-bot (bot_worker.py); sem eles o bot abre as próprias.
+        """
         self.bot_id = bot_id
         self.bot_config = None
-        self.supabase = self._init_supabase()
+        # Fila de I/O do bot: escritas no Supabase saem do loop e seguem em ordem
+        self._alvo_io = f"supabase:{bot_id}"
+        self.supabase = supabase or self._init_supabase()
         
         # Configurar logging específico para este bot
         self.logger = self._setup_logging()
@@ -92,12 +115,14 @@ class BotInstance:
         self.growth_rate = 0.0
         self.max_operations = 10
         self.ativo = 'R_75'
+        self.padrao_entrada = RISE_FALL_PATTERN
+        self._parametros_pendentes = None  # (parâmetros, modelo de proposta) aguardando fronteira de operação
         
         # Carregar configuração do banco
         self._load_bot_configuration()
         
         # Inicializar componentes
-        self.api_manager = DerivWebSocketNativo(self.logger)
+        self.api_manager = api_manager or DerivWebSocketNativo(self.logger)
         self.robust_order_system = RobustOrderSystem(self.api_manager)
         self.sync_system = EnhancedSyncSystem(max_concurrent_operations=2, max_queue_size=3)
         
@@ -112,6 +137,7 @@ class BotInstance:
         
         # Estado do bot
         self.running = False
+        self._shutdown_event = asyncio.Event()  # acorda o consumidor de sinais no shutdown
         self.shutdown_requested = False
         self.last_heartbeat = datetime.now()
         self.heartbeat_interval = 60  # segundos
@@ -128,7 +154,8 @@ class BotInstance:
         self.failed_operations = 0
         
         # Sistema de ticks
-        self.tick_buffer = []
+        self.tick_buffer = TickRingBuffer(max_size=5, max_age_seconds=None)
+        self.detector_padrao = TickDirectionDetector(self.padrao_entrada)
         self.tick_subscription_active = False
         
         # Log de estado final
@@ -154,7 +181,7 @@ class BotInstance:
             
         except Exception as e:
             print(f"❌ Erro ao conectar com Supabase: {e}")
-            sys.exit(1)
+            raise
     
     def _setup_logging(self) -> logging.Logger:
         """Configura logging específico para este bot"""
@@ -197,56 +224,19 @@ class BotInstance:
             
             self.bot_config = response.data
             
-            # Carregar parâmetros padrão
+            # Carregar parâmetros (colunas param_* + config_json + param_overrides)
             self.bot_name = self.bot_config['bot_name']
-            self.stake = float(self.bot_config['param_stake_inicial'])
+            parametros = self._ler_parametros(self.bot_config, registrar_overrides=True)
+            self.stake = parametros['stake_inicial']
             self.initial_stake = self.stake
-            self.take_profit_percentual = float(self.bot_config['param_take_profit']) / 100.0
-            self.growth_rate = float(self.bot_config.get('param_growth_rate', 2.0)) / 100.0
-            self.max_operations = int(self.bot_config.get('param_max_operations', 10))
-            
-            # Configurações adicionais do JSON
-            config_json = self.bot_config.get('config_json', {})
-            if isinstance(config_json, str):
-                config_json = json.loads(config_json)
-            
-            self.ativo = config_json.get('ativo', 'R_75')
-            self.win_stop = config_json.get('win_stop', 1000.0)
-            self.loss_limit = config_json.get('loss_limit', 1000.0)
-            
-            # Aplicar param_overrides se existir
-            param_overrides = self.bot_config.get('param_overrides')
-            if param_overrides:
-                try:
-                    if isinstance(param_overrides, str):
-                        overrides = json.loads(param_overrides)
-                    else:
-                        overrides = param_overrides
-                    
-                    # Sobrescrever parâmetros específicos
-                    if 'growth_rate' in overrides:
-                        self.growth_rate = float(overrides['growth_rate']) / 100.0
-                        self.logger.info(f"🔧 Override aplicado - Growth Rate: {self.growth_rate*100}%")
-                    
-                    if 'symbol' in overrides:
-                        self.ativo = overrides['symbol']
-                        self.logger.info(f"🔧 Override aplicado - Symbol: {self.ativo}")
-                    
-                    if 'stake_inicial' in overrides:
-                        self.stake = float(overrides['stake_inicial'])
-                        self.initial_stake = self.stake
-                        self.logger.info(f"🔧 Override aplicado - Stake: ${self.stake}")
-                    
-                    if 'take_profit' in overrides:
-                        self.take_profit_percentual = float(overrides['take_profit']) / 100.0
-                        self.logger.info(f"🔧 Override aplicado - Take Profit: {self.take_profit_percentual*100}%")
-                    
-                    if 'max_operations' in overrides:
-                        self.max_operations = int(overrides['max_operations'])
-                        self.logger.info(f"🔧 Override aplicado - Max Operations: {self.max_operations}")
-                        
-                except Exception as e:
-                    self.logger.error(f"⚠️ Erro ao aplicar param_overrides: {e}")
+            self.take_profit_percentual = parametros['take_profit_percentual']
+            self.growth_rate = parametros['growth_rate']
+            self.max_operations = parametros['max_operations']
+            self.ativo = parametros['ativo']
+            self.padrao_entrada = parametros['padrao_entrada']
+            self.win_stop = parametros['win_stop']
+            self.loss_limit = parametros['loss_limit']
+            self._assinatura_parametros = self._assinatura_configuracao(self.bot_config)
             
             # VALIDAÇÃO CRÍTICA DOS PARÂMETROS
             if self.stake <= 0:
@@ -281,10 +271,161 @@ class BotInstance:
                 'win_stop': self.win_stop,
                 'loss_limit': self.loss_limit
             }
+            self._modelo_proposta = self._construir_modelo_proposta(self.ativo, self.growth_rate)
             
         except Exception as e:
             self.logger.error(f"❌ Erro ao carregar configuração: {e}")
-            sys.exit(1)
+            raise
+    
+    # ------------------------------------------------------------------
+    # Recarga de parâmetros a quente
+    # ------------------------------------------------------------------
+    # Colunas relidas a cada heartbeat; mudança em qualquer uma gera uma nova configuração
+    COLUNAS_PARAMETROS = ('param_stake_inicial', 'param_take_profit', 'param_growth_rate',
+                          'param_max_operations', 'param_overrides', 'config_json')
+    
+    # param_overrides: chave -> (parâmetro, conversão, rótulo do log)
+    OVERRIDES = {
+        'growth_rate': ('growth_rate', lambda v: float(v) / 100.0, 'Growth Rate'),
+        'symbol': ('ativo', lambda v: v, 'Symbol'),
+        'stake_inicial': ('stake_inicial', float, 'Stake'),
+        'take_profit': ('take_profit_percentual', lambda v: float(v) / 100.0, 'Take Profit'),
+        'padrao_entrada': ('padrao_entrada', lambda v: v, 'Padrão de entrada'),
+        'max_operations': ('max_operations', int, 'Max Operations'),
+    }
+    
+    # Só mudam com reinício (subscription de ticks e detector aquecido)
+    PARAMETROS_REINICIO = ('ativo', 'padrao_entrada')
+    
+    def _ler_parametros(self, config: Dict[str, Any], registrar_overrides: bool = False,
+                        estrito: bool = False) -> Dict[str, Any]:
+        """
+        Parâmetros de trading de uma linha de bot_configurations. Com estrito,
+        param_overrides ilegível gera ValueError em vez de ser ignorado (o hot
+        reload rejeita a mudança em vez de reverter os overrides em vigor).
+        """
+        config_json = config.get('config_json') or {}
+        if isinstance(config_json, str):
+            config_json = json.loads(config_json)
+        
+        parametros = {
+            'stake_inicial': float(config['param_stake_inicial']),
+            'take_profit_percentual': float(config['param_take_profit']) / 100.0,
+            'growth_rate': float(config.get('param_growth_rate', 2.0)) / 100.0,
+            'max_operations': int(config.get('param_max_operations', 10)),
+            'ativo': config_json.get('ativo', 'R_75'),
+            'padrao_entrada': config_json.get('padrao_entrada', RISE_FALL_PATTERN),
+            'win_stop': config_json.get('win_stop', 1000.0),
+            'loss_limit': config_json.get('loss_limit', 1000.0),
+        }
+        
+        # Aplicar param_overrides se existir
+        param_overrides = config.get('param_overrides')
+        if param_overrides:
+            try:
+                overrides = json.loads(param_overrides) if isinstance(param_overrides, str) else param_overrides
+                for chave, (parametro, converter, rotulo) in self.OVERRIDES.items():
+                    if chave in overrides:
+                        parametros[parametro] = converter(overrides[chave])
+                        if registrar_overrides:
+                            self.logger.info(f"🔧 Override aplicado - {rotulo}: {overrides[chave]}")
+            except Exception as e:
+                if estrito:
+                    raise ValueError(f"param_overrides inválido: {e}") from e
+                self.logger.error(f"⚠️ Erro ao aplicar param_overrides: {e}")
+        
+        return parametros
+    
+    @classmethod
+    def _assinatura_configuracao(cls, config: Dict[str, Any]) -> str:
+        return json.dumps([config.get(coluna) for coluna in cls.COLUNAS_PARAMETROS], sort_keys=True, default=str)
+    
+    @staticmethod
+    def _validar_parametros(parametros: Dict[str, Any]) -> List[str]:
+        """Mesmos limites que executar_compra aplica antes de comprar"""
+        erros = []
+        if not 0.35 <= parametros['stake_inicial'] <= 1000.0:
+            erros.append(f"stake ${parametros['stake_inicial']} fora de $0.35-$1000")
+        if not 0.01 <= parametros['growth_rate'] <= 0.05:
+            erros.append(f"growth rate {parametros['growth_rate']*100}% fora de 1-5%")
+        if not 0 < parametros['take_profit_percentual'] <= 1:
+            erros.append(f"take profit {parametros['take_profit_percentual']*100}% fora de 0-100%")
+        if parametros['max_operations'] <= 0:
+            erros.append(f"max operations {parametros['max_operations']} deve ser positivo")
+        return erros
+    
+    @staticmethod
+    def _construir_modelo_proposta(ativo: str, growth_rate: float) -> Dict[str, Any]:
+        """Parte fixa da proposta ACCU; stake e take profit entram a cada compra"""
+        return {
+            "proposal": 1,
+            "contract_type": "ACCU",
+            "symbol": ativo,
+            "basis": "stake",
+            "currency": "USD",
+            "growth_rate": growth_rate,
+        }
+    
+    def _receber_configuracao(self, config: Dict[str, Any]):
+        """
+        Linha de bot_configurations relida no heartbeat. Uma mudança válida fica
+        pendente (com o modelo de proposta já montado) até a próxima fronteira de
+        operação; uma inválida é rejeitada e a configuração corrente segue valendo.
+        """
+        assinatura = self._assinatura_configuracao(config)
+        if assinatura == self._assinatura_parametros:
+            return
+        self._assinatura_parametros = assinatura
+        
+        try:
+            parametros = self._ler_parametros(config, estrito=True)
+        except (KeyError, TypeError, ValueError) as e:
+            self.logger.error(f"❌ Nova configuração ilegível - mantendo a atual: {e}")
+            return
+        erros = self._validar_parametros(parametros)
+        if erros:
+            self.logger.error(f"❌ Nova configuração rejeitada - mantendo a atual: {'; '.join(erros)}")
+            return
+        
+        for parametro in self.PARAMETROS_REINICIO:
+            if parametros[parametro] != getattr(self, parametro):
+                self.logger.warning(f"⚠️ {parametro} alterado para {parametros[parametro]} - só vale após reiniciar o bot")
+                parametros[parametro] = getattr(self, parametro)
+        
+        modelo = self._construir_modelo_proposta(parametros['ativo'], parametros['growth_rate'])
+        self._parametros_pendentes = (parametros, modelo)
+        self.logger.info(f"🔄 Nova configuração validada - aplicada na próxima fronteira de operação")
+    
+    def _aplicar_parametros_pendentes(self) -> bool:
+        """Troca todos os parâmetros de uma vez; chamado só sem contrato em andamento"""
+        if self._parametros_pendentes is None:
+            return False
+        parametros, modelo = self._parametros_pendentes
+        self._parametros_pendentes = None
+        
+        # Stake inicial novo reinicia a progressão; sem mudança, o stake corrente segue
+        if parametros['stake_inicial'] != self.initial_stake:
+            self.stake = parametros['stake_inicial']
+            self.initial_stake = parametros['stake_inicial']
+        self.take_profit_percentual = parametros['take_profit_percentual']
+        self.growth_rate = parametros['growth_rate']
+        self.max_operations = parametros['max_operations']
+        self.win_stop = parametros['win_stop']
+        self.loss_limit = parametros['loss_limit']
+        self._modelo_proposta = modelo
+        self.config.update({
+            'param_stake_inicial': self.initial_stake,
+            'param_stake_atual': self.stake,
+            'param_take_profit': self.take_profit_percentual * 100,
+            'growth_rate': self.growth_rate * 100,
+            'param_max_operations': self.max_operations,
+            'win_stop': self.win_stop,
+            'loss_limit': self.loss_limit,
+        })
+        self.logger.info(f"✅ CONFIGURAÇÃO RECARREGADA: Stake ${self.stake:.2f} (inicial ${self.initial_stake}), "
+                         f"Take Profit {self.take_profit_percentual*100}%, Growth Rate {self.growth_rate*100}%, "
+                         f"Max Operations {self.max_operations}")
+        return True
     
     async def send_heartbeat(self):
         """Envia sinal de vida para o banco de dados"""
@@ -296,10 +437,10 @@ class BotInstance:
                 'process_id': os.getpid() if hasattr(os, 'getpid') else None
             }
             
-            self.supabase.table('bot_configurations') \
-                .update(update_data) \
-                .eq('id', self.bot_id) \
-                .execute()
+            await executar_io(self._alvo_io, self.supabase.table('bot_configurations')
+                              .update(update_data)
+                              .eq('id', self.bot_id)
+                              .execute)
             
             self.last_heartbeat = datetime.now()
             self.logger.info(f"💓 Heartbeat enviado - Status: running, PID: {update_data.get('process_id')}")
@@ -322,9 +463,9 @@ class BotInstance:
             self.logger.debug(f"🔄 Tentando registrar operação no Supabase: {log_data}")
             
             # Inserir no Supabase
-            result = self.supabase.table('bot_operation_logs') \
-                .insert(log_data) \
-                .execute()
+            result = await executar_io(self._alvo_io, self.supabase.table('bot_operation_logs')
+                                       .insert(log_data)
+                                       .execute)
             
             self.logger.debug(f"📊 Resposta do Supabase: {result}")
             
@@ -342,7 +483,7 @@ class BotInstance:
             # Tentar reconectar ao Supabase
             try:
                 self.logger.info("🔄 Tentando reconectar ao Supabase...")
-                self.supabase = self._init_supabase()
+                self.supabase = await executar_io(self._alvo_io, self._init_supabase)
                 self.logger.info("✅ Reconexão ao Supabase bem-sucedida")
             except Exception as reconnect_error:
                 self.logger.error(f"❌ Falha na reconexão ao Supabase: {reconnect_error}")
@@ -350,13 +491,13 @@ class BotInstance:
             return False
     
     async def check_shutdown_signal(self) -> bool:
-        """Verifica se deve fazer shutdown graceful"""
+        """Verifica se deve fazer shutdown graceful (e recebe parâmetros alterados na mesma leitura)"""
         try:
-            response = self.supabase.table('bot_configurations') \
-                .select('is_active, status') \
-                .eq('id', self.bot_id) \
-                .single() \
-                .execute()
+            response = await executar_io(self._alvo_io, self.supabase.table('bot_configurations')
+                                         .select(', '.join(('is_active', 'status') + self.COLUNAS_PARAMETROS))
+                                         .eq('id', self.bot_id)
+                                         .single()
+                                         .execute)
             
             if response.data:
                 is_active = response.data.get('is_active', True)
@@ -367,6 +508,8 @@ class BotInstance:
                 if not is_active or status == 'stopped':
                     self.logger.info(f"🛑 Sinal de shutdown recebido - is_active: {is_active}, status: {status}")
                     return True
+                
+                self._receber_configuracao(response.data)
             
             return False
             
@@ -387,25 +530,20 @@ class BotInstance:
             # Log do tick recebido
             self.logger.debug(f"📊 Tick recebido: {tick_value:.5f}")
             
-            # Adicionar ao buffer
-            self.tick_buffer.append(tick_value)
-            
-            # Manter apenas os últimos 5 ticks
-            if len(self.tick_buffer) > 5:
-                removed_tick = self.tick_buffer.pop(0)
-                self.logger.debug(f"🗑️ Tick removido do buffer: {removed_tick:.5f}")
+            # Adicionar ao anel (mantém apenas os últimos 5 ticks)
+            self.tick_buffer.add_tick(tick_value)
+            padrao = self.detector_padrao.add_tick(tick_value)
             
             # Log do buffer atual
-            self.logger.debug(f"📋 Buffer atual ({len(self.tick_buffer)} ticks): {[f'{t:.5f}' for t in self.tick_buffer]}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"📋 Buffer atual ({len(self.tick_buffer)} ticks): {[f'{t:.5f}' for t in self.tick_buffer]}")
             
             # Analisar padrão quando tiver 5 ticks
-            if len(self.tick_buffer) == 5:
-                self.logger.info(f"📊 Buffer completo ({len(self.tick_buffer)} ticks): {[f'{t:.5f}' for t in self.tick_buffer]}")
-                
-                pattern_detected = self.analisar_padrao_entrada(self.tick_buffer.copy())
+            if self.tick_buffer.is_full():
+                pattern_detected = padrao is not None
                 
                 if pattern_detected:
-                    self.logger.info(f"🎯 PADRÃO DETECTADO! Buffer: {[f'{t:.5f}' for t in self.tick_buffer]}")
+                    self.logger.info(f"🎯 PADRÃO DETECTADO ({padrao.name})! Buffer: {[f'{t:.5f}' for t in self.tick_buffer]}")
                     
                     # Log da operação
                     await self.log_operation(
@@ -413,11 +551,9 @@ class BotInstance:
                         profit_percentage=0.0,
                         stake_value=self.stake
                     )
-                else:
-                    self.logger.info(f"⏳ Padrão não detectado. Buffer: {[f'{t:.5f}' for t in self.tick_buffer]}")
                 
                 # Enviar para queue
-                success = self.sync_system.queue_signal(self.tick_buffer.copy(), pattern_detected)
+                success = self.sync_system.queue_signal(self.tick_buffer.to_list(), pattern_detected)
                 if success:
                     self.logger.info(f"📤 Sinal enviado para queue - Pattern: {pattern_detected}")
                 else:
@@ -426,54 +562,23 @@ class BotInstance:
         except Exception as e:
             self.logger.error(f"❌ Erro ao processar tick: {e}")
             self.logger.error(f"📊 Tick data: {tick_data}")
-            self.logger.error(f"📋 Buffer atual: {self.tick_buffer}")
+            self.logger.error(f"📋 Buffer atual: {self.tick_buffer.to_list()}")
     
     def analisar_padrao_entrada(self, ticks: List[float]) -> bool:
-        """Analisa padrão de entrada baseado na lógica XML do Accumulator"""
+        """Analisa padrão de entrada baseado na lógica XML do Accumulator (máscara de bits, log só no match)"""
         if len(ticks) < 5:
             self.logger.warning(f"⚠️ Ticks insuficientes para análise: {len(ticks)} < 5")
             return False
         
         try:
-            # LÓGICA XML DO ACCUMULATOR STANDALONE
-            # Padrão: 4 ticks consecutivos em alta seguidos de 1 em baixa
-            # ticks[0] = tick mais antigo, ticks[4] = tick mais recente
-            
-            # Obter os 5 ticks em ordem cronológica
-            tick1 = ticks[0]  # Mais antigo
-            tick2 = ticks[1]
-            tick3 = ticks[2]
-            tick4 = ticks[3]
-            tick5 = ticks[4]  # Mais recente
-            
-            # Verificar se há tendência de alta nos primeiros 4 ticks
-            trend_up = (tick2 > tick1 and tick3 > tick2 and tick4 > tick3)
-            
-            # Verificar se o último tick é uma queda (confirma o padrão)
-            last_fall = tick5 < tick4
-            
-            # Padrão detectado: tendência de alta + queda final
-            entrada_xml = trend_up and last_fall
-            
-            # Log detalhado para debug
-            self.logger.info(f"📊 VERIFICAÇÃO DE PADRÃO XML:")
-            self.logger.info(f"   • tick1 (antigo): {tick1:.5f}")
-            self.logger.info(f"   • tick2: {tick2:.5f} {'↗️' if tick2 > tick1 else '↘️'}")
-            self.logger.info(f"   • tick3: {tick3:.5f} {'↗️' if tick3 > tick2 else '↘️'}")
-            self.logger.info(f"   • tick4: {tick4:.5f} {'↗️' if tick4 > tick3 else '↘️'}")
-            self.logger.info(f"   • tick5 (recente): {tick5:.5f} {'↗️' if tick5 > tick4 else '↘️'}")
-            self.logger.info(f"   • Tendência alta: {trend_up}")
-            self.logger.info(f"   • Queda final: {last_fall}")
-            self.logger.info(f"   • Padrão esperado: 4 ticks ↗️ + 1 tick ↘️")
-            self.logger.info(f"   • Entrada detectada: {entrada_xml}")
-            
-            if entrada_xml:
-                self.logger.info("🎯 PADRÃO DE ENTRADA DETECTADO! (XML MATCH)")
-                self.logger.info("🚀 EXECUTANDO COMPRA DO CONTRATO ACCUMULATOR...")
-            else:
-                self.logger.info("⏳ Aguardando padrão correto...")
-                
-            return entrada_xml
+            # Padrão configurável (padrão: 3 ticks em alta seguidos de 1 em baixa)
+            padrao = self.detector_padrao.evaluate(ticks)
+            if padrao is None:
+                return False
+            
+            self.logger.info(f"🎯 PADRÃO DE ENTRADA DETECTADO! (XML MATCH: {padrao.name} = {[f'{t:.5f}' for t in ticks[-5:]]})")
+            self.logger.info("🚀 EXECUTANDO COMPRA DO CONTRATO ACCUMULATOR...")
+            return True
             
         except Exception as e:
             self.logger.error(f"❌ Erro na análise de padrão: {e}")
@@ -527,13 +632,8 @@ class BotInstance:
             # ESTRUTURA CORRETA PARA ACCUMULATOR CONFORME DOCUMENTAÇÃO DERIV
             # Primeiro fazer proposal para obter o ID
             proposal_params = {
-                "proposal": 1,
-                "contract_type": "ACCU",
-                "symbol": self.ativo,
+                **self._modelo_proposta,
                 "amount": round(float(stake_para_usar), 2),  # CORREÇÃO: Arredondar para 2 casas decimais
-                "basis": "stake",
-                "currency": "USD",
-                "growth_rate": self.growth_rate,
                 "limit_order": {
                     "take_profit": round(float(take_profit_amount), 2)  # CORREÇÃO: Arredondar para 2 casas decimais
                 }
@@ -713,15 +813,33 @@ class BotInstance:
             self.logger.error(f"❌ Erro no monitoramento do contrato {contract_id}: {e}")
             return 0.0
     
+    @property
+    def shutdown_requested(self) -> bool:
+        return self._shutdown_event.is_set()
+    
+    @shutdown_requested.setter
+    def shutdown_requested(self, valor: bool):
+        # Atribuição (heartbeat, shutdown(), bot_worker.parar_bot) também acorda o consumidor
+        if valor:
+            self._shutdown_event.set()
+        else:
+            self._shutdown_event.clear()
+    
     async def _process_signals_from_queue(self):
         """Processa sinais da queue"""
         self.logger.info(f"🔄 Processador de sinais iniciado")
         
         while not self.shutdown_requested:
             try:
-                signal = self.sync_system.get_next_signal()
+                # Só sinais com padrão chegam aqui; None = shutdown solicitado (o sinal fica na fila)
+                signal = await self.sync_system.aguardar_sinal(self._shutdown_event)
+                if signal is None:
+                    break
                 
-                if signal and signal.pattern_detected:
+                # Fronteira de operação: nenhum contrato em andamento neste ponto
+                self._aplicar_parametros_pendentes()
+                
+                if signal.pattern_detected:
                     self.logger.info(f"🎯 SINAL PROCESSADO - Padrão detectado: {[f'{t:.5f}' for t in signal.ticks]}")
                     
                     if self.sync_system.can_execute_operation():
@@ -741,13 +859,6 @@ class BotInstance:
                                 self.sync_system.record_operation_failure()
                     else:
                         self.logger.info(f"⏳ Sistema ocupado, aguardando...")
-                elif signal:
-                    self.logger.debug(f"📊 Sinal recebido sem padrão: {[f'{t:.5f}' for t in signal.ticks]}")
-                else:
-                    # Sem sinais na queue
-                    pass
-                
-                await asyncio.sleep(0.1)
                 
             except Exception as e:
                 self.logger.error(f"❌ Erro no processamento de sinais: {e}")
@@ -791,12 +902,6 @@ class BotInstance:
             self.logger.info(f"🎯 Ativo: {self.ativo}")
             self.logger.info(f"📊 Growth Rate: {self.growth_rate*100}%")
             
-            await self.log_operation(
-                operation_result='BOT_START',
-                profit_percentage=0.0,
-                stake_value=self.stake
-            )
-            
             # Conectar à API
             self.logger.info(f"🔗 Conectando à API Deriv...")
             await self.api_manager.connect()
@@ -810,10 +915,19 @@ class BotInstance:
             
             self.running = True
             
+            # Registro de início só depois da subscription: a gravação no Supabase
+            # não atrasa o primeiro tick
+            log_inicio = asyncio.create_task(self.log_operation(
+                operation_result='BOT_START',
+                profit_percentage=0.0,
+                stake_value=self.stake
+            ), name="log_bot_start")
+            
             # Iniciar tasks
             self.logger.info(f"🔄 Iniciando tasks...")
             
             tasks = [
+                log_inicio,
                 asyncio.create_task(self._process_signals_from_queue(), name="signal_processor"),
                 asyncio.create_task(self._heartbeat_loop(), name="heartbeat")
             ]
@@ -856,10 +970,10 @@ class BotInstance:
                 'last_heartbeat': datetime.now().isoformat()
             }
             
-            self.supabase.table('bot_configurations') \
-                .update(update_data) \
-                .eq('id', self.bot_id) \
-                .execute()
+            await executar_io(self._alvo_io, self.supabase.table('bot_configurations')
+                              .update(update_data)
+                              .eq('id', self.bot_id)
+                              .execute)
                 
             self.logger.info(f"✅ Status final atualizado: stopped")
             
@@ -904,12 +1018,20 @@ class DerivWebSocketNativo:
         self.last_request_time = 0
         self.min_request_interval = 0.5
         
+        # Subscriptions ativas: symbol -> subscription id (para forget)
+        self.subscriptions: Dict[str, str] = {}
+        
         # Configurações
         self.app_id = "85515"
         self.api_token = os.getenv('DERIV_API_TOKEN')
         
         if not self.api_token:
             raise ValueError("DERIV_API_TOKEN deve estar definido")
+        
+        # Arquivo de ticks (tick_store): grava (epoch, quote) de cada tick recebido quando TICK_STORE_DIR está definido.
+        # Um único escritor por ativo: com vários processos no mesmo diretório, só o primeiro grava.
+        tick_store_dir = os.getenv('TICK_STORE_DIR')
+        self.tick_store = get_shared_store(tick_store_dir) if tick_store_dir else None
     
     def _get_next_req_id(self):
         """Gera próximo request ID de forma thread-safe"""
@@ -994,6 +1116,8 @@ class DerivWebSocketNativo:
                     self.logger.debug(f"📥 Mensagem recebida - req_id: {req_id}")
                     
                     # Processar ticks em tempo real
+                    if 'tick' in data and self.tick_store is not None:
+                        self.tick_store.record_tick(data['tick'])
                     if 'tick' in data and self.bot_instance:
                         self.logger.debug(f"📊 Tick recebido: {data['tick']}")
                         await self.bot_instance._handle_new_tick(data['tick'])
@@ -1092,13 +1216,22 @@ class DerivWebSocketNativo:
                 self.logger.error(f"❌ {error_msg}")
                 raise Exception(error_msg)
             else:
+                self.subscriptions[symbol] = response.get('subscription', {}).get('id')
                 self.logger.info(f"✅ Subscrito aos ticks de {symbol}")
                 self.logger.debug(f"📡 Response: {response}")
+                return response
                 
         except Exception as e:
             self.logger.error(f"❌ Erro na subscrição de ticks: {e}")
             raise
     
+    async def unsubscribe_ticks(self, symbol: str):
+        """Cancela a subscription de ticks de um símbolo"""
+        subscription_id = self.subscriptions.pop(symbol, None)
+        if subscription_id and self.connected:
+            await self._send_request({"forget": subscription_id})
+            self.logger.info(f"📡 Subscription de {symbol} cancelada")
+    
     async def buy(self, params):
         """Executa compra"""
         try:
@@ -1163,6 +1296,9 @@ class DerivWebSocketNativo:
             self.connected = False
             self.authorized = False
             
+            if self.tick_store is not None:
+                self.tick_store.flush()
+            
             if self.ws:
                 await self.ws.close()
                 self.ws = None
@@ -1215,4 +1351,4 @@ async def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    executar(main())
\ No newline at end of file
@@ -41,6 +41,9 @@ try:
 except ImportError:
     print("Aviso: Modulo bot_aura_under8 nao encontrado. Sera definido localmente.")
 
+from trading_system.utils.task_supervisor import SupervisorBots, PoliticaReinicio
+from async_runtime import executar
+
 # Importar bot accumulator_scalping
 try:
     from trading_system.bots.accumulator_bot.bot_accumulator_scalping import bot_accumulator_scalping
@@ -48,43 +51,66 @@ except ImportError:
     print("Aviso: Modulo bot_accumulator_scalping nao encontrado. Sera definido localmente.")
 
 # CLASSE APIMANAGER - GERENCIAMENTO ROBUSTO DE API
+TIMEOUT_CHAMADA_API = 15.0  # segundos por chamada feita sob o lock
+TIMEOUT_TROCA_CONEXAO = 45.0  # segundos para pegar o lock e autorizar a nova conexão
+
 class ApiManager:
     """
     Classe para gerenciar chamadas à API da Deriv de forma robusta
     Implementa controle de concorrência e pausas para evitar rate limiting
+    
+    Com uma fábrica de conexões, reconectar() troca a conexão por baixo dos
+    bots em execução: as chamadas feitas durante a troca aguardam no lock.
+    Toda chamada sob o lock tem timeout, então um socket meio aberto não
+    segura o lock (nem a troca) para sempre.
     """
     
-    def __init__(self, api):
+    def __init__(self, api, conectar=None, timeout_chamada: float = TIMEOUT_CHAMADA_API):
         self.api = api
         self.api_lock = asyncio.Lock()
+        self.conectar = conectar
+        self.timeout_chamada = timeout_chamada
+        self.reconexoes = 0
+    
+    async def reconectar(self):
+        """Descarta a conexão antiga e abre uma nova autorizada"""
+        if self.conectar is None:
+            raise RuntimeError("ApiManager sem fábrica de conexões")
+        antiga = self.api
+        # Fechar antes de pegar o lock: a chamada presa na conexão morta falha
+        # agora e libera o lock, em vez de esperar o próprio timeout
+        try:
+            await asyncio.wait_for(antiga.disconnect(), timeout=self.timeout_chamada)
+        except Exception:
+            pass
+        await asyncio.wait_for(self.api_lock.acquire(), timeout=TIMEOUT_TROCA_CONEXAO)
+        try:
+            self.api = await asyncio.wait_for(self.conectar(), timeout=TIMEOUT_TROCA_CONEXAO)
+            self.reconexoes += 1
+        finally:
+            self.api_lock.release()
     
-    async def buy(self, params):
-        """Wrapper para chamadas de compra com controle de concorrência"""
+    async def _chamar(self, metodo: str, params):
         async with self.api_lock:
-            resultado = await self.api.buy(params)
+            resultado = await asyncio.wait_for(getattr(self.api, metodo)(params), timeout=self.timeout_chamada)
             await asyncio.sleep(0.3)  # Pausa de 300ms para evitar saturação
             return resultado
     
+    async def buy(self, params):
+        """Wrapper para chamadas de compra com controle de concorrência"""
+        return await self._chamar('buy', params)
+    
     async def ticks_history(self, params):
         """Wrapper para chamadas de histórico de ticks com controle de concorrência"""
-        async with self.api_lock:
-            resultado = await self.api.ticks_history(params)
-            await asyncio.sleep(0.3)  # Pausa de 300ms para evitar saturação
-            return resultado
+        return await self._chamar('ticks_history', params)
     
     async def proposal_open_contract(self, params):
         """Wrapper para chamadas de status de contrato com controle de concorrência"""
-        async with self.api_lock:
-            resultado = await self.api.proposal_open_contract(params)
-            await asyncio.sleep(0.3)  # Pausa de 300ms para evitar saturação
-            return resultado
+        return await self._chamar('proposal_open_contract', params)
     
     async def proposal(self, params):
         """Wrapper para chamadas de proposta com controle de concorrência"""
-        async with self.api_lock:
-            resultado = await self.api.proposal(params)
-            await asyncio.sleep(0.3)  # Pausa de 300ms para evitar saturação
-            return resultado
+        return await self._chamar('proposal', params)
 
 async def bot_scale(api_manager):
         """
@@ -482,6 +508,10 @@ RATE_LIMIT_CONFIG = {
     'proposal_open_contract': {'max_calls': 20, 'window_seconds': 60}  # 20 verificações por minuto
 }
 
+# Reinícios programados: rolling, um bot por vez (em vez do processo inteiro a cada hora)
+INTERVALO_REINICIO_ROLLING = 3600  # segundos
+PAUSA_REINICIO_ROLLING = 5  # segundos entre um bot e o próximo
+
 # 3. CONFIGURAÇÕES E CONEXÃO COM SUPABASE
 # Credenciais da Deriv API (carregadas do arquivo .env)
 DERIV_APP_ID = os.getenv("DERIV_APP_ID")
@@ -2621,10 +2651,11 @@ async def bot_vip_boster(api_manager):
             await asyncio.sleep(5)
 
 
-async def connection_watchdog(api_manager, main_task):
+async def connection_watchdog(api_manager):
     """
     Função watchdog que monitora a saúde da conexão com a Deriv API.
-    Verifica a conexão a cada 20 segundos e força o reinício se detectar falhas.
+    Verifica a conexão a cada 20 segundos e, se detectar falha, troca a
+    conexão por baixo dos bots em execução (sem reiniciá-los).
     """
     while True:
         # Pausa de 20 segundos entre verificações
@@ -2632,24 +2663,26 @@ async def connection_watchdog(api_manager, main_task):
         
         try:
             # Teste leve da conexão com ping
-            await api_manager.api.ping()
+            await asyncio.wait_for(api_manager.api.ping(), timeout=10.0)
             print("🟢 WATCHDOG: Conexão com Deriv OK")
         except Exception as e:
-            # Conexão perdida - forçar reinício do sistema
-            print("🚨 WATCHDOG: Conexão com a Deriv perdida! Forçando o reinício de todo o sistema...")
+            print("🚨 WATCHDOG: Conexão com a Deriv perdida! Reconectando por baixo dos bots...")
             print(f"🔍 Erro detectado: {e}")
-            
-            # Cancelar a tarefa principal que roda o gather dos bots
-            main_task.cancel()
-            
-            # Sair da função watchdog
-            return
+            try:
+                await api_manager.reconectar()
+                print(f"✅ WATCHDOG: Conexão restabelecida (reconexões: {api_manager.reconexoes})")
+            except Exception as erro_reconexao:
+                # Tenta de novo no próximo ciclo; os bots seguem com suas próprias retentativas
+                print(f"❌ WATCHDOG: Falha na reconexão: {erro_reconexao}")
 
 # 6. FUNÇÃO PRINCIPAL (ORQUESTRADOR AUTORREPARÁVEL)
 async def main():
     """
     Função principal autorreparável que coordena a execução de todos os bots em paralelo.
-    Implementa um loop infinito com reinício automático em caso de falhas.
+    Cada bot roda na sua própria tarefa supervisionada (falha reinicia só o bot),
+    a conexão é trocada pelo watchdog sem parar os bots e os reinícios
+    programados são rolling, um bot por vez. O loop externo só recria tudo
+    se a conexão inicial falhar.
     """
     global connection_pool, supervisor_stats
     
@@ -2658,6 +2691,7 @@ async def main():
     # Loop infinito para auto-reparação
     while True:
         api = None
+        api_manager = None
         tasks = []
         connection_pool = None
         
@@ -2680,12 +2714,16 @@ async def main():
             print("📊 Conectando à API da Deriv...")
             
             # Conectar à API da Deriv
-            api = DerivAPI(app_id=DERIV_APP_ID)
-            await api.authorize(DERIV_API_TOKEN)
+            async def nova_conexao():
+                conexao = DerivAPI(app_id=DERIV_APP_ID)
+                await asyncio.wait_for(conexao.authorize(DERIV_API_TOKEN), timeout=30.0)
+                return conexao
+            
+            api = await nova_conexao()
             print("✅ Conexão com Deriv API estabelecida com sucesso!")
             
             # Criar instância única do ApiManager
-            api_manager = ApiManager(api)
+            api_manager = ApiManager(api, conectar=nova_conexao)
             print("🛡️ ApiManager inicializado com controle de concorrência")
             
             # Verificar conexão com Supabase
@@ -2719,51 +2757,34 @@ async def main():
                 bot_aura_under8  # Adicionando o AuraBot_Under8 à lista
             ]
             
-            # Função auxiliar para criar bot com delay inicial (fora do loop para evitar closure)
-            async def delayed_bot(func, delay, manager, bot_name):
-                print(f"⏰ Bot {bot_name} aguardando {delay}s para iniciar...")
-                await asyncio.sleep(delay)
-                print(f"🚀 Iniciando {bot_name}...")
-                try:
-                    await func(manager)
-                except Exception as e:
-                    print(f"❌ Erro no {bot_name}: {e}")
-                    import traceback
-                    traceback.print_exc()
-            
-            # Criar tarefas passando api_manager para cada bot
+            # Uma tarefa supervisionada por bot, com 2 segundos de intervalo entre os inícios
+            supervisor_bots = SupervisorBots(PoliticaReinicio(PoliticaReinicio.SEMPRE))
             for i, bot_func in enumerate(bot_functions):
-                # Obter nome do bot
-                bot_name = bot_func.__name__
-                
-                # Adicionar tarefa com delay de 2 segundos entre cada bot
-                tasks.append(asyncio.create_task(delayed_bot(bot_func, i * 2, api_manager, bot_name)))
-            
-            # Obter a tarefa atual que está rodando o gather
-            main_task = asyncio.current_task()
+                supervisor_bots.adicionar(bot_func.__name__, lambda f=bot_func: f(api_manager),
+                                          atraso_inicial=i * 2)
+            tasks.extend(supervisor_bots.iniciar())
             
-            # Adicionar a tarefa do watchdog à lista
-            tasks.append(asyncio.create_task(connection_watchdog(api_manager, main_task)))
+            # Watchdog de conexão e reinícios programados rolling (um bot por vez)
+            tasks.append(asyncio.create_task(connection_watchdog(api_manager)))
+            tasks.append(asyncio.create_task(
+                supervisor_bots.reinicio_rolling(INTERVALO_REINICIO_ROLLING, pausa=PAUSA_REINICIO_ROLLING)))
             
-            print(f"📈 {len(tasks)-1} bots configurados para execução paralela com ApiManager")
+            print(f"📈 {len(supervisor_bots.bots)} bots configurados para execução paralela com ApiManager")
             print("🛡️ Watchdog de conexão ativado - monitoramento a cada 20 segundos")
-            print("🎯 Sistema em execução - aguardando falhas para auto-reparação...")
+            print(f"🔄 Reinício rolling a cada {INTERVALO_REINICIO_ROLLING}s, um bot por vez")
+            print("🎯 Sistema em execução - falhas reiniciam só o bot afetado...")
             
-            # PONTO CRÍTICO: Esta linha só termina se um bot falhar catastroficamente ou watchdog detectar falha
+            # Os supervisores não propagam falhas dos bots; isto só termina no encerramento
             await asyncio.gather(*tasks)
             
-            # Se chegou aqui, significa que gather() terminou (provavelmente por falha)
-            print("⚠️ Um ou mais bots pararam. Reiniciando todas as tarefas em 15 segundos...")
-            await asyncio.sleep(15)
-            
         except KeyboardInterrupt:
             print("\n⏹️  Interrupção manual detectada...")
             break
             
         except asyncio.CancelledError:
-            # Cancelamento iniciado pelo watchdog devido à perda de conexão
-            print("🔄 WATCHDOG: Reinício forçado devido à perda de conexão detectada")
-            print("⚠️ Reiniciando todo o sistema em 15 segundos...")
+            # Encerramento do processo: as tarefas dos bots são canceladas no finally
+            print("⏹️  Encerramento solicitado - parando os bots...")
+            raise
             
         except Exception as e:
             # Este bloco captura qualquer erro fatal não tratado
@@ -2809,6 +2830,8 @@ async def main():
                     if not task.done():
                         task.cancel()
             
+            if api_manager is not None:
+                api = api_manager.api  # pode ter sido trocada pelo watchdog
             if api:
                 try:
                     await api.disconnect()
@@ -2829,18 +2852,18 @@ async def main():
 def supervisor():
     """
     Função supervisor que gerencia o auto-reinício dos bots
-    Reinicia o sistema a cada intervalo definido para manter estabilidade
+    Reinicia o processo worker apenas se ele morrer; os reinícios programados
+    são feitos dentro do worker, um bot por vez (reinício rolling)
     """
     print("🔧 MODO SUPERVISOR ATIVADO")
     print("=" * 60)
     
     # Configurações do supervisor
-    tempo_de_execucao_segundos = 3600  # 1 hora (3600 segundos)
     pausa_entre_reinicios_segundos = 15
     ciclo = 1
     
     print(f"🎯 SISTEMA DE TRADING AUTOMATIZADO - DERIV")
-    print(f"⏰ Tempo de execução configurado: {tempo_de_execucao_segundos} segundos")
+    print(f"🔄 Reinício rolling dos bots a cada {INTERVALO_REINICIO_ROLLING} segundos")
     print(f"🔄 Rate limiting ativo para proteção da API")
     print(f"📊 Configurações de rate limiting:")
     print(f"   • Compras: {RATE_LIMIT_CONFIG['buy']['max_calls']} por {RATE_LIMIT_CONFIG['buy']['window_seconds']}s")
@@ -2848,7 +2871,7 @@ def supervisor():
     print(f"   • Verificações: {RATE_LIMIT_CONFIG['proposal_open_contract']['max_calls']} por {RATE_LIMIT_CONFIG['proposal_open_contract']['window_seconds']}s")
     print("=" * 60)
     print(f"⚙️  Configurações do Supervisor:")
-    print(f"   ⏱️  Tempo de execução: {tempo_de_execucao_segundos} segundos")
+    print(f"   🔄 Reinício rolling: a cada {INTERVALO_REINICIO_ROLLING}s, {PAUSA_REINICIO_ROLLING}s entre bots")
     print(f"   ⏸️  Pausa entre reinícios: {pausa_entre_reinicios_segundos} segundos")
     print("=" * 60)
     
@@ -2868,27 +2891,9 @@ def supervisor():
                 bufsize=1
             )
             
-            try:
-                # Aguardar o processo por tempo_de_execucao_segundos
-                processo.wait(timeout=tempo_de_execucao_segundos)
-                print(f"✅ Processo worker finalizado naturalmente")
-                
-            except subprocess.TimeoutExpired:
-                print(f"⏰ Tempo limite atingido ({tempo_de_execucao_segundos}s)")
-                print("🔄 Encerrando processo worker educadamente...")
-                
-                # Tentar encerrar educadamente
-                processo.terminate()
-                
-                try:
-                    # Aguardar 10 segundos para encerramento educado
-                    processo.wait(timeout=10)
-                    print("✅ Processo worker encerrado educadamente")
-                except subprocess.TimeoutExpired:
-                    print("⚠️  Forçando encerramento do processo worker...")
-                    processo.kill()
-                    processo.wait()
-                    print("🛑 Processo worker encerrado forçadamente")
+            # Aguardar o processo; só um worker morto é reiniciado inteiro
+            processo.wait()
+            print(f"⚠️ Processo worker terminou (código {processo.returncode})")
             
             print(f"⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - Ciclo {ciclo} finalizado")
             
@@ -2946,7 +2951,7 @@ if __name__ == "__main__":
         
         try:
             # Executar o sistema principal dos bots
-            asyncio.run(main())
+            executar(main())
         except KeyboardInterrupt:
             print("\n\n⏹️  Sistema worker interrompido pelo usuário (Ctrl+C)")
             print("🔄 Finalizando operações em andamento...")
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=====================================================
+BOT WORKER - VÁRIOS OPERÁRIOS EM UM PROCESSO
+=====================================================
+Hospeda muitos BotInstance no mesmo event loop, com uma
+única conexão Deriv autenticada e um único cliente
+Supabase compartilhados. Cada ativo é subscrito uma vez e
+os ticks são distribuídos aos bots que o operam.
+
+O orchestrator mantém ~1 worker por núcleo e envia comandos
+pela entrada padrão (uma linha por comando):
+    start <bot_id>
+    stop <bot_id>
+e o worker avisa pela saída padrão quando um bot termina sem
+ter recebido stop (o orchestrator decide se o reinicia):
+    exited <bot_id> erro|finalizado
+
+Uso: python bot_worker.py --worker 0 [--bot_ids 12,15] [--controle-stdin]
+=====================================================
+"""
+
+import os
+import sys
+import asyncio
+import signal
+import logging
+import argparse
+from typing import Dict, List, Optional, Set
+
+from dotenv import load_dotenv
+from supabase import create_client, Client
+
+# Carregar variáveis de ambiente
+load_dotenv('.env.accumulator')
+
+# Adicionar o diretório atual ao path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bot_instance import BotInstance, DerivWebSocketNativo
+from async_runtime import executar
+from io_offload import enviar_io, executar_io
+
+INTERVALO_VIGIA = 5.0  # segundos entre verificações da conexão compartilhada
+
+class ConexaoCompartilhada:
+    """
+    Uma DerivWebSocketNativo para todos os bots do worker. Fica no lugar do
+    bot como destino dos ticks e os repassa aos bots inscritos no ativo.
+    """
+
+    def __init__(self, logger: logging.Logger, api=None):
+        self.logger = logger
+        self.api = api or DerivWebSocketNativo(logger)
+        self.api.set_bot_instance(self)
+        self.inscritos: Dict[str, List[BotInstance]] = {}
+        self._lock = asyncio.Lock()
+
+    async def conectar(self):
+        """Conecta (ou reconecta) e refaz as subscriptions dos ativos em uso"""
+        async with self._lock:
+            if self.api.connected:
+                return
+            await self.api.connect()
+            for symbol in self.inscritos:
+                await self.api.subscribe_ticks(symbol)
+
+    async def inscrever(self, bot: BotInstance, symbol: str):
+        await self.conectar()
+        async with self._lock:
+            bots = self.inscritos.setdefault(symbol, [])
+            if not bots:
+                try:
+                    await self.api.subscribe_ticks(symbol)
+                except Exception:
+                    del self.inscritos[symbol]
+                    raise
+            if bot not in bots:
+                bots.append(bot)
+
+    async def cancelar(self, bot: BotInstance):
+        """Remove o bot de todos os ativos; o último bot de um ativo cancela a subscription"""
+        async with self._lock:
+            for symbol, bots in list(self.inscritos.items()):
+                if bot in bots:
+                    bots.remove(bot)
+                if not bots:
+                    del self.inscritos[symbol]
+                    try:
+                        await self.api.unsubscribe_ticks(symbol)
+                    except Exception as e:
+                        self.logger.warning(f"⚠️ Erro ao cancelar subscription de {symbol}: {e}")
+
+    async def _handle_new_tick(self, tick_data):
+        for bot in tuple(self.inscritos.get(tick_data.get('symbol'), ())):
+            try:
+                await bot._handle_new_tick(tick_data)
+            except Exception as e:
+                self.logger.error(f"❌ Erro no tick do bot {bot.bot_id}: {e}")
+
+class ConexaoBot:
+    """api_manager de um bot dentro do worker: ciclo de vida próprio, socket compartilhado"""
+
+    def __init__(self, compartilhada: ConexaoCompartilhada):
+        self._compartilhada = compartilhada
+        self._bot: Optional[BotInstance] = None
+
+    def set_bot_instance(self, bot_instance):
+        self._bot = bot_instance
+
+    async def connect(self):
+        await self._compartilhada.conectar()
+
+    async def subscribe_ticks(self, symbol: str):
+        await self._compartilhada.inscrever(self._bot, symbol)
+
+    async def disconnect(self):
+        await self._compartilhada.cancelar(self._bot)
+
+    def __getattr__(self, nome):
+        # buy, proposal, proposal_open_contract, connected, ... vão para a conexão compartilhada
+        return getattr(self._compartilhada.api, nome)
+
+class WorkerBots:
+    """Processo hospedeiro de vários BotInstance"""
+
+    def __init__(self, worker_id: int, supabase: Optional[Client] = None, api=None):
+        self.worker_id = worker_id
+        self.logger = logging.getLogger(f"bot_worker_{worker_id}")
+        self.supabase = supabase or self._init_supabase()
+        self.conexao = ConexaoCompartilhada(self.logger, api)
+        self.bots: Dict[str, BotInstance] = {}
+        self.tarefas: Dict[str, asyncio.Task] = {}
+        self._parando: Set[str] = set()  # stop pedido: a saída não é reportada
+        self._encerrar = asyncio.Event()
+
+    def _init_supabase(self) -> Client:
+        url = os.getenv('SUPABASE_URL')
+        key = os.getenv('SUPABASE_ANON_KEY')
+        if not url or not key:
+            raise ValueError("SUPABASE_URL e SUPABASE_ANON_KEY devem estar definidas")
+        return create_client(url, key)
+
+    def iniciar_bot(self, bot_id: str) -> bool:
+        """Agenda o bot no loop do worker; a configuração é carregada fora do loop"""
+        if bot_id in self.tarefas:
+            self.logger.info(f"ℹ️ Bot {bot_id} já está rodando neste worker")
+            return True
+        tarefa = asyncio.create_task(self._executar_bot(bot_id), name=f"bot_{bot_id}")
+        tarefa.add_done_callback(lambda t, b=bot_id: self._bot_finalizado(b, t))
+        self.tarefas[bot_id] = tarefa
+        self.logger.info(f"🚀 Bot {bot_id} iniciado no worker {self.worker_id} ({len(self.tarefas)} bots)")
+        return True
+
+    def _criar_bot(self, bot_id: str) -> BotInstance:
+        conexao = ConexaoBot(self.conexao)
+        bot = BotInstance(bot_id, api_manager=conexao, supabase=self.supabase)
+        conexao.set_bot_instance(bot)
+        return bot
+
+    async def _executar_bot(self, bot_id: str):
+        # O construtor lê bot_configurations com o cliente síncrono: vai para a fila de I/O do bot
+        try:
+            bot = await executar_io(f"supabase:{bot_id}", self._criar_bot, bot_id)
+        except Exception as e:
+            self.logger.error(f"❌ Falha ao criar bot {bot_id}: {e}")
+            self._atualizar_status(bot_id, 'error')
+            raise
+        self.bots[bot_id] = bot
+        await bot.run()
+
+    async def parar_bot(self, bot_id: str):
+        tarefa = self.tarefas.get(bot_id)
+        if tarefa is None:
+            return
+        self._parando.add(bot_id)
+        bot = self.bots.get(bot_id)
+        if bot is not None:
+            bot.shutdown_requested = True
+        tarefa.cancel()  # o finally do run() faz o shutdown do bot
+        await asyncio.gather(tarefa, return_exceptions=True)
+
+    def _bot_finalizado(self, bot_id: str, tarefa: asyncio.Task):
+        self.tarefas.pop(bot_id, None)
+        self.bots.pop(bot_id, None)
+        pedido = bot_id in self._parando or tarefa.cancelled()
+        self._parando.discard(bot_id)
+        if not tarefa.cancelled() and tarefa.exception():
+            self.logger.error(f"❌ Bot {bot_id} terminou com erro: {tarefa.exception()}")
+        else:
+            self.logger.info(f"🛑 Bot {bot_id} finalizado ({len(self.tarefas)} bots no worker)")
+        if not pedido:
+            self._reportar_saida(bot_id, 'erro' if tarefa.exception() else 'finalizado')
+
+    def _reportar_saida(self, bot_id: str, motivo: str):
+        """Avisa o orchestrator (saída padrão, uma linha) que o bot terminou sozinho"""
+        try:
+            print(f"exited {bot_id} {motivo}", flush=True)
+        except OSError as e:
+            self.logger.error(f"❌ Orchestrator não recebeu a saída do bot {bot_id}: {e}")
+
+    def _atualizar_status(self, bot_id: str, status: str):
+        # Chamado de callback de tarefa: enfileira na mesma fila de I/O do bot, sem bloquear o loop
+        try:
+            enviar_io(f"supabase:{bot_id}", self.supabase.table('bot_configurations')
+                      .update({'status': status})
+                      .eq('id', bot_id)
+                      .execute)
+        except Exception as e:
+            self.logger.error(f"❌ Erro ao atualizar status do bot {bot_id}: {e}")
+
+    async def executar_comando(self, linha: str):
+        partes = linha.split()
+        if len(partes) != 2 or partes[0] not in ('start', 'stop'):
+            if partes:
+                self.logger.warning(f"⚠️ Comando inválido: {linha.strip()}")
+            return
+        acao, bot_id = partes
+        if acao == 'start':
+            self.iniciar_bot(bot_id)
+        else:
+            await self.parar_bot(bot_id)
+
+    async def _ler_comandos(self):
+        """Comandos do orchestrator pela entrada padrão; EOF = orchestrator saiu"""
+        loop = asyncio.get_running_loop()
+        leitor = asyncio.StreamReader()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(leitor), sys.stdin)
+        while not self._encerrar.is_set():
+            linha = await leitor.readline()
+            if not linha:
+                self.logger.warning("⚠️ Canal de controle fechado - encerrando worker")
+                self._encerrar.set()
+                break
+            await self.executar_comando(linha.decode())
+
+    async def _vigiar_conexao(self):
+        """Reconecta a conexão compartilhada e refaz as subscriptions se ela cair"""
+        while not self._encerrar.is_set():
+            await asyncio.sleep(INTERVALO_VIGIA)
+            if self.conexao.inscritos and not self.conexao.api.connected:
+                self.logger.warning("⚠️ Conexão compartilhada caiu - reconectando")
+                try:
+                    await self.conexao.conectar()
+                except Exception as e:
+                    self.logger.error(f"❌ Falha ao reconectar: {e}")
+
+    def encerrar(self):
+        self._encerrar.set()
+
+    async def executar(self, bot_ids: List[str], controle_stdin: bool = False):
+        loop = asyncio.get_running_loop()
+        for sinal in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sinal, self.encerrar)
+
+        auxiliares = [asyncio.create_task(self._vigiar_conexao(), name="vigia_conexao")]
+        if controle_stdin:
+            auxiliares.append(asyncio.create_task(self._ler_comandos(), name="comandos"))
+        for bot_id in bot_ids:
+            self.iniciar_bot(bot_id)
+
+        self.logger.info(f"✅ Worker {self.worker_id} ativo (PID {os.getpid()}) com {len(self.tarefas)} bots")
+        await self._encerrar.wait()
+
+        self.logger.info(f"🛑 Encerrando worker {self.worker_id} ({len(self.tarefas)} bots)...")
+        await asyncio.gather(*(self.parar_bot(bot_id) for bot_id in list(self.tarefas)))
+        for tarefa in auxiliares:
+            tarefa.cancel()
+        await asyncio.gather(*auxiliares, return_exceptions=True)
+        try:
+            await self.conexao.api.disconnect()
+        except Exception as e:
+            self.logger.error(f"❌ Erro ao desconectar: {e}")
+        self.logger.info(f"✅ Worker {self.worker_id} finalizado")
+
+def parse_arguments():
+    """Parse argumentos da linha de comando"""
+    parser = argparse.ArgumentParser(description='Bot Worker - vários operários em um processo')
+    parser.add_argument('--worker', type=int, default=0, help='Índice do worker')
+    parser.add_argument('--bot_ids', type=str, default='', help='IDs iniciais separados por vírgula')
+    parser.add_argument('--controle-stdin', action='store_true', help='Receber start/stop pela entrada padrão')
+    return parser.parse_args()
+
+async def main():
+    args = parse_arguments()
+    logging.basicConfig(
+        level=logging.INFO,
+        format=f'%(asctime)s - [WORKER_{args.worker}] - %(levelname)s - %(message)s'
+    )
+    worker = WorkerBots(args.worker)
+    bot_ids = [b for b in args.bot_ids.split(',') if b]
+    await worker.executar(bot_ids, controle_stdin=args.controle_stdin)
+
+if __name__ == "__main__":
+    executar(main())
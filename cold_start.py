@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Partida a frio dos bots (tunderbot / bot_instance)
+
+Com reinícios pelo orquestrador, o tempo entre o processo subir e o primeiro
+tick é tempo fora do mercado. Este módulo reúne:
+
+- ModuloTardio: proxy de módulo importado só no primeiro acesso a um
+  atributo, para o que não está no caminho até o primeiro tick (aiohttp do
+  servidor /status, psutil do monitor de saúde). O supabase do tunderbot é
+  importado na primeira gravação;
+- medição com ``python -X importtime`` em um interpretador limpo, com
+  orçamento de importação por módulo e lista de módulos que não podem ser
+  importados na partida;
+- tempo até o primeiro tick do tunderbot (importação + construção do bot +
+  processamento de um tick, sem rede).
+
+Uso:
+    python cold_start.py                    # mede tunderbot e bot_instance
+    python cold_start.py tunderbot --top 15 # maiores importações
+"""
+
+import os
+import sys
+import time
+import argparse
+import importlib
+import subprocess
+import tempfile
+from typing import Dict, List, Optional
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+
+# Importação acumulada máxima (ms) de cada bot em um interpretador limpo
+ORCAMENTO_IMPORTACAO_MS = {
+    'tunderbot': 450,
+    'bot_instance': 900,  # supabase segue necessário: a configuração vem do banco
+}
+ORCAMENTO_PRIMEIRO_TICK_MS = 900  # processo novo até o primeiro tick processado
+
+# Pacotes pesados que não podem entrar na partida do tunderbot
+MODULOS_TARDIOS = ('supabase', 'aiohttp', 'aiohttp_cors', 'psutil')
+
+class ModuloTardio:
+    """Módulo importado no primeiro acesso a um atributo"""
+
+    def __init__(self, nome: str):
+        self._nome = nome
+        self._modulo = None
+
+    def __getattr__(self, atributo):
+        if self._modulo is None:
+            self._modulo = importlib.import_module(self._nome)
+        return getattr(self._modulo, atributo)
+
+    def __repr__(self):
+        estado = 'carregado' if self._modulo is not None else 'não carregado'
+        return f"<ModuloTardio {self._nome} ({estado})>"
+
+def _executar(codigo: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    """Interpretador limpo, fora do repositório (os bots criam arquivos de log no cwd)"""
+    ambiente = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [DIRETORIO, os.getenv('PYTHONPATH')])))
+    ambiente.pop('TICK_STORE_DIR', None)
+    comando = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', codigo]
+    with tempfile.TemporaryDirectory() as cwd:
+        return subprocess.run(comando, cwd=cwd, env=ambiente, capture_output=True, text=True, timeout=120)
+
+def medir_importacao(modulo: str) -> Dict[str, int]:
+    """{módulo: tempo acumulado em µs} de ``import modulo`` segundo -X importtime"""
+    resultado = _executar(f"import {modulo}", importtime=True)
+    if resultado.returncode != 0:
+        raise RuntimeError(f"Falha ao importar {modulo}: {resultado.stderr.strip().splitlines()[-1:]}")
+    tempos = {}
+    for linha in resultado.stderr.splitlines():
+        if not linha.startswith('import time:'):
+            continue
+        partes = linha[len('import time:'):].split('|')
+        if len(partes) == 3 and partes[1].strip().isdigit():
+            tempos[partes[2].strip()] = int(partes[1])
+    return tempos
+
+def importacoes_indevidas(tempos: Dict[str, int], proibidos=MODULOS_TARDIOS) -> List[str]:
+    return sorted(nome for nome in tempos if nome.split('.')[0] in proibidos)
+
+_PRIMEIRO_TICK = """
+import time, asyncio, logging
+import tunderbot
+logging.disable(logging.CRITICAL)
+bot = tunderbot.AccumulatorScalpingBot({'name': 'ColdStart', 'token': 'COLDSTART' * 4, 'app_id': '1', 'handoff': False})
+bot.api_manager.set_bot_instance(bot)
+asyncio.run(bot.api_manager._process_tick({'symbol': bot.ativo, 'quote': 1000.123, 'epoch': int(time.time())}))
+print(time.time())
+"""
+
+def tempo_ate_primeiro_tick() -> float:
+    """ms desde o lançamento do processo até o primeiro tick processado pelo tunderbot"""
+    inicio = time.time()
+    resultado = _executar(_PRIMEIRO_TICK)
+    if resultado.returncode != 0:
+        raise RuntimeError(f"Falha no primeiro tick: {resultado.stderr.strip().splitlines()[-1:]}")
+    return (float(resultado.stdout.strip().splitlines()[-1]) - inicio) * 1000
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Orçamento de partida a frio dos bots")
+    parser.add_argument('modulos', nargs='*', default=list(ORCAMENTO_IMPORTACAO_MS))
+    parser.add_argument('--top', type=int, default=10, help="maiores importações a listar")
+    args = parser.parse_args(argv)
+
+    dentro = True
+    for modulo in args.modulos:
+        tempos = medir_importacao(modulo)
+        total_ms = tempos.get(modulo, 0) / 1000
+        orcamento = ORCAMENTO_IMPORTACAO_MS.get(modulo)
+        ok = orcamento is None or total_ms <= orcamento
+        dentro &= ok
+        print(f"{'✅' if ok else '❌'} import {modulo}: {total_ms:.0f} ms (orçamento: {orcamento or '-'} ms)")
+        for nome, us in sorted(tempos.items(), key=lambda item: -item[1])[1:args.top + 1]:
+            print(f"   {us / 1000:8.1f} ms  {nome}")
+        if modulo == 'tunderbot':
+            indevidos = importacoes_indevidas(tempos)
+            dentro &= not indevidos
+            if indevidos:
+                print(f"❌ Importados na partida: {', '.join(indevidos[:10])}")
+
+    if 'tunderbot' in args.modulos:
+        primeiro_tick = tempo_ate_primeiro_tick()
+        ok = primeiro_tick <= ORCAMENTO_PRIMEIRO_TICK_MS
+        dentro &= ok
+        print(f"{'✅' if ok else '❌'} primeiro tick do tunderbot: {primeiro_tick:.0f} ms "
+              f"(orçamento: {ORCAMENTO_PRIMEIRO_TICK_MS} ms)")
+    return 0 if dentro else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,592 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Motor local de liquidação de contratos da Deriv para paper trading e replay
+
+Liquida contra um stream de ticks, seguindo as regras dos contratos usados
+pelos bots:
+
+- ACCU: a partir do tick de entrada, cada tick dentro da faixa de barreira
+  (tick anterior ± tick_size_barrier) multiplica o valor por (1 + growth_rate);
+  um tick que toca a barreira perde o stake. O take profit (limit_order)
+  encerra o contrato no primeiro tick em que o lucro o atinge, e o contrato
+  também encerra ao atingir o máximo de ticks ou de payout.
+- DIGITMATCH/DIFF/OVER/UNDER/EVEN/ODD: último dígito (pip_size do ativo) do
+  N-ésimo tick após a compra.
+- CALL/PUT: spot de saída contra o de entrada (empate perde), com duração
+  em ticks ou tempo.
+- RESETCALL/RESETPUT: na metade da duração a barreira é reposicionada no
+  spot atual se o contrato estiver perdendo.
+
+Payouts: stake / probabilidade × (1 - comissão). A meia-largura da barreira
+ACCU vem de contracts_for (tick_size_barrier) quando informada. Sem ela, é
+estimada pela volatilidade do índice de forma que a chance de nocaute por
+tick empate com o crescimento: (1 + g)(1 - p) = 1.
+
+O motor se encaixa no ExecutorSimulado (replay acelerado, tick_replay) e
+no ExecutorPapel (ordens simuladas sobre o stream real). Os dois ficam aqui,
+e não no tick_replay, para o modo papel não carregar o driver de replay no
+caminho de importação dos bots; instalar_executor também troca os métodos
+Supabase do bot por no-ops, então operações simuladas nunca chegam às
+tabelas de produção (logs e radar):
+
+    executor = ExecutorSimulado(liquidar=MotorContratos())
+    ativar_modo_papel(bot)          # ou account_config['paper_trading'] / PAPER_TRADING=1
+"""
+
+import os
+import math
+import asyncio
+import logging
+import itertools
+from dataclasses import dataclass, field
+from statistics import NormalDist
+from typing import Any, Callable, Dict, Optional
+
+from trading_system.utils.digit_stats import extrair_digito, pip_size_do_ativo
+
+logger = logging.getLogger(__name__)
+
+COMISSAO_PADRAO = 0.03
+SEGUNDOS_POR_ANO = 365 * 24 * 3600
+
+# Volatilidade anual dos índices sintéticos
+VOLATILIDADE = {
+    'R_10': 0.10, 'R_25': 0.25, 'R_50': 0.50, 'R_75': 0.75, 'R_100': 1.00,
+    '1HZ10V': 0.10, '1HZ25V': 0.25, '1HZ50V': 0.50, '1HZ75V': 0.75, '1HZ100V': 1.00,
+}
+
+# Máximo de ticks de um ACCU por growth rate
+MAX_TICKS_ACCU = {0.01: 230, 0.02: 120, 0.03: 80, 0.04: 60, 0.05: 50}
+MAX_PAYOUT_ACCU = 10000.0
+
+DIGITOS = ('DIGITMATCH', 'DIGITDIFF', 'DIGITOVER', 'DIGITUNDER', 'DIGITEVEN', 'DIGITODD')
+SUBIDA_QUEDA = ('CALL', 'PUT', 'RESETCALL', 'RESETPUT')
+PROBABILIDADE_RESET = 0.625  # P(vitória) de um RESET num passeio aleatório sem tendência
+
+SALDO_INICIAL = 10000.0
+# Métodos dos bots que gravam/leem o Supabase de produção
+METODOS_SUPABASE = ('log_to_supabase', 'save_signal_to_radar', 'get_signal_from_radar', 'update_signal_status')
+
+# ============================================================================
+# EXECUTOR SIMULADO
+# ============================================================================
+
+@dataclass
+class ContratoSimulado:
+    contract_id: int
+    contract_type: str
+    symbol: str
+    stake: float
+    parametros: Dict[str, Any]
+    entry_epoch: Optional[int] = None
+    entry_spot: Optional[float] = None
+    current_spot: Optional[float] = None
+    ticks: int = 0
+    status: str = 'open'
+    profit: float = 0.0
+    sell_epoch: Optional[int] = None
+    dados: Dict[str, Any] = field(default_factory=dict)  # estado do liquidante
+
+    @property
+    def is_sold(self) -> int:
+        return 0 if self.status == 'open' else 1
+
+def liquidar_apos_ticks(ticks: int = 1, lucro: float = 0.0) -> Callable:
+    """Liquidante trivial: encerra após N ticks com lucro fixo (mede fluxo, não estratégia)"""
+    def liquidar(contrato: ContratoSimulado, tick: Dict[str, Any]) -> Optional[float]:
+        return lucro if contrato.ticks >= ticks else None
+    return liquidar
+
+class ExecutorSimulado:
+    """
+    Substitui DerivWebSocketNativo durante o replay.
+
+    liquidar(contrato, tick) é chamado a cada tick para cada contrato
+    aberto e devolve o lucro quando o contrato encerra (None enquanto
+    aberto). Se o liquidante tiver cotar(params), proposal/buy o usam para
+    validar os parâmetros e informar o payout (ver MotorContratos).
+    """
+
+    def __init__(self, liquidar: Optional[Callable] = None, saldo: float = SALDO_INICIAL,
+                 latencia: float = 0.0):
+        self.liquidar = liquidar or liquidar_apos_ticks()
+        self.saldo = saldo
+        self.latencia = latencia
+        self._iniciar_conexao()
+        self.bot_instance = None
+        self.ultimo_tick: Dict[str, Dict[str, Any]] = {}
+        self.contratos: Dict[int, ContratoSimulado] = {}
+        self.abertos: Dict[int, ContratoSimulado] = {}
+        self._propostas: Dict[str, Dict[str, Any]] = {}
+        self._ids = itertools.count(1)
+        self.chamadas: Dict[str, int] = {}
+
+    # -- ciclo de vida da conexão --------------------------------------
+
+    def _iniciar_conexao(self):
+        self.connected = True
+        self.authorized = True
+        self.session_id = 'replay'
+
+    def _contar(self, metodo: str):
+        self.chamadas[metodo] = self.chamadas.get(metodo, 0) + 1
+
+    async def _responder(self, metodo: str):
+        self._contar(metodo)
+        if self.latencia:
+            await asyncio.sleep(self.latencia)
+
+    async def connect(self):
+        return True
+
+    async def ensure_connection(self):
+        return True
+
+    async def disconnect(self):
+        self.connected = False
+
+    def set_bot_instance(self, bot_instance):
+        self.bot_instance = bot_instance
+
+    async def subscribe_ticks(self, symbol: str):
+        await self._responder('subscribe_ticks')
+        return {'subscription': {'id': f'replay-{symbol}'}, 'msg_type': 'tick'}
+
+    async def unsubscribe_ticks(self, symbol: str):
+        return True
+
+    # -- ticks ---------------------------------------------------------
+
+    async def _process_tick(self, tick_data: Dict[str, Any]):
+        """Mesmo contrato do _process_tick ao vivo: liquida contratos abertos e repassa ao bot"""
+        self.ultimo_tick[tick_data.get('symbol')] = tick_data
+        if self.abertos:
+            self._liquidar_abertos(tick_data)
+        if self.bot_instance is not None:
+            await self.bot_instance._handle_new_tick(tick_data)
+
+    def _liquidar_abertos(self, tick: Dict[str, Any]):
+        for contrato in list(self.abertos.values()):
+            if contrato.symbol != tick.get('symbol'):
+                continue
+            contrato.ticks += 1
+            contrato.current_spot = float(tick['quote'])
+            lucro = self.liquidar(contrato, tick)
+            if lucro is not None:
+                self._encerrar(contrato, lucro, tick.get('epoch'))
+
+    def _encerrar(self, contrato: ContratoSimulado, lucro: float, epoch: Optional[int]):
+        contrato.profit = round(float(lucro), 2)
+        contrato.status = 'won' if contrato.profit > 0 else 'lost'
+        contrato.sell_epoch = epoch
+        self.saldo += contrato.stake + contrato.profit
+        self.abertos.pop(contrato.contract_id, None)
+
+    async def ticks_history(self, symbol: str, count: int = 5, start: Optional[int] = None, end="latest"):
+        await self._responder('ticks_history')
+        tick = self.ultimo_tick.get(symbol)
+        return {'history': {'prices': [tick['quote']] if tick else [], 'times': [tick['epoch']] if tick else []}}
+
+    # -- ordens --------------------------------------------------------
+
+    def _simbolo_padrao(self) -> Optional[str]:
+        return next(reversed(self.ultimo_tick), None) if self.ultimo_tick else None
+
+    def _cotar(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Cotação do liquidante; ErroContrato (code/message) vira resposta de erro"""
+        cotar = getattr(self.liquidar, 'cotar', None)
+        return cotar(params) if cotar else {}
+
+    async def proposal(self, params: Dict[str, Any]):
+        await self._responder('proposal')
+        symbol = params.get('symbol') or self._simbolo_padrao()
+        tick = self.ultimo_tick.get(symbol)
+        if tick is None:
+            return {'error': {'code': 'MarketIsClosed', 'message': 'Sem ticks para o ativo no replay'},
+                    'echo_req': params}
+        try:
+            cotacao = self._cotar(dict(params, symbol=symbol))
+        except Exception as e:
+            return {'error': {'code': getattr(e, 'code', 'ContractCreationFailure'), 'message': str(e)},
+                    'echo_req': params}
+        proposta_id = f"P{next(self._ids)}"
+        stake = float(params.get('amount', 0))
+        self._propostas[proposta_id] = dict(params, symbol=symbol)
+        return {'proposal': {'id': proposta_id, 'ask_price': stake, 'spot': tick['quote'],
+                             'spot_time': tick['epoch'], **cotacao},
+                'echo_req': params, 'msg_type': 'proposal'}
+
+    async def buy(self, params: Dict[str, Any]):
+        await self._responder('buy')
+        if 'parameters' in params:  # compra direta sem proposta
+            parametros = dict(params['parameters'])
+            parametros.setdefault('symbol', self._simbolo_padrao())
+            try:
+                self._cotar(parametros)
+            except Exception as e:
+                return {'error': {'code': getattr(e, 'code', 'ContractCreationFailure'), 'message': str(e)},
+                        'echo_req': params}
+        else:
+            parametros = self._propostas.pop(params.get('buy'), None)
+            if parametros is None:
+                return {'error': {'code': 'InvalidContractProposal', 'message': 'Proposta desconhecida'},
+                        'echo_req': params}
+        stake = float(params.get('price') or parametros.get('amount', 0))
+        if stake > self.saldo:
+            return {'error': {'code': 'InsufficientBalance', 'message': 'Saldo insuficiente'}, 'echo_req': params}
+        tick = self.ultimo_tick.get(parametros['symbol'])
+        contrato = ContratoSimulado(
+            contract_id=next(self._ids), contract_type=parametros.get('contract_type', ''),
+            symbol=parametros['symbol'], stake=stake, parametros=parametros,
+            entry_epoch=tick['epoch'] if tick else None,
+            entry_spot=float(tick['quote']) if tick else None,
+        )
+        contrato.current_spot = contrato.entry_spot
+        self.saldo -= stake
+        self.contratos[contrato.contract_id] = contrato
+        self.abertos[contrato.contract_id] = contrato
+        return {'buy': {'contract_id': contrato.contract_id, 'buy_price': stake,
+                        'balance_after': round(self.saldo, 2), 'start_time': contrato.entry_epoch},
+                'echo_req': params, 'msg_type': 'buy'}
+
+    def _estado_contrato(self, contrato: ContratoSimulado) -> Dict[str, Any]:
+        return {
+            'contract_id': contrato.contract_id, 'contract_type': contrato.contract_type,
+            'underlying': contrato.symbol, 'buy_price': contrato.stake,
+            'status': contrato.status, 'is_sold': contrato.is_sold,
+            'profit': contrato.profit, 'entry_spot': contrato.entry_spot,
+            'current_spot': contrato.current_spot, 'sell_time': contrato.sell_epoch,
+            **{k: v for k, v in contrato.dados.items() if not k.startswith('_')},
+        }
+
+    async def proposal_open_contract(self, contract_id):
+        await self._responder('proposal_open_contract')
+        contrato = self.contratos.get(int(contract_id))
+        if contrato is None:
+            return {'error': {'code': 'InvalidContractId', 'message': 'Contrato desconhecido'}}
+        return {'proposal_open_contract': self._estado_contrato(contrato), 'msg_type': 'proposal_open_contract'}
+
+    async def portfolio(self, params=None):
+        await self._responder('portfolio')
+        return {'portfolio': {'contracts': [self._estado_contrato(c) for c in self.abertos.values()]},
+                'msg_type': 'portfolio'}
+
+    def obter_estatisticas(self) -> Dict[str, Any]:
+        encerrados = [c for c in self.contratos.values() if c.status != 'open']
+        return {
+            'contratos': len(self.contratos),
+            'abertos': len(self.abertos),
+            'ganhos': sum(c.status == 'won' for c in encerrados),
+            'perdas': sum(c.status == 'lost' for c in encerrados),
+            'lucro_total': round(sum(c.profit for c in encerrados), 2),
+            'saldo': round(self.saldo, 2),
+            'chamadas': dict(self.chamadas),
+        }
+
+def _supabase_nulo(executor: ExecutorSimulado, nome: str):
+    async def nulo(*args, **kwargs):
+        executor._contar(f'supabase.{nome}')
+        return None
+    return nulo
+
+def desligar_supabase(bot, executor: ExecutorSimulado):
+    """Troca os métodos Supabase do bot por no-ops contados no executor (nenhum cliente é criado)"""
+    for nome in METODOS_SUPABASE:
+        if hasattr(bot, nome):
+            setattr(bot, nome, _supabase_nulo(executor, nome))
+
+def instalar_executor(bot, executor: ExecutorSimulado):
+    """
+    Troca a conexão do bot (e dos subsistemas que a guardam, ex.: RobustOrderSystem)
+    pelo executor e desliga o Supabase: operações simuladas não vão para os logs
+    de produção nem para o radar.
+    """
+    anterior = getattr(bot, 'api_manager', None)
+    bot.api_manager = executor
+    for valor in list(vars(bot).values()):
+        if anterior is not None and getattr(valor, 'api_manager', None) is anterior:
+            valor.api_manager = executor
+    executor.set_bot_instance(bot)
+    desligar_supabase(bot, executor)
+
+# ============================================================================
+# MOTOR DE CONTRATOS
+# ============================================================================
+
+
+class ErroContrato(Exception):
+    """Parâmetros recusados, no formato de erro da API ({'code', 'message'})"""
+
+    def __init__(self, code: str, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+def _segundos(duracao: int, unidade: str) -> int:
+    fatores = {'s': 1, 'm': 60, 'h': 3600}
+    if unidade not in fatores:
+        raise ErroContrato('OfferingsValidationError', f"Unidade de duração não suportada: {unidade}")
+    return duracao * fatores[unidade]
+
+def barreira_accu_relativa(symbol: str, growth_rate: float) -> float:
+    """Meia-largura relativa da faixa ACCU estimada pela volatilidade do índice"""
+    volatilidade = VOLATILIDADE.get(symbol, 0.5)
+    intervalo = 1 if symbol.startswith('1HZ') else 2
+    sigma_tick = volatilidade * math.sqrt(intervalo / SEGUNDOS_POR_ANO)
+    nocaute = growth_rate / (1 + growth_rate)
+    return sigma_tick * NormalDist().inv_cdf(1 - nocaute / 2)
+
+class MotorContratos:
+    """
+    Liquidante para o ExecutorSimulado: cotar() valida/precifica a proposta e
+    __call__(contrato, tick) avança o contrato a cada tick, devolvendo o
+    lucro quando ele encerra.
+    """
+
+    def __init__(self, comissao: float = COMISSAO_PADRAO,
+                 tick_size_barrier: Optional[Dict[tuple, float]] = None,
+                 max_payout_accu: float = MAX_PAYOUT_ACCU):
+        self.comissao = comissao
+        # {(symbol, growth_rate): meia-largura relativa} vinda de contracts_for
+        self.tick_size_barrier = dict(tick_size_barrier or {})
+        self.max_payout_accu = max_payout_accu
+
+    # ------------------------------------------------------------------
+    # Cotação
+    # ------------------------------------------------------------------
+
+    def _probabilidade(self, tipo: str, barreira: Optional[int]) -> float:
+        if tipo in ('DIGITEVEN', 'DIGITODD', 'CALL', 'PUT'):
+            return 0.5
+        if tipo in ('RESETCALL', 'RESETPUT'):
+            return PROBABILIDADE_RESET
+        if barreira is None or not 0 <= barreira <= 9:
+            raise ErroContrato('InvalidBarrier', f"{tipo} requer barreira entre 0 e 9")
+        if tipo == 'DIGITMATCH':
+            return 0.1
+        if tipo == 'DIGITDIFF':
+            return 0.9
+        if tipo == 'DIGITOVER':
+            if barreira > 8:
+                raise ErroContrato('InvalidBarrier', "DIGITOVER aceita barreira de 0 a 8")
+            return (9 - barreira) / 10
+        if barreira < 1:
+            raise ErroContrato('InvalidBarrier', "DIGITUNDER aceita barreira de 1 a 9")
+        return barreira / 10
+
+    def cotar(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Valida os parâmetros e devolve o payout (ou o crescimento, para ACCU)"""
+        tipo = params.get('contract_type')
+        stake = float(params.get('amount', 0))
+        if stake < 0.35:
+            raise ErroContrato('ContractBuyValidationError', f"Stake mínimo é 0.35: {stake}")
+
+        if tipo == 'ACCU':
+            growth_rate = float(params.get('growth_rate', 0))
+            if not 0.01 <= growth_rate <= 0.05:
+                raise ErroContrato('ContractBuyValidationError', f"growth_rate deve estar entre 0.01 e 0.05: {growth_rate}")
+            return {'ask_price': stake, 'growth_rate': growth_rate,
+                    'max_ticks': MAX_TICKS_ACCU.get(round(growth_rate, 2), 50)}
+
+        if tipo in DIGITOS or tipo in SUBIDA_QUEDA:
+            duracao = int(params.get('duration', 0))
+            unidade = params.get('duration_unit', 't')
+            if duracao < 1 or (unidade == 't' and duracao > 10):
+                raise ErroContrato('OfferingsValidationError', f"Duração inválida: {duracao}{unidade}")
+            if tipo in DIGITOS and unidade != 't':
+                raise ErroContrato('OfferingsValidationError', "Contratos de dígitos só aceitam duração em ticks")
+            if tipo.startswith('RESET') and unidade == 't':
+                raise ErroContrato('OfferingsValidationError', "RESET requer duração em tempo")
+            if unidade != 't':
+                _segundos(duracao, unidade)
+            barreira = params.get('barrier')
+            probabilidade = self._probabilidade(tipo, int(barreira) if barreira is not None else None)
+            payout = round(stake / probabilidade * (1 - self.comissao), 2)
+            return {'ask_price': stake, 'payout': payout}
+
+        raise ErroContrato('InvalidContractType', f"Tipo de contrato não suportado no simulador: {tipo}")
+
+    # ------------------------------------------------------------------
+    # Liquidação
+    # ------------------------------------------------------------------
+
+    def __call__(self, contrato: ContratoSimulado, tick: Dict[str, Any]) -> Optional[float]:
+        tipo = contrato.contract_type
+        if tipo == 'ACCU':
+            return self._accu(contrato, tick)
+        if tipo in DIGITOS:
+            return self._digitos(contrato, tick)
+        return self._subida_queda(contrato, tick)
+
+    def _entrada(self, contrato: ContratoSimulado, tick: Dict[str, Any]):
+        """Primeiro tick após a compra é o tick de entrada"""
+        contrato.entry_spot = float(tick['quote'])
+        contrato.entry_epoch = int(tick['epoch'])
+
+    def _accu(self, contrato: ContratoSimulado, tick: Dict[str, Any]) -> Optional[float]:
+        dados = contrato.dados
+        spot = float(tick['quote'])
+        if contrato.ticks == 1:
+            self._entrada(contrato, tick)
+            g = float(contrato.parametros.get('growth_rate', 0.01))
+            largura = self.tick_size_barrier.get((contrato.symbol, g)) or barreira_accu_relativa(contrato.symbol, g)
+            dados.update(growth_rate=g, _largura=largura, tick_count=0, _valor=contrato.stake,
+                         _max_ticks=MAX_TICKS_ACCU.get(round(g, 2), 50))
+        else:
+            anterior = dados['_anterior']
+            distancia = anterior * dados['_largura']
+            if abs(spot - anterior) >= distancia:
+                dados['exit_tick'] = spot
+                return -contrato.stake
+            dados['tick_count'] += 1
+            dados['_valor'] = contrato.stake * (1 + dados['growth_rate']) ** dados['tick_count']
+            lucro = dados['_valor'] - contrato.stake
+            take_profit = (contrato.parametros.get('limit_order') or {}).get('take_profit')
+            if ((take_profit is not None and lucro >= float(take_profit))
+                    or dados['tick_count'] >= dados['_max_ticks']
+                    or dados['_valor'] >= self.max_payout_accu):
+                dados['exit_tick'] = spot
+                return lucro
+        dados['_anterior'] = spot
+        dados['high_barrier'] = round(spot * (1 + dados['_largura']), 6)
+        dados['low_barrier'] = round(spot * (1 - dados['_largura']), 6)
+        return None
+
+    def _payout(self, contrato: ContratoSimulado) -> float:
+        return self.cotar(contrato.parametros)['payout']
+
+    def _digitos(self, contrato: ContratoSimulado, tick: Dict[str, Any]) -> Optional[float]:
+        if contrato.ticks == 1:
+            self._entrada(contrato, tick)
+        if contrato.ticks < int(contrato.parametros.get('duration', 1)):
+            return None
+        pip_size = tick.get('pip_size', pip_size_do_ativo(contrato.symbol))
+        digito = extrair_digito(float(tick['quote']), pip_size)
+        barreira = int(contrato.parametros.get('barrier', 0))
+        tipo = contrato.contract_type
+        venceu = {
+            'DIGITMATCH': digito == barreira,
+            'DIGITDIFF': digito != barreira,
+            'DIGITOVER': digito > barreira,
+            'DIGITUNDER': digito < barreira,
+            'DIGITEVEN': digito % 2 == 0,
+            'DIGITODD': digito % 2 == 1,
+        }[tipo]
+        contrato.dados.update(exit_tick=float(tick['quote']), last_digit=digito)
+        return self._payout(contrato) - contrato.stake if venceu else -contrato.stake
+
+    def _subida_queda(self, contrato: ContratoSimulado, tick: Dict[str, Any]) -> Optional[float]:
+        dados = contrato.dados
+        spot = float(tick['quote'])
+        epoch = int(tick['epoch'])
+        parametros = contrato.parametros
+        tipo = contrato.contract_type
+        alta = tipo in ('CALL', 'RESETCALL')
+
+        if contrato.ticks == 1:
+            self._entrada(contrato, tick)
+            dados['barrier'] = spot
+            if parametros.get('duration_unit', 't') != 't':
+                total = _segundos(int(parametros['duration']), parametros['duration_unit'])
+                dados['_expira'] = epoch + total
+                dados['_reset'] = epoch + total // 2 if tipo.startswith('RESET') else None
+            dados['_ultimo'] = spot
+            return None
+
+        saida = None
+        if parametros.get('duration_unit', 't') == 't':
+            if contrato.ticks - 1 >= int(parametros.get('duration', 1)):
+                saida = spot
+        else:
+            # Spot no instante: último tick com epoch <= instante
+            reset = dados.get('_reset')
+            if reset is not None and epoch >= reset:
+                spot_reset = spot if epoch == reset else dados['_ultimo']
+                perdendo = spot_reset < dados['barrier'] if alta else spot_reset > dados['barrier']
+                if perdendo:
+                    dados['barrier'] = spot_reset
+                dados['_reset'] = None
+            if epoch >= dados['_expira']:
+                saida = spot if epoch == dados['_expira'] else dados['_ultimo']
+        dados['_ultimo'] = spot
+        if saida is None:
+            return None
+
+        dados['exit_tick'] = saida
+        venceu = saida > dados['barrier'] if alta else saida < dados['barrier']
+        return self._payout(contrato) - contrato.stake if venceu else -contrato.stake
+
+# ============================================================================
+# PAPER TRADING SOBRE O STREAM REAL
+# ============================================================================
+
+class _EncaminhadorTicks:
+    """Fica no lugar do bot na conexão real: liquida os contratos simulados e repassa o tick"""
+
+    def __init__(self, executor: 'ExecutorPapel', bot):
+        self._executor = executor
+        self._bot = bot
+
+    async def _handle_new_tick(self, tick_data):
+        await self._executor._process_tick(tick_data)
+
+    def __getattr__(self, nome):
+        return getattr(self._bot, nome)
+
+class ExecutorPapel(ExecutorSimulado):
+    """
+    Ordens simuladas sobre a conexão real: ticks, assinatura e estado da
+    conexão vêm da DerivWebSocketNativo; proposal/buy/proposal_open_contract/
+    portfolio são atendidos localmente pelo MotorContratos.
+    """
+
+    def __init__(self, api, motor: Optional[MotorContratos] = None, saldo: float = SALDO_INICIAL):
+        self.api = api
+        super().__init__(liquidar=motor or MotorContratos(), saldo=saldo)
+
+    def _iniciar_conexao(self):
+        pass  # connected/authorized/session_id/ws vêm da conexão real
+
+    def __getattr__(self, nome):
+        if nome == 'api':
+            raise AttributeError(nome)
+        return getattr(self.api, nome)
+
+    async def connect(self):
+        return await self.api.connect()
+
+    async def ensure_connection(self):
+        return await self.api.ensure_connection()
+
+    async def disconnect(self):
+        return await self.api.disconnect()
+
+    async def subscribe_ticks(self, symbol: str):
+        return await self.api.subscribe_ticks(symbol)
+
+    async def unsubscribe_ticks(self, symbol: str):
+        return await self.api.unsubscribe_ticks(symbol)
+
+    async def ticks_history(self, *args, **kwargs):
+        return await self.api.ticks_history(*args, **kwargs)
+
+    def set_bot_instance(self, bot_instance):
+        self.bot_instance = bot_instance
+        self.api.set_bot_instance(_EncaminhadorTicks(self, bot_instance))
+
+    def trocar_conexao(self, api) -> 'ExecutorPapel':
+        """Reinicialização do bot criou outra conexão: mantém contratos e saldo simulados"""
+        self.api = api
+        return self
+
+def modo_papel_solicitado(account_config: Optional[Dict[str, Any]]) -> bool:
+    return bool((account_config or {}).get('paper_trading')) or os.getenv('PAPER_TRADING') == '1'
+
+def ativar_modo_papel(bot, motor: Optional[MotorContratos] = None, saldo: float = SALDO_INICIAL) -> ExecutorPapel:
+    """Coloca um bot em paper trading: mesmo ciclo de vida, ordens liquidadas localmente"""
+    executor = ExecutorPapel(bot.api_manager, motor, saldo)
+    instalar_executor(bot, executor)
+    bot.executor_papel = executor
+    logger.warning(f"📝 MODO PAPEL ATIVO - ordens simuladas localmente (saldo virtual ${saldo:.2f})")
+    return executor
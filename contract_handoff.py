@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Snapshot de handoff de contratos abertos entre instâncias de um bot
+
+Um reinício (programado, forçado ou por queda) não pode abandonar contratos
+ACCU abertos. O bot grava em disco, a cada compra e a cada liquidação:
+
+- os contract_ids abertos e o ativo de cada um;
+- o estado de risco (stake, total_lost, total_profit, operações) da conta e
+  de cada ativo.
+
+Protocolo de drenagem:
+1. a instância nova carrega o snapshot, restaura o estado de risco e
+   reanexa os contratos abertos (subscription de proposal_open_contract);
+2. ao gravar o snapshot com o próprio id, ela se torna a dona;
+3. a instância antiga, se ainda estiver viva, percebe que perdeu o snapshot,
+   para de abrir contratos e se aposenta sem aplicar a gestão dos contratos
+   que a nova já acompanha.
+
+A gravação é atômica (arquivo temporário + os.replace), então um processo
+morto no meio da escrita deixa o snapshot anterior intacto. O dono fica em
+cache: ``sou_dono()`` só relê o JSON quando o arquivo mudou (inode, mtime ou
+tamanho) — um stat por sinal em vez de abrir e decodificar o snapshot.
+
+O nome do arquivo identifica a conta: nome + id do bot (ou um hash do token),
+para que dois bots com o nome padrão não dividam o mesmo snapshot.
+
+Uso:
+    handoff = SnapshotHandoff('Bot_Principal_1a2b3c4d5e6f')
+    anterior = handoff.carregar()           # None se não existe ou expirou
+    handoff.salvar({'contratos': {...}, 'ativos': {...}})
+    handoff.sou_dono()
+"""
+
+import os
+import json
+import time
+import uuid
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+VERSAO_SNAPSHOT = 1
+IDADE_MAXIMA_SNAPSHOT = 12 * 3600  # segundos; estado de risco mais antigo que isso é descartado
+
+class SnapshotHandoff:
+    """Snapshot de contratos abertos e estado de risco de uma conta"""
+
+    def __init__(self, nome_conta: str, diretorio: Optional[str] = None,
+                 idade_maxima: float = IDADE_MAXIMA_SNAPSHOT):
+        diretorio = diretorio or os.getenv('HANDOFF_DIR', '.')
+        self.caminho = os.path.join(diretorio, f"handoff_{nome_conta}.json")
+        self.idade_maxima = idade_maxima
+        self.instancia = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._assinatura_vista = None  # (inode, mtime, tamanho) do arquivo quando o dono foi lido
+        self._dono: Optional[str] = None
+
+    def salvar(self, estado: Dict[str, Any]):
+        """Grava o snapshot em nome desta instância (que passa a ser a dona)"""
+        dados = dict(estado, versao=VERSAO_SNAPSHOT, instancia=self.instancia, timestamp=time.time())
+        temporario = f"{self.caminho}.{self.instancia}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(dados, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, self.caminho)
+        self._dono = self.instancia
+        self._assinatura_vista = self._assinatura()
+
+    def _assinatura(self):
+        try:
+            estado = os.stat(self.caminho)
+        except FileNotFoundError:
+            return None
+        return (estado.st_ino, estado.st_mtime_ns, estado.st_size)
+
+    def _ler(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.caminho, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Snapshot de handoff ilegível ({self.caminho}): {e}")
+            return None
+        if not isinstance(dados, dict) or dados.get('versao') != VERSAO_SNAPSHOT:
+            return None
+        return dados
+
+    def carregar(self) -> Optional[Dict[str, Any]]:
+        """Snapshot de outra instância, se houver e não estiver expirado"""
+        dados = self._ler()
+        if dados is None or dados.get('instancia') == self.instancia:
+            return None
+        idade = time.time() - float(dados.get('timestamp', 0))
+        if idade > self.idade_maxima:
+            logger.info(f"🗑️ Snapshot de handoff expirado ({idade/3600:.1f}h) - ignorado")
+            return None
+        return dados
+
+    def dono(self) -> Optional[str]:
+        dados = self._ler()
+        return dados.get('instancia') if dados else None
+
+    def sou_dono(self) -> bool:
+        """Sem snapshot, ou snapshot gravado por esta instância (relê só se o arquivo mudou)"""
+        assinatura = self._assinatura()
+        if assinatura != self._assinatura_vista:
+            dados = self._ler() if assinatura is not None else None
+            self._dono = dados.get('instancia') if dados else None
+            self._assinatura_vista = assinatura
+        return self._dono in (None, self.instancia)
+
+    def descartar(self):
+        try:
+            os.remove(self.caminho)
+        except FileNotFoundError:
+            pass
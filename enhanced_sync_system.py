@@ -1,22 +1,30 @@
 #!/usr/bin/env python3
 """
 Sistema de Sincronização Aprimorado para Bot Accumulator
-Inclui queue thread-safe, processamento paralelo e monitoramento em tempo real
+Inclui queue de sinais do event loop, processamento paralelo e monitoramento em tempo real
+
+Só sinais com padrão entram na fila de operação (asyncio.Queue): o consumidor
+aguarda em aguardar_sinal() e acorda no instante do enfileiramento, sem poll.
+Sinais sem padrão (estatística) só incrementam um contador.
+
+Tudo roda no event loop do bot: sem threads nem locks (os contadores só são
+tocados pela thread do loop) e durações medidas com time.monotonic().
 """
 
 import asyncio
-import threading
 import time
-import json
 import logging
-from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, asdict
-from queue import Queue, Empty
+from dataclasses import dataclass
 from collections import deque
-from threading import Lock
-from aiohttp import web
-import aiohttp_cors
+
+from cold_start import ModuloTardio
+from async_runtime import estatisticas_loop
+from io_offload import enviar_io, gravar_json
+
+# Servidor /status: aiohttp só é importado quando o servidor sobe
+web = ModuloTardio('aiohttp.web')
+aiohttp_cors = ModuloTardio('aiohttp_cors')
 
 # Configuração de logging com timestamps precisos
 logging.basicConfig(
@@ -30,16 +38,27 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-@dataclass
 class SignalData:
     """Estrutura de dados para sinais detectados"""
-    timestamp: float
-    ticks: List[float]
-    pattern_detected: bool
-    signal_id: str
-    processing_started: Optional[float] = None
-    processing_completed: Optional[float] = None
-    operation_result: Optional[str] = None
+    
+    __slots__ = ('timestamp', 'ticks', 'pattern_detected', 'signal_id', 'symbol',
+                 'processing_started', 'processing_completed', 'operation_result')
+    
+    def __init__(self, timestamp: float, ticks: List[float], pattern_detected: bool, signal_id: str,
+                 symbol: Optional[str] = None, processing_started: Optional[float] = None,
+                 processing_completed: Optional[float] = None, operation_result: Optional[str] = None):
+        self.timestamp = timestamp  # epoch do sinal (time.time)
+        self.ticks = ticks
+        self.pattern_detected = pattern_detected
+        self.signal_id = signal_id
+        self.symbol = symbol  # Ativo de origem (bots multi-ativo)
+        self.processing_started = processing_started  # time.monotonic()
+        self.processing_completed = processing_completed  # time.monotonic()
+        self.operation_result = operation_result
+    
+    def __repr__(self):
+        return (f"SignalData(signal_id={self.signal_id!r}, symbol={self.symbol!r}, "
+                f"pattern_detected={self.pattern_detected}, operation_result={self.operation_result!r})")
 
 @dataclass
 class SystemStats:
@@ -54,6 +73,7 @@ class SystemStats:
     average_processing_time: float = 0.0
     cache_hits: int = 0
     cache_misses: int = 0
+    statistics_signals: int = 0  # sinais sem padrão: contados, fora da fila de operação
 
 class ProposalCache:
     """Cache para propostas válidas com TTL de 5 segundos"""
@@ -61,65 +81,54 @@ class ProposalCache:
     def __init__(self, ttl: float = 5.0):
         self.cache = {}
         self.ttl = ttl
-        self.lock = Lock()
     
     def get(self, key: str) -> Optional[Dict[str, Any]]:
         """Obtém item do cache se ainda válido"""
-        with self.lock:
-            if key in self.cache:
-                data, timestamp = self.cache[key]
-                if time.time() - timestamp < self.ttl:
-                    return data
-                else:
-                    del self.cache[key]
+        item = self.cache.get(key)
+        if item is None:
+            return None
+        data, expira_em = item
+        if time.monotonic() < expira_em:
+            return data
+        del self.cache[key]
         return None
     
     def set(self, key: str, value: Dict[str, Any]):
         """Armazena item no cache"""
-        with self.lock:
-            self.cache[key] = (value, time.time())
+        self.cache[key] = (value, time.monotonic() + self.ttl)
     
     def clear_expired(self):
         """Remove itens expirados do cache"""
-        current_time = time.time()
-        with self.lock:
-            expired_keys = [
-                key for key, (_, timestamp) in self.cache.items()
-                if current_time - timestamp >= self.ttl
-            ]
-            for key in expired_keys:
-                del self.cache[key]
+        agora = time.monotonic()
+        for key in [key for key, (_, expira_em) in self.cache.items() if agora >= expira_em]:
+            del self.cache[key]
 
 class EnhancedSyncSystem:
-    """Sistema de sincronização aprimorado com queue thread-safe e processamento paralelo"""
+    """Sistema de sincronização aprimorado com queue do event loop e processamento paralelo"""
     
     def __init__(self, max_concurrent_operations: int = 2, max_queue_size: int = 3):
-        # Sistema de queue thread-safe
-        self.signal_queue = Queue(maxsize=max_queue_size)
+        # Fila de sinais com padrão (consumida com await em aguardar_sinal)
+        self.signal_queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
         self.max_queue_size = max_queue_size
         
         # Controle de concorrência
         self.max_concurrent_operations = max_concurrent_operations
         self.operation_semaphore = asyncio.Semaphore(max_concurrent_operations)
         self.active_operations = 0
-        self.operations_lock = Lock()
         
         # Cache de propostas
         self.proposal_cache = ProposalCache()
         
         # Histórico de sinais (últimos 100)
         self.signal_history = deque(maxlen=100)
-        self.history_lock = Lock()
         
-        # Estatísticas
+        # Estatísticas (queue_size e active_operations são lidos na consulta)
         self.stats = SystemStats()
-        self.stats_lock = Lock()
         
-        # Controle de threads
+        # Tarefas de fundo (iniciadas em start)
         self.running = False
-        self.processor_thread = None
-        self.monitor_thread = None
-        self.stats_thread = None
+        self._tarefas: List[asyncio.Task] = []
+        self._sequencia_sinais = 0
         
         # Servidor HTTP para endpoint /status
         self.app = None
@@ -130,59 +139,30 @@ class EnhancedSyncSystem:
         logger.info(f"⚙️ Configurações: max_operations={max_concurrent_operations}, max_queue={max_queue_size}")
     
     def _generate_signal_id(self) -> str:
-        """Gera ID único para sinal"""
-        timestamp = int(time.time() * 1000000)  # Microsegundos
-        return f"signal_{timestamp}"
+        """Gera ID único para sinal (microssegundos + sequência: sem colisão no mesmo instante)"""
+        self._sequencia_sinais += 1
+        return f"signal_{int(time.time() * 1000000)}_{self._sequencia_sinais}"
     
-    def queue_signal(self, ticks: List[float], pattern_detected: bool) -> bool:
-        """Adiciona sinal à queue thread-safe"""
+    def queue_signal(self, ticks: List[float], pattern_detected: bool, symbol: Optional[str] = None) -> bool:
+        """Adiciona sinal com padrão à queue; sinal sem padrão só conta para as estatísticas"""
+        agora = time.time()
+        self.stats.last_signal_time = agora
+        if not pattern_detected:
+            # Caminho de baixa prioridade: sem objeto de sinal, sem fila, sem log por tick
+            self.stats.statistics_signals += 1
+            return True
+        
+        signal_data = SignalData(agora, list(ticks), pattern_detected, self._generate_signal_id(), symbol)
         try:
-            signal_id = self._generate_signal_id()
-            signal_data = SignalData(
-                timestamp=time.time(),
-                ticks=ticks.copy(),
-                pattern_detected=pattern_detected,
-                signal_id=signal_id
-            )
-            
-            # Tentar adicionar à queue (não bloqueante)
             self.signal_queue.put_nowait(signal_data)
-            
-            # Atualizar estatísticas
-            with self.stats_lock:
-                self.stats.queue_size = self.signal_queue.qsize()
-                self.stats.last_signal_time = signal_data.timestamp
-            
-            logger.info(f"📥 SINAL ENFILEIRADO: {signal_id} | Queue: {self.signal_queue.qsize()}/{self.max_queue_size}")
-            return True
-            
-        except Exception as e:
-            logger.warning(f"⚠️ Queue cheia - descartando sinal mais antigo: {e}")
-            try:
-                # Remover sinal mais antigo e adicionar novo
-                old_signal = self.signal_queue.get_nowait()
-                logger.warning(f"🗑️ Sinal descartado: {old_signal.signal_id}")
-                
-                self.signal_queue.put_nowait(signal_data)
-                logger.info(f"📥 SINAL ENFILEIRADO (substituição): {signal_id}")
-                return True
-            except Exception as e2:
-                logger.error(f"❌ Erro ao gerenciar queue: {e2}")
-                return False
-    
-    def _increment_active_operations(self):
-        """Incrementa contador de operações ativas"""
-        with self.operations_lock:
-            self.active_operations += 1
-            with self.stats_lock:
-                self.stats.active_operations = self.active_operations
-    
-    def _decrement_active_operations(self):
-        """Decrementa contador de operações ativas"""
-        with self.operations_lock:
-            self.active_operations = max(0, self.active_operations - 1)
-            with self.stats_lock:
-                self.stats.active_operations = self.active_operations
+            logger.info(f"📥 SINAL ENFILEIRADO: {signal_data.signal_id} | Queue: {self.signal_queue.qsize()}/{self.max_queue_size}")
+        except asyncio.QueueFull:
+            # Remover sinal mais antigo e adicionar novo
+            old_signal = self.signal_queue.get_nowait()
+            logger.warning(f"🗑️ Queue cheia - sinal descartado: {old_signal.signal_id}")
+            self.signal_queue.put_nowait(signal_data)
+            logger.info(f"📥 SINAL ENFILEIRADO (substituição): {signal_data.signal_id}")
+        return True
     
     async def _process_signal_queue(self):
         """Processa sinais da queue em loop contínuo"""
@@ -190,39 +170,31 @@ class EnhancedSyncSystem:
         
         while self.running:
             try:
-                # Tentar obter sinal da queue (timeout de 1s)
-                try:
-                    signal_data = self.signal_queue.get(timeout=1.0)
-                except Empty:
-                    continue
+                signal_data = await self.aguardar_sinal()
                 
-                # Verificar se há slots disponíveis para processamento
-                if self.operation_semaphore.acquire(blocking=False):
-                    # Criar task para processar sinal
-                    asyncio.create_task(self._process_single_signal(signal_data))
-                else:
-                    # Sem slots disponíveis - recolocar na queue
-                    logger.warning(f"⏳ Sem slots disponíveis - reagendando sinal {signal_data.signal_id}")
-                    self.signal_queue.put(signal_data)
-                    await asyncio.sleep(0.1)
+                # Aguardar slot de processamento (liberado ao fim de _process_single_signal)
+                await self.operation_semaphore.acquire()
+                asyncio.create_task(self._process_single_signal(signal_data))
                 
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 logger.error(f"❌ Erro no processador de sinais: {e}")
                 await asyncio.sleep(1.0)
     
     async def _process_single_signal(self, signal_data: SignalData):
         """Processa um único sinal"""
-        start_time = time.time()
+        start_time = time.monotonic()
         signal_data.processing_started = start_time
+        stats = self.stats
         
         try:
-            self._increment_active_operations()
+            self.active_operations += 1
             
             logger.info(f"🔄 PROCESSANDO SINAL: {signal_data.signal_id} | Operações ativas: {self.active_operations}")
             
             # Adicionar ao histórico
-            with self.history_lock:
-                self.signal_history.append(signal_data)
+            self.signal_history.append(signal_data)
             
             # Simular processamento (substituir pela lógica real do bot)
             if signal_data.pattern_detected:
@@ -232,12 +204,10 @@ class EnhancedSyncSystem:
                 
                 if cached_proposal:
                     logger.info(f"💾 Cache HIT para proposta: {signal_data.signal_id}")
-                    with self.stats_lock:
-                        self.stats.cache_hits += 1
+                    stats.cache_hits += 1
                 else:
                     logger.info(f"🔍 Cache MISS - gerando nova proposta: {signal_data.signal_id}")
-                    with self.stats_lock:
-                        self.stats.cache_misses += 1
+                    stats.cache_misses += 1
                     
                     # Simular geração de proposta
                     await asyncio.sleep(0.5)  # Simular latência
@@ -248,8 +218,7 @@ class EnhancedSyncSystem:
                 await asyncio.sleep(0.3)  # Simular latência de compra
                 
                 signal_data.operation_result = "SUCCESS"
-                with self.stats_lock:
-                    self.stats.successful_operations += 1
+                stats.successful_operations += 1
                 
                 logger.info(f"✅ OPERAÇÃO CONCLUÍDA: {signal_data.signal_id}")
             else:
@@ -258,53 +227,47 @@ class EnhancedSyncSystem:
             
         except Exception as e:
             signal_data.operation_result = f"ERROR: {str(e)}"
-            with self.stats_lock:
-                self.stats.failed_operations += 1
+            stats.failed_operations += 1
             logger.error(f"❌ Erro ao processar sinal {signal_data.signal_id}: {e}")
         
         finally:
             # Finalizar processamento
-            signal_data.processing_completed = time.time()
+            signal_data.processing_completed = time.monotonic()
             processing_time = signal_data.processing_completed - start_time
             
             # Atualizar estatísticas
-            with self.stats_lock:
-                self.stats.total_signals_processed += 1
-                # Calcular média móvel do tempo de processamento
-                if self.stats.average_processing_time == 0:
-                    self.stats.average_processing_time = processing_time
-                else:
-                    self.stats.average_processing_time = (
-                        self.stats.average_processing_time * 0.9 + processing_time * 0.1
-                    )
+            stats.total_signals_processed += 1
+            # Calcular média móvel do tempo de processamento
+            if stats.average_processing_time == 0:
+                stats.average_processing_time = processing_time
+            else:
+                stats.average_processing_time = stats.average_processing_time * 0.9 + processing_time * 0.1
             
-            self._decrement_active_operations()
+            self.active_operations = max(0, self.active_operations - 1)
             self.operation_semaphore.release()
             
             logger.info(f"⏱️ Sinal {signal_data.signal_id} processado em {processing_time:.3f}s")
     
     def _save_signal_history(self):
-        """Salva histórico de sinais em arquivo JSON"""
+        """Salva histórico de sinais em arquivo JSON (gravação fora do event loop)"""
         try:
-            with self.history_lock:
-                history_data = [
-                    {
-                        "signal_id": signal.signal_id,
-                        "timestamp": signal.timestamp,
-                        "pattern_detected": signal.pattern_detected,
-                        "processing_time": (
-                            signal.processing_completed - signal.processing_started
-                            if signal.processing_started and signal.processing_completed
-                            else None
-                        ),
-                        "operation_result": signal.operation_result,
-                        "ticks_count": len(signal.ticks)
-                    }
-                    for signal in self.signal_history
-                ]
-            
-            with open('signal_history.json', 'w', encoding='utf-8') as f:
-                json.dump(history_data, f, indent=2, ensure_ascii=False)
+            history_data = [
+                {
+                    "signal_id": signal.signal_id,
+                    "timestamp": signal.timestamp,
+                    "pattern_detected": signal.pattern_detected,
+                    "processing_time": (
+                        signal.processing_completed - signal.processing_started
+                        if signal.processing_started and signal.processing_completed
+                        else None
+                    ),
+                    "operation_result": signal.operation_result,
+                    "ticks_count": len(signal.ticks)
+                }
+                for signal in self.signal_history
+            ]
+            enviar_io('arquivo:signal_history.json', gravar_json, 'signal_history.json', history_data,
+                      substituir=True, indent=2, ensure_ascii=False)
                 
         except Exception as e:
             logger.error(f"❌ Erro ao salvar histórico: {e}")
@@ -315,13 +278,13 @@ class EnhancedSyncSystem:
             try:
                 await asyncio.sleep(30.0)
                 
-                with self.stats_lock:
-                    stats_copy = SystemStats(**asdict(self.stats))
+                stats_copy = self.get_stats()
                 
                 logger.info("📊 ESTATÍSTICAS DO SISTEMA:")
                 logger.info(f"   • Operações ativas: {stats_copy.active_operations}/{self.max_concurrent_operations}")
                 logger.info(f"   • Queue: {stats_copy.queue_size}/{self.max_queue_size}")
                 logger.info(f"   • Sinais processados: {stats_copy.total_signals_processed}")
+                logger.info(f"   • Sinais de estatística: {stats_copy.statistics_signals}")
                 logger.info(f"   • Sucessos: {stats_copy.successful_operations}")
                 logger.info(f"   • Falhas: {stats_copy.failed_operations}")
                 logger.info(f"   • Tempo médio: {stats_copy.average_processing_time:.3f}s")
@@ -334,23 +297,23 @@ class EnhancedSyncSystem:
                 # Limpar cache expirado
                 self.proposal_cache.clear_expired()
                 
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 logger.error(f"❌ Erro no log de estatísticas: {e}")
     
     async def _status_handler(self, request):
         """Handler para endpoint /status"""
         try:
-            with self.stats_lock:
-                stats_dict = asdict(self.stats)
-            
             # Adicionar informações extras
             status_data = {
-                **stats_dict,
+                **self.get_statistics(),
                 "timestamp": time.time(),
-                "uptime_seconds": time.time() - getattr(self, 'start_time', time.time()),
+                "uptime_seconds": time.monotonic() - getattr(self, 'start_time', time.monotonic()),
                 "max_concurrent_operations": self.max_concurrent_operations,
                 "max_queue_size": self.max_queue_size,
-                "cache_size": len(self.proposal_cache.cache)
+                "cache_size": len(self.proposal_cache.cache),
+                "event_loop": estatisticas_loop()
             }
             
             return web.json_response(status_data)
@@ -362,7 +325,7 @@ class EnhancedSyncSystem:
     async def start(self, port: int = 8080):
         """Inicia o sistema de sincronização"""
         self.running = True
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         
         # Configurar servidor HTTP
         self.app = web.Application()
@@ -389,11 +352,11 @@ class EnhancedSyncSystem:
         
         logger.info(f"🌐 Servidor de status iniciado em http://localhost:{port}/status")
         
-        # Iniciar processador de sinais
-        asyncio.create_task(self._process_signal_queue())
-        
-        # Iniciar logger de estatísticas
-        asyncio.create_task(self._periodic_stats_logger())
+        # Processador de sinais e logger de estatísticas
+        self._tarefas = [
+            asyncio.create_task(self._process_signal_queue(), name="sync_processador_sinais"),
+            asyncio.create_task(self._periodic_stats_logger(), name="sync_estatisticas"),
+        ]
         
         logger.info("✅ Sistema de Sincronização Aprimorado iniciado")
     
@@ -403,6 +366,12 @@ class EnhancedSyncSystem:
         
         self.running = False
         
+        # Parar tarefas de fundo (aguardar_sinal não acorda sozinho)
+        for tarefa in self._tarefas:
+            tarefa.cancel()
+        await asyncio.gather(*self._tarefas, return_exceptions=True)
+        self._tarefas = []
+        
         # Parar servidor HTTP
         if self.site:
             await self.site.stop()
@@ -416,35 +385,53 @@ class EnhancedSyncSystem:
     
     def get_stats(self) -> SystemStats:
         """Retorna estatísticas atuais"""
-        with self.stats_lock:
-            return SystemStats(**asdict(self.stats))
+        return SystemStats(**self.get_statistics())
     
     def update_circuit_breaker_state(self, state: str):
         """Atualiza estado do circuit breaker"""
-        with self.stats_lock:
-            self.stats.circuit_breaker_state = state
+        self.stats.circuit_breaker_state = state
         logger.info(f"🔒 Circuit Breaker: {state}")
     
     def get_next_signal(self) -> Optional[SignalData]:
         """Obtém próximo sinal da queue (não bloqueante)"""
         try:
             return self.signal_queue.get_nowait()
-        except Empty:
+        except asyncio.QueueEmpty:
             return None
     
+    async def aguardar_sinal(self, parar: Optional[asyncio.Event] = None) -> Optional[SignalData]:
+        """
+        Aguarda o próximo sinal com padrão, acordando no instante em que é enfileirado.
+        Com ``parar``, devolve None assim que o evento for setado (shutdown).
+        """
+        if parar is None or not self.signal_queue.empty():
+            return await self.signal_queue.get()
+        obter = asyncio.ensure_future(self.signal_queue.get())
+        parada = asyncio.ensure_future(parar.wait())
+        try:
+            await asyncio.wait((obter, parada), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            parada.cancel()
+            if not obter.done():
+                obter.cancel()  # Queue.get cancelado não consome item
+        if not obter.done() or obter.cancelled():
+            return None
+        return obter.result()
+    
     def get_statistics(self) -> Dict[str, Any]:
         """Retorna estatísticas como dicionário"""
-        with self.stats_lock:
-            return asdict(self.stats)
+        stats = self.stats
+        stats.queue_size = self.signal_queue.qsize()
+        stats.active_operations = self.active_operations
+        return dict(stats.__dict__)  # campos escalares: cópia rasa basta (asdict faz deepcopy)
     
     def can_execute_operation(self) -> bool:
         """Verifica se há slots disponíveis para executar operação"""
-        return self.operation_semaphore._value > 0
+        return not self.operation_semaphore.locked()
     
     def record_operation_failure(self, error_message: str = None):
         """Registra uma falha de operação nas estatísticas"""
-        with self.stats_lock:
-            self.stats.failed_operations += 1
+        self.stats.failed_operations += 1
         
         if error_message:
             logger.error(f"❌ Falha de operação registrada: {error_message}")
@@ -453,27 +440,17 @@ class EnhancedSyncSystem:
     
     def record_operation_success(self):
         """Registra uma operação bem-sucedida nas estatísticas"""
-        with self.stats_lock:
-            self.stats.successful_operations += 1
+        self.stats.successful_operations += 1
         logger.info("✅ Operação bem-sucedida registrada")
     
     async def clear_signal_queue(self):
         """Limpa completamente a queue de sinais"""
-        try:
-            # Limpar todos os sinais da queue
-            cleared_count = 0
-            while not self.signal_queue.empty():
-                try:
-                    self.signal_queue.get_nowait()
-                    cleared_count += 1
-                except:
-                    break
-            
-            # Atualizar estatísticas
-            with self.stats_lock:
-                self.stats.queue_size = 0
-            
-            logger.info(f"🧹 Queue de sinais limpa: {cleared_count} sinais removidos")
-            
-        except Exception as e:
-            logger.error(f"❌ Erro ao limpar queue de sinais: {e}")
\ No newline at end of file
+        cleared_count = 0
+        while True:
+            try:
+                self.signal_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            cleared_count += 1
+        
+        logger.info(f"🧹 Queue de sinais limpa: {cleared_count} sinais removidos")
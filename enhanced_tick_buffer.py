@@ -1,105 +1,140 @@
 import time
-import threading
-from collections import deque
-from dataclasses import dataclass
 from typing import List, Optional
 import logging
 
-@dataclass
-class SyncedTick:
-    """Estrutura para tick com timestamp preciso"""
-    value: float
-    timestamp: float
-    tick_id: str = None
-
-class EnhancedTickBuffer:
-    """Buffer thread-safe para ticks com sincronização temporal"""
-    
-    def __init__(self, max_size: int = 10, tolerance_seconds: float = 1.0):
+import numpy as np
+
+class TickRingBuffer:
+    """
+    Anel pré-alocado de ticks com arrays float64 paralelos de valores e timestamps.
+
+    Cada tick é gravado duas vezes (posição i e i + max_size), de modo que os
+    últimos N ticks sempre formam uma fatia contígua: window() devolve uma view
+    somente-leitura sem cópia. Append, descarte de obsoletos e validação da
+    janela de sincronização são O(1) (amortizado). Feito para o event loop de
+    um único bot: não usa lock.
+    """
+
+    def __init__(self, max_size: int = 10, tolerance_seconds: float = 1.0,
+                 max_age_seconds: Optional[float] = 5.0):
+        if max_size < 1:
+            raise ValueError(f"max_size deve ser positivo: {max_size}")
         self.max_size = max_size
         self.tolerance_seconds = tolerance_seconds
-        self.buffer = deque(maxlen=max_size)
-        self.lock = threading.Lock()
+        self.max_age_seconds = max_age_seconds
+        self._valores = np.zeros(2 * max_size, dtype=np.float64)
+        self._tempos = np.zeros(2 * max_size, dtype=np.float64)
+        # Posições lógicas: [_inicio, _fim) são os ticks válidos
+        self._inicio = 0
+        self._fim = 0
         self.logger = logging.getLogger(__name__)
-    
+
+    def __len__(self) -> int:
+        return self._fim - self._inicio
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def is_full(self) -> bool:
+        return len(self) == self.max_size
+
     def add_tick(self, tick_value: float, custom_timestamp: float = None) -> bool:
-        """Adiciona tick ao buffer com validação temporal"""
+        """Adiciona tick ao anel com validação temporal"""
         try:
-            with self.lock:
-                timestamp = custom_timestamp if custom_timestamp else time.time()
-                
-                # Validar ordem cronológica
-                if self.buffer and timestamp < self.buffer[-1].timestamp:
-                    self.logger.warning(f"Tick fora de ordem temporal ignorado: {timestamp}")
-                    return False
-                
-                # Criar tick sincronizado
-                synced_tick = SyncedTick(
-                    value=float(tick_value),
-                    timestamp=timestamp,
-                    tick_id=f"tick_{int(timestamp*1000000)}"
-                )
-                
-                # Adicionar ao buffer
-                self.buffer.append(synced_tick)
-                
-                # Limpeza automática de ticks obsoletos
-                self._cleanup_old_ticks()
-                
-                return True
-        
-        except Exception as e:
+            tick_value = float(tick_value)
+        except (TypeError, ValueError) as e:
             self.logger.error(f"Erro ao adicionar tick: {e}")
             return False
-    
+        timestamp = custom_timestamp if custom_timestamp else time.time()
+
+        # Validar ordem cronológica
+        if self._fim > self._inicio and timestamp < self._tempos[(self._fim - 1) % self.max_size]:
+            self.logger.warning(f"Tick fora de ordem temporal ignorado: {timestamp}")
+            return False
+
+        pos = self._fim % self.max_size
+        espelho = pos + self.max_size
+        self._valores[pos] = self._valores[espelho] = tick_value
+        self._tempos[pos] = self._tempos[espelho] = timestamp
+        self._fim += 1
+        if self._fim - self._inicio > self.max_size:
+            self._inicio = self._fim - self.max_size
+
+        if self.max_age_seconds is not None:
+            self._cleanup_old_ticks(timestamp)
+        return True
+
+    def _cleanup_old_ticks(self, agora: float):
+        """Avança o início do anel sobre ticks obsoletos (> max_age_seconds do tick mais novo)"""
+        while (self._fim > self._inicio and
+               agora - self._tempos[self._inicio % self.max_size] > self.max_age_seconds):
+            self._inicio += 1
+
+    def _fatia(self, n: Optional[int]) -> slice:
+        n = len(self) if n is None else max(0, min(n, len(self)))
+        fim = (self._fim - 1) % self.max_size + self.max_size + 1
+        return slice(fim - n, fim)
+
+    def window(self, n: Optional[int] = None) -> np.ndarray:
+        """View somente-leitura dos últimos n valores (mais antigo primeiro); muda no próximo add_tick"""
+        view = self._valores[self._fatia(n)]
+        view.flags.writeable = False
+        return view
+
+    def timestamps(self, n: Optional[int] = None) -> np.ndarray:
+        """View somente-leitura dos timestamps dos últimos n ticks"""
+        view = self._tempos[self._fatia(n)]
+        view.flags.writeable = False
+        return view
+
+    def to_list(self, n: Optional[int] = None) -> List[float]:
+        """Cópia dos últimos n valores como lista (para filas e histórico)"""
+        return self.window(n).tolist()
+
+    @property
+    def last(self) -> Optional[float]:
+        return float(self._valores[(self._fim - 1) % self.max_size]) if len(self) else None
+
     def get_last_n_ticks(self, n: int = 5) -> List[float]:
         """Retorna os últimos N ticks como lista de valores"""
-        try:
-            with self.lock:
-                if len(self.buffer) < n:
-                    return []
-                
-                # Verificar sincronização temporal
-                if not self._validate_sync_window():
-                    self.logger.warning("Ticks fora da janela de sincronização")
-                    return []
-                
-                # Retornar apenas os valores dos últimos N ticks
-                return [tick.value for tick in list(self.buffer)[-n:]]
-        
-        except Exception as e:
-            self.logger.error(f"Erro ao obter ticks: {e}")
+        if len(self) < n:
             return []
-    
-    def _cleanup_old_ticks(self):
-        """Remove ticks obsoletos (>5 segundos)"""
-        current_time = time.time()
-        while (self.buffer and
-               current_time - self.buffer[0].timestamp > 5.0):
-            removed_tick = self.buffer.popleft()
-            self.logger.debug(f"Tick obsoleto removido: {removed_tick.timestamp}")
-    
+
+        # Verificar sincronização temporal
+        if not self._validate_sync_window():
+            self.logger.warning("Ticks fora da janela de sincronização")
+            return []
+
+        return self.to_list(n)
+
+    def _time_span(self) -> float:
+        if len(self) < 2:
+            return 0.0
+        return float(self._tempos[(self._fim - 1) % self.max_size] - self._tempos[self._inicio % self.max_size])
+
     def _validate_sync_window(self) -> bool:
-        """Valida se todos os ticks estão dentro da janela de sincronização"""
-        if len(self.buffer) < 2:
-            return True
-        
-        timestamps = [tick.timestamp for tick in self.buffer]
-        max_diff = max(timestamps) - min(timestamps)
-        
-        return max_diff <= self.tolerance_seconds
-    
+        """Valida se todos os ticks estão dentro da janela de sincronização (timestamps são crescentes)"""
+        return self._time_span() <= self.tolerance_seconds
+
+    def clear(self):
+        """Esvazia o anel sem realocar"""
+        self._inicio = self._fim = 0
+
+    clear_buffer = clear
+
     def get_buffer_stats(self) -> dict:
         """Retorna estatísticas do buffer"""
-        with self.lock:
-            if not self.buffer:
-                return {"size": 0, "time_span": 0, "synced": True}
-            
-            timestamps = [tick.timestamp for tick in self.buffer]
-            return {
-                "size": len(self.buffer),
-                "time_span": max(timestamps) - min(timestamps),
-                "synced": self._validate_sync_window(),
-                "oldest_tick_age": time.time() - min(timestamps),
-                "newest_tick_age": time.time() - max(timestamps)
-            }
\ No newline at end of file
+        if not len(self):
+            return {"size": 0, "time_span": 0, "synced": True}
+
+        agora = time.time()
+        return {
+            "size": len(self),
+            "time_span": self._time_span(),
+            "synced": self._validate_sync_window(),
+            "oldest_tick_age": agora - float(self._tempos[self._inicio % self.max_size]),
+            "newest_tick_age": agora - float(self._tempos[(self._fim - 1) % self.max_size])
+        }
+
+# Nome histórico usado pelos bots
+EnhancedTickBuffer = TickRingBuffer
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Camada de I/O fora do event loop
+
+O cliente Supabase é síncrono e as gravações de arquivo também: chamados
+dentro de uma corrotina, param o loop (e o processamento de ticks) pelo tempo
+de uma requisição HTTP ou de um fsync. Aqui esse trabalho vai para um pool de
+threads limitado:
+
+- cada alvo (ex.: 'supabase:<bot>', 'arquivo:<caminho>') tem uma fila própria,
+  executada em ordem por no máximo uma thread de cada vez — gravações de um
+  mesmo alvo não se reordenam, alvos diferentes andam em paralelo;
+- backpressure: ``await executar(...)`` espera vaga quando a fila do alvo está
+  cheia; ``enviar(...)`` (dispara e esquece, chamável de código síncrono)
+  nunca espera — descarta a tarefa pendente mais antiga do alvo, ou, com
+  ``substituir=True``, troca a pendente pela nova (snapshot de arquivo: só a
+  última versão interessa).
+
+Guarda de loop (``instalar_guarda``): audit hook que aponta conexões de rede
+síncronas (socket bloqueante, getaddrinfo) feitas na thread de um event loop
+em execução, com a linha do nosso código responsável. IO_GUARD=warn (padrão)
+registra e avisa uma vez por local; IO_GUARD=raise faz a chamada falhar;
+IO_GUARD=off desliga.
+
+Uso:
+    resultado = await executar_io(f'supabase:{bot_id}', consulta.execute)
+    enviar_io(f'arquivo:{caminho}', gravar_json, caminho, dados, substituir=True)
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import logging
+import threading
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+
+MAX_THREADS_IO = int(os.getenv('IO_OFFLOAD_THREADS', '8'))
+MAX_PENDENTES_POR_ALVO = 64
+
+class _TarefaIO:
+    __slots__ = ('funcao', 'args', 'kwargs', 'futuro', 'enfileirada')
+
+    def __init__(self, funcao, args, kwargs):
+        self.funcao = funcao
+        self.args = args
+        self.kwargs = kwargs
+        self.futuro: Future = Future()
+        self.enfileirada = time.monotonic()
+
+class _Alvo:
+    def __init__(self):
+        self.pendentes = deque()
+        self.drenando = False
+        self.concluidas = 0
+        self.falhas = 0
+        self.descartadas = 0
+        self.substituidas = 0
+        self.espera_max = 0.0  # segundos entre enfileirar e começar
+
+class DescarregadorIO:
+    """Pool de threads limitado com uma fila ordenada por alvo"""
+
+    def __init__(self, max_threads: int = MAX_THREADS_IO, max_pendentes: int = MAX_PENDENTES_POR_ALVO):
+        self.max_pendentes = max_pendentes
+        self._pool = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix='io_offload')
+        self._alvos: Dict[str, _Alvo] = {}
+        self._lock = threading.Lock()
+
+    def _enfileirar(self, nome: str, tarefa: _TarefaIO, substituir: bool = False):
+        with self._lock:
+            alvo = self._alvos.setdefault(nome, _Alvo())
+            if substituir and alvo.pendentes:
+                anterior = alvo.pendentes.pop()
+                anterior.futuro.cancel()
+                alvo.substituidas += 1
+            elif len(alvo.pendentes) >= self.max_pendentes:
+                descartada = alvo.pendentes.popleft()
+                descartada.futuro.cancel()
+                alvo.descartadas += 1
+                if alvo.descartadas == 1 or alvo.descartadas % 100 == 0:
+                    logger.warning(f"⚠️ Fila de I/O '{nome}' cheia - {alvo.descartadas} tarefas descartadas")
+            alvo.pendentes.append(tarefa)
+            if not alvo.drenando:
+                alvo.drenando = True
+                self._pool.submit(self._drenar, nome, alvo)
+
+    def _drenar(self, nome: str, alvo: _Alvo):
+        """Thread do pool: executa as tarefas do alvo em ordem até a fila esvaziar"""
+        while True:
+            with self._lock:
+                if not alvo.pendentes:
+                    alvo.drenando = False
+                    return
+                tarefa = alvo.pendentes.popleft()
+                alvo.espera_max = max(alvo.espera_max, time.monotonic() - tarefa.enfileirada)
+            if not tarefa.futuro.set_running_or_notify_cancel():
+                continue
+            try:
+                resultado = tarefa.funcao(*tarefa.args, **tarefa.kwargs)
+            except BaseException as e:
+                with self._lock:
+                    alvo.falhas += 1
+                tarefa.futuro.set_exception(e)
+            else:
+                with self._lock:
+                    alvo.concluidas += 1
+                tarefa.futuro.set_result(resultado)
+
+    def _cheio(self, nome: str) -> Optional[Future]:
+        with self._lock:
+            alvo = self._alvos.get(nome)
+            if alvo is not None and len(alvo.pendentes) >= self.max_pendentes:
+                return alvo.pendentes[0].futuro
+        return None
+
+    async def executar(self, nome: str, funcao: Callable[..., Any], *args, **kwargs) -> Any:
+        """Executa funcao(*args) na fila do alvo e devolve o resultado; espera vaga se a fila estiver cheia"""
+        while (mais_antiga := self._cheio(nome)) is not None:
+            await asyncio.wait({asyncio.wrap_future(mais_antiga)})
+        tarefa = _TarefaIO(funcao, args, kwargs)
+        self._enfileirar(nome, tarefa)
+        return await asyncio.wrap_future(tarefa.futuro)
+
+    def enviar(self, nome: str, funcao: Callable[..., Any], *args, substituir: bool = False, **kwargs) -> Future:
+        """Dispara funcao(*args) na fila do alvo sem esperar (seguro no caminho dos ticks)"""
+        tarefa = _TarefaIO(funcao, args, kwargs)
+        tarefa.futuro.add_done_callback(_registrar_falha(nome))
+        self._enfileirar(nome, tarefa, substituir=substituir)
+        return tarefa.futuro
+
+    async def aguardar(self):
+        """Espera as tarefas já enfileiradas terminarem (ex.: antes de encerrar)"""
+        with self._lock:
+            futuros = [t.futuro for alvo in self._alvos.values() for t in alvo.pendentes]
+        if futuros:
+            await asyncio.wait([asyncio.wrap_future(f) for f in futuros])
+        # A tarefa em execução em cada alvo: uma rodada vazia na fila marca o fim dela
+        marcadores = [self.enviar(nome, _nada) for nome in list(self._alvos)]
+        if marcadores:
+            await asyncio.wait([asyncio.wrap_future(f) for f in marcadores])
+
+    def obter_estatisticas(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                nome: {
+                    'pendentes': len(alvo.pendentes),
+                    'concluidas': alvo.concluidas,
+                    'falhas': alvo.falhas,
+                    'descartadas': alvo.descartadas,
+                    'substituidas': alvo.substituidas,
+                    'espera_max_ms': round(alvo.espera_max * 1000, 1),
+                }
+                for nome, alvo in self._alvos.items()
+            }
+
+def _nada():
+    return None
+
+def _registrar_falha(nome: str):
+    def callback(futuro: Future):
+        if not futuro.cancelled() and futuro.exception() is not None:
+            logger.error(f"❌ Falha em I/O '{nome}': {futuro.exception()}")
+    return callback
+
+def gravar_json(caminho: str, dados: Any, **opcoes_json):
+    """Grava JSON via arquivo temporário + os.replace (leitores nunca veem meio arquivo)"""
+    temporario = f"{caminho}.tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(dados, f, **opcoes_json)
+    os.replace(temporario, caminho)
+
+# Descarregador do processo
+_descarregador: Optional[DescarregadorIO] = None
+_descarregador_lock = threading.Lock()
+
+def descarregador() -> DescarregadorIO:
+    global _descarregador
+    with _descarregador_lock:
+        if _descarregador is None:
+            _descarregador = DescarregadorIO()
+        return _descarregador
+
+async def executar_io(alvo: str, funcao: Callable[..., Any], *args, **kwargs) -> Any:
+    return await descarregador().executar(alvo, funcao, *args, **kwargs)
+
+def enviar_io(alvo: str, funcao: Callable[..., Any], *args, substituir: bool = False, **kwargs) -> Future:
+    return descarregador().enviar(alvo, funcao, *args, substituir=substituir, **kwargs)
+
+# ============================================================================
+# GUARDA: I/O DE REDE SÍNCRONO NA THREAD DO EVENT LOOP
+# ============================================================================
+EVENTOS_REDE = frozenset({'socket.connect', 'socket.getaddrinfo', 'socket.gethostbyname'})
+
+class ChamadaBloqueanteNoLoop(RuntimeError):
+    """I/O de rede síncrono feito na thread de um event loop (IO_GUARD=raise)"""
+
+_modo_guarda = 'off'
+_guarda_instalada = False
+violacoes: Counter = Counter()  # 'arquivo.py:linha (função) evento' -> ocorrências
+
+def _local_chamador() -> str:
+    frame = sys._getframe(2)
+    while frame is not None:
+        arquivo = frame.f_code.co_filename
+        if arquivo.startswith(DIRETORIO) and arquivo != __file__:
+            return f"{os.path.basename(arquivo)}:{frame.f_lineno} ({frame.f_code.co_name})"
+        frame = frame.f_back
+    return '?'
+
+def _guarda(evento: str, args):
+    if evento not in EVENTOS_REDE or _modo_guarda == 'off':
+        return
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return  # fora do loop (threads do pool, scripts síncronos)
+    if evento == 'socket.connect':
+        sock = args[0]
+        if isinstance(sock, socket.socket) and not sock.getblocking():
+            return  # sockets do próprio asyncio: não bloqueiam
+    local = _local_chamador()
+    chave = f"{local} {evento}"
+    violacoes[chave] += 1
+    if violacoes[chave] == 1:
+        logger.warning(f"🚧 I/O de rede síncrono no event loop: {evento} em {local} - use io_offload.executar_io")
+    if _modo_guarda == 'raise':
+        raise ChamadaBloqueanteNoLoop(f"{evento} síncrono no event loop em {local}")
+
+def instalar_guarda(modo: Optional[str] = None) -> str:
+    """Liga (ou troca o modo de) a guarda; audit hooks não podem ser removidos, só desligados"""
+    global _modo_guarda, _guarda_instalada
+    modo = (modo or os.getenv('IO_GUARD', 'warn')).lower()
+    if modo not in ('off', 'warn', 'raise'):
+        logger.warning(f"⚠️ IO_GUARD desconhecido: {modo} - usando 'warn'")
+        modo = 'warn'
+    _modo_guarda = modo
+    if modo != 'off' and not _guarda_instalada:
+        sys.addaudithook(_guarda)
+        _guarda_instalada = True
+    return modo
@@ -19,6 +19,7 @@ import os
 import sys
 import time
 import signal
+import asyncio
 import subprocess
 import multiprocessing
 from datetime import datetime, timedelta
@@ -27,6 +28,8 @@ import logging
 import json
 from pathlib import Path
 
+from io_offload import enviar_io, descarregador
+
 # Configurar logging
 logging.basicConfig(
     level=logging.INFO,
@@ -54,8 +57,8 @@ class BotOrchestrator:
     Orquestrador principal para gerenciar a nova geração de robôs
     """
     
-    def __init__(self):
-        self.supabase = self._init_supabase()
+    def __init__(self, supabase: Optional[Client] = None):
+        self.supabase = supabase or self._init_supabase()
         self.active_processes: Dict[str, subprocess.Popen] = {}  # Mudança: usar bot_id como chave
         self.bot_configs: Dict[str, dict] = {}
         self.bot_health_status: Dict[str, str] = {}  # Novo: rastrear status de saúde
@@ -63,8 +66,28 @@ class BotOrchestrator:
         self.shutdown_requested = False
         self.sync_interval = 60  # segundos
         self.heartbeat_timeout = 180  # 3 minutos
-        self.startup_delay = 5  # segundos entre inicializações
+        self.startup_concurrency = int(os.getenv('BOT_STARTUP_CONCURRENCY', 8))  # inícios simultâneos
+        self.startup_stagger = 0.25  # segundos que cada início ocupa uma vaga do lançador
         self.startup_grace_period = 30  # segundos de graça para novos processos
+        self.restart_backoff_base = 1.0  # segundos; o 1º restart após um crash é imediato
+        self.restart_backoff_max = 60.0
+        self.restart_backoff_reset = 300.0  # sem crash por esse tempo, o backoff volta a zero
+        self.crash_history: Dict[str, tuple] = {}  # bot_id -> (crashes seguidos, monotonic do último)
+        self.pending_starts: Dict[str, asyncio.Task] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._watched: Dict[int, Optional[int]] = {}  # pid -> pidfd (None = coberto pelo SIGCHLD)
+        self._watched_processes: Dict[int, subprocess.Popen] = {}
+        self._shutdown_event: Optional[asyncio.Event] = None
+        self._termination_tasks: Dict[asyncio.Task, tuple] = {}  # kill pendente -> (nome, processo)
+        self.terminate_grace = 10  # segundos entre SIGTERM e SIGKILL de um bot
+        self.worker_terminate_grace = 30  # idem para um worker (encerra todos os seus bots)
+        
+        # Modo worker: vários bots por processo (bot_worker.py), ~1 worker por núcleo.
+        # BOT_WORKERS=0 volta ao modo antigo de um bot_instance.py por bot.
+        self.worker_count = int(os.getenv('BOT_WORKERS', os.cpu_count() or 1))
+        self.workers: Dict[int, subprocess.Popen] = {}  # índice do worker -> processo
+        self.bot_worker: Dict[str, int] = {}  # bot_id -> índice do worker que o hospeda
+        self._worker_output: Dict[subprocess.Popen, bytes] = {}  # worker -> linha incompleta da saída
         
         # Configurar handlers de sinal
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -97,6 +120,8 @@ class BotOrchestrator:
         """Handler para sinais de shutdown"""
         logger.info(f"[SIGNAL] Sinal {signum} recebido. Iniciando shutdown graceful...")
         self.shutdown_requested = True
+        if self._shutdown_event is not None:
+            self._shutdown_event.set()
     
     def sync_with_database(self) -> bool:
         """Sincroniza estado com a tabela bot_configurations"""
@@ -174,10 +199,12 @@ class BotOrchestrator:
                             if time_diff.total_seconds() > self.heartbeat_timeout:
                                 logger.warning(f"[ZOMBIE] {bot_name}: Heartbeat expirado ({time_diff.total_seconds():.0f}s)")
                                 
-                                # Matar processo zumbi
+                                # Matar processo zumbi (no modo worker, só o bot é parado)
                                 try:
-                                    process.kill()
-                                    process.wait(timeout=5)
+                                    if bot_id in self.bot_worker:
+                                        self._stop_bot_in_worker(bot_id)
+                                    else:
+                                        process.kill()  # coletado pelo supervisor (pidfd/SIGCHLD)
                                 except Exception as e:
                                     logger.error(f"[ERROR] Erro ao matar processo zumbi {bot_name}: {e}")
                                 
@@ -216,7 +243,7 @@ class BotOrchestrator:
                 if health_status in ['dead', 'stopped']:
                     if database_status in ['running', 'starting']:
                         logger.info(f"[ACTION] {bot_name}: Precisa ser iniciado (morto/parado mas deveria estar rodando)")
-                        self._start_bot_process(bot_id, bot_name)
+                        self._schedule_start(bot_id, bot_name)
                     else:
                         logger.debug(f"[ACTION] {bot_name}: Mantém parado (status correto)")
                         
@@ -238,14 +265,15 @@ class BotOrchestrator:
         try:
             logger.info(f"[START] Iniciando {bot_name} (ID: {bot_id})...")
             
-            # Comando para iniciar o bot_instance.py
-            cmd = [sys.executable, 'bot_instance.py', '--bot_id', bot_id]
-            
-            # Iniciar processo (sem capturar stdout/stderr para evitar buffer overflow)
-            process = subprocess.Popen(
-                cmd,
-                cwd=os.getcwd()
-            )
+            if self.worker_count > 0:
+                process = self._start_bot_in_worker(bot_id)
+            else:
+                # Iniciar processo (sem capturar stdout/stderr para evitar buffer overflow)
+                process = subprocess.Popen(
+                    self._bot_command(bot_id),
+                    cwd=os.getcwd()
+                )
+                self._watch_process(process)
             
             # Registrar processo na lista ativa
             self.active_processes[bot_id] = process
@@ -255,18 +283,136 @@ class BotOrchestrator:
             # Processo adicionado à lista ativa
             
             # Atualizar status no banco
-            self._update_bot_status(bot_id, 'starting', process.pid)
+            self._publish_bot_status(bot_id, 'starting', process.pid)
             
             logger.info(f"[SUCCESS] {bot_name}: Processo iniciado (PID: {process.pid})")
             
-            # Delay para não sobrecarregar APIs
-            time.sleep(self.startup_delay)
-            
         except Exception as e:
             logger.error(f"[ERROR] Erro ao iniciar {bot_name}: {e}")
-            self._update_bot_status(bot_id, 'error', None)
+            self._publish_bot_status(bot_id, 'error', None)
             self.bot_health_status[bot_id] = 'error'
     
+    def _bot_command(self, bot_id: str) -> List[str]:
+        """Comando para iniciar o bot_instance.py"""
+        return [sys.executable, 'bot_instance.py', '--bot_id', bot_id]
+    
+    def _schedule_start(self, bot_id: str, bot_name: str, delay: float = 0.0):
+        """Agenda o início no lançador; sem supervisor rodando, inicia direto"""
+        if self._loop is None:
+            self._start_bot_process(bot_id, bot_name)
+            return
+        if bot_id in self.pending_starts:
+            return
+        task = self._loop.create_task(self._launch_bot(bot_id, bot_name, delay))
+        self.pending_starts[bot_id] = task
+        task.add_done_callback(lambda t: self.pending_starts.pop(bot_id, None))
+    
+    async def _launch_bot(self, bot_id: str, bot_name: str, delay: float):
+        """Lançador: no máximo startup_concurrency inícios por janela de startup_stagger"""
+        if delay > 0:
+            await asyncio.sleep(delay)
+        async with self._launch_semaphore:
+            if self.shutdown_requested or self._is_bot_process_running(bot_id):
+                return
+            self._start_bot_process(bot_id, bot_name)
+            # Escalonar para não sobrecarregar APIs, sem travar o loop
+            await asyncio.sleep(self.startup_stagger)
+    
+    def _next_backoff(self, bot_id: str) -> float:
+        """Atraso do próximo restart: 0, base, 2*base, 4*base... até restart_backoff_max"""
+        now = time.monotonic()
+        crashes, last_crash = self.crash_history.get(bot_id, (0, 0.0))
+        if now - last_crash > self.restart_backoff_reset:
+            crashes = 0
+        delay = 0.0 if crashes == 0 else min(self.restart_backoff_base * 2 ** (crashes - 1),
+                                             self.restart_backoff_max)
+        self.crash_history[bot_id] = (crashes + 1, now)
+        return delay
+    
+    def _watch_process(self, process: subprocess.Popen):
+        """Registra o filho no supervisor: pidfd no Linux, SIGCHLD nos demais"""
+        if self._loop is None or process.pid in self._watched:
+            return
+        pidfd = None
+        if hasattr(os, 'pidfd_open'):
+            try:
+                pidfd = os.pidfd_open(process.pid)
+            except OSError:
+                pidfd = None  # já saiu ou kernel sem pidfd: o SIGCHLD cobre
+        self._watched[process.pid] = pidfd
+        self._watched_processes[process.pid] = process
+        if pidfd is not None:
+            self._loop.add_reader(pidfd, self._on_pidfd_ready, process)
+        elif process.poll() is not None:
+            self._loop.call_soon(self._on_child_exit, process)
+    
+    def _unwatch_process(self, process: subprocess.Popen):
+        pidfd = self._watched.pop(process.pid, None)
+        self._watched_processes.pop(process.pid, None)
+        if pidfd is not None:
+            self._loop.remove_reader(pidfd)
+            os.close(pidfd)
+    
+    def _on_pidfd_ready(self, process: subprocess.Popen):
+        process.poll()  # coleta o status de saída
+        self._on_child_exit(process)
+    
+    def _on_sigchld(self):
+        for process in list(self._watched_processes.values()):
+            if self._watched.get(process.pid) is None and process.poll() is not None:
+                self._on_child_exit(process)
+    
+    def _on_child_exit(self, process: subprocess.Popen):
+        """Filho saiu: marca seus bots como mortos e reagenda os que deveriam estar rodando"""
+        if process.pid not in self._watched:
+            return
+        self._unwatch_process(process)
+        self._reap_dead_workers()
+        crashed = [b for b, p in self.active_processes.items() if p is process]
+        if not crashed:
+            return  # término pedido pelo próprio orchestrator
+        logger.warning(f"[CRASH] PID {process.pid} saiu (código {process.returncode}) - bots: {crashed}")
+        for bot_id in crashed:
+            self._on_bot_exit(bot_id)
+    
+    def _on_bot_exit(self, bot_id: str):
+        """Bot saiu sem ser pedido: marca como morto e reagenda se deveria estar rodando"""
+        self.active_processes.pop(bot_id, None)
+        self.recently_started.pop(bot_id, None)
+        self.bot_health_status[bot_id] = 'dead'
+        config = self.bot_configs.get(bot_id)
+        if self.shutdown_requested or not config or config.get('status') not in ('running', 'starting'):
+            return
+        delay = self._next_backoff(bot_id)
+        logger.info(f"[RESTART] {config['bot_name']}: reinício em {delay:.1f}s")
+        self._schedule_start(bot_id, config['bot_name'], delay)
+    
+    def _start_supervisor(self):
+        """Liga o supervisor de filhos e o lançador ao event loop corrente"""
+        self._loop = asyncio.get_running_loop()
+        self._launch_semaphore = asyncio.Semaphore(self.startup_concurrency)
+        self._shutdown_event = asyncio.Event()
+        if self.shutdown_requested:
+            self._shutdown_event.set()
+        if not hasattr(os, 'pidfd_open'):
+            self._loop.add_signal_handler(signal.SIGCHLD, self._on_sigchld)
+        for process in set(self.active_processes.values()) | set(self.workers.values()):
+            self._watch_process(process)
+        for process in self.workers.values():
+            self._watch_worker_output(process)
+    
+    def _stop_supervisor(self):
+        for task in list(self.pending_starts.values()):
+            task.cancel()
+        for process in list(self._watched_processes.values()):
+            self._unwatch_process(process)
+        for process in list(self._worker_output):
+            self._loop.remove_reader(process.stdout.fileno())
+            del self._worker_output[process]
+        if not hasattr(os, 'pidfd_open'):
+            self._loop.remove_signal_handler(signal.SIGCHLD)
+        self._loop = None
+    
     def _terminate_bot_process(self, bot_id: str, bot_name: str):
         """Termina um processo de robô"""
         try:
@@ -275,30 +421,153 @@ class BotOrchestrator:
                 
                 logger.info(f"[TERMINATE] Terminando {bot_name} (PID: {process.pid})...")
                 
-                # Tentar terminar graciosamente
-                process.terminate()
-                
-                # Aguardar até 10 segundos
-                try:
-                    process.wait(timeout=10)
-                except subprocess.TimeoutExpired:
-                    # Forçar kill se não terminar
-                    logger.warning(f"[KILL] Forçando kill do {bot_name}")
-                    process.kill()
-                    process.wait()
+                if bot_id in self.bot_worker:
+                    # O worker continua rodando os outros bots
+                    self._stop_bot_in_worker(bot_id)
+                else:
+                    # Terminar graciosamente; kill após terminate_grace sem travar o loop
+                    process.terminate()
+                    if self._loop is not None:
+                        task = self._loop.create_task(self._kill_if_stuck(process, bot_name, self.terminate_grace))
+                        self._termination_tasks[task] = (bot_name, process)
+                        # cancelada com o loop: fica registrada para o shutdown()
+                        task.add_done_callback(lambda t: t.cancelled() or self._termination_tasks.pop(t, None))
+                    else:
+                        try:
+                            process.wait(timeout=self.terminate_grace)
+                        except subprocess.TimeoutExpired:
+                            logger.warning(f"[KILL] Forçando kill do {bot_name}")
+                            process.kill()
+                            process.wait()
                 
                 # Remover da lista ativa
                 del self.active_processes[bot_id]
                 self.bot_health_status[bot_id] = 'stopped'
                 
                 # Atualizar status no banco
-                self._update_bot_status(bot_id, 'stopped', None)
+                self._publish_bot_status(bot_id, 'stopped', None)
                 
                 logger.info(f"[SUCCESS] {bot_name}: Processo terminado")
                 
         except Exception as e:
             logger.error(f"[ERROR] Erro ao terminar {bot_name}: {e}")
     
+    async def _wait_process(self, process: subprocess.Popen, timeout: float) -> bool:
+        """process.wait numa thread: o loop do supervisor segue atendendo os outros filhos"""
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, process.wait, timeout)
+            return True
+        except subprocess.TimeoutExpired:
+            return False
+    
+    async def _kill_if_stuck(self, process: subprocess.Popen, name: str, timeout: float):
+        """Depois de um SIGTERM: SIGKILL se o processo não sair em timeout segundos"""
+        if not await self._wait_process(process, timeout):
+            logger.warning(f"[KILL] Forçando kill do {name}")
+            process.kill()
+            await self._wait_process(process, None)
+    
+    def _worker_command(self, index: int) -> List[str]:
+        """Comando para iniciar um bot_worker.py controlado pela entrada padrão"""
+        return [sys.executable, 'bot_worker.py', '--worker', str(index), '--controle-stdin']
+    
+    def _spawn_worker(self, index: int) -> subprocess.Popen:
+        """Inicia um worker; a saída padrão dele traz os avisos de bots que terminaram"""
+        process = subprocess.Popen(
+            self._worker_command(index),
+            cwd=os.getcwd(),
+            stdin=subprocess.PIPE,
+            # Sem supervisor ninguém leria o pipe (e o worker travaria com ele cheio)
+            stdout=subprocess.PIPE if self._loop is not None else None,
+            text=True
+        )
+        self._watch_process(process)
+        self._watch_worker_output(process)
+        logger.info(f"[WORKER] Worker {index} iniciado (PID: {process.pid})")
+        return process
+    
+    def _watch_worker_output(self, process: subprocess.Popen):
+        if self._loop is None or process.stdout is None or process.stdout.closed or process in self._worker_output:
+            return
+        fd = process.stdout.fileno()
+        os.set_blocking(fd, False)
+        self._worker_output[process] = b''
+        self._loop.add_reader(fd, self._on_worker_output, process)
+    
+    def _on_worker_output(self, process: subprocess.Popen):
+        fd = process.stdout.fileno()
+        try:
+            chunk = os.read(fd, 65536)
+        except BlockingIOError:
+            return
+        if not chunk:  # worker saiu (a queda em si é tratada pelo _on_child_exit)
+            self._loop.remove_reader(fd)
+            self._worker_output.pop(process, None)
+            process.stdout.close()
+            return
+        lines = (self._worker_output[process] + chunk).split(b'\n')
+        self._worker_output[process] = lines.pop()
+        for line in lines:
+            self._on_worker_line(process, line.decode('utf-8', errors='replace'))
+    
+    def _on_worker_line(self, process: subprocess.Popen, line: str):
+        """'exited <bot_id> <motivo>' = bot terminou sozinho dentro do worker; o resto é repassado"""
+        parts = line.split()
+        if len(parts) != 3 or parts[0] != 'exited':
+            if line.strip():
+                print(line, flush=True)
+            return
+        bot_id, reason = parts[1], parts[2]
+        index = next((i for i, p in self.workers.items() if p is process), None)
+        if index is None or self.bot_worker.get(bot_id) != index:
+            return  # já parado ou realocado pelo orchestrator
+        del self.bot_worker[bot_id]
+        logger.warning(f"[CRASH] Bot ID {bot_id} saiu do worker {index} ({reason})")
+        self._on_bot_exit(bot_id)
+    
+    def _reap_dead_workers(self):
+        """Esquece workers mortos; seus bots serão redistribuídos ao reiniciar"""
+        for index, process in list(self.workers.items()):
+            if process.poll() is None:
+                continue
+            orphans = [b for b, i in self.bot_worker.items() if i == index]
+            logger.warning(f"[WORKER] Worker {index} morreu (PID: {process.pid}) - bots afetados: {orphans}")
+            del self.workers[index]
+            for bot_id in orphans:
+                del self.bot_worker[bot_id]
+    
+    def _select_worker(self) -> int:
+        """Worker com menos bots; cria workers até atingir worker_count"""
+        self._reap_dead_workers()
+        if len(self.workers) < self.worker_count:
+            index = next(i for i in range(self.worker_count) if i not in self.workers)
+            self.workers[index] = self._spawn_worker(index)
+            return index
+        load = {index: 0 for index in self.workers}
+        for index in self.bot_worker.values():
+            load[index] += 1
+        return min(load, key=load.get)
+    
+    def _send_worker_command(self, index: int, command: str):
+        process = self.workers[index]
+        process.stdin.write(command + '\n')
+        process.stdin.flush()
+    
+    def _start_bot_in_worker(self, bot_id: str) -> subprocess.Popen:
+        """Hospeda o bot no worker menos carregado e devolve o processo do worker"""
+        index = self._select_worker()
+        self._send_worker_command(index, f"start {bot_id}")
+        self.bot_worker[bot_id] = index
+        logger.info(f"[WORKER] Bot ID {bot_id} -> worker {index}")
+        return self.workers[index]
+    
+    def _stop_bot_in_worker(self, bot_id: str):
+        index = self.bot_worker.pop(bot_id)
+        try:
+            self._send_worker_command(index, f"stop {bot_id}")
+        except (BrokenPipeError, OSError) as e:
+            logger.warning(f"[WORKER] Worker {index} não recebeu stop de {bot_id}: {e}")
+    
     def _is_bot_process_running(self, bot_id: str) -> bool:
         """Verifica se um processo de bot ainda está rodando"""
         if bot_id not in self.active_processes:
@@ -307,6 +576,13 @@ class BotOrchestrator:
         process = self.active_processes[bot_id]
         return process.poll() is None
     
+    def _publish_bot_status(self, bot_id: str, status: str, process_id: Optional[int]):
+        """Com o supervisor rodando, o UPDATE vai para a fila 'supabase:<bot>' (em ordem, fora do loop)"""
+        if self._loop is None:
+            self._update_bot_status(bot_id, status, process_id)
+        else:
+            enviar_io(f"supabase:{bot_id}", self._update_bot_status, bot_id, status, process_id)
+    
     def _update_bot_status(self, bot_id: str, status: str, process_id: Optional[int]):
         """Atualiza status do robô no banco de dados"""
         try:
@@ -356,6 +632,8 @@ class BotOrchestrator:
         logger.info("[REPORT] === STATUS REPORT ===")
         logger.info(f"[REPORT] Robôs configurados: {len(self.bot_configs)}")
         logger.info(f"[REPORT] Processos ativos: {len(self.active_processes)}")
+        if self.worker_count > 0:
+            logger.info(f"[REPORT] Workers: {len(self.workers)}/{self.worker_count}")
         
         for bot_id, config in self.bot_configs.items():
             bot_name = config['bot_name']
@@ -382,6 +660,28 @@ class BotOrchestrator:
         logger.info(f"[CONFIG] Intervalo de sincronização: {self.sync_interval}s")
         logger.info(f"[CONFIG] Timeout de heartbeat: {self.heartbeat_timeout}s")
         
+        try:
+            asyncio.run(self._run_async())
+        except KeyboardInterrupt:
+            logger.info("[INTERRUPT] Interrupção manual detectada")
+        except Exception as e:
+            logger.error(f"[ERROR] Erro crítico no loop principal: {e}")
+        finally:
+            self.shutdown()
+    
+    async def _wait_or_shutdown(self, timeout: float):
+        try:
+            await asyncio.wait_for(self._shutdown_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+    
+    async def _run_async(self):
+        """Ciclo de sincronização; quedas de processos são tratadas na hora pelo supervisor"""
+        self._start_supervisor()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self._signal_handler, sig, None)
+        
         cycle_count = 0
         
         try:
@@ -390,9 +690,9 @@ class BotOrchestrator:
                 logger.info(f"[CYCLE] === CICLO {cycle_count} ===")
                 
                 # 1. Sincronizar com banco de dados
-                if not self.sync_with_database():
+                if not await loop.run_in_executor(None, self.sync_with_database):
                     logger.error("[ERROR] Falha na sincronização. Tentando novamente...")
-                    time.sleep(10)
+                    await self._wait_or_shutdown(10)
                     continue
                 
                 # 2. ETAPA 1: Verificar saúde real dos processos
@@ -410,31 +710,38 @@ class BotOrchestrator:
                 
                 # 6. Aguardar próximo ciclo
                 logger.info(f"[WAIT] Aguardando {self.sync_interval}s para próximo ciclo...")
-                time.sleep(self.sync_interval)
-                
-        except KeyboardInterrupt:
-            logger.info("[INTERRUPT] Interrupção manual detectada")
-        except Exception as e:
-            logger.error(f"[ERROR] Erro crítico no loop principal: {e}")
+                await self._wait_or_shutdown(self.sync_interval)
         finally:
-            self.shutdown()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.remove_signal_handler(sig)
+            self._stop_supervisor()
+    
+    async def _terminate_children(self):
+        """SIGTERM em todos os filhos de uma vez e espera em paralelo (kill de quem não sair)"""
+        children = [(f"worker {index}", process, self.worker_terminate_grace)
+                    for index, process in self.workers.items()]
+        children += [(f"processo Bot ID {bot_id}", process, self.terminate_grace)
+                     for bot_id, process in self.active_processes.items() if bot_id not in self.bot_worker]
+        # Terminados durante o ciclo cujo kill ficou pendente quando o loop do supervisor parou
+        children += [(name, process, self.terminate_grace) for name, process in self._termination_tasks.values()]
+        children = [child for child in children if child[1].poll() is None]
+        for name, process, _ in children:
+            logger.info(f"[SHUTDOWN] Terminando {name} (PID: {process.pid})...")
+            process.terminate()
+        await asyncio.gather(*(self._kill_if_stuck(process, name, grace) for name, process, grace in children),
+                             return_exceptions=True)
+        # Status ainda na fila: o 'stopped' final do shutdown() não pode ser sobrescrito por eles
+        await descarregador().aguardar()
     
     def shutdown(self):
         """Shutdown graceful do orquestrador"""
         logger.info("[SHUTDOWN] Iniciando shutdown do Orchestrator...")
         
-        # Terminar todos os processos ativos
-        for bot_id, process in list(self.active_processes.items()):
-            try:
-                logger.info(f"[SHUTDOWN] Terminando processo Bot ID {bot_id} (PID: {process.pid})...")
-                process.terminate()
-                process.wait(timeout=10)
-            except subprocess.TimeoutExpired:
-                logger.warning(f"[KILL] Forçando kill do processo Bot ID {bot_id}")
-                process.kill()
-                process.wait()
-            except Exception as e:
-                logger.error(f"[ERROR] Erro ao terminar processo Bot ID {bot_id}: {e}")
+        # Workers (SIGTERM faz o shutdown graceful dos bots hospedados) e processos de bot
+        try:
+            asyncio.run(self._terminate_children())
+        except Exception as e:
+            logger.error(f"[ERROR] Erro ao terminar processos: {e}")
         
         # Atualizar status no banco
         try:
@@ -456,7 +763,7 @@ def main():
     print("[ROBOS] Gerenciados: Accumulator, Speed Bot")
     print("[SYNC] Sincronizacao: A cada 60 segundos")
     print("[HEARTBEAT] Timeout de 3 minutos")
-    print("[INIT] Inicializacao: Delay de 5 segundos entre robos")
+    print("[INIT] Inicializacao: Lancador concorrente, restart imediato com backoff")
     print("="*70)
     print("")
     
@@ -27,6 +27,8 @@ from dataclasses import dataclass, field
 # from threading import Lock  # REMOVIDO - threading órfão não utilizado
 from functools import wraps
 
+from radar_memo import MemoAnaliseRadar
+
 # ===== CORREÇÃO 2: IMPORTS PARA SISTEMA TELEGRAM SEGURO =====
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
@@ -352,6 +354,9 @@ active_signal_data = None
 active_tracking_id = None  # ID numérico do registro de rastreamento ativo
 monitoring_results = []  # Lista para armazenar resultados das operações em tempo real
 
+# Decisão memorizada do estado ANALYZING (pula análise e upsert se o histórico não mudou)
+memo_analise = MemoAnaliseRadar('radar_analisis_scalping_bot')
+
 # ===== FUNÇÕES DE GERENCIAMENTO DE ESTADO =====
 
 def reset_bot_state(supabase=None):
@@ -388,6 +393,7 @@ def reset_bot_state(supabase=None):
     active_signal_data = None
     active_tracking_id = None
     monitoring_results = []
+    memo_analise.invalidar()
 
 def activate_monitoring_state_CORRIGIDO(signal_data: dict, latest_operation_id: str, supabase):
     """Ativa o estado MONITORING com todas as correções aplicadas"""
@@ -2256,6 +2262,20 @@ def executar_ciclo_FINAL_CORRIGIDO(supabase):
                 'resultado': resultado_padrao
             }
         
+        # Histórico idêntico ao do último ciclo ANALYZING: reaproveitar a decisão
+        impressao = None
+        if bot_current_state == BotState.ANALYZING:
+            impressao = memo_analise.impressao(latest_operation_id, len(historico), bot_current_state)
+            decisao_memorizada = memo_analise.consultar(impressao)
+            memo_analise.registrar_resumo(logger)
+            if decisao_memorizada is not None:
+                return {
+                    'status': 'SUCCESS',
+                    'message': f'Ciclo executado - Estado: {bot_current_state} (memo)',
+                    'resultado': decisao_memorizada,
+                    'memo_hit': True
+                }
+        
         logger.info(f"[CICLO] 📈 Últimas 10 operações: {' '.join(historico[-10:]) if len(historico) >= 10 else ' '.join(historico)}")
         resultado_ciclo = resultado_padrao.copy()
         
@@ -2265,7 +2285,9 @@ def executar_ciclo_FINAL_CORRIGIDO(supabase):
             try:
                 # Executar análise com logs detalhados
                 logger.info("[ANALISE] Iniciando análise PRECISION_SURGE...")
+                inicio_analise = time.perf_counter()
                 resultado_ciclo = executar_analise_precision_surge_unico(historico)
+                duracao_analise = time.perf_counter() - inicio_analise
                 
                 if not resultado_ciclo:
                     logger.error("[ANALISE] ❌ Resultado da análise é None")
@@ -2308,6 +2330,8 @@ def executar_ciclo_FINAL_CORRIGIDO(supabase):
                 else:
                     reason = resultado_ciclo.get('reason', 'Patrón no encontrado')
                     logger.info(f"[PATTERN] ❌ PADRÃO NÃO ENCONTRADO: {reason}")
+                    # Só decisões "sem padrão" são memorizadas; sinais sempre mudam o estado
+                    memo_analise.armazenar(impressao, resultado_ciclo, duracao_analise)
                         
             except Exception as e:
                 error_msg = str(e)
@@ -2553,9 +2577,13 @@ def main_loop_FINAL():
                 message = resultado_ciclo.get('message', 'Sem mensagem')
                 resultado_analise = resultado_ciclo.get('resultado', {})  # Este é o dicionário que precisamos
                 
-                # 2. Envia o resultado da análise para o Supabase (SEMPRE)
-                if resultado_ciclo and resultado_ciclo.get('resultado'):
-                    enviar_status_para_supabase(supabase, resultado_ciclo['resultado'])
+                # 2. Envia o resultado da análise para o Supabase (exceto se nada mudou desde o último envio)
+                if resultado_ciclo.get('memo_hit'):
+                    logger.debug("[MAIN] Histórico inalterado - decisão memorizada, envio ao Supabase dispensado")
+                elif resultado_ciclo and resultado_ciclo.get('resultado'):
+                    if not enviar_status_para_supabase(supabase, resultado_ciclo['resultado']):
+                        # Envio falhou: não reaproveitar a decisão para que o próximo ciclo reenvie
+                        memo_analise.invalidar()
                 else:
                     logger.warning("[MAIN] Nenhum resultado de análise para enviar ao Supabase.")
                 
@@ -17,6 +17,9 @@ from dataclasses import dataclass, field
 import threading
 from threading import Lock
 
+from radar_memo import MemoAnaliseRadar
+from radar_trace import Adiado, criar_trace, iniciar_servidor_trace
+
 # Carregar variaveis de ambiente
 load_dotenv()
 
@@ -31,6 +34,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Rastro preguiçoso da análise (buffer em memória, descarregado em erro ou via /trace)
+trace = criar_trace('radar_analyzer', logger)
+
 # Reduzir logs de bibliotecas externas (Supabase/HTTP)
 logging.getLogger('httpx').setLevel(logging.WARNING)
 logging.getLogger('httpcore').setLevel(logging.WARNING)
@@ -113,6 +119,10 @@ timestamp_estrategia_detectada: Optional[float] = None
 operations_after_pattern_global: int = 0
 estrategia_travada_ate_operacoes: bool = False
 
+# Id da operação mais recente lida por buscar_operacoes_historico (impressão do histórico)
+ultimo_id_operacao = None
+memo_analise = MemoAnaliseRadar('radar_analyzer')
+
 # Thread-safe para variáveis globais
 _persistence_lock = Lock()
 
@@ -192,12 +202,17 @@ def validar_bounds_array(array: List, start_idx: int, end_idx: int, operation_na
 
 def log_historico_completo(historico: List[str], operation: str) -> None:
     """Log completo do estado do histórico antes da análise"""
-    logger.debug(f"[HISTORICO_ESTADO] {operation}:")
-    logger.debug(f"  - Tamanho: {len(historico)} operações")
-    logger.debug(f"  - Sequência completa: {' '.join(historico)}")
-    logger.debug(f"  - Últimas 10: {' '.join(historico[:10])}")
-    logger.debug(f"  - WINs totais: {historico.count('V')} ({(historico.count('V')/len(historico)*100):.1f}%)")
-    logger.debug(f"  - LOSSes totais: {historico.count('D')} ({(historico.count('D')/len(historico)*100):.1f}%)")
+    if not trace.ativo or not historico:
+        return
+    trace.registrar("[HISTORICO_ESTADO] {}:", operation)
+    trace.registrar("  - Tamanho: {} operações", len(historico))
+    trace.registrar("  - Sequência completa: {}", Adiado(' '.join, historico))
+    trace.registrar("  - Últimas 10: {}", Adiado(' '.join, historico[:10]))
+    trace.registrar("  - WINs totais: {} ({:.1f}%)", Adiado(historico.count, 'V'), Adiado(_percentual, historico, 'V'))
+    trace.registrar("  - LOSSes totais: {} ({:.1f}%)", Adiado(historico.count, 'D'), Adiado(_percentual, historico, 'D'))
+
+def _percentual(historico: List[str], resultado: str) -> float:
+    return historico.count(resultado) / len(historico) * 100
 
 def validar_integridade_historico(historico: List[str]) -> bool:
     """Valida integridade dos dados de histórico com verificações avançadas"""
@@ -480,23 +495,24 @@ def log_filter_result(strategy_name: str, filter_name: str, condition: str, resu
         filter_rejection_counter[strategy_name][filter_name] += 1
     
     # Formato: [TIMESTAMP] [STRATEGY_NAME] [DEBUG] Filtro X: [condição] -> [resultado] (valores: X, Y, Z)
-    values_str = ', '.join([f"{k}: {v}" for k, v in values.items()]) if values else "N/A"
-    result_str = "ACEITO" if result else "REJEITADO"
-    
-    logger.debug(f"[{strategy_name}] [DEBUG] {filter_name}: {condition} -> {result_str} (valores: {values_str})")
+    if trace.ativo:
+        trace.registrar("[{}] [DEBUG] {}: {} -> {} (valores: {})", strategy_name, filter_name, condition,
+                        "ACEITO" if result else "REJEITADO", Adiado(_formatar_valores, values))
+
+def _formatar_valores(values: Dict) -> str:
+    return ', '.join([f"{k}: {v}" for k, v in values.items()]) if values else "N/A"
 
 def log_strategy_analysis(strategy_name: str, historico: List[str]) -> None:
     """Log padronizado para início de análise de estratégia no formato solicitado"""
     # Formato: [TIMESTAMP] [STRATEGY_NAME] [DEBUG] Histórico analisado: [primeiros 10 elementos]
-    historico_sample = historico[:10] if len(historico) >= 10 else historico
-    historico_str = ' '.join(historico_sample)
-    logger.debug(f"[{strategy_name}] [DEBUG] Histórico analisado: [{historico_str}]")
+    if not trace.ativo:
+        return
+    trace.registrar("[{}] [DEBUG] Histórico analisado: [{}]", strategy_name, Adiado(' '.join, historico[:10]))
     
     # Log adicional de contexto estatístico
-    win_rate = (historico.count('V') / len(historico)) * 100 if historico else 0
-    total_wins = historico.count('V')
-    total_losses = historico.count('D')
-    logger.debug(f"[{strategy_name}] [CONTEXT] Total: {len(historico)} ops, WINs: {total_wins}, LOSSes: {total_losses}, WR: {win_rate:.1f}%")
+    trace.registrar("[{}] [CONTEXT] Total: {} ops, WINs: {}, LOSSes: {}, WR: {:.1f}%", strategy_name, len(historico),
+                    Adiado(historico.count, 'V'), Adiado(historico.count, 'D'),
+                    Adiado(_percentual, historico, 'V') if historico else 0)
 
 def log_strategy_final_result(strategy_name: str, accepted: bool, confidence: float, reason: str = "") -> None:
     """Log padronizado para resultado final da estratégia"""
@@ -920,25 +936,29 @@ def buscar_operacoes_historico(supabase):
     Busca as ultimas operacoes da tabela scalping_accumulator_bot_logs
     Retorna lista de resultados ['V', 'D', 'V', ...] onde V=vitoria, D=derrota
     """
+    global ultimo_id_operacao
+    ultimo_id_operacao = None
     start_time = time.time()
     try:
-        logger.debug(f"[DB_QUERY] Iniciando busca de {OPERACOES_HISTORICO} operações")
-        print(f"* Buscando ultimas {OPERACOES_HISTORICO} operacoes...")
+        trace.registrar("[DB_QUERY] Iniciando busca de {} operações", OPERACOES_HISTORICO)
+        trace.saida("* Buscando ultimas {} operacoes...", OPERACOES_HISTORICO)
         
         response = supabase.table('scalping_accumulator_bot_logs') \
-            .select('profit_percentage, created_at') \
+            .select('id, profit_percentage, created_at') \
             .order('id', desc=True) \
             .limit(OPERACOES_HISTORICO) \
             .execute()
         
         query_time = time.time() - start_time
-        logger.debug(f"[DB_PERFORMANCE] Query executada em {query_time:.3f}s")
+        trace.registrar("[DB_PERFORMANCE] Query executada em {:.3f}s", query_time)
         
         if not response.data:
             logger.warning("[DB_EMPTY] Nenhuma operação encontrada na base de dados")
-            print("! Nenhuma operacao encontrada na base de dados")
+            trace.saida("! Nenhuma operacao encontrada na base de dados")
             return [], []
         
+        ultimo_id_operacao = response.data[0].get('id')
+        
         # Converter profit_percentage em V/D e manter timestamps
         historico = []
         timestamps = []
@@ -948,12 +968,13 @@ def buscar_operacoes_historico(supabase):
             historico.append(resultado)
             timestamps.append(operacao.get('created_at'))
             
-            logger.debug(f"[DB_RECORD_{i}] profit={profit_percentage}% -> {resultado}, timestamp={operacao.get('created_at')}")
+            trace.registrar("[DB_RECORD_{}] profit={}% -> {}, timestamp={}", i, profit_percentage, resultado, operacao.get('created_at'))
         
         total_time = time.time() - start_time
-        logger.debug(f"[DB_TOTAL_TIME] Processamento completo em {total_time:.3f}s")
+        trace.registrar("[DB_TOTAL_TIME] Processamento completo em {:.3f}s", total_time)
         
-        print(f"* Historico encontrado ({len(historico)} operacoes): {' '.join(historico[:10])}{'...' if len(historico) > 10 else ''}")
+        if trace.ativo:
+            trace.saida("* Historico encontrado ({} operacoes): {}{}", len(historico), Adiado(' '.join, historico[:10]), '...' if len(historico) > 10 else '')
         log_historico_completo(historico, "BUSCA_INICIAL")
         
         return historico, timestamps
@@ -974,10 +995,10 @@ def analisar_estrategias_portfolio(historico):
     analysis_start_time = time.time()
     
     # CORREÇÃO 6: LOG DE DEBUGGING PARA RASTREAMENTO
-    logger.debug(f"[CICLO_DEBUG] Persistente: {estrategia_ativa_persistente is not None}, Ops: {operations_after_pattern_global}/2, Tempo: {time.time() - timestamp_estrategia_detectada if timestamp_estrategia_detectada else 0:.1f}s")
+    trace.registrar("[CICLO_DEBUG] Persistente: {}, Ops: {}/2, Tempo: {:.1f}s", estrategia_ativa_persistente is not None, operations_after_pattern_global, time.time() - timestamp_estrategia_detectada if timestamp_estrategia_detectada else 0)
     
-    logger.debug(f"[PORTFOLIO_START] Iniciando análise do portfólio com {len(historico)} operações")
-    logger.debug(f"[PERSISTENCE_STATE] Estratégia persistente: {estrategia_ativa_persistente is not None}, operations_after_pattern: {operations_after_pattern_global}")
+    trace.registrar("[PORTFOLIO_START] Iniciando análise do portfólio com {} operações", len(historico))
+    trace.registrar("[PERSISTENCE_STATE] Estratégia persistente: {}, operations_after_pattern: {}", estrategia_ativa_persistente is not None, operations_after_pattern_global)
     log_historico_completo(historico, "PORTFOLIO_ANALYSIS")
     
     # BLOQUEIO ABSOLUTO: Se há estratégia ativa, não analisar novamente
@@ -987,7 +1008,7 @@ def analisar_estrategias_portfolio(historico):
         
         # Só permitir reset por timeout de 5 minutos OU 2+ operações
         if tempo_decorrido <= 300:  # Dentro do prazo válido
-            logger.debug(f"[ESTRATEGIA_BLOQUEADA] Mantendo {estrategia_ativa_persistente['strategy']} - {tempo_decorrido:.1f}s ativo")
+            trace.registrar("[ESTRATEGIA_BLOQUEADA] Mantendo {} - {:.1f}s ativo", estrategia_ativa_persistente['strategy'], tempo_decorrido)
             return {
                 'should_operate': True,
                 'reason': f"Patron Encontrado, Activar Bot Ahora! - {estrategia_ativa_persistente['strategy']} ({estrategia_ativa_persistente['confidence']}%)",
@@ -1000,14 +1021,14 @@ def analisar_estrategias_portfolio(historico):
     if estrategia_ativa_persistente is not None:
         # ÚNICA condição de reset permitida
         if operations_after_pattern_global >= 2:
-            logger.debug(f"[PERSISTENCE_RESET_FINAL] Reset autorizado após {operations_after_pattern_global} operações")
+            trace.registrar("[PERSISTENCE_RESET_FINAL] Reset autorizado após {} operações", operations_after_pattern_global)
             estrategia_ativa_persistente = None
             timestamp_estrategia_detectada = None
             operations_after_pattern_global = 0
             estrategia_travada_ate_operacoes = False
         else:
             # FORÇAR manutenção da estratégia
-            logger.debug(f"[PERSISTENCE_FORCED] Forçando manutenção - {operations_after_pattern_global}/2 operações")
+            trace.registrar("[PERSISTENCE_FORCED] Forçando manutenção - {}/2 operações", operations_after_pattern_global)
             return {
                 'should_operate': True,
                 'reason': f"Patron Encontrado, Activar Bot Ahora! - {estrategia_ativa_persistente['strategy']} ({estrategia_ativa_persistente['confidence']}%)",
@@ -1028,28 +1049,29 @@ def analisar_estrategias_portfolio(historico):
     
     estrategias_resultado = []
     
-    print(f"* Analisando Portfolio de 8 Estratégias: {' '.join(historico[:25])}")
-    logger.debug(f"[PORTFOLIO_SEQUENCE] Sequência de análise: {' '.join(historico[:25])}")
+    if trace.ativo:
+        trace.saida("* Analisando Portfolio de 8 Estratégias: {}", Adiado(' '.join, historico[:25]))
+        trace.registrar("[PORTFOLIO_SEQUENCE] Sequência de análise: {}", Adiado(' '.join, historico[:25]))
     
     # ESTRATÉGIA 1: PREMIUM RECOVERY (97% confiança)
     # Trigger: Dupla LOSS com filtros ultra-avançados
     @strategy_exception_handler('PREMIUM_RECOVERY')
     def estrategia_premium_recovery(historico):
         strategy_start_time = time.time()
-        logger.debug("[PREMIUM_RECOVERY_START] Iniciando análise da estratégia PREMIUM_RECOVERY")
+        trace.registrar("[PREMIUM_RECOVERY_START] Iniciando análise da estratégia PREMIUM_RECOVERY")
         
         try:
             if len(historico) < 2:
-                logger.debug(f"[PREMIUM_RECOVERY_EDGE] Histórico insuficiente: {len(historico)} < 2")
+                trace.registrar("[PREMIUM_RECOVERY_EDGE] Histórico insuficiente: {} < 2", len(historico))
                 return None
                 
             # Detectar dupla LOSS consecutiva
             trigger_condition = len(historico) >= 2 and historico[0] == 'D' and historico[1] == 'D'
-            logger.debug(f"[PREMIUM_RECOVERY_TRIGGER] Dupla LOSS? historico[0]={historico[0]}, historico[1]={historico[1]}, trigger={trigger_condition}")
+            trace.registrar("[PREMIUM_RECOVERY_TRIGGER] Dupla LOSS? historico[0]={}, historico[1]={}, trigger={}", historico[0], historico[1], trigger_condition)
             
             if trigger_condition:
-                print("  - PREMIUM_RECOVERY: Dupla LOSS detectada")
-                logger.debug("[PREMIUM_RECOVERY_DETECTED] Dupla LOSS consecutiva confirmada")
+                trace.saida("  - PREMIUM_RECOVERY: Dupla LOSS detectada")
+                trace.registrar("[PREMIUM_RECOVERY_DETECTED] Dupla LOSS consecutiva confirmada")
                 
                 # FILTRO 1 CORRIGIDO: Contar WINs nas 7 operações ANTES da primeira LOSS da dupla
                 filtro1_start = time.time()
@@ -1064,19 +1086,19 @@ def analisar_estrategias_portfolio(historico):
                     operacoes_antes_primeira_loss = historico[start_idx:end_idx]
                     wins_antes_primeira_loss = operacoes_antes_primeira_loss.count('V')
                     
-                    logger.debug(f"[PREMIUM_RECOVERY_F1] Ops antes 1ª LOSS [{start_idx}:{end_idx}]: {operacoes_antes_primeira_loss}")
-                    logger.debug(f"[PREMIUM_RECOVERY_F1] WINs totais: {wins_antes_primeira_loss}/7, critério: <7")
+                    trace.registrar("[PREMIUM_RECOVERY_F1] Ops antes 1ª LOSS [{}:{}]: {}", start_idx, end_idx, operacoes_antes_primeira_loss)
+                    trace.registrar("[PREMIUM_RECOVERY_F1] WINs totais: {}/7, critério: <7", wins_antes_primeira_loss)
                     
                     # CORREÇÃO 2: Aceitar exatamente 6 WINs (rejeitar apenas se > 6)
                     if wins_antes_primeira_loss > 6:
                         filtro1_time = time.time() - filtro1_start
-                        logger.debug(f"[PREMIUM_RECOVERY_F1_REJECT] Filtro 1 rejeitado: {wins_antes_primeira_loss} > 6")
-                        print(f"    X Rejeitado: {wins_antes_primeira_loss} WINs antes da 1ª LOSS (>6)")
+                        trace.registrar("[PREMIUM_RECOVERY_F1_REJECT] Filtro 1 rejeitado: {} > 6", wins_antes_primeira_loss)
+                        trace.saida("    X Rejeitado: {} WINs antes da 1ª LOSS (>6)", wins_antes_primeira_loss)
                         return None
                     
                     filtro1_time = time.time() - filtro1_start
-                    logger.debug(f"[PREMIUM_RECOVERY_F1_PASS] Filtro 1 passou: {wins_antes_primeira_loss} <= 6")
-                    print(f"    ✓ Filtro 1: {wins_antes_primeira_loss} WINs antes da 1ª LOSS (<=6)")
+                    trace.registrar("[PREMIUM_RECOVERY_F1_PASS] Filtro 1 passou: {} <= 6", wins_antes_primeira_loss)
+                    trace.saida("    ✓ Filtro 1: {} WINs antes da 1ª LOSS (<=6)", wins_antes_primeira_loss)
                 
                 # FILTRO 2 CORRIGIDO: Máximo 3 LOSSes nas últimas 20 operações (incluindo a dupla atual)
                 filtro2_start = time.time()
@@ -1087,18 +1109,19 @@ def analisar_estrategias_portfolio(historico):
                     ultimas_20 = historico[:20]
                     losses_20 = ultimas_20.count('D')
                     
-                    logger.debug(f"[PREMIUM_RECOVERY_F2] Últimas 20 ops: {' '.join(ultimas_20)}")
-                    logger.debug(f"[PREMIUM_RECOVERY_F2] LOSSes: {losses_20}/20, critério: <=3")
+                    if trace.ativo:
+                        trace.registrar("[PREMIUM_RECOVERY_F2] Últimas 20 ops: {}", Adiado(' '.join, ultimas_20))
+                        trace.registrar("[PREMIUM_RECOVERY_F2] LOSSes: {}/20, critério: <=3", losses_20)
                     
                     if losses_20 > 3:
                         filtro2_time = time.time() - filtro2_start
-                        logger.debug(f"[PREMIUM_RECOVERY_F2_REJECT] Filtro 2 rejeitado: {losses_20} > 3")
-                        print(f"    X Rejeitado: {losses_20} LOSSes nas últimas 20 (>3)")
+                        trace.registrar("[PREMIUM_RECOVERY_F2_REJECT] Filtro 2 rejeitado: {} > 3", losses_20)
+                        trace.saida("    X Rejeitado: {} LOSSes nas últimas 20 (>3)", losses_20)
                         return None
                     
                     filtro2_time = time.time() - filtro2_start
-                    logger.debug(f"[PREMIUM_RECOVERY_F2_PASS] Filtro 2 passou: {losses_20} <= 3")
-                    print(f"    ✓ Filtro 2: {losses_20} LOSSes nas últimas 20 (<=3)")
+                    trace.registrar("[PREMIUM_RECOVERY_F2_PASS] Filtro 2 passou: {} <= 3", losses_20)
+                    trace.saida("    ✓ Filtro 2: {} LOSSes nas últimas 20 (<=3)", losses_20)
                 
                 # FILTRO 3 CORRIGIDO: Nenhuma LOSS nas 5 operações IMEDIATAMENTE antes da dupla
                 filtro3_start = time.time()
@@ -1110,22 +1133,22 @@ def analisar_estrategias_portfolio(historico):
                     operacoes_antes_dupla = historico[start_idx:end_idx]
                     losses_antes_dupla = operacoes_antes_dupla.count('D')
                     
-                    logger.debug(f"[PREMIUM_RECOVERY_F3] 5 ops antes dupla [{start_idx}:{end_idx}]: {operacoes_antes_dupla}")
-                    logger.debug(f"[PREMIUM_RECOVERY_F3] LOSSes: {losses_antes_dupla}, critério: =0")
+                    trace.registrar("[PREMIUM_RECOVERY_F3] 5 ops antes dupla [{}:{}]: {}", start_idx, end_idx, operacoes_antes_dupla)
+                    trace.registrar("[PREMIUM_RECOVERY_F3] LOSSes: {}, critério: =0", losses_antes_dupla)
                     
                     if losses_antes_dupla > 0:
                         filtro3_time = time.time() - filtro3_start
-                        logger.debug(f"[PREMIUM_RECOVERY_F3_REJECT] Filtro 3 rejeitado: {losses_antes_dupla} LOSSes")
-                        print(f"    X Rejeitado: {losses_antes_dupla} LOSS(es) nas 5 ops antes da dupla")
+                        trace.registrar("[PREMIUM_RECOVERY_F3_REJECT] Filtro 3 rejeitado: {} LOSSes", losses_antes_dupla)
+                        trace.saida("    X Rejeitado: {} LOSS(es) nas 5 ops antes da dupla", losses_antes_dupla)
                         return None
                     
                     filtro3_time = time.time() - filtro3_start
-                    logger.debug(f"[PREMIUM_RECOVERY_F3_PASS] Filtro 3 passou: 0 LOSSes")
-                    print("    ✓ Filtro 3: 0 LOSSes nas 5 ops antes da dupla")
+                    trace.registrar("[PREMIUM_RECOVERY_F3_PASS] Filtro 3 passou: 0 LOSSes")
+                    trace.saida("    ✓ Filtro 3: 0 LOSSes nas 5 ops antes da dupla")
                 
                 strategy_total_time = time.time() - strategy_start_time
-                logger.debug(f"[PREMIUM_RECOVERY_SUCCESS] Estratégia aprovada em {strategy_total_time:.3f}s")
-                print("    ✓ PREMIUM_RECOVERY: Todos os filtros passaram")
+                trace.registrar("[PREMIUM_RECOVERY_SUCCESS] Estratégia aprovada em {:.3f}s", strategy_total_time)
+                trace.saida("    ✓ PREMIUM_RECOVERY: Todos os filtros passaram")
                 return {'strategy': 'PREMIUM_RECOVERY', 'confidence': 97}
                 
         except Exception as e:
@@ -1134,7 +1157,7 @@ def analisar_estrategias_portfolio(historico):
             print(f"    X Erro na PREMIUM_RECOVERY: {e}")
         
         strategy_total_time = time.time() - strategy_start_time
-        logger.debug(f"[PREMIUM_RECOVERY_END] Estratégia finalizada em {strategy_total_time:.3f}s (sem trigger)")
+        trace.registrar("[PREMIUM_RECOVERY_END] Estratégia finalizada em {:.3f}s (sem trigger)", strategy_total_time)
         return None
     
     # ESTRATÉGIA 2: MOMENTUM CONTINUATION (89% confiança)
@@ -1144,7 +1167,7 @@ def analisar_estrategias_portfolio(historico):
         try:
             # Detectar LOSS isolada
             if len(historico) >= 2 and historico[0] == 'D' and historico[1] != 'D':
-                print("  - MOMENTUM_CONTINUATION: LOSS isolada detectada")
+                trace.saida("  - MOMENTUM_CONTINUATION: LOSS isolada detectada")
                 
                 # Contar WINs consecutivos antes da LOSS
                 wins_consecutivos = 0
@@ -1156,7 +1179,7 @@ def analisar_estrategias_portfolio(historico):
                 
                 # Filtro 1: Aceitar apenas se 4-6 WINs antes da LOSS
                 if wins_consecutivos < 4 or wins_consecutivos > 6:
-                    print(f"    X Rejeitado: {wins_consecutivos} WINs (precisa 4-6)")
+                    trace.saida("    X Rejeitado: {} WINs (precisa 4-6)", wins_consecutivos)
                     return None
                 
                 # Filtro 2: Rejeitar se LOSS nas últimas 8 operações (excluindo atual)
@@ -1165,29 +1188,29 @@ def analisar_estrategias_portfolio(historico):
                     losses_count = ultimas_8_antes.count('D')
                     
                     if losses_count > 0:
-                        print(f"    X Rejeitado: {losses_count} LOSS nas últimas 8 operações (deve ser 0)")
+                        trace.saida("    X Rejeitado: {} LOSS nas últimas 8 operações (deve ser 0)", losses_count)
                         return None
                     
-                    print(f"    ✓ Filtro 2: Nenhuma LOSS nas últimas 8 operações")
+                    trace.saida("    ✓ Filtro 2: Nenhuma LOSS nas últimas 8 operações")
                 
                 # Filtro 3: Win rate nas últimas 12 operações >= 85% (incluindo a atual)
                 if len(historico) >= 12:
                     ultimas_12 = historico[:12]
                     win_rate = (ultimas_12.count('V') / 12) * 100
                     if win_rate < 85:
-                        print(f"    X Rejeitado: Win rate {win_rate:.1f}% < 85%")
+                        trace.saida("    X Rejeitado: Win rate {:.1f}% < 85%", win_rate)
                         return None
-                    print(f"    ✓ Filtro 3: Win rate {win_rate:.1f}% >= 85%")
+                    trace.saida("    ✓ Filtro 3: Win rate {:.1f}% >= 85%", win_rate)
                 else:
                     # Para histórico < 12, usar win rate mais flexível
                     total_ops = len(historico)
                     win_rate = (historico.count('V') / total_ops) * 100
                     if win_rate < 80:  # Critério mais flexível para amostras menores
-                        print(f"    X Rejeitado: Win rate {win_rate:.1f}% < 80% (histórico pequeno)")
+                        trace.saida("    X Rejeitado: Win rate {:.1f}% < 80% (histórico pequeno)", win_rate)
                         return None
-                    print(f"    ✓ Filtro 3: Win rate {win_rate:.1f}% >= 80% (histórico: {total_ops} ops)")
+                    trace.saida("    ✓ Filtro 3: Win rate {:.1f}% >= 80% (histórico: {} ops)", win_rate, total_ops)
                 
-                print(f"    ✓ MOMENTUM_CONTINUATION: {wins_consecutivos} WINs consecutivos")
+                trace.saida("    ✓ MOMENTUM_CONTINUATION: {} WINs consecutivos", wins_consecutivos)
                 return {'strategy': 'MOMENTUM_CONTINUATION', 'confidence': 89}
         except Exception as e:
             print(f"    X Erro na MOMENTUM_CONTINUATION: {e}")
@@ -1200,11 +1223,11 @@ def analisar_estrategias_portfolio(historico):
         try:
             # Detectar LOSS isolada
             if len(historico) >= 2 and historico[0] == 'D' and historico[1] != 'D':
-                print("  - VOLATILITY_BREAK: LOSS isolada detectada")
+                trace.saida("  - VOLATILITY_BREAK: LOSS isolada detectada")
                 
                 # Filtro 1: Operação anterior deve ser WIN
                 if historico[1] != 'V':
-                    print("    X Rejeitado: Operação anterior não é WIN")
+                    trace.saida("    X Rejeitado: Operação anterior não é WIN")
                     return None
                 
                 # Analisar últimas 8 operações antes da LOSS para detectar volatilidade
@@ -1217,12 +1240,12 @@ def analisar_estrategias_portfolio(historico):
                         if ultimas_8[i] != ultimas_8[i + 1]:
                             alternacoes += 1
                     
-                    print(f"    - Sequência analisada: {ultimas_8}")
-                    print(f"    - Alternações detectadas: {alternacoes}")
+                    trace.saida("    - Sequência analisada: {}", ultimas_8)
+                    trace.saida("    - Alternações detectadas: {}", alternacoes)
                     
                     # Filtro 2: Aceitar apenas se 4+ alternações em 8 operações
                     if alternacoes < 4:
-                        print(f"    X Rejeitado: {alternacoes} alternações < 4")
+                        trace.saida("    X Rejeitado: {} alternações < 4", alternacoes)
                         return None
                     
                     # Filtro 3: Máximo 2 LOSSes nas últimas 10 operações (incluindo a atual)
@@ -1230,16 +1253,16 @@ def analisar_estrategias_portfolio(historico):
                         ultimas_10 = historico[:10]  # Incluir a LOSS atual
                         losses_10 = ultimas_10.count('D')
                         if losses_10 > 2:
-                            print(f"    X Rejeitado: {losses_10} LOSSes > 2 nas últimas 10")
+                            trace.saida("    X Rejeitado: {} LOSSes > 2 nas últimas 10", losses_10)
                             return None
-                        print(f"    ✓ Filtro 3: {losses_10} LOSSes <= 2 nas últimas 10 operações")
+                        trace.saida("    ✓ Filtro 3: {} LOSSes <= 2 nas últimas 10 operações", losses_10)
                     else:
                         # Para histórico menor, verificar se não há LOSSes consecutivas
                         if len(historico) >= 2 and historico[1] == 'D':
-                            print("    X Rejeitado: LOSSes consecutivas detectadas")
+                            trace.saida("    X Rejeitado: LOSSes consecutivas detectadas")
                             return None
                     
-                    print(f"    ✓ VOLATILITY_BREAK: {alternacoes} alternações detectadas")
+                    trace.saida("    ✓ VOLATILITY_BREAK: {} alternações detectadas", alternacoes)
                     return {'strategy': 'VOLATILITY_BREAK', 'confidence': 84}
         except Exception as e:
             print(f"    X Erro na VOLATILITY_BREAK: {e}")
@@ -1256,29 +1279,29 @@ def analisar_estrategias_portfolio(historico):
                 padrao_esperado = ['V', 'V', 'D', 'V', 'V', 'D']
                 padrao_atual = historico[:6]
                 
-                print(f"    - Sequência atual: {padrao_atual}")
-                print(f"    - Padrão esperado: {padrao_esperado}")
+                trace.saida("    - Sequência atual: {}", padrao_atual)
+                trace.saida("    - Padrão esperado: {}", padrao_esperado)
                 
                 if padrao_atual == padrao_esperado:
-                    print("  - PATTERN_REVERSAL: Padrão V-V-D-V-V-D detectado")
+                    trace.saida("  - PATTERN_REVERSAL: Padrão V-V-D-V-V-D detectado")
                     
                     # Filtro 1: Máximo 2 LOSSes nas últimas 10 operações
                     if len(historico) >= 10:
                         ultimas_10 = historico[:10]
                         losses_10 = ultimas_10.count('D')
                         if losses_10 > 2:
-                            print(f"    X Rejeitado: {losses_10} LOSSes > 2 nas últimas 10 operações")
+                            trace.saida("    X Rejeitado: {} LOSSes > 2 nas últimas 10 operações", losses_10)
                             return None
-                        print(f"    ✓ Filtro 1: {losses_10} LOSSes <= 2 nas últimas 10 operações")
+                        trace.saida("    ✓ Filtro 1: {} LOSSes <= 2 nas últimas 10 operações", losses_10)
                     
                     # Filtro 2: Win rate nas últimas 8 operações >= 70%
                     if len(historico) >= 8:
                         ultimas_8 = historico[:8]
                         win_rate = (ultimas_8.count('V') / 8) * 100
                         if win_rate < 70:
-                            print(f"    X Rejeitado: Win rate {win_rate:.1f}% < 70%")
+                            trace.saida("    X Rejeitado: Win rate {:.1f}% < 70%", win_rate)
                             return None
-                        print(f"    ✓ Filtro 2: Win rate {win_rate:.1f}% >= 70%")
+                        trace.saida("    ✓ Filtro 2: Win rate {:.1f}% >= 70%", win_rate)
                     
                     # Filtro 3: Validação de contexto - não mais de 2 LOSSes consecutivas no histórico
                     consecutivas = 0
@@ -1291,10 +1314,10 @@ def analisar_estrategias_portfolio(historico):
                             consecutivas = 0
                     
                     if max_consecutivas > 2:
-                        print(f"    X Rejeitado: {max_consecutivas} LOSSes consecutivas > 2")
+                        trace.saida("    X Rejeitado: {} LOSSes consecutivas > 2", max_consecutivas)
                         return None
                     
-                    print("    ✓ PATTERN_REVERSAL: Padrão específico confirmado com contexto válido")
+                    trace.saida("    ✓ PATTERN_REVERSAL: Padrão específico confirmado com contexto válido")
                     return {'strategy': 'PATTERN_REVERSAL', 'confidence': 91}
         except Exception as e:
             print(f"    X Erro na PATTERN_REVERSAL: {e}")
@@ -1305,42 +1328,42 @@ def analisar_estrategias_portfolio(historico):
     @strategy_exception_handler('CYCLE_TRANSITION')
     def estrategia_cycle_transition(historico):
         strategy_start_time = time.time()
-        logger.debug("[CYCLE_TRANSITION_START] Iniciando análise da estratégia CYCLE_TRANSITION")
+        trace.registrar("[CYCLE_TRANSITION_START] Iniciando análise da estratégia CYCLE_TRANSITION")
         
         try:
             # Edge case: histórico insuficiente
             if len(historico) < 2:
-                logger.debug(f"[CYCLE_TRANSITION_EDGE] Histórico insuficiente: {len(historico)} < 2")
+                trace.registrar("[CYCLE_TRANSITION_EDGE] Histórico insuficiente: {} < 2", len(historico))
                 return None
                 
             # Detectar LOSS isolada
             trigger_condition = len(historico) >= 2 and historico[0] == 'D' and historico[1] != 'D'
-            logger.debug(f"[CYCLE_TRANSITION_TRIGGER] LOSS isolada? historico[0]={historico[0]}, historico[1]={historico[1] if len(historico) > 1 else 'N/A'}, trigger={trigger_condition}")
+            trace.registrar("[CYCLE_TRANSITION_TRIGGER] LOSS isolada? historico[0]={}, historico[1]={}, trigger={}", historico[0], historico[1] if len(historico) > 1 else 'N/A', trigger_condition)
             
             if trigger_condition:
-                print("  - CYCLE_TRANSITION: LOSS isolada detectada")
-                logger.debug("[CYCLE_TRANSITION_DETECTED] LOSS isolada confirmada")
+                trace.saida("  - CYCLE_TRANSITION: LOSS isolada detectada")
+                trace.registrar("[CYCLE_TRANSITION_DETECTED] LOSS isolada confirmada")
                 
                 # Calcular posição no ciclo baseado no número de operações, não tempo real
                 # Usar tamanho do histórico para determinar posição no ciclo de 20 operações
                 operations_count = len(historico)
                 posicao_ciclo = ((operations_count - 1) % 20) + 1  # Ciclo 1-20
                 
-                logger.debug(f"[CYCLE_TRANSITION_CALC] Total operações: {operations_count}")
-                logger.debug(f"[CYCLE_TRANSITION_POSITION] Posição no ciclo: {posicao_ciclo}/20")
-                print(f"    - Posição no ciclo (baseado em operações): {posicao_ciclo}/20")
+                trace.registrar("[CYCLE_TRANSITION_CALC] Total operações: {}", operations_count)
+                trace.registrar("[CYCLE_TRANSITION_POSITION] Posição no ciclo: {}/20", posicao_ciclo)
+                trace.saida("    - Posição no ciclo (baseado em operações): {}/20", posicao_ciclo)
                 
                 # Filtro 1: Operar apenas nas posições 1-5 do ciclo (início do ciclo)
                 filtro1_start = time.time()
                 if posicao_ciclo < 1 or posicao_ciclo > 5:
                     filtro1_time = time.time() - filtro1_start
-                    logger.debug(f"[CYCLE_TRANSITION_F1_REJECT] Filtro 1 rejeitado: posição {posicao_ciclo} fora do range 1-5")
-                    print(f"    X Rejeitado: Posição {posicao_ciclo} fora do range 1-5 (início de ciclo)")
+                    trace.registrar("[CYCLE_TRANSITION_F1_REJECT] Filtro 1 rejeitado: posição {} fora do range 1-5", posicao_ciclo)
+                    trace.saida("    X Rejeitado: Posição {} fora do range 1-5 (início de ciclo)", posicao_ciclo)
                     return None
                 
                 filtro1_time = time.time() - filtro1_start
-                logger.debug(f"[CYCLE_TRANSITION_F1_PASS] Filtro 1 passou: posição {posicao_ciclo} válida")
-                print(f"    OK Filtro 1: Posição {posicao_ciclo} no início do ciclo")
+                trace.registrar("[CYCLE_TRANSITION_F1_PASS] Filtro 1 passou: posição {} válida", posicao_ciclo)
+                trace.saida("    OK Filtro 1: Posição {} no início do ciclo", posicao_ciclo)
                 
                 # Filtro 2: Últimas 3 operações antes da LOSS devem ser ['V', 'V', 'V']
                 filtro2_start = time.time()
@@ -1352,18 +1375,19 @@ def analisar_estrategias_portfolio(historico):
                     ultimas_3_antes = historico[start_idx:end_idx]
                     padrao_esperado = ['V', 'V', 'V']
                     
-                    logger.debug(f"[CYCLE_TRANSITION_F2] Últimas 3 antes da LOSS [{start_idx}:{end_idx}]: {' '.join(ultimas_3_antes)}")
-                    logger.debug(f"[CYCLE_TRANSITION_F2] Padrão esperado: {' '.join(padrao_esperado)}")
+                    if trace.ativo:
+                        trace.registrar("[CYCLE_TRANSITION_F2] Últimas 3 antes da LOSS [{}:{}]: {}", start_idx, end_idx, Adiado(' '.join, ultimas_3_antes))
+                        trace.registrar("[CYCLE_TRANSITION_F2] Padrão esperado: {}", Adiado(' '.join, padrao_esperado))
                     
                     if ultimas_3_antes != padrao_esperado:
                         filtro2_time = time.time() - filtro2_start
-                        logger.debug(f"[CYCLE_TRANSITION_F2_REJECT] Filtro 2 rejeitado em {filtro2_time:.3f}s: padrão não confere")
-                        print(f"    X Rejeitado: Últimas 3 operações {ultimas_3_antes} != ['V','V','V']")
+                        trace.registrar("[CYCLE_TRANSITION_F2_REJECT] Filtro 2 rejeitado em {:.3f}s: padrão não confere", filtro2_time)
+                        trace.saida("    X Rejeitado: Últimas 3 operações {} != ['V','V','V']", ultimas_3_antes)
                         return None
                     
                     filtro2_time = time.time() - filtro2_start
-                    logger.debug(f"[CYCLE_TRANSITION_F2_PASS] Filtro 2 passou em {filtro2_time:.3f}s: padrão ['V','V','V'] confirmado")
-                    print(f"    ✓ Filtro 2: Últimas 3 operações são ['V','V','V']")
+                    trace.registrar("[CYCLE_TRANSITION_F2_PASS] Filtro 2 passou em {:.3f}s: padrão ['V','V','V'] confirmado", filtro2_time)
+                    trace.saida("    ✓ Filtro 2: Últimas 3 operações são ['V','V','V']")
                 
                 # Filtro 3: Nenhuma LOSS nas últimas 8 operações (excluindo atual)
                 filtro3_start = time.time()
@@ -1375,18 +1399,19 @@ def analisar_estrategias_portfolio(historico):
                     ultimas_8_antes = historico[start_idx:end_idx]
                     losses_count = ultimas_8_antes.count('D')
                     
-                    logger.debug(f"[CYCLE_TRANSITION_F3] Últimas 8 antes da LOSS [{start_idx}:{end_idx}]: {' '.join(ultimas_8_antes)}")
-                    logger.debug(f"[CYCLE_TRANSITION_F3] LOSSes: {losses_count}/8, critério: =0")
+                    if trace.ativo:
+                        trace.registrar("[CYCLE_TRANSITION_F3] Últimas 8 antes da LOSS [{}:{}]: {}", start_idx, end_idx, Adiado(' '.join, ultimas_8_antes))
+                        trace.registrar("[CYCLE_TRANSITION_F3] LOSSes: {}/8, critério: =0", losses_count)
                     
                     if losses_count > 0:
                         filtro3_time = time.time() - filtro3_start
-                        logger.debug(f"[CYCLE_TRANSITION_F3_REJECT] Filtro 3 rejeitado em {filtro3_time:.3f}s: {losses_count} > 0")
-                        print(f"    X Rejeitado: {losses_count} LOSS nas últimas 8 operações (deve ser 0)")
+                        trace.registrar("[CYCLE_TRANSITION_F3_REJECT] Filtro 3 rejeitado em {:.3f}s: {} > 0", filtro3_time, losses_count)
+                        trace.saida("    X Rejeitado: {} LOSS nas últimas 8 operações (deve ser 0)", losses_count)
                         return None
                     
                     filtro3_time = time.time() - filtro3_start
-                    logger.debug(f"[CYCLE_TRANSITION_F3_PASS] Filtro 3 passou em {filtro3_time:.3f}s: nenhuma LOSS")
-                    print(f"    ✓ Filtro 3: Nenhuma LOSS nas últimas 8 operações")
+                    trace.registrar("[CYCLE_TRANSITION_F3_PASS] Filtro 3 passou em {:.3f}s: nenhuma LOSS", filtro3_time)
+                    trace.saida("    ✓ Filtro 3: Nenhuma LOSS nas últimas 8 operações")
                 
                 # Filtro 4: Verificar estabilidade do ciclo anterior (últimas 20 operações)
                 filtro4_start = time.time()
@@ -1398,22 +1423,23 @@ def analisar_estrategias_portfolio(historico):
                     ciclo_anterior = historico[start_idx:end_idx]  # 20 operações do ciclo anterior
                     win_rate_ciclo = (ciclo_anterior.count('V') / 20) * 100
                     
-                    logger.debug(f"[CYCLE_TRANSITION_F4] Ciclo anterior [{start_idx}:{end_idx}]: {' '.join(ciclo_anterior)}")
-                    logger.debug(f"[CYCLE_TRANSITION_F4] Win rate: {win_rate_ciclo:.1f}%, critério: >=75%")
+                    if trace.ativo:
+                        trace.registrar("[CYCLE_TRANSITION_F4] Ciclo anterior [{}:{}]: {}", start_idx, end_idx, Adiado(' '.join, ciclo_anterior))
+                        trace.registrar("[CYCLE_TRANSITION_F4] Win rate: {:.1f}%, critério: >=75%", win_rate_ciclo)
                     
                     if win_rate_ciclo < 75:  # Ciclo anterior deve ter pelo menos 75% de WINs
                         filtro4_time = time.time() - filtro4_start
-                        logger.debug(f"[CYCLE_TRANSITION_F4_REJECT] Filtro 4 rejeitado em {filtro4_time:.3f}s: {win_rate_ciclo:.1f}% < 75%")
-                        print(f"    X Rejeitado: Win rate do ciclo anterior {win_rate_ciclo:.1f}% < 75%")
+                        trace.registrar("[CYCLE_TRANSITION_F4_REJECT] Filtro 4 rejeitado em {:.3f}s: {:.1f}% < 75%", filtro4_time, win_rate_ciclo)
+                        trace.saida("    X Rejeitado: Win rate do ciclo anterior {:.1f}% < 75%", win_rate_ciclo)
                         return None
                     
                     filtro4_time = time.time() - filtro4_start
-                    logger.debug(f"[CYCLE_TRANSITION_F4_PASS] Filtro 4 passou em {filtro4_time:.3f}s: {win_rate_ciclo:.1f}%")
-                    print(f"    OK Filtro 4: Win rate do ciclo anterior {win_rate_ciclo:.1f}%")
+                    trace.registrar("[CYCLE_TRANSITION_F4_PASS] Filtro 4 passou em {:.3f}s: {:.1f}%", filtro4_time, win_rate_ciclo)
+                    trace.saida("    OK Filtro 4: Win rate do ciclo anterior {:.1f}%", win_rate_ciclo)
                 
                 strategy_total_time = time.time() - strategy_start_time
-                logger.debug(f"[CYCLE_TRANSITION_SUCCESS] Estratégia aprovada em {strategy_total_time:.3f}s, posição: {posicao_ciclo}")
-                print(f"    OK CYCLE_TRANSITION: Posição {posicao_ciclo}/20 no ciclo")
+                trace.registrar("[CYCLE_TRANSITION_SUCCESS] Estratégia aprovada em {:.3f}s, posição: {}", strategy_total_time, posicao_ciclo)
+                trace.saida("    OK CYCLE_TRANSITION: Posição {}/20 no ciclo", posicao_ciclo)
                 return {'strategy': 'CYCLE_TRANSITION', 'confidence': 86}
                 
         except Exception as e:
@@ -1422,7 +1448,7 @@ def analisar_estrategias_portfolio(historico):
             print(f"    X Erro na CYCLE_TRANSITION: {e}")
         
         strategy_total_time = time.time() - strategy_start_time
-        logger.debug(f"[CYCLE_TRANSITION_END] Estratégia finalizada em {strategy_total_time:.3f}s (sem trigger)")
+        trace.registrar("[CYCLE_TRANSITION_END] Estratégia finalizada em {:.3f}s (sem trigger)", strategy_total_time)
         return None
     
     # ESTRATÉGIA 6: FIBONACCI RECOVERY (87.5% confiança)
@@ -1430,12 +1456,12 @@ def analisar_estrategias_portfolio(historico):
     @strategy_exception_handler('FIBONACCI_RECOVERY')
     def estrategia_fibonacci_recovery(historico):
         strategy_start_time = time.time()
-        logger.debug("[FIBONACCI_RECOVERY_START] Iniciando análise da estratégia FIBONACCI_RECOVERY")
+        trace.registrar("[FIBONACCI_RECOVERY_START] Iniciando análise da estratégia FIBONACCI_RECOVERY")
         
         try:
             # Edge case: histórico insuficiente ou não é LOSS isolada
             if len(historico) < 10:
-                logger.debug(f"[FIBONACCI_RECOVERY_EDGE] Histórico insuficiente: {len(historico)} < 10")
+                trace.registrar("[FIBONACCI_RECOVERY_EDGE] Histórico insuficiente: {} < 10", len(historico))
                 return None
                 
             # Verificar LOSS isolada
@@ -1443,15 +1469,15 @@ def analisar_estrategias_portfolio(historico):
             trigger_condition2 = len(historico) < 2 or historico[1] != 'D'
             trigger_condition = trigger_condition1 and trigger_condition2
             
-            logger.debug(f"[FIBONACCI_RECOVERY_TRIGGER] LOSS isolada? historico[0]={historico[0]}, historico[1]={historico[1] if len(historico) > 1 else 'N/A'}")
-            logger.debug(f"[FIBONACCI_RECOVERY_TRIGGER] Condições: LOSS={trigger_condition1}, não dupla={trigger_condition2}, trigger={trigger_condition}")
+            trace.registrar("[FIBONACCI_RECOVERY_TRIGGER] LOSS isolada? historico[0]={}, historico[1]={}", historico[0], historico[1] if len(historico) > 1 else 'N/A')
+            trace.registrar("[FIBONACCI_RECOVERY_TRIGGER] Condições: LOSS={}, não dupla={}, trigger={}", trigger_condition1, trigger_condition2, trigger_condition)
             
             if not trigger_condition:
-                logger.debug("[FIBONACCI_RECOVERY_NO_TRIGGER] Não é LOSS isolada")
+                trace.registrar("[FIBONACCI_RECOVERY_NO_TRIGGER] Não é LOSS isolada")
                 return None
             
-            print("  - FIBONACCI_RECOVERY: LOSS isolada detectada")
-            logger.debug("[FIBONACCI_RECOVERY_DETECTED] LOSS isolada confirmada")
+            trace.saida("  - FIBONACCI_RECOVERY: LOSS isolada detectada")
+            trace.registrar("[FIBONACCI_RECOVERY_DETECTED] LOSS isolada confirmada")
             
             # Filtro 1: Win rate nas últimas 10 operações ≥ 80%
             filtro1_start = time.time()
@@ -1462,18 +1488,19 @@ def analisar_estrategias_portfolio(historico):
                 ultimas_10 = historico[:10]
                 win_rate_geral = (ultimas_10.count('V') / 10) * 100
                 
-                logger.debug(f"[FIBONACCI_RECOVERY_F1] Últimas 10 ops: {' '.join(ultimas_10)}")
-                logger.debug(f"[FIBONACCI_RECOVERY_F1] Win rate geral: {win_rate_geral:.1f}%, critério: >=80%")
+                if trace.ativo:
+                    trace.registrar("[FIBONACCI_RECOVERY_F1] Últimas 10 ops: {}", Adiado(' '.join, ultimas_10))
+                    trace.registrar("[FIBONACCI_RECOVERY_F1] Win rate geral: {:.1f}%, critério: >=80%", win_rate_geral)
                 
                 if win_rate_geral < 80:
                     filtro1_time = time.time() - filtro1_start
-                    logger.debug(f"[FIBONACCI_RECOVERY_F1_REJECT] Filtro 1 rejeitado em {filtro1_time:.3f}s: {win_rate_geral:.1f}% < 80%")
-                    print(f"    X Rejeitado: Win rate {win_rate_geral:.1f}% < 80% nas últimas 10")
+                    trace.registrar("[FIBONACCI_RECOVERY_F1_REJECT] Filtro 1 rejeitado em {:.3f}s: {:.1f}% < 80%", filtro1_time, win_rate_geral)
+                    trace.saida("    X Rejeitado: Win rate {:.1f}% < 80% nas últimas 10", win_rate_geral)
                     return None
                 
                 filtro1_time = time.time() - filtro1_start
-                logger.debug(f"[FIBONACCI_RECOVERY_F1_PASS] Filtro 1 passou em {filtro1_time:.3f}s: {win_rate_geral:.1f}% >= 80%")
-                print(f"    ✓ Filtro 1: Win rate {win_rate_geral:.1f}% >= 80% nas últimas 10")
+                trace.registrar("[FIBONACCI_RECOVERY_F1_PASS] Filtro 1 passou em {:.3f}s: {:.1f}% >= 80%", filtro1_time, win_rate_geral)
+                trace.saida("    ✓ Filtro 1: Win rate {:.1f}% >= 80% nas últimas 10", win_rate_geral)
             
             # Verificar janelas Fibonacci: nas últimas 3, 5 ou 8 operações, 
             # o número de WINs deve ser exatamente 3, 5 ou 8 (números Fibonacci)
@@ -1483,7 +1510,7 @@ def analisar_estrategias_portfolio(historico):
                 8: {'start': 1, 'end': 9, 'fibonacci_target': 8}     # Exatamente 8 WINs em 8 operações
             }
             
-            logger.debug(f"[FIBONACCI_RECOVERY_WINDOWS] Configuração Fibonacci correta: {fibonacci_windows}")
+            trace.registrar("[FIBONACCI_RECOVERY_WINDOWS] Configuração Fibonacci correta: {}", fibonacci_windows)
             fibonacci_matches = []
             
             for fib_num, config in fibonacci_windows.items():
@@ -1496,8 +1523,9 @@ def analisar_estrategias_portfolio(historico):
                     window = historico[start_idx:end_idx]
                     win_count = window.count('V')
                     
-                    logger.debug(f"[FIBONACCI_RECOVERY_W{fib_num}] Janela F{fib_num} [{start_idx}:{end_idx}]: {' '.join(window)}")
-                    logger.debug(f"[FIBONACCI_RECOVERY_W{fib_num}] WINs: {win_count}, Target Fibonacci: {config['fibonacci_target']}")
+                    if trace.ativo:
+                        trace.registrar("[FIBONACCI_RECOVERY_W{}] Janela F{} [{}:{}]: {}", fib_num, fib_num, start_idx, end_idx, Adiado(' '.join, window))
+                        trace.registrar("[FIBONACCI_RECOVERY_W{}] WINs: {}, Target Fibonacci: {}", fib_num, win_count, config['fibonacci_target'])
                     
                     # Verificar se atende ao critério Fibonacci - deve ser exatamente o número Fibonacci
                     if win_count == config['fibonacci_target']:
@@ -1508,26 +1536,26 @@ def analisar_estrategias_portfolio(historico):
                             'is_exact_fibonacci': True,
                             'win_rate': (win_count / fib_num) * 100
                         })
-                        logger.debug(f"[FIBONACCI_RECOVERY_W{fib_num}_VALID] Janela Fibonacci válida - exato")
-                        print(f"    ✓ Fibonacci {fib_num}: {win_count} WINs = {config['fibonacci_target']} (exato)")
+                        trace.registrar("[FIBONACCI_RECOVERY_W{}_VALID] Janela Fibonacci válida - exato", fib_num)
+                        trace.saida("    ✓ Fibonacci {}: {} WINs = {} (exato)", fib_num, win_count, config['fibonacci_target'])
                     else:
-                        logger.debug(f"[FIBONACCI_RECOVERY_W{fib_num}_INVALID] Não exato: {win_count} != {config['fibonacci_target']}")
+                        trace.registrar("[FIBONACCI_RECOVERY_W{}_INVALID] Não exato: {} != {}", fib_num, win_count, config['fibonacci_target'])
                 else:
-                    logger.debug(f"[FIBONACCI_RECOVERY_W{fib_num}_SKIP] Histórico insuficiente: {len(historico)} < {config['end']}")
+                    trace.registrar("[FIBONACCI_RECOVERY_W{}_SKIP] Histórico insuficiente: {} < {}", fib_num, len(historico), config['end'])
             
-            logger.debug(f"[FIBONACCI_RECOVERY_WINDOWS_RESULT] Análise das janelas Fibonacci concluída, janelas válidas: {len(fibonacci_matches)}")
+            trace.registrar("[FIBONACCI_RECOVERY_WINDOWS_RESULT] Análise das janelas Fibonacci concluída, janelas válidas: {}", len(fibonacci_matches))
             
             # Filtro 2: Pelo menos 1 janela Fibonacci deve atender aos critérios
             filtro2_start = time.time()
             if len(fibonacci_matches) < 1:
                 filtro2_time = time.time() - filtro2_start
-                logger.debug(f"[FIBONACCI_RECOVERY_F2_REJECT] Filtro 2 rejeitado em {filtro2_time:.3f}s: {len(fibonacci_matches)} < 1")
-                print(f"    X Rejeitado: Nenhuma janela Fibonacci válida encontrada")
+                trace.registrar("[FIBONACCI_RECOVERY_F2_REJECT] Filtro 2 rejeitado em {:.3f}s: {} < 1", filtro2_time, len(fibonacci_matches))
+                trace.saida("    X Rejeitado: Nenhuma janela Fibonacci válida encontrada")
                 return None
             
             filtro2_time = time.time() - filtro2_start
-            logger.debug(f"[FIBONACCI_RECOVERY_F2_PASS] Filtro 2 passou em {filtro2_time:.3f}s: {len(fibonacci_matches)} >= 1")
-            print(f"    ✓ Filtro 2: {len(fibonacci_matches)} janela(s) Fibonacci válida(s)")
+            trace.registrar("[FIBONACCI_RECOVERY_F2_PASS] Filtro 2 passou em {:.3f}s: {} >= 1", filtro2_time, len(fibonacci_matches))
+            trace.saida("    ✓ Filtro 2: {} janela(s) Fibonacci válida(s)", len(fibonacci_matches))
             
             # Filtro 3: Verificar consistência - não deve haver mais de 1 LOSS nas últimas 10 operações
             filtro3_start = time.time()
@@ -1539,27 +1567,28 @@ def analisar_estrategias_portfolio(historico):
                 ultimas_10_antes = historico[start_idx:end_idx]  # Excluir LOSS atual
                 losses_10 = ultimas_10_antes.count('D')
                 
-                logger.debug(f"[FIBONACCI_RECOVERY_F3] Últimas 10 antes da LOSS [{start_idx}:{end_idx}]: {' '.join(ultimas_10_antes)}")
-                logger.debug(f"[FIBONACCI_RECOVERY_F3] LOSSes: {losses_10}/10, critério: <=1")
+                if trace.ativo:
+                    trace.registrar("[FIBONACCI_RECOVERY_F3] Últimas 10 antes da LOSS [{}:{}]: {}", start_idx, end_idx, Adiado(' '.join, ultimas_10_antes))
+                    trace.registrar("[FIBONACCI_RECOVERY_F3] LOSSes: {}/10, critério: <=1", losses_10)
                 
                 if losses_10 > 1:
                     filtro3_time = time.time() - filtro3_start
-                    logger.debug(f"[FIBONACCI_RECOVERY_F3_REJECT] Filtro 3 rejeitado em {filtro3_time:.3f}s: {losses_10} > 1")
-                    print(f"    X Rejeitado: {losses_10} LOSSes nas últimas 10 operações (máximo 1)")
+                    trace.registrar("[FIBONACCI_RECOVERY_F3_REJECT] Filtro 3 rejeitado em {:.3f}s: {} > 1", filtro3_time, losses_10)
+                    trace.saida("    X Rejeitado: {} LOSSes nas últimas 10 operações (máximo 1)", losses_10)
                     return None
                 
                 filtro3_time = time.time() - filtro3_start
-                logger.debug(f"[FIBONACCI_RECOVERY_F3_PASS] Filtro 3 passou em {filtro3_time:.3f}s: {losses_10} <= 1")
-                print(f"    ✓ Filtro 3: {losses_10} LOSS nas últimas 10 operações")
+                trace.registrar("[FIBONACCI_RECOVERY_F3_PASS] Filtro 3 passou em {:.3f}s: {} <= 1", filtro3_time, losses_10)
+                trace.saida("    ✓ Filtro 3: {} LOSS nas últimas 10 operações", losses_10)
             
             # Selecionar a melhor janela Fibonacci
             melhor_fibonacci = max(fibonacci_matches, key=lambda x: x['win_rate'])
             
             strategy_total_time = time.time() - strategy_start_time
-            logger.debug(f"[FIBONACCI_RECOVERY_SUCCESS] Estratégia aprovada em {strategy_total_time:.3f}s")
-            logger.debug(f"[FIBONACCI_RECOVERY_RESULT] Janelas válidas: {len(fibonacci_matches)}, melhor: F{melhor_fibonacci['window_size']} ({melhor_fibonacci['win_rate']:.1f}%)")
+            trace.registrar("[FIBONACCI_RECOVERY_SUCCESS] Estratégia aprovada em {:.3f}s", strategy_total_time)
+            trace.registrar("[FIBONACCI_RECOVERY_RESULT] Janelas válidas: {}, melhor: F{} ({:.1f}%)", len(fibonacci_matches), melhor_fibonacci['window_size'], melhor_fibonacci['win_rate'])
             
-            print(f"    ✓ FIBONACCI_RECOVERY: {len(fibonacci_matches)} janelas válidas, melhor: F{melhor_fibonacci['window_size']} ({melhor_fibonacci['win_rate']:.1f}%)")
+            trace.saida("    ✓ FIBONACCI_RECOVERY: {} janelas válidas, melhor: F{} ({:.1f}%)", len(fibonacci_matches), melhor_fibonacci['window_size'], melhor_fibonacci['win_rate'])
             return {
                 'strategy': 'FIBONACCI_RECOVERY',
                 'confidence': 87.5,
@@ -1574,7 +1603,7 @@ def analisar_estrategias_portfolio(historico):
             print(f"    X Erro na FIBONACCI_RECOVERY: {e}")
         
         strategy_total_time = time.time() - strategy_start_time
-        logger.debug(f"[FIBONACCI_RECOVERY_END] Estratégia finalizada em {strategy_total_time:.3f}s (sem trigger)")
+        trace.registrar("[FIBONACCI_RECOVERY_END] Estratégia finalizada em {:.3f}s (sem trigger)", strategy_total_time)
         return None
     
     # ESTRATÉGIA 7: MOMENTUM SHIFT (87.5% confiança)
@@ -1582,12 +1611,12 @@ def analisar_estrategias_portfolio(historico):
     @strategy_exception_handler('MOMENTUM_SHIFT')
     def estrategia_momentum_shift(historico):
         strategy_start_time = time.time()
-        logger.debug("[MOMENTUM_SHIFT_START] Iniciando análise da estratégia MOMENTUM_SHIFT")
+        trace.registrar("[MOMENTUM_SHIFT_START] Iniciando análise da estratégia MOMENTUM_SHIFT")
         
         try:
             # Edge case: histórico insuficiente ou não é LOSS isolada
             if len(historico) < 20:
-                logger.debug(f"[MOMENTUM_SHIFT_EDGE] Histórico insuficiente: {len(historico)} < 20")
+                trace.registrar("[MOMENTUM_SHIFT_EDGE] Histórico insuficiente: {} < 20", len(historico))
                 return None
                 
             # Verificar LOSS isolada
@@ -1595,15 +1624,15 @@ def analisar_estrategias_portfolio(historico):
             trigger_condition2 = len(historico) < 2 or historico[1] != 'D'
             trigger_condition = trigger_condition1 and trigger_condition2
             
-            logger.debug(f"[MOMENTUM_SHIFT_TRIGGER] LOSS isolada? historico[0]={historico[0]}, historico[1]={historico[1] if len(historico) > 1 else 'N/A'}")
-            logger.debug(f"[MOMENTUM_SHIFT_TRIGGER] Condições: LOSS={trigger_condition1}, não dupla={trigger_condition2}, trigger={trigger_condition}")
+            trace.registrar("[MOMENTUM_SHIFT_TRIGGER] LOSS isolada? historico[0]={}, historico[1]={}", historico[0], historico[1] if len(historico) > 1 else 'N/A')
+            trace.registrar("[MOMENTUM_SHIFT_TRIGGER] Condições: LOSS={}, não dupla={}, trigger={}", trigger_condition1, trigger_condition2, trigger_condition)
             
             if not trigger_condition:
-                logger.debug("[MOMENTUM_SHIFT_NO_TRIGGER] Não é LOSS isolada")
+                trace.registrar("[MOMENTUM_SHIFT_NO_TRIGGER] Não é LOSS isolada")
                 return None
             
-            print("  - MOMENTUM_SHIFT: LOSS isolada detectada")
-            logger.debug("[MOMENTUM_SHIFT_DETECTED] LOSS isolada confirmada")
+            trace.saida("  - MOMENTUM_SHIFT: LOSS isolada detectada")
+            trace.registrar("[MOMENTUM_SHIFT_DETECTED] LOSS isolada confirmada")
             
             # Corrigir ordem cronológica das janelas
             # historico[0] = mais recente, historico[n] = mais antigo
@@ -1624,52 +1653,53 @@ def analisar_estrategias_portfolio(historico):
                 recent_window = historico[recent_start:recent_end]  # 7 operações recentes [-7,0]
                 old_window = historico[old_start:old_end]           # 8 operações antigas [-15,-7]
                 
-                logger.debug(f"[MOMENTUM_SHIFT_WINDOWS] Janela RECENTE (cronologicamente) [{recent_start}:{recent_end}]: {' '.join(recent_window)}")
-                logger.debug(f"[MOMENTUM_SHIFT_WINDOWS] Janela ANTIGA (cronologicamente) [{old_start}:{old_end}]: {' '.join(old_window)}")
+                if trace.ativo:
+                    trace.registrar("[MOMENTUM_SHIFT_WINDOWS] Janela RECENTE (cronologicamente) [{}:{}]: {}", recent_start, recent_end, Adiado(' '.join, recent_window))
+                    trace.registrar("[MOMENTUM_SHIFT_WINDOWS] Janela ANTIGA (cronologicamente) [{}:{}]: {}", old_start, old_end, Adiado(' '.join, old_window))
                 
                 old_wins = old_window.count('V')
                 recent_wins = recent_window.count('V')
                 old_win_rate = old_wins / len(old_window)
                 recent_win_rate = recent_wins / len(recent_window)
                 
-                print(f"    - Período ANTIGO: {old_window} - Win rate: {old_win_rate*100:.1f}%")
-                print(f"    - Período RECENTE: {recent_window} - Win rate: {recent_win_rate*100:.1f}%")
+                trace.saida("    - Período ANTIGO: {} - Win rate: {:.1f}%", old_window, old_win_rate*100)
+                trace.saida("    - Período RECENTE: {} - Win rate: {:.1f}%", recent_window, recent_win_rate*100)
                 
                 # Calcular melhoria com baseline correto
                 improvement = recent_win_rate - old_win_rate
-                logger.debug(f"[MOMENTUM_SHIFT_IMPROVEMENT] Melhoria: {recent_win_rate*100:.1f}% - {old_win_rate*100:.1f}% = {improvement*100:.1f}%")
+                trace.registrar("[MOMENTUM_SHIFT_IMPROVEMENT] Melhoria: {:.1f}% - {:.1f}% = {:.1f}%", recent_win_rate*100, old_win_rate*100, improvement*100)
                 
                 # Filtro 1: Melhoria deve ser significativa (≥20%)
                 filtro1_start = time.time()
                 if improvement < 0.20:
                     filtro1_time = time.time() - filtro1_start
-                    logger.debug(f"[MOMENTUM_SHIFT_F1_REJECT] Filtro 1 rejeitado em {filtro1_time:.3f}s: {improvement*100:.1f}% < 20%")
-                    print(f"    X Rejeitado: Melhoria {improvement*100:.1f}% < 20%")
+                    trace.registrar("[MOMENTUM_SHIFT_F1_REJECT] Filtro 1 rejeitado em {:.3f}s: {:.1f}% < 20%", filtro1_time, improvement*100)
+                    trace.saida("    X Rejeitado: Melhoria {:.1f}% < 20%", improvement*100)
                     return None
                 
                 filtro1_time = time.time() - filtro1_start
-                logger.debug(f"[MOMENTUM_SHIFT_F1_PASS] Filtro 1 passou em {filtro1_time:.3f}s: {improvement*100:.1f}% >= 20%")
-                print(f"    ✓ Filtro 1: Melhoria {improvement*100:.1f}% >= 20%")
+                trace.registrar("[MOMENTUM_SHIFT_F1_PASS] Filtro 1 passou em {:.3f}s: {:.1f}% >= 20%", filtro1_time, improvement*100)
+                trace.saida("    ✓ Filtro 1: Melhoria {:.1f}% >= 20%", improvement*100)
                 
                 # Filtro 2: Win rate recente deve ser alto (≥85%)
                 filtro2_start = time.time()
                 if recent_win_rate < 0.85:
                     filtro2_time = time.time() - filtro2_start
-                    logger.debug(f"[MOMENTUM_SHIFT_F2_REJECT] Filtro 2 rejeitado em {filtro2_time:.3f}s: {recent_win_rate*100:.1f}% < 85%")
-                    print(f"    X Rejeitado: Win rate recente {recent_win_rate*100:.1f}% < 85%")
+                    trace.registrar("[MOMENTUM_SHIFT_F2_REJECT] Filtro 2 rejeitado em {:.3f}s: {:.1f}% < 85%", filtro2_time, recent_win_rate*100)
+                    trace.saida("    X Rejeitado: Win rate recente {:.1f}% < 85%", recent_win_rate*100)
                     return None
                 
                 filtro2_time = time.time() - filtro2_start
-                logger.debug(f"[MOMENTUM_SHIFT_F2_PASS] Filtro 2 passou em {filtro2_time:.3f}s: {recent_win_rate*100:.1f}% >= 85%")
-                print(f"    ✓ Filtro 2: Win rate recente {recent_win_rate*100:.1f}% >= 85%")
+                trace.registrar("[MOMENTUM_SHIFT_F2_PASS] Filtro 2 passou em {:.3f}s: {:.1f}% >= 85%", filtro2_time, recent_win_rate*100)
+                trace.saida("    ✓ Filtro 2: Win rate recente {:.1f}% >= 85%", recent_win_rate*100)
                 
                 # Todos os filtros passaram
                 
                 strategy_total_time = time.time() - strategy_start_time
-                logger.debug(f"[MOMENTUM_SHIFT_SUCCESS] Estratégia aprovada em {strategy_total_time:.3f}s")
-                logger.debug(f"[MOMENTUM_SHIFT_RESULT] Melhoria: {improvement*100:.1f}% (de {old_win_rate*100:.1f}% para {recent_win_rate*100:.1f}%)")
+                trace.registrar("[MOMENTUM_SHIFT_SUCCESS] Estratégia aprovada em {:.3f}s", strategy_total_time)
+                trace.registrar("[MOMENTUM_SHIFT_RESULT] Melhoria: {:.1f}% (de {:.1f}% para {:.1f}%)", improvement*100, old_win_rate*100, recent_win_rate*100)
                 
-                print(f"    OK MOMENTUM_SHIFT: Melhoria {improvement*100:.1f}% (de {old_win_rate*100:.1f}% para {recent_win_rate*100:.1f}%)")
+                trace.saida("    OK MOMENTUM_SHIFT: Melhoria {:.1f}% (de {:.1f}% para {:.1f}%)", improvement*100, old_win_rate*100, recent_win_rate*100)
                 return {
                     'strategy': 'MOMENTUM_SHIFT',
                     'confidence': 87.5,
@@ -1678,8 +1708,8 @@ def analisar_estrategias_portfolio(historico):
                     'recent_win_rate': round(recent_win_rate * 100, 1)
                 }
             
-            logger.debug("[MOMENTUM_SHIFT_INSUFFICIENT] Histórico insuficiente para análise de momentum")
-            print("    X Rejeitado: Histórico insuficiente para análise de momentum")
+            trace.registrar("[MOMENTUM_SHIFT_INSUFFICIENT] Histórico insuficiente para análise de momentum")
+            trace.saida("    X Rejeitado: Histórico insuficiente para análise de momentum")
             return None
         except Exception as e:
             strategy_error_time = time.time() - strategy_start_time
@@ -1687,7 +1717,7 @@ def analisar_estrategias_portfolio(historico):
             print(f"    X Erro na MOMENTUM_SHIFT: {e}")
         
         strategy_total_time = time.time() - strategy_start_time
-        logger.debug(f"[MOMENTUM_SHIFT_END] Estratégia finalizada em {strategy_total_time:.3f}s (sem trigger)")
+        trace.registrar("[MOMENTUM_SHIFT_END] Estratégia finalizada em {:.3f}s (sem trigger)", strategy_total_time)
         return None
     
     # ESTRATÉGIA 8: STABILITY BREAK (88.7% confiança)
@@ -1697,30 +1727,30 @@ def analisar_estrategias_portfolio(historico):
     @strategy_exception_handler('STABILITY_BREAK')
     def estrategia_stability_break(historico):
         strategy_start_time = time.time()
-        logger.debug("[STABILITY_BREAK_START] Iniciando análise da estratégia STABILITY_BREAK")
+        trace.registrar("[STABILITY_BREAK_START] Iniciando análise da estratégia STABILITY_BREAK")
         
         try:
             # Edge case: histórico insuficiente
             if len(historico) < 16:  # Precisa de pelo menos 16 operações (1 atual + 15 anteriores)
-                logger.debug(f"[STABILITY_BREAK_EDGE] Histórico insuficiente: {len(historico)} < 16")
+                trace.registrar("[STABILITY_BREAK_EDGE] Histórico insuficiente: {} < 16", len(historico))
                 return None
                 
             # TRIGGER OBRIGATÓRIO: LOSS isolada
             trigger_condition = historico[0] == 'D' and historico[1] != 'D'
             
-            logger.debug(f"[STABILITY_BREAK_TRIGGER] LOSS isolada? historico[0]={historico[0]}, historico[1]={historico[1]}")
-            logger.debug(f"[STABILITY_BREAK_TRIGGER] Trigger condition: {trigger_condition}")
+            trace.registrar("[STABILITY_BREAK_TRIGGER] LOSS isolada? historico[0]={}, historico[1]={}", historico[0], historico[1])
+            trace.registrar("[STABILITY_BREAK_TRIGGER] Trigger condition: {}", trigger_condition)
             
             if not trigger_condition:
-                logger.debug("[STABILITY_BREAK_NO_TRIGGER] Não é LOSS isolada")
+                trace.registrar("[STABILITY_BREAK_NO_TRIGGER] Não é LOSS isolada")
                 return None
             
-            print("  - STABILITY_BREAK: LOSS isolada detectada")
-            logger.debug("[STABILITY_BREAK_DETECTED] LOSS isolada confirmada")
+            trace.saida("  - STABILITY_BREAK: LOSS isolada detectada")
+            trace.registrar("[STABILITY_BREAK_DETECTED] LOSS isolada confirmada")
             
             # FILTRO DE ESTABILIDADE: Máximo 1 LOSS nas últimas 15 operações (antes da LOSS atual)
             filter1_start_time = time.time()
-            logger.debug("[STABILITY_BREAK_FILTER1_START] Verificando filtro de estabilidade")
+            trace.registrar("[STABILITY_BREAK_FILTER1_START] Verificando filtro de estabilidade")
             
             # Validar bounds para as últimas 15 operações antes da LOSS atual
             if not validar_bounds_array(historico, 1, 16, "STABILITY_BREAK_stability_filter"):
@@ -1729,24 +1759,24 @@ def analisar_estrategias_portfolio(historico):
             ultimas_15 = historico[1:16]  # Operações 1-15 (excluindo a LOSS atual na posição 0)
             losses_in_15 = ultimas_15.count('D')
             
-            logger.debug(f"[STABILITY_BREAK_FILTER1_CALC] Últimas 15 operações: {ultimas_15}")
-            logger.debug(f"[STABILITY_BREAK_FILTER1_CALC] LOSSes encontradas: {losses_in_15}")
+            trace.registrar("[STABILITY_BREAK_FILTER1_CALC] Últimas 15 operações: {}", ultimas_15)
+            trace.registrar("[STABILITY_BREAK_FILTER1_CALC] LOSSes encontradas: {}", losses_in_15)
             
-            print(f"    - Filtro de estabilidade: {losses_in_15} LOSSes nas últimas 15 operações")
+            trace.saida("    - Filtro de estabilidade: {} LOSSes nas últimas 15 operações", losses_in_15)
             
             if losses_in_15 > 1:
                 filter1_fail_time = time.time() - filter1_start_time
-                logger.debug(f"[STABILITY_BREAK_FILTER1_FAIL] Filtro 1 falhou em {filter1_fail_time:.3f}s: {losses_in_15} LOSSes > 1")
-                print(f"    X Rejeitado: {losses_in_15} LOSSes nas últimas 15 operações (máximo 1)")
+                trace.registrar("[STABILITY_BREAK_FILTER1_FAIL] Filtro 1 falhou em {:.3f}s: {} LOSSes > 1", filter1_fail_time, losses_in_15)
+                trace.saida("    X Rejeitado: {} LOSSes nas últimas 15 operações (máximo 1)", losses_in_15)
                 return None
             
             filter1_pass_time = time.time() - filter1_start_time
-            logger.debug(f"[STABILITY_BREAK_FILTER1_PASS] Filtro 1 passou em {filter1_pass_time:.3f}s")
-            print(f"    ✓ Filtro de estabilidade: {losses_in_15} LOSS nas últimas 15 operações")
+            trace.registrar("[STABILITY_BREAK_FILTER1_PASS] Filtro 1 passou em {:.3f}s", filter1_pass_time)
+            trace.saida("    ✓ Filtro de estabilidade: {} LOSS nas últimas 15 operações", losses_in_15)
             
             # FILTRO DE QUALIDADE: Últimas 5 operações antes da LOSS devem ter pelo menos 4 WINs
             filter2_start_time = time.time()
-            logger.debug("[STABILITY_BREAK_FILTER2_START] Verificando filtro de qualidade")
+            trace.registrar("[STABILITY_BREAK_FILTER2_START] Verificando filtro de qualidade")
             
             # Validar bounds para as últimas 5 operações antes da LOSS atual
             if not validar_bounds_array(historico, 1, 6, "STABILITY_BREAK_quality_filter"):
@@ -1755,24 +1785,24 @@ def analisar_estrategias_portfolio(historico):
             ultimas_5 = historico[1:6]  # Operações 1-5 (excluindo a LOSS atual na posição 0)
             wins_in_5 = ultimas_5.count('V')
             
-            logger.debug(f"[STABILITY_BREAK_FILTER2_CALC] Últimas 5 operações: {ultimas_5}")
-            logger.debug(f"[STABILITY_BREAK_FILTER2_CALC] WINs encontrados: {wins_in_5}")
+            trace.registrar("[STABILITY_BREAK_FILTER2_CALC] Últimas 5 operações: {}", ultimas_5)
+            trace.registrar("[STABILITY_BREAK_FILTER2_CALC] WINs encontrados: {}", wins_in_5)
             
-            print(f"    - Filtro de qualidade: {wins_in_5} WINs nas últimas 5 operações")
+            trace.saida("    - Filtro de qualidade: {} WINs nas últimas 5 operações", wins_in_5)
             
             if wins_in_5 < 4:
                 filter2_fail_time = time.time() - filter2_start_time
-                logger.debug(f"[STABILITY_BREAK_FILTER2_FAIL] Filtro 2 falhou em {filter2_fail_time:.3f}s: {wins_in_5} WINs < 4")
-                print(f"    X Rejeitado: {wins_in_5} WINs nas últimas 5 operações (mínimo 4)")
+                trace.registrar("[STABILITY_BREAK_FILTER2_FAIL] Filtro 2 falhou em {:.3f}s: {} WINs < 4", filter2_fail_time, wins_in_5)
+                trace.saida("    X Rejeitado: {} WINs nas últimas 5 operações (mínimo 4)", wins_in_5)
                 return None
             
             filter2_pass_time = time.time() - filter2_start_time
-            logger.debug(f"[STABILITY_BREAK_FILTER2_PASS] Filtro 2 passou em {filter2_pass_time:.3f}s")
-            print(f"    ✓ Filtro de qualidade: {wins_in_5} WINs nas últimas 5 operações")
+            trace.registrar("[STABILITY_BREAK_FILTER2_PASS] Filtro 2 passou em {:.3f}s", filter2_pass_time)
+            trace.saida("    ✓ Filtro de qualidade: {} WINs nas últimas 5 operações", wins_in_5)
             
             strategy_total_time = time.time() - strategy_start_time
-            logger.debug(f"[STABILITY_BREAK_SUCCESS] Estratégia aprovada em {strategy_total_time:.3f}s")
-            print(f"    ✓ STABILITY_BREAK: Estabilidade ({losses_in_15}/15 LOSSes) + Qualidade ({wins_in_5}/5 WINs)")
+            trace.registrar("[STABILITY_BREAK_SUCCESS] Estratégia aprovada em {:.3f}s", strategy_total_time)
+            trace.saida("    ✓ STABILITY_BREAK: Estabilidade ({}/15 LOSSes) + Qualidade ({}/5 WINs)", losses_in_15, wins_in_5)
             
             return {
                 'strategy': 'STABILITY_BREAK',
@@ -1789,7 +1819,7 @@ def analisar_estrategias_portfolio(historico):
             print(f"    X Erro na STABILITY_BREAK: {e}")
         
         strategy_total_time = time.time() - strategy_start_time
-        logger.debug(f"[STABILITY_BREAK_END] Estratégia finalizada em {strategy_total_time:.3f}s (sem trigger)")
+        trace.registrar("[STABILITY_BREAK_END] Estratégia finalizada em {:.3f}s (sem trigger)", strategy_total_time)
         return None
     
     # Executar todas as estratégias (5 originais + 3 avançadas) com medição de tempo
@@ -1831,10 +1861,10 @@ def analisar_estrategias_portfolio(historico):
             
             if resultado:
                 strategy_metrics[strategy_name].successful_triggers += 1
-                logger.debug(f"[{strategy_name}_SUCCESS] Estratégia ativada com confiança {resultado.get('confidence', 0)}%")
+                trace.registrar("[{}_SUCCESS] Estratégia ativada com confiança {}%", strategy_name, resultado.get('confidence', 0))
             else:
                 strategy_metrics[strategy_name].failed_triggers += 1
-                logger.debug(f"[{strategy_name}_REJECT] Estratégia rejeitada")
+                trace.registrar("[{}_REJECT] Estratégia rejeitada", strategy_name)
             
             estrategias.append(resultado)
             
@@ -1879,7 +1909,7 @@ def analisar_estrategias_portfolio(historico):
     # Retornar estratégia com maior confiança
     if estrategias_resultado:
         melhor = max(estrategias_resultado, key=lambda x: x['confidence'])
-        print(f"* Estratégia selecionada: {melhor['strategy']} ({melhor['confidence']}%)")
+        trace.saida("* Estratégia selecionada: {} ({}%)", melhor['strategy'], melhor['confidence'])
         
         # Preparar dados completos da estratégia
         melhor_estrategia = {
@@ -1894,7 +1924,7 @@ def analisar_estrategias_portfolio(historico):
         # Salvar estratégia como persistente
         estrategia_ativa_persistente = melhor_estrategia
         timestamp_estrategia_detectada = time.time()
-        logger.debug(f"[PERSISTENCE_SAVED] Estratégia salva como persistente: {melhor['strategy']} ({melhor['confidence']}%) em {timestamp_estrategia_detectada}")
+        trace.registrar("[PERSISTENCE_SAVED] Estratégia salva como persistente: {} ({}%) em {}", melhor['strategy'], melhor['confidence'], timestamp_estrategia_detectada)
         
         return {
             'should_operate': True,
@@ -1908,14 +1938,14 @@ def analisar_estrategias_portfolio(historico):
     if estrategia_ativa_persistente is not None:
         # ÚNICA condição de reset permitida
         if operations_after_pattern_global >= 2:
-            logger.debug(f"[PERSISTENCE_RESET_FINAL] Reset autorizado após {operations_after_pattern_global} operações")
+            trace.registrar("[PERSISTENCE_RESET_FINAL] Reset autorizado após {} operações", operations_after_pattern_global)
             estrategia_ativa_persistente = None
             timestamp_estrategia_detectada = None
             operations_after_pattern_global = 0
             estrategia_travada_ate_operacoes = False
         else:
             # FORÇAR manutenção da estratégia
-            logger.debug(f"[PERSISTENCE_FORCED] Forçando manutenção - {operations_after_pattern_global}/2 operações")
+            trace.registrar("[PERSISTENCE_FORCED] Forçando manutenção - {}/2 operações", operations_after_pattern_global)
             return {
                 'should_operate': True,
                 'reason': f"Patron Encontrado, Activar Bot Ahora! - {estrategia_ativa_persistente['strategy']} ({estrategia_ativa_persistente['confidence']}%)",
@@ -2093,6 +2123,23 @@ def analisar_e_enviar_sinal(supabase):
         enviar_sinal_para_supabase(supabase, False, reason)
         return
     
+    # Passo 1.1: Sem padrão ativo e sem estratégia persistente, a decisão só depende do histórico
+    impressao = None
+    padrao_ativo = bool(ultimo_sinal and ultimo_sinal.get('pattern_found_at') is not None
+                        and ultimo_sinal.get('is_safe_to_operate'))
+    if not padrao_ativo and estrategia_ativa_persistente is None:
+        impressao = memo_analise.impressao(
+            ultimo_id_operacao, len(historico),
+            bool(ultimo_sinal and ultimo_sinal.get('is_safe_to_operate')),
+            ultimo_sinal.get('pattern_found_at') if ultimo_sinal else None,
+            operations_after_pattern_global
+        )
+        decisao_memorizada = memo_analise.consultar(impressao)
+        memo_analise.registrar_resumo(logger)
+        if decisao_memorizada is not None:
+            trace.saida("* Historico inalterado - decisao memorizada: {}", decisao_memorizada[1])
+            return decisao_memorizada
+    
     # Passo 2: Verificar se ja temos um padrao ativo e contar operacoes
     pattern_found_at = None
     operations_after_pattern = 0
@@ -2148,7 +2195,9 @@ def analisar_e_enviar_sinal(supabase):
         print(f"* Modo compatibilidade: Controle de operacoes nao disponivel")
     
     # Passo 3: Aplicar filtros e analise
+    inicio_analise = time.perf_counter()
     resultado_estrategias = analisar_estrategias_portfolio(historico)
+    duracao_analise = time.perf_counter() - inicio_analise
     is_safe_to_operate = resultado_estrategias['should_operate']
     reason = resultado_estrategias['reason']
     
@@ -2178,6 +2227,10 @@ def analisar_e_enviar_sinal(supabase):
     # Passo 5: Enviar resultado com informações das estratégias
     sucesso = enviar_sinal_para_supabase(supabase, is_safe_to_operate, reason, pattern_found_at, operations_after_pattern, historico, strategy_info)
     
+    # Memorizar apenas decisões WAIT já gravadas; um sinal sempre altera o estado persistente
+    if sucesso and not is_safe_to_operate and estrategia_ativa_persistente is None:
+        memo_analise.armazenar(impressao, (is_safe_to_operate, reason), duracao_analise)
+    
     # Log final
     status_icon = "OK" if is_safe_to_operate else "WAIT"
     print(f"\n[{status_icon}] RESULTADO FINAL: {'SAFE TO OPERATE' if is_safe_to_operate else 'WAIT'}")
@@ -2558,6 +2611,12 @@ def main():
             print("\n🛑 Execução interrompida pelo usuário.")
             return
     
+    # Endpoint opcional do rastro (RADAR_TRACE_PORTA)
+    try:
+        iniciar_servidor_trace(trace)
+    except OSError as e:
+        print(f"! Endpoint /trace indisponivel: {e}")
+    
     # Loop infinito
     ciclo = 0
     try:
@@ -2571,6 +2630,7 @@ def main():
                 
             except Exception as e:
                 print(f"X Erro no ciclo de analise: {e}")
+                trace.descarregar(f"erro no ciclo {ciclo}")
             
             # Aguardar proximo ciclo
             print(f"\n... Aguardando {ANALISE_INTERVALO}s para proxima analise...")
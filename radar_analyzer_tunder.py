@@ -7,13 +7,22 @@ Baseado no radar_analyzer.py original, adaptado para o Tunder Bot
 
 import os
 import time
+import logging
 from datetime import datetime
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
+from radar_trace import Adiado, criar_trace, iniciar_servidor_trace
+
 # Carregar variaveis de ambiente
 load_dotenv()
 
+logger = logging.getLogger('radar_analyzer_tunder')
+
+# Rastro preguiçoso da análise (mesmo esquema do radar_analyzer): as linhas de
+# console do ciclo vão para o buffer e só são impressas com o logger em DEBUG
+trace = criar_trace('radar_analyzer_tunder', logger)
+
 # Configuracoes especificas para Tunder Bot
 BOT_NAME = 'Tunder Bot'
 TABELA_LOGS = 'tunder_bot_logs'
@@ -44,7 +53,7 @@ def buscar_operacoes_historico(supabase):
     Retorna lista de resultados ['V', 'D', 'V', ...] onde V=vitoria, D=derrota
     """
     try:
-        print(f"* Buscando ultimas {OPERACOES_HISTORICO} operacoes do Tunder Bot...")
+        trace.saida("* Buscando ultimas {} operacoes do Tunder Bot...", OPERACOES_HISTORICO)
         
         response = supabase.table(TABELA_LOGS) \
             .select('profit_percentage, created_at') \
@@ -53,7 +62,7 @@ def buscar_operacoes_historico(supabase):
             .execute()
         
         if not response.data:
-            print("! Nenhuma operacao encontrada na base de dados do Tunder Bot")
+            logger.warning("! Nenhuma operacao encontrada na base de dados do Tunder Bot")
             return [], []
         
         # Converter profit_percentage em V/D e manter timestamps
@@ -65,11 +74,13 @@ def buscar_operacoes_historico(supabase):
             historico.append(resultado)
             timestamps.append(operacao.get('created_at'))
         
-        print(f"* Historico Tunder Bot encontrado ({len(historico)} operacoes): {' '.join(historico[:10])}{'...' if len(historico) > 10 else ''}")
+        if trace.ativo:
+            trace.saida("* Historico Tunder Bot encontrado ({} operacoes): {}{}", len(historico),
+                        Adiado(' '.join, historico[:10]), '...' if len(historico) > 10 else '')
         return historico, timestamps
         
     except Exception as e:
-        print(f"X Erro ao buscar operacoes do Tunder Bot: {e}")
+        logger.error(f"X Erro ao buscar operacoes do Tunder Bot: {e}")
         return [], []
 
 def analisar_padroes(historico):
@@ -82,77 +93,78 @@ def analisar_padroes(historico):
     # Verificacao 1: Dados suficientes
     if len(historico) < OPERACOES_MINIMAS:
         reason = "Aguardando dados suficientes do Tunder Bot..."
-        print(f"... {reason} (Temos {len(historico)}/{OPERACOES_MINIMAS} operacoes)")
+        trace.saida("... {} (Temos {}/{} operacoes)", reason, len(historico), OPERACOES_MINIMAS)
         return False, reason
     
     # Pegar ultimas 20 operacoes para analise
     ultimas_20 = historico[:20]
     derrotas_ultimas_20 = ultimas_20.count('D')
     
-    print(f"* Analise Tunder Bot das ultimas 20 operacoes: {derrotas_ultimas_20} derrotas")
+    trace.saida("* Analise Tunder Bot das ultimas 20 operacoes: {} derrotas", derrotas_ultimas_20)
     
     # Verificacao 2: Filtro de Mercado Instavel (mais conservador para Tunder Bot)
     if derrotas_ultimas_20 > 2:  # Mais restritivo que o accumulator (era 3)
         reason = "Tunder Bot: Mercado Instavel, Volte daqui uns minutos."
-        print(f"X {reason} ({derrotas_ultimas_20} derrotas > 2)")
+        trace.saida("X {} ({} derrotas > 2)", reason, derrotas_ultimas_20)
         return False, reason
     
     # Verificacao 3: Filtro de Espera
     if derrotas_ultimas_20 > 1:  # Mais conservador (era 2)
         reason = "Tunder Bot: Esperando o Padrao. Nao ligar ainda."
-        print(f"- {reason} ({derrotas_ultimas_20} derrotas > 1)")
+        trace.saida("- {} ({} derrotas > 1)", reason, derrotas_ultimas_20)
         return False, reason
     
     # Verificacao 4: Gatilho V-D-V (mesmo padrao)
     if len(historico) < 3:
         reason = "Tunder Bot: Esperando o Padrao. Nao ligar ainda."
-        print(f"- {reason} (Historico insuficiente para padrao V-D-V)")
+        trace.saida("- {} (Historico insuficiente para padrao V-D-V)", reason)
         return False, reason
     
     # Padrao V-D-V: [0]=mais recente, [1]=anterior, [2]=anterior ao anterior
     padrao_vdv = historico[0] == 'V' and historico[1] == 'D' and historico[2] == 'V'
-    print(f"* Verificacao padrao V-D-V Tunder Bot: {historico[0]}-{historico[1]}-{historico[2]} = {'OK' if padrao_vdv else 'NAO'}")
+    trace.saida("* Verificacao padrao V-D-V Tunder Bot: {}-{}-{} = {}", historico[0], historico[1], historico[2],
+                'OK' if padrao_vdv else 'NAO')
     
     if not padrao_vdv:
         reason = "Tunder Bot: Esperando o Padrao. Nao ligar ainda."
-        print(f"- {reason} (Padrao V-D-V nao encontrado)")
+        trace.saida("- {} (Padrao V-D-V nao encontrado)", reason)
         return False, reason
     
-    print("OK - Gatilho V-D-V encontrado no Tunder Bot! Aplicando filtros adicionais...")
+    trace.saida("OK - Gatilho V-D-V encontrado no Tunder Bot! Aplicando filtros adicionais...")
     
     # Verificacao 5: Filtro 1 (Condicao Geral) - 10 operacoes anteriores ao padrao
     if len(historico) < 13:  # Precisamos de pelo menos 13 para ter 10 anteriores
         reason = "Tunder Bot: Gatilho Encontrado, mas Condicao Geral Fraca"
-        print(f"! {reason} (Historico insuficiente para Filtro 1)")
+        trace.saida("! {} (Historico insuficiente para Filtro 1)", reason)
         return False, reason
     
     operacoes_anteriores_10 = historico[3:13]  # indices 3 a 12
     derrotas_anteriores_10 = operacoes_anteriores_10.count('D')
-    print(f"* Filtro 1 Tunder Bot (Condicao Geral): {derrotas_anteriores_10} derrotas nas 10 operacoes anteriores")
+    trace.saida("* Filtro 1 Tunder Bot (Condicao Geral): {} derrotas nas 10 operacoes anteriores", derrotas_anteriores_10)
     
     if derrotas_anteriores_10 > 1:  # Mais conservador (era 2)
         reason = "Tunder Bot: Gatilho Encontrado, mas Condicao Geral Fraca"
-        print(f"! {reason} ({derrotas_anteriores_10} derrotas > 1)")
+        trace.saida("! {} ({} derrotas > 1)", reason, derrotas_anteriores_10)
         return False, reason
     
     # Verificacao 6: Filtro 2 (Condicao Imediata) - 5 operacoes anteriores ao padrao
     if len(historico) < 8:  # Precisamos de pelo menos 8 para ter 5 anteriores
         reason = "Tunder Bot: Gatilho Encontrado, mas Condicao Imediata Fraca"
-        print(f"! {reason} (Historico insuficiente para Filtro 2)")
+        trace.saida("! {} (Historico insuficiente para Filtro 2)", reason)
         return False, reason
     
     operacoes_anteriores_5 = historico[3:8]  # indices 3 a 7
     vitorias_anteriores_5 = operacoes_anteriores_5.count('V')
-    print(f"* Filtro 2 Tunder Bot (Condicao Imediata): {vitorias_anteriores_5} vitorias nas 5 operacoes anteriores")
+    trace.saida("* Filtro 2 Tunder Bot (Condicao Imediata): {} vitorias nas 5 operacoes anteriores", vitorias_anteriores_5)
     
     if vitorias_anteriores_5 < 4:  # Mais exigente (era 3)
         reason = "Tunder Bot: Gatilho Encontrado, mas Condicao Imediata Fraca"
-        print(f"! {reason} ({vitorias_anteriores_5} vitorias < 4)")
+        trace.saida("! {} ({} vitorias < 4)", reason, vitorias_anteriores_5)
         return False, reason
     
     # Todas as verificacoes aprovadas
     reason = "Tunder Bot: Patron Encontrado, Activar Bot Ahora!"
-    print(f"OK - {reason} - Todas as condicoes foram atendidas!")
+    trace.saida("OK - {} - Todas as condicoes foram atendidas!", reason)
     return True, reason
 
 def buscar_ultimo_sinal(supabase):
@@ -182,7 +194,7 @@ def buscar_ultimo_sinal(supabase):
         return None
         
     except Exception as e:
-        print(f"X Erro ao buscar ultimo sinal do Tunder Bot: {e}")
+        logger.error(f"X Erro ao buscar ultimo sinal do Tunder Bot: {e}")
         return None
 
 def contar_operacoes_apos_padrao(supabase, pattern_found_at):
@@ -201,7 +213,7 @@ def contar_operacoes_apos_padrao(supabase, pattern_found_at):
         return len(response.data) if response.data else 0
         
     except Exception as e:
-        print(f"X Erro ao contar operacoes apos padrao do Tunder Bot: {e}")
+        logger.error(f"X Erro ao contar operacoes apos padrao do Tunder Bot: {e}")
         return 0
 
 def calcular_estatisticas_bot(supabase, historico):
@@ -226,7 +238,7 @@ def calcular_estatisticas_bot(supabase, historico):
         return losses_10, wins_5, accuracy
         
     except Exception as e:
-        print(f"Erro ao calcular estatísticas: {e}")
+        logger.error(f"Erro ao calcular estatísticas: {e}")
         return 0, 0, 0.0
 
 def enviar_sinal_para_supabase(supabase, is_safe_to_operate, reason, pattern_found_at=None, operations_after_pattern=0, historico=None):
@@ -255,21 +267,24 @@ def enviar_sinal_para_supabase(supabase, is_safe_to_operate, reason, pattern_fou
         response = supabase.table('radar_de_apalancamiento_signals').upsert(data, on_conflict='bot_name').execute()
         
         if response.data:
-            print(f"✓ Sinal Tunder Bot enviado - Losses(10): {losses_10}, Wins(5): {wins_5}, Accuracy: {accuracy}%")
+            trace.saida("✓ Sinal Tunder Bot enviado - Losses(10): {}, Wins(5): {}, Accuracy: {}%", losses_10, wins_5, accuracy)
             return True
         return False
             
     except Exception as e:
-        print(f"X Erro ao enviar sinal Tunder Bot: {e}")
+        logger.error(f"X Erro ao enviar sinal Tunder Bot: {e}")
         return False
 
+def _agora(formato: str) -> str:
+    return datetime.now().strftime(formato)
+
 def analisar_e_enviar_sinal(supabase):
     """
     Funcao principal de analise que executa todo o processo para o Tunder Bot
     """
-    print(f"\n{'='*60}")
-    print(f">> INICIANDO ANALISE TUNDER BOT - {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
-    print(f"{'='*60}")
+    if trace.ativo:
+        trace.saida("\n{}\n>> INICIANDO ANALISE TUNDER BOT - {}\n{}", '=' * 60,
+                    Adiado(_agora, '%d/%m/%Y %H:%M:%S'), '=' * 60)
     
     # Passo 0: Verificar estado atual do controle de operacoes
     ultimo_sinal = buscar_ultimo_sinal(supabase)
@@ -294,23 +309,21 @@ def analisar_e_enviar_sinal(supabase):
             pattern_found_at = ultimo_sinal.get('pattern_found_at')
             operations_after_pattern = contar_operacoes_apos_padrao(supabase, pattern_found_at)
             
-            print(f"* Padrao Tunder Bot ativo desde: {pattern_found_at}")
-            print(f"* Operacoes Tunder Bot apos padrao: {operations_after_pattern}")
+            trace.saida("* Padrao Tunder Bot ativo desde: {}", pattern_found_at)
+            trace.saida("* Operacoes Tunder Bot apos padrao: {}", operations_after_pattern)
             
             # Verificar se deve desligar apos 3 operacoes
             if operations_after_pattern >= 3:
                 reason = "Tunder Bot: Bot Desligado - 3 operacoes completadas apos o padrao"
-                print(f"! {reason}")
                 sucesso = enviar_sinal_para_supabase(supabase, False, reason, pattern_found_at, operations_after_pattern)
                 
-                # Log final
-                print(f"\n[STOP] RESULTADO FINAL TUNDER BOT: BOT DESLIGADO AUTOMATICAMENTE")
-                print(f"* Motivo: {reason}")
-                print(f"* Status do envio: {'Enviado' if sucesso else 'Falhou'}")
+                # Resultado do ciclo: sempre no log, mesmo em modo silencioso
+                logger.info(f"[STOP] RESULTADO FINAL TUNDER BOT: BOT DESLIGADO AUTOMATICAMENTE - {reason} "
+                            f"(envio: {'Enviado' if sucesso else 'Falhou'})")
                 return False, reason
     else:
         # Modo compatibilidade - sem controle de operacoes
-        print(f"* Modo compatibilidade Tunder Bot: Controle de operacoes nao disponivel")
+        trace.saida("* Modo compatibilidade Tunder Bot: Controle de operacoes nao disponivel")
     
     # Passo 3: Aplicar filtros e analise
     is_safe_to_operate, reason = analisar_padroes(historico)
@@ -319,7 +332,7 @@ def analisar_e_enviar_sinal(supabase):
     if is_safe_to_operate and "Patron Encontrado" in reason:
         pattern_found_at = datetime.now().isoformat()
         operations_after_pattern = 0
-        print(f"* Novo padrao Tunder Bot encontrado! Timestamp: {pattern_found_at}")
+        trace.saida("* Novo padrao Tunder Bot encontrado! Timestamp: {}", pattern_found_at)
     elif ultimo_sinal and ultimo_sinal.get('pattern_found_at') and ultimo_sinal.get('is_safe_to_operate'):
         # Manter dados do padrao anterior se ainda ativo
         pattern_found_at = ultimo_sinal.get('pattern_found_at')
@@ -327,12 +340,10 @@ def analisar_e_enviar_sinal(supabase):
     # Passo 5: Enviar resultado
     sucesso = enviar_sinal_para_supabase(supabase, is_safe_to_operate, reason, pattern_found_at, operations_after_pattern, historico)
     
-    # Log final
+    # Resultado do ciclo: sempre no log, mesmo em modo silencioso
     status_icon = "OK" if is_safe_to_operate else "WAIT"
-    print(f"\n[{status_icon}] RESULTADO FINAL TUNDER BOT: {'SAFE TO OPERATE' if is_safe_to_operate else 'WAIT'}")
-    print(f"* Motivo: {reason}")
-    print(f"* Operacoes apos padrao: {operations_after_pattern}/3")
-    print(f"* Status do envio: {'Enviado' if sucesso else 'Falhou'}")
+    logger.info(f"[{status_icon}] RESULTADO FINAL TUNDER BOT: {'SAFE TO OPERATE' if is_safe_to_operate else 'WAIT'} - "
+                f"{reason} (operacoes apos padrao: {operations_after_pattern}/3, envio: {'Enviado' if sucesso else 'Falhou'})")
     
     return is_safe_to_operate, reason
 
@@ -340,6 +351,12 @@ def main():
     """
     Loop principal do radar analyzer para Tunder Bot
     """
+    # DEBUG ecoa as linhas da análise no console (como os prints antigos); RADAR_TRACE=quiet as desliga
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+    for biblioteca in ('httpx', 'httpcore', 'supabase', 'postgrest', 'urllib3'):
+        logging.getLogger(biblioteca).setLevel(logging.WARNING)
+    iniciar_servidor_trace(trace)
+    
     print("\n" + "="*70)
     print("RADAR ANALYZER TUNDER - Monitor de Estrategias de Trading")
     print("="*70)
@@ -362,17 +379,18 @@ def main():
     try:
         while True:
             ciclo += 1
-            print(f"\n>> CICLO TUNDER BOT {ciclo} - {datetime.now().strftime('%H:%M:%S')}")
+            if trace.ativo:
+                trace.saida("\n>> CICLO TUNDER BOT {} - {}", ciclo, Adiado(_agora, '%H:%M:%S'))
             
             try:
                 # Executar analise
                 analisar_e_enviar_sinal(supabase)
                 
             except Exception as e:
-                print(f"X Erro no ciclo de analise Tunder Bot: {e}")
+                logger.error(f"X Erro no ciclo de analise Tunder Bot: {e}")
             
             # Aguardar proximo ciclo
-            print(f"\n... Aguardando {ANALISE_INTERVALO}s para proxima analise Tunder Bot...")
+            trace.saida("\n... Aguardando {}s para proxima analise Tunder Bot...", ANALISE_INTERVALO)
             time.sleep(ANALISE_INTERVALO)
             
     except KeyboardInterrupt:
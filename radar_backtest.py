@@ -0,0 +1,729 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Radar Backtest - Motor de backtest histórico para as estratégias dos radares
+
+Reproduz, sobre uma tabela de logs exportada (CSV ou Parquet), as decisões que
+os radares tomariam operação a operação:
+
+- analisar_estrategias_portfolio (radar_analyzer.py) - 8 estratégias
+- analisar_precision_surge_CORRIGIDO (radar_analisis_scalping_bot.py)
+- analisar_max_frequency_filter (radar_scalping_double.py)
+- analisar_estrategia_momentum_calmo (radartunder3.5.py)
+
+Cada estratégia é reescrita como um kernel vetorizado em NumPy sobre somas
+acumuladas do histórico (1 = WIN, 0 = LOSS), o que permite avaliar milhões de
+operações por segundo. A trava de persistência (2 operações ou timeout de
+300 s) é simulada de forma sequencial apenas nos pontos em que algum kernel
+disparou.
+
+Uso:
+    python radar_backtest.py logs.csv --estrategia PORTFOLIO_8
+    python radar_backtest.py logs.parquet --todas
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Configurações padrão (espelham os radares em produção)
+OPERACOES_HISTORICO = 30  # operações buscadas no histórico por ciclo
+OPERACOES_MINIMAS = 20  # operações mínimas para o portfólio analisar
+PERSISTENCIA_OPERACOES = 2  # operações até liberar a trava
+PERSISTENCIA_TIMEOUT = 300  # segundos até a trava expirar
+TAMANHO_BLOCO = 1_000_000  # linhas lidas por bloco do arquivo
+
+# ===== CONTEXTO VETORIZADO =====
+
+class JanelaContexto:
+    """
+    Visão vetorizada do histórico de cada operação avaliada.
+
+    Para a operação de índice cronológico ``i``, ``historico[k]`` (como usado nos
+    radares, 0 = mais recente) corresponde a ``resultados[i - k]``. Todos os
+    métodos retornam arrays alinhados às operações avaliadas.
+    """
+
+    def __init__(self, resultados: np.ndarray, lucros: np.ndarray, timestamps: np.ndarray,
+                 inicio: int, fim: int, janela: int):
+        self.resultados = resultados
+        self.lucros = lucros
+        self.timestamps = timestamps
+        self.inicio = inicio
+        self.fim = fim
+        self.janela = janela
+        self._acumulados: Dict[int, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return self.fim - self.inicio
+
+    def _acumulado(self, serie: np.ndarray) -> np.ndarray:
+        chave = id(serie)
+        cache = self._acumulados.get(chave)
+        if cache is None or cache[0] is not serie:
+            acumulado = np.zeros(len(serie) + 1, dtype=np.int64)
+            np.cumsum(serie, out=acumulado[1:])
+            cache = (serie, acumulado)
+            self._acumulados[chave] = cache
+        return cache[1]
+
+    def posicao(self, k: int, serie: Optional[np.ndarray] = None) -> np.ndarray:
+        """Valor de ``historico[k]`` para cada operação avaliada."""
+        serie = self.resultados if serie is None else serie
+        return serie[self.inicio - k:self.fim - k]
+
+    def contar(self, a: int, b: int, serie: Optional[np.ndarray] = None) -> np.ndarray:
+        """Soma de ``serie`` em ``historico[a:b]`` (por padrão, número de WINs)."""
+        serie = self.resultados if serie is None else serie
+        acumulado = self._acumulado(serie)
+        return (acumulado[self.inicio - a + 1:self.fim - a + 1]
+                - acumulado[self.inicio - b + 1:self.fim - b + 1])
+
+    def wins(self, a: int, b: int) -> np.ndarray:
+        return self.contar(a, b)
+
+    def losses(self, a: int, b: int) -> np.ndarray:
+        return (b - a) - self.contar(a, b)
+
+    def sequencia_wins(self, a: int, limite: int) -> np.ndarray:
+        """WINs consecutivos a partir de ``historico[a]``, limitados a ``limite``."""
+        resultados = self.resultados
+        indices = np.arange(len(resultados))
+        ultimo_loss = np.maximum.accumulate(np.where(resultados == 0, indices, -1))
+        sequencia = indices - ultimo_loss
+        return np.minimum(self.posicao(a, sequencia), limite)
+
+    def intervalo_proxima(self) -> np.ndarray:
+        """Segundos entre cada operação avaliada e a operação seguinte."""
+        return self.timestamps[self.inicio + 1:self.fim + 1] - self.timestamps[self.inicio:self.fim]
+
+# ===== REGISTRO DE ESTRATÉGIAS =====
+
+@dataclass
+class EstrategiaBacktest:
+    """Estratégia registrada para backtest"""
+    nome: str
+    kernel: Callable[[JanelaContexto, Dict], Tuple[np.ndarray, np.ndarray]]
+    parametros: Dict = field(default_factory=dict)
+    janela: int = OPERACOES_HISTORICO
+    descricao: str = ""
+
+ESTRATEGIAS: Dict[str, EstrategiaBacktest] = {}
+
+def registrar_estrategia(nome: str, janela: int = OPERACOES_HISTORICO, descricao: str = "", **parametros):
+    """
+    Decorator que registra um kernel de estratégia.
+
+    O kernel recebe ``(ctx, params)`` e retorna ``(dispara, confianca)``: um array
+    booleano e um array float com a confiança de cada disparo.
+    """
+    def decorator(func):
+        ESTRATEGIAS[nome] = EstrategiaBacktest(
+            nome=nome, kernel=func, parametros=dict(parametros),
+            janela=janela, descricao=descricao or (func.__doc__ or "").strip()
+        )
+        return func
+    return decorator
+
+def _constante(ctx: JanelaContexto, dispara: np.ndarray, confianca: float) -> Tuple[np.ndarray, np.ndarray]:
+    return dispara, np.full(len(ctx), confianca, dtype=np.float64)
+
+def _nunca(ctx: JanelaContexto) -> Tuple[np.ndarray, np.ndarray]:
+    return np.zeros(len(ctx), dtype=bool), np.zeros(len(ctx), dtype=np.float64)
+
+def _loss_isolada(ctx: JanelaContexto) -> np.ndarray:
+    return (ctx.posicao(0) == 0) & (ctx.posicao(1) == 1)
+
+# --- radar_analyzer.analisar_estrategias_portfolio ---
+
+@registrar_estrategia('PREMIUM_RECOVERY', max_wins_antes=6, max_losses_20=3, confianca=97)
+def kernel_premium_recovery(ctx, p):
+    """Dupla LOSS com no máximo 6 WINs antes e 3 LOSSes nas últimas 20"""
+    W = ctx.janela
+    dispara = (ctx.posicao(0) == 0) & (ctx.posicao(1) == 0)
+    if W >= 9:
+        dispara &= ctx.wins(2, 9) <= p['max_wins_antes']
+    if W >= 20:
+        dispara &= ctx.losses(0, 20) <= p['max_losses_20']
+    if W >= 7:
+        dispara &= ctx.losses(2, 7) == 0
+    return _constante(ctx, dispara, p['confianca'])
+
+@registrar_estrategia('MOMENTUM_CONTINUATION', min_wins=4, max_wins=6, win_rate_12=85, confianca=89)
+def kernel_momentum_continuation(ctx, p):
+    """LOSS isolada após 4-6 WINs consecutivos"""
+    W = ctx.janela
+    dispara = _loss_isolada(ctx)
+    wins_consecutivos = ctx.sequencia_wins(1, W - 1)
+    dispara &= (wins_consecutivos >= p['min_wins']) & (wins_consecutivos <= p['max_wins'])
+    if W >= 9:
+        dispara &= ctx.losses(1, 9) == 0
+    if W >= 12:
+        dispara &= (ctx.wins(0, 12) / 12) * 100 >= p['win_rate_12']
+    else:
+        dispara &= (ctx.wins(0, W) / W) * 100 >= 80
+    return _constante(ctx, dispara, p['confianca'])
+
+@registrar_estrategia('VOLATILITY_BREAK', min_alternacoes=4, max_losses_10=2, confianca=84)
+def kernel_volatility_break(ctx, p):
+    """LOSS após período de alternância WIN-LOSS"""
+    W = ctx.janela
+    if W < 9:
+        return _nunca(ctx)
+    resultados = ctx.resultados
+    alternou = np.zeros(len(resultados), dtype=np.int8)
+    alternou[1:] = resultados[1:] != resultados[:-1]
+    # Par (historico[m], historico[m+1]) para m = 1..7
+    alternacoes = ctx.contar(1, 8, alternou)
+    dispara = _loss_isolada(ctx) & (alternacoes >= p['min_alternacoes'])
+    if W >= 10:
+        dispara &= ctx.losses(0, 10) <= p['max_losses_10']
+    return _constante(ctx, dispara, p['confianca'])
+
+@registrar_estrategia('PATTERN_REVERSAL', max_losses_10=2, win_rate_8=70, max_losses_consecutivas=2, confianca=91)
+def kernel_pattern_reversal(ctx, p):
+    """Padrão V-V-D-V-V-D com contexto estável"""
+    W = ctx.janela
+    if W < 6:
+        return _nunca(ctx)
+    dispara = np.ones(len(ctx), dtype=bool)
+    for k, esperado in enumerate((1, 1, 0, 1, 1, 0)):
+        dispara &= ctx.posicao(k) == esperado
+    if W >= 10:
+        dispara &= ctx.losses(0, 10) <= p['max_losses_10']
+    if W >= 8:
+        dispara &= (ctx.wins(0, 8) / 8) * 100 >= p['win_rate_8']
+    # Sequência de LOSSes maior que o limite em qualquer ponto da janela
+    limite = p['max_losses_consecutivas'] + 1
+    if limite <= W:
+        resultados = ctx.resultados
+        sequencia_longa = np.zeros(len(resultados), dtype=np.int8)
+        perdas = resultados == 0
+        terminada = perdas[limite - 1:].copy()
+        for deslocamento in range(1, limite):
+            terminada &= perdas[limite - 1 - deslocamento:len(perdas) - deslocamento]
+        sequencia_longa[limite - 1:] = terminada
+        dispara &= ctx.contar(0, W - limite + 1, sequencia_longa) == 0
+    return _constante(ctx, dispara, p['confianca'])
+
+@registrar_estrategia('CYCLE_TRANSITION', tamanho_ciclo=20, posicao_maxima=5, win_rate_ciclo=75, confianca=86)
+def kernel_cycle_transition(ctx, p):
+    """LOSS isolada no início de um novo ciclo após período estável"""
+    W = ctx.janela
+    posicao_ciclo = ((W - 1) % p['tamanho_ciclo']) + 1
+    if posicao_ciclo < 1 or posicao_ciclo > p['posicao_maxima']:
+        return _nunca(ctx)
+    dispara = _loss_isolada(ctx)
+    if W >= 4:
+        dispara &= ctx.wins(1, 4) == 3
+    if W >= 9:
+        dispara &= ctx.losses(1, 9) == 0
+    if W >= 21:
+        dispara &= (ctx.wins(1, 21) / 20) * 100 >= p['win_rate_ciclo']
+    return _constante(ctx, dispara, p['confianca'])
+
+@registrar_estrategia('FIBONACCI_RECOVERY', win_rate_10=80, max_losses_10=1, confianca=87.5)
+def kernel_fibonacci_recovery(ctx, p):
+    """LOSS isolada com janelas Fibonacci (3/5/8) completas de WINs"""
+    W = ctx.janela
+    if W < 11:
+        return _nunca(ctx)
+    dispara = _loss_isolada(ctx)
+    dispara &= (ctx.wins(0, 10) / 10) * 100 >= p['win_rate_10']
+    dispara &= (ctx.wins(1, 4) == 3) | (ctx.wins(1, 6) == 5) | (ctx.wins(1, 9) == 8)
+    dispara &= ctx.losses(1, 11) <= p['max_losses_10']
+    return _constante(ctx, dispara, p['confianca'])
+
+@registrar_estrategia('MOMENTUM_SHIFT', melhoria_minima=0.20, win_rate_recente=0.85, confianca=87.5)
+def kernel_momentum_shift(ctx, p):
+    """LOSS isolada após melhoria de win rate entre janelas antiga e recente"""
+    W = ctx.janela
+    if W < 20:
+        return _nunca(ctx)
+    taxa_recente = ctx.wins(1, 8) / 7
+    taxa_antiga = ctx.wins(8, 16) / 8
+    dispara = _loss_isolada(ctx)
+    dispara &= (taxa_recente - taxa_antiga) >= p['melhoria_minima']
+    dispara &= taxa_recente >= p['win_rate_recente']
+    return _constante(ctx, dispara, p['confianca'])
+
+@registrar_estrategia('STABILITY_BREAK', max_losses_15=1, min_wins_5=4, confianca=88.7)
+def kernel_stability_break(ctx, p):
+    """LOSS isolada após 15 operações estáveis"""
+    W = ctx.janela
+    if W < 16:
+        return _nunca(ctx)
+    dispara = _loss_isolada(ctx)
+    dispara &= ctx.losses(1, 16) <= p['max_losses_15']
+    dispara &= ctx.wins(1, 6) >= p['min_wins_5']
+    return _constante(ctx, dispara, p['confianca'])
+
+ESTRATEGIAS_PORTFOLIO = [
+    'PREMIUM_RECOVERY', 'MOMENTUM_CONTINUATION', 'VOLATILITY_BREAK', 'PATTERN_REVERSAL',
+    'CYCLE_TRANSITION', 'FIBONACCI_RECOVERY', 'MOMENTUM_SHIFT', 'STABILITY_BREAK'
+]
+
+def portfolio_vencedora(ctx, p) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Como ``kernel_portfolio``, mais o índice em ESTRATEGIAS_PORTFOLIO da
+    estratégia vencedora (-1 sem disparo). Confianças empatadas (ex.: 87.5)
+    ficam com a primeira da lista, como o ``max`` do radar_analyzer.
+    """
+    W = ctx.janela
+    vencedora = np.full(len(ctx), -1, dtype=np.int8)
+    if W < p['operacoes_minimas']:
+        return (*_nunca(ctx), vencedora)
+    melhor = np.zeros(len(ctx), dtype=np.float64)
+    for indice, nome in enumerate(ESTRATEGIAS_PORTFOLIO):
+        estrategia = ESTRATEGIAS[nome]
+        parametros = {**estrategia.parametros, **p.get(nome, {})}
+        dispara, confianca = estrategia.kernel(ctx, parametros)
+        vence = dispara & (confianca > melhor)
+        melhor = np.where(vence, confianca, melhor)
+        vencedora = np.where(vence, indice, vencedora).astype(np.int8)
+    # validar_integridade_historico rejeita janelas 100% WIN ou 100% LOSS
+    wins = ctx.wins(0, W)
+    dispara = (melhor > 0) & (wins > 0) & (wins < W)
+    return dispara, melhor, np.where(dispara, vencedora, -1).astype(np.int8)
+
+@registrar_estrategia('PORTFOLIO_8', operacoes_minimas=OPERACOES_MINIMAS)
+def kernel_portfolio(ctx, p):
+    """Portfólio de 8 estratégias (radar_analyzer): vence a de maior confiança"""
+    dispara, melhor, _ = portfolio_vencedora(ctx, p)
+    return dispara, melhor
+
+# --- radar_analisis_scalping_bot.analisar_precision_surge_CORRIGIDO ---
+
+@registrar_estrategia('PRECISION_SURGE', min_wins=4, max_wins=5, max_losses_15=2, confianca=93.5)
+def kernel_precision_surge(ctx, p):
+    """4-5 WINs consecutivos, máx 2 LOSSes em 15, sem LOSSes consecutivos em 10"""
+    if ctx.janela < 15:
+        return _nunca(ctx)
+    wins_consecutivos = ctx.sequencia_wins(0, 15)
+    losses_15 = ctx.losses(0, 15)
+    resultados = ctx.resultados
+    dupla_loss = np.zeros(len(resultados), dtype=np.int8)
+    dupla_loss[1:] = (resultados[1:] == 0) & (resultados[:-1] == 0)
+    dispara = (wins_consecutivos >= p['min_wins']) & (wins_consecutivos <= p['max_wins'])
+    dispara &= losses_15 <= p['max_losses_15']
+    dispara &= ctx.contar(0, 9, dupla_loss) == 0
+    confianca = (p['confianca'] + np.where(wins_consecutivos == 5, 1.5, 0.0)
+                 + np.select([losses_15 == 0, losses_15 == 1], [2.0, 1.0], 0.0))
+    return dispara, confianca
+
+# --- radar_scalping_double.analisar_max_frequency_filter ---
+
+@registrar_estrategia('MAX_FREQUENCY_FILTER', janela=4, lucro_minimo=10.0, intervalo_minimo=120,
+                      max_losses_4=1, confianca=78.6)
+def kernel_max_frequency_filter(ctx, p):
+    """Última WIN com lucro > 10%, 120 s sem operações e máx 1 LOSS em 4"""
+    dispara = ctx.posicao(0) == 1
+    dispara &= ctx.posicao(0, ctx.lucros) >= p['lucro_minimo']
+    dispara &= ctx.losses(0, 4) <= p['max_losses_4']
+    # O radar consulta a cada 5 s: o sinal sai se a próxima operação demorar 120 s+
+    dispara &= ctx.intervalo_proxima() >= p['intervalo_minimo']
+    return _constante(ctx, dispara, p['confianca'])
+
+# --- radartunder3.5.analisar_estrategia_momentum_calmo ---
+
+@registrar_estrategia('MOMENTUM_CALMO_LL', janela=35, operacoes_minimas=2, confianca=85)
+def kernel_momentum_calmo(ctx, p):
+    """Gatilho LL: duas LOSSes consecutivas"""
+    if ctx.janela < p['operacoes_minimas']:
+        return _nunca(ctx)
+    dispara = (ctx.posicao(0) == 0) & (ctx.posicao(1) == 0)
+    return _constante(ctx, dispara, p['confianca'])
+
+# ===== LEITURA DOS LOGS EXPORTADOS =====
+
+COLUNAS_TIMESTAMP = ('created_at', 'timestamp')
+COLUNAS_RESULTADO = ('profit_percentage', 'operation_result', 'profit')
+
+def _converter_bloco(df) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Converte um DataFrame de logs em (resultados, lucros, timestamps)"""
+    import pandas as pd
+
+    coluna_ts = next((c for c in COLUNAS_TIMESTAMP if c in df.columns), None)
+    coluna_res = next((c for c in COLUNAS_RESULTADO if c in df.columns), None)
+    if coluna_ts is None or coluna_res is None:
+        raise ValueError(f"Colunas obrigatórias ausentes: timestamp {COLUNAS_TIMESTAMP}, resultado {COLUNAS_RESULTADO}")
+
+    if 'id' in df.columns:
+        df = df.sort_values('id', kind='stable')
+    else:
+        df = df.sort_values(coluna_ts, kind='stable')
+
+    timestamps = pd.to_datetime(df[coluna_ts], utc=True, format='ISO8601').astype('int64').to_numpy() / 1e9
+    if coluna_res == 'operation_result':
+        resultados = (df[coluna_res].astype(str).str.upper() == 'WIN').to_numpy(np.uint8)
+        lucros = df['profit_percentage'].to_numpy(np.float64) if 'profit_percentage' in df.columns \
+            else np.where(resultados == 1, 1.0, -1.0)
+    else:
+        lucros = df[coluna_res].fillna(0).to_numpy(np.float64)
+        resultados = (lucros > 0).astype(np.uint8)
+    return resultados, lucros, timestamps
+
+def ler_operacoes_em_blocos(caminho: str, tamanho_bloco: int = TAMANHO_BLOCO) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Lê um export da tabela de logs em blocos cronológicos.
+
+    Aceita CSV ou Parquet com as colunas de ``scalping_accumulator_bot_logs``
+    (id, profit_percentage, created_at) ou ``tunder_bot_logs``
+    (id, operation_result, timestamp). Cada bloco deve estar em ordem
+    cronológica em relação ao anterior (exports ordenados por id).
+    """
+    import pandas as pd
+
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao in ('.parquet', '.pq'):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            yield _converter_bloco(pd.read_parquet(caminho))
+            return
+        arquivo = pq.ParquetFile(caminho)
+        for lote in arquivo.iter_batches(batch_size=tamanho_bloco):
+            yield _converter_bloco(lote.to_pandas())
+    else:
+        for df in pd.read_csv(caminho, chunksize=tamanho_bloco):
+            yield _converter_bloco(df)
+
+# ===== MOTOR DE BACKTEST =====
+
+@dataclass
+class ResultadoBacktest:
+    """Métricas de uma estratégia ao final do backtest"""
+    estrategia: str
+    operacoes: int = 0
+    sinais: int = 0
+    sinais_expirados: int = 0
+    acertos: int = 0
+    trades: int = 0
+    trades_vencedores: int = 0
+    lucro_total: float = 0.0
+    max_drawdown: float = 0.0
+    max_sinais_perdidos_seguidos: int = 0
+    horas: float = 0.0
+    duracao_s: float = 0.0
+    sinais_por_estrategia: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def taxa_acerto(self) -> float:
+        concluidos = self.sinais - self.sinais_expirados
+        return (self.acertos / concluidos * 100) if concluidos > 0 else 0.0
+
+    @property
+    def taxa_vitoria_trades(self) -> float:
+        return (self.trades_vencedores / self.trades * 100) if self.trades > 0 else 0.0
+
+    @property
+    def sinais_por_hora(self) -> float:
+        return self.sinais / self.horas if self.horas > 0 else 0.0
+
+    @property
+    def operacoes_por_segundo(self) -> float:
+        return self.operacoes / self.duracao_s if self.duracao_s > 0 else 0.0
+
+    def to_dict(self) -> Dict:
+        dados = asdict(self)
+        dados.update({
+            'taxa_acerto': round(self.taxa_acerto, 2),
+            'taxa_vitoria_trades': round(self.taxa_vitoria_trades, 2),
+            'sinais_por_hora': round(self.sinais_por_hora, 3),
+            'operacoes_por_segundo': round(self.operacoes_por_segundo, 0),
+        })
+        return dados
+
+class BacktestEngine:
+    """
+    Simula um radar sobre um fluxo de operações.
+
+    A cada operação o radar vê o histórico das últimas ``operacoes_historico``
+    operações. Quando a estratégia dispara, a trava de persistência mantém o
+    sinal ativo pelas próximas ``persistencia_operacoes`` operações (as que o
+    bot executa) ou até ``persistencia_timeout`` segundos sem completá-las.
+    Um sinal é um acerto quando todas as operações executadas foram WIN.
+    """
+
+    def __init__(self, estrategia: str, parametros: Optional[Dict] = None,
+                 operacoes_historico: Optional[int] = None,
+                 persistencia_operacoes: int = PERSISTENCIA_OPERACOES,
+                 persistencia_timeout: float = PERSISTENCIA_TIMEOUT):
+        if estrategia not in ESTRATEGIAS:
+            raise ValueError(f"Estratégia desconhecida: {estrategia}. Disponíveis: {', '.join(ESTRATEGIAS)}")
+        self.estrategia = ESTRATEGIAS[estrategia]
+        self.parametros = {**self.estrategia.parametros, **(parametros or {})}
+        self.janela = operacoes_historico or self.estrategia.janela
+        self.persistencia_operacoes = persistencia_operacoes
+        self.persistencia_timeout = persistencia_timeout
+        self.resultado = ResultadoBacktest(estrategia=estrategia)
+
+        # Cauda do bloco anterior (histórico + operação ainda sem sucessora)
+        self._resultados = np.zeros(0, dtype=np.uint8)
+        self._lucros = np.zeros(0, dtype=np.float64)
+        self._timestamps = np.zeros(0, dtype=np.float64)
+        self._processadas = 0  # operações da cauda já avaliadas
+
+        # Estado da trava entre blocos
+        self._trava_restante = 0
+        self._trava_inicio = 0.0
+        self._trava_venceu = True
+        self._primeiro_ts: Optional[float] = None
+        self._ultimo_ts: Optional[float] = None
+        self._equity = 0.0
+        self._pico = 0.0
+        self._perdidos_seguidos = 0
+
+    def processar_bloco(self, resultados: np.ndarray, lucros: np.ndarray, timestamps: np.ndarray) -> None:
+        """Processa um bloco cronológico de operações"""
+        inicio_cpu = time.perf_counter()
+        if len(resultados) == 0:
+            return
+        if self._primeiro_ts is None:
+            self._primeiro_ts = float(timestamps[0])
+        self._ultimo_ts = float(timestamps[-1])
+
+        resultados = np.concatenate([self._resultados, np.asarray(resultados, dtype=np.uint8)])
+        lucros = np.concatenate([self._lucros, np.asarray(lucros, dtype=np.float64)])
+        timestamps = np.concatenate([self._timestamps, np.asarray(timestamps, dtype=np.float64)])
+
+        # Avaliar até a penúltima operação: a última ainda não tem sucessora
+        inicio = self._processadas
+        fim = len(resultados) - 1
+        if fim > inicio:
+            self._simular(resultados, lucros, timestamps, inicio, fim)
+            self.resultado.operacoes += fim - inicio
+
+        # Guardar cauda suficiente para a próxima janela
+        manter = min(len(resultados), self.janela + 1)
+        self._resultados = resultados[-manter:].copy()
+        self._lucros = lucros[-manter:].copy()
+        self._timestamps = timestamps[-manter:].copy()
+        self._processadas = manter - 1
+        self.resultado.duracao_s += time.perf_counter() - inicio_cpu
+
+    def _simular(self, resultados, lucros, timestamps, inicio: int, fim: int) -> None:
+        W = self.janela
+        dispara = np.zeros(fim - inicio, dtype=bool)
+        vencedora = np.full(fim - inicio, -1, dtype=np.int8)
+        primeiro_valido = max(inicio, W - 1)
+        if fim > primeiro_valido:
+            ctx = JanelaContexto(resultados, lucros, timestamps, primeiro_valido, fim, W)
+            if self.estrategia.nome == 'PORTFOLIO_8':
+                d, _, v = portfolio_vencedora(ctx, self.parametros)
+                vencedora[primeiro_valido - inicio:] = v
+            else:
+                d, _ = self.estrategia.kernel(ctx, self.parametros)
+            dispara[primeiro_valido - inicio:] = d
+
+        # Loop sequencial apenas sobre os disparos: decide quais viram sinais e
+        # quais operações a trava executa. As métricas são vetorizadas depois.
+        ts = timestamps.tolist()
+        timeout = self.persistencia_timeout
+        executadas: List[int] = []
+        fechamentos: List[Tuple[int, bool]] = []  # (fim do sinal em ``executadas``, concluído)
+        vencedoras_sinais: List[int] = []  # índice em ESTRATEGIAS_PORTFOLIO (-1 fora do portfólio)
+        expirados = 0
+
+        j = inicio
+        restante = self._trava_restante
+        inicio_trava = self._trava_inicio
+        disparos = (np.flatnonzero(dispara) + inicio).tolist()
+        proximo = 0
+        while True:
+            # Consumir a trava ativa
+            while restante > 0 and j < fim:
+                if ts[j] - inicio_trava > timeout:
+                    expirados += 1
+                    restante = 0
+                    fechamentos.append((len(executadas), False))
+                    break
+                executadas.append(j)
+                restante -= 1
+                j += 1
+                if restante == 0:
+                    fechamentos.append((len(executadas), True))
+                    # A operação que completou a trava já entra na próxima análise
+                    j -= 1
+            if restante > 0:
+                break
+            # Próximo disparo com o radar livre
+            while proximo < len(disparos) and disparos[proximo] < j:
+                proximo += 1
+            if proximo >= len(disparos):
+                break
+            i = disparos[proximo]
+            proximo += 1
+            vencedoras_sinais.append(int(vencedora[i - inicio]))
+            restante = self.persistencia_operacoes
+            inicio_trava = ts[i]
+            j = i + 1
+
+        self._trava_restante = restante
+        self._trava_inicio = inicio_trava
+        self._contabilizar(resultados, lucros, executadas, fechamentos, expirados, vencedoras_sinais)
+
+    def _contabilizar(self, resultados, lucros, executadas: List[int], fechamentos: List[Tuple[int, bool]],
+                      expirados: int, vencedoras_sinais: List[int]) -> None:
+        """Atualiza as métricas com as operações executadas pelas travas"""
+        r = self.resultado
+        r.sinais += len(vencedoras_sinais)
+        r.sinais_expirados += expirados
+        if vencedoras_sinais and self.estrategia.nome == 'PORTFOLIO_8':
+            valores, totais = np.unique(np.array(vencedoras_sinais), return_counts=True)
+            for valor, total in zip(valores.tolist(), totais.tolist()):
+                nome = ESTRATEGIAS_PORTFOLIO[valor] if valor >= 0 else 'DESCONHECIDA'
+                r.sinais_por_estrategia[nome] = r.sinais_por_estrategia.get(nome, 0) + total
+
+        indices = np.array(executadas, dtype=np.int64)
+        res = resultados[indices].astype(np.int64)
+        luc = lucros[indices]
+        r.trades += len(indices)
+        r.trades_vencedores += int(res.sum())
+        r.lucro_total += float(luc.sum())
+        if len(indices):
+            equity = self._equity + np.cumsum(luc)
+            pico = np.maximum.accumulate(np.maximum(equity, self._pico))
+            r.max_drawdown = max(r.max_drawdown, float((pico - equity).max()))
+            self._equity = float(equity[-1])
+            self._pico = float(pico[-1])
+
+        # Um sinal acerta quando todas as operações da trava foram WIN. Operações
+        # de uma trava que veio do bloco anterior continuam o sinal pendente.
+        perdas = np.concatenate([[0], np.cumsum(1 - res)])
+        anterior = 0
+        for fechamento, concluido in fechamentos:
+            venceu = self._trava_venceu and perdas[fechamento] == perdas[anterior]
+            anterior = fechamento
+            self._trava_venceu = True
+            if not concluido:
+                continue
+            if venceu:
+                r.acertos += 1
+                self._perdidos_seguidos = 0
+            else:
+                self._perdidos_seguidos += 1
+                r.max_sinais_perdidos_seguidos = max(r.max_sinais_perdidos_seguidos, self._perdidos_seguidos)
+        # Trava ainda aberta: lembrar se as operações já executadas foram WIN
+        if self._trava_restante > 0:
+            self._trava_venceu = self._trava_venceu and perdas[-1] == perdas[anterior]
+
+    def finalizar(self) -> ResultadoBacktest:
+        """Fecha o backtest e retorna as métricas"""
+        # A última operação do fluxo só pode completar uma trava pendente
+        if self._trava_restante > 0 and len(self._resultados) > self._processadas:
+            self._simular(self._resultados, self._lucros, self._timestamps,
+                          self._processadas, self._processadas + 1)
+            self._trava_restante = 0
+        if self._primeiro_ts is not None and self._ultimo_ts is not None:
+            self.resultado.horas = (self._ultimo_ts - self._primeiro_ts) / 3600
+        return self.resultado
+
+def _contexto_historico(historico: List[str], lucros: Optional[List[float]], timestamps: Optional[List[float]],
+                        agora: Optional[float]) -> JanelaContexto:
+    resultados = np.array([1 if r in ('V', 'WIN') else 0 for r in reversed(historico)], dtype=np.uint8)
+    # Operação fictícia no fim para que intervalo_proxima seja definido: no radar
+    # ao vivo ela é a consulta atual (``agora``), sem lucro
+    resultados = np.append(resultados, 0)
+    n = len(historico)
+    serie_lucros = np.zeros(n + 1, dtype=np.float64)
+    serie_timestamps = np.zeros(n + 1, dtype=np.float64)
+    if lucros is not None:
+        serie_lucros[:n] = np.array(lucros[:n], dtype=np.float64)[::-1]
+    if timestamps is not None:
+        serie_timestamps[:n] = np.array(timestamps[:n], dtype=np.float64)[::-1]
+        serie_timestamps[n] = time.time() if agora is None else agora
+    return JanelaContexto(resultados, serie_lucros, serie_timestamps, n - 1, n, n)
+
+def avaliar_estrategia(estrategia: str, historico: List[str], parametros: Optional[Dict] = None,
+                       lucros: Optional[List[float]] = None, timestamps: Optional[List[float]] = None,
+                       agora: Optional[float] = None) -> Tuple[Optional[str], float]:
+    """
+    Avalia um único histórico no formato dos radares (['V', 'D', ...], 0 = mais recente).
+
+    ``lucros`` (profit_percentage) e ``timestamps`` (epoch) seguem a mesma ordem
+    do histórico; sem eles, filtros de lucro e de intervalo nunca passam.
+    Retorna ``(nome, confianca)`` da estratégia que disparou — no PORTFOLIO_8,
+    a estratégia vencedora — ou ``(None, 0.0)``.
+    """
+    registrada = ESTRATEGIAS[estrategia]
+    parametros = {**registrada.parametros, **(parametros or {})}
+    ctx = _contexto_historico(historico, lucros, timestamps, agora)
+    if estrategia == 'PORTFOLIO_8':
+        dispara, confianca, vencedora = portfolio_vencedora(ctx, parametros)
+        nome = ESTRATEGIAS_PORTFOLIO[int(vencedora[0])] if dispara[0] else None
+    else:
+        dispara, confianca = registrada.kernel(ctx, parametros)
+        nome = estrategia if dispara[0] else None
+    return nome, float(confianca[0]) if dispara[0] else 0.0
+
+def avaliar_historico(estrategia: str, historico: List[str], parametros: Optional[Dict] = None,
+                      **series) -> Tuple[bool, float]:
+    """
+    Como ``avaliar_estrategia``, retornando ``(dispara, confianca)``.
+
+    Útil para comparar os kernels com as funções originais.
+    """
+    nome, confianca = avaliar_estrategia(estrategia, historico, parametros, **series)
+    return nome is not None, confianca
+
+def executar_backtest(blocos: Iterable[Tuple[np.ndarray, np.ndarray, np.ndarray]], estrategias: List[str],
+                      parametros: Optional[Dict[str, Dict]] = None, **opcoes) -> Dict[str, ResultadoBacktest]:
+    """Executa várias estratégias sobre o mesmo fluxo de blocos"""
+    parametros = parametros or {}
+    motores = {nome: BacktestEngine(nome, parametros.get(nome), **opcoes) for nome in estrategias}
+    for resultados, lucros, timestamps in blocos:
+        for motor in motores.values():
+            motor.processar_bloco(resultados, lucros, timestamps)
+    return {nome: motor.finalizar() for nome, motor in motores.items()}
+
+def backtest_arquivo(caminho: str, estrategias: List[str], **opcoes) -> Dict[str, ResultadoBacktest]:
+    """Backtest direto de um export CSV/Parquet"""
+    return executar_backtest(ler_operacoes_em_blocos(caminho), estrategias, **opcoes)
+
+def exibir_resultados(resultados: Dict[str, ResultadoBacktest]) -> None:
+    """Mostra o relatório do backtest no terminal"""
+    print(f"\n{'='*100}")
+    print(f"{'ESTRATÉGIA':<24}{'OPS':>12}{'SINAIS':>9}{'ACERTO%':>9}{'TRADES%':>9}"
+          f"{'LUCRO':>11}{'DRAWDOWN':>11}{'SIN/H':>8}{'OPS/S':>12}")
+    print(f"{'-'*100}")
+    for r in resultados.values():
+        print(f"{r.estrategia:<24}{r.operacoes:>12}{r.sinais:>9}{r.taxa_acerto:>9.2f}"
+              f"{r.taxa_vitoria_trades:>9.2f}{r.lucro_total:>11.2f}{r.max_drawdown:>11.2f}"
+              f"{r.sinais_por_hora:>8.2f}{r.operacoes_por_segundo:>12.0f}")
+        for nome, total in sorted(r.sinais_por_estrategia.items(), key=lambda x: -x[1]):
+            print(f"    - {nome}: {total} sinais")
+    print(f"{'='*100}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Backtest histórico das estratégias dos radares')
+    parser.add_argument('arquivo', help='Export da tabela de logs (CSV ou Parquet)')
+    parser.add_argument('--estrategia', action='append', help='Estratégia registrada (pode repetir)')
+    parser.add_argument('--todas', action='store_true', help='Executar todas as estratégias registradas')
+    parser.add_argument('--historico', type=int, default=None, help='Operações na janela do radar')
+    parser.add_argument('--persistencia-operacoes', type=int, default=PERSISTENCIA_OPERACOES)
+    parser.add_argument('--persistencia-timeout', type=float, default=PERSISTENCIA_TIMEOUT)
+    args = parser.parse_args()
+
+    estrategias = list(ESTRATEGIAS) if args.todas else (args.estrategia or ['PORTFOLIO_8'])
+    print(f"* Backtest de {args.arquivo} - {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
+    resultados = backtest_arquivo(
+        args.arquivo, estrategias,
+        operacoes_historico=args.historico,
+        persistencia_operacoes=args.persistencia_operacoes,
+        persistencia_timeout=args.persistencia_timeout,
+    )
+    exibir_resultados(resultados)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
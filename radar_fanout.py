@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Radar Fanout - Um único radar monitorando vários bots
+
+Cada radar em produção está preso a um BOT_NAME e a uma tabela de logs, e
+faz chamadas síncronas supabase.table(...).execute() em sequência. Para dez
+contas são dez processos. Aqui o radar recebe uma lista de alvos
+(bot_name, tabela, estratégias) e, a cada ciclo:
+
+1. busca o histórico de todos os alvos em paralelo com o cliente assíncrono
+   do Supabase (httpx por baixo);
+2. avalia apenas os alvos com operações novas, usando os kernels
+   vetorizados de radar_backtest.py;
+3. grava os sinais alterados em radar_de_apalancamiento_signals com um
+   único upsert em lote.
+
+A trava de persistência segue os radares: após um sinal o alvo continua
+liberado até 2 novas operações ou 300 s, e então é desligado.
+
+Avaliação: avaliar_alvo é Python puro e preso ao GIL (0,2-0,8 ms por alvo),
+então um pool de threads só somaria uma troca de thread por alvo, sem
+paralelismo. Ela roda direto no loop; só quando um ciclo tem pelo menos
+AVALIACAO_EM_PROCESSOS alvos pendentes (dezenas de ms de CPU) os alvos vão
+em lotes, um por worker, para um ProcessPoolExecutor criado sob demanda.
+
+Uso:
+    python radar_fanout.py --alvo "Scalping Bot:scalping_accumulator_bot_logs:PORTFOLIO_8"
+    python radar_fanout.py --config alvos.json --workers 4
+
+Formato do alvos.json:
+    [{"bot_name": "Scalping Bot", "tabela": "scalping_accumulator_bot_logs",
+      "estrategias": ["PORTFOLIO_8"]}]
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from radar_backtest import (
+    ESTRATEGIAS, OPERACOES_HISTORICO, OPERACOES_MINIMAS,
+    PERSISTENCIA_OPERACOES, PERSISTENCIA_TIMEOUT, avaliar_estrategia
+)
+
+logger = logging.getLogger(__name__)
+
+TABELA_SINAIS = 'radar_de_apalancamiento_signals'
+TABELA_PADRAO = 'scalping_accumulator_bot_logs'
+ANALISE_INTERVALO = 5  # segundos entre ciclos
+MAX_CONSULTAS_SIMULTANEAS = 16  # consultas HTTP em voo ao mesmo tempo
+INTERVALO_HEARTBEAT = 60  # segundos até regravar um sinal inalterado (mantém created_at vivo)
+# Disparam pelo tempo desde a última operação: reavaliadas a cada ciclo, mesmo sem operações novas
+ESTRATEGIAS_TEMPORAIS = frozenset({'MAX_FREQUENCY_FILTER'})
+AVALIACAO_EM_PROCESSOS = 64  # alvos pendentes num ciclo a partir dos quais a avaliação sai do loop
+
+@dataclass
+class AlvoRadar:
+    """Bot monitorado: nome no painel, tabela de logs e estratégias avaliadas"""
+    bot_name: str
+    tabela: str = TABELA_PADRAO
+    estrategias: Tuple[str, ...] = ('PORTFOLIO_8',)
+    operacoes_historico: Optional[int] = None
+
+    def __post_init__(self):
+        self.estrategias = tuple(self.estrategias)
+        desconhecidas = [e for e in self.estrategias if e not in ESTRATEGIAS]
+        if desconhecidas:
+            raise ValueError(f"Estratégias desconhecidas para {self.bot_name}: {desconhecidas}")
+        if self.operacoes_historico is None:
+            self.operacoes_historico = max([OPERACOES_HISTORICO] + [ESTRATEGIAS[e].janela for e in self.estrategias])
+
+    @classmethod
+    def de_texto(cls, texto: str) -> 'AlvoRadar':
+        """Lê 'bot_name:tabela:EST1,EST2' (tabela e estratégias opcionais)"""
+        partes = texto.split(':')
+        bot_name = partes[0].strip()
+        tabela = partes[1].strip() if len(partes) > 1 and partes[1].strip() else TABELA_PADRAO
+        estrategias = tuple(e.strip() for e in partes[2].split(',')) if len(partes) > 2 and partes[2].strip() else ('PORTFOLIO_8',)
+        return cls(bot_name, tabela, estrategias)
+
+    @property
+    def temporal(self) -> bool:
+        return not ESTRATEGIAS_TEMPORAIS.isdisjoint(self.estrategias)
+
+@dataclass
+class EstadoAlvo:
+    """Estado de persistência e último sinal gravado de um alvo"""
+    ultimo_id: Any = None
+    id_no_sinal: Any = None
+    sinal_em: Optional[float] = None
+    pattern_found_at: Optional[str] = None
+    estrategia: Optional[str] = None
+    confianca: float = 0.0
+    operacoes_apos: int = 0
+    linha_enviada: Optional[Dict] = None
+    enviada_em: float = 0.0
+
+    @property
+    def travado(self) -> bool:
+        return self.sinal_em is not None
+
+@dataclass
+class ResultadoCiclo:
+    alvos: int = 0
+    buscados: int = 0
+    avaliados: int = 0
+    sinais: int = 0
+    gravados: int = 0
+    erros: List[str] = field(default_factory=list)
+    duracao_s: float = 0.0
+
+@dataclass
+class HistoricoAlvo:
+    """Últimas operações de um alvo, mais recente primeiro"""
+    historico: List[str]
+    ids: List[Any]
+    lucros: List[float]
+    timestamps: List[Optional[float]]
+
+def carregar_alvos(caminho: str) -> List[AlvoRadar]:
+    """Carrega a lista de alvos de um arquivo JSON"""
+    with open(caminho, encoding='utf-8') as f:
+        return [AlvoRadar(**item) for item in json.load(f)]
+
+def _estatisticas(historico: List[str]) -> Tuple[int, int, float]:
+    """Mesmas métricas de calcular_estatisticas_bot (radar_analyzer.py)"""
+    if len(historico) < 20:
+        return 0, 0, 0.0
+    return historico[:10].count('D'), historico[:5].count('V'), round(historico.count('V') / len(historico) * 100, 2)
+
+def _epoch(valor: Any) -> Optional[float]:
+    """created_at do Supabase (ISO 8601) em segundos desde a época"""
+    if not valor:
+        return None
+    try:
+        return datetime.fromisoformat(str(valor).replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
+def avaliar_alvo(alvo: AlvoRadar, busca: HistoricoAlvo, agora: Optional[float] = None) -> Tuple[Optional[str], float]:
+    """Avalia as estratégias do alvo e retorna a de maior confiança que disparou"""
+    n = alvo.operacoes_historico
+    series = {'lucros': busca.lucros[:n], 'agora': agora}
+    # Um created_at ausente invalida o intervalo: o filtro de frequência não passa
+    if all(ts is not None for ts in busca.timestamps[:n]):
+        series['timestamps'] = busca.timestamps[:n]
+    melhor, melhor_confianca = None, 0.0
+    for nome in alvo.estrategias:
+        estrategia, confianca = avaliar_estrategia(nome, busca.historico[:n], **series)
+        if estrategia is not None and confianca > melhor_confianca:
+            melhor, melhor_confianca = estrategia, confianca
+    return melhor, melhor_confianca
+
+def avaliar_lote(pendentes: List[Tuple[AlvoRadar, HistoricoAlvo]], agora: Optional[float]) -> List[Any]:
+    """avaliar_alvo para vários alvos (um lote por processo); exceções retornadas por alvo"""
+    avaliacoes = []
+    for alvo, busca in pendentes:
+        try:
+            avaliacoes.append(avaliar_alvo(alvo, busca, agora))
+        except Exception as e:
+            avaliacoes.append(e)
+    return avaliacoes
+
+class RadarFanout:
+    """
+    Radar multi-bot: busca concorrente, avaliação no loop (em processos para
+    listas grandes) e gravação em lote.
+
+    O estado de cada alvo fica em memória; só alvos com operações novas (ou
+    com estratégia temporal) são reavaliados e só linhas alteradas (ou vencidas pelo heartbeat) são gravadas.
+    """
+
+    def __init__(self, alvos: List[AlvoRadar], workers: Optional[int] = None,
+                 persistencia_operacoes: int = PERSISTENCIA_OPERACOES,
+                 persistencia_timeout: float = PERSISTENCIA_TIMEOUT,
+                 max_consultas: int = MAX_CONSULTAS_SIMULTANEAS,
+                 intervalo_heartbeat: float = INTERVALO_HEARTBEAT,
+                 avaliacao_em_processos: int = AVALIACAO_EM_PROCESSOS):
+        nomes = [a.bot_name for a in alvos]
+        if len(set(nomes)) != len(nomes):
+            raise ValueError("bot_name repetido na lista de alvos")
+        self.alvos = list(alvos)
+        self.estados: Dict[str, EstadoAlvo] = {a.bot_name: EstadoAlvo() for a in alvos}
+        self.persistencia_operacoes = persistencia_operacoes
+        self.persistencia_timeout = persistencia_timeout
+        self.max_consultas = max_consultas
+        self.intervalo_heartbeat = intervalo_heartbeat
+        self.workers = workers if workers is not None else min(8, os.cpu_count() or 1)  # 0/1: sempre no loop
+        self.avaliacao_em_processos = avaliacao_em_processos
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.ciclos = 0
+
+    # ===== BUSCA =====
+
+    async def _buscar(self, cliente, alvo: AlvoRadar, semaforo: asyncio.Semaphore) -> HistoricoAlvo:
+        async with semaforo:
+            resposta = await cliente.table(alvo.tabela) \
+                .select('id, profit_percentage, created_at') \
+                .order('id', desc=True) \
+                .limit(alvo.operacoes_historico) \
+                .execute()
+        linhas = resposta.data or []
+        lucros = [float(linha.get('profit_percentage') or 0) for linha in linhas]
+        return HistoricoAlvo(
+            historico=['V' if lucro > 0 else 'D' for lucro in lucros],
+            ids=[linha.get('id') for linha in linhas],
+            lucros=lucros,
+            timestamps=[_epoch(linha.get('created_at')) for linha in linhas],
+        )
+
+    async def buscar_historicos(self, cliente) -> List[Any]:
+        """Busca o histórico de todos os alvos em paralelo (exceções retornadas por alvo)"""
+        semaforo = asyncio.Semaphore(self.max_consultas)
+        return await asyncio.gather(*(self._buscar(cliente, alvo, semaforo) for alvo in self.alvos),
+                                    return_exceptions=True)
+
+    # ===== PERSISTÊNCIA =====
+
+    def _decidir(self, alvo: AlvoRadar, estado: EstadoAlvo, historico: List[str], ids: List[Any],
+                 avaliacao: Optional[Tuple[Optional[str], float]], agora: float) -> Dict:
+        """Aplica a trava de persistência e monta a linha do alvo"""
+        if estado.travado:
+            estado.operacoes_apos = sum(1 for i in ids if i is not None and estado.id_no_sinal is not None and i > estado.id_no_sinal)
+            expirado = agora - estado.sinal_em > self.persistencia_timeout
+            if estado.operacoes_apos >= self.persistencia_operacoes or expirado:
+                motivo = (f"{alvo.bot_name}: Desligado - {estado.operacoes_apos} operações completadas após sinal"
+                          if not expirado else f"{alvo.bot_name}: Sinal expirado após {self.persistencia_timeout:.0f}s")
+                linha = self._linha(alvo, historico, False, motivo, estado)
+                estado.sinal_em = estado.id_no_sinal = estado.pattern_found_at = estado.estrategia = None
+                estado.confianca = 0.0
+                estado.operacoes_apos = 0
+                return linha
+            return self._linha(alvo, historico, True, self._motivo_sinal(estado), estado)
+
+        if len(historico) < OPERACOES_MINIMAS:
+            return self._linha(alvo, historico, False, "Aguardando dados suficientes...", estado)
+
+        estrategia, confianca = avaliacao if avaliacao else (None, 0.0)
+        if estrategia is None:
+            return self._linha(alvo, historico, False, "Aguardando padrão seguro...", estado)
+
+        estado.sinal_em = agora
+        estado.id_no_sinal = ids[0] if ids else None
+        estado.pattern_found_at = datetime.now().isoformat()
+        estado.estrategia = estrategia
+        estado.confianca = confianca
+        estado.operacoes_apos = 0
+        return self._linha(alvo, historico, True, self._motivo_sinal(estado), estado)
+
+    @staticmethod
+    def _motivo_sinal(estado: EstadoAlvo) -> str:
+        return f"Patron Encontrado, Activar Bot Ahora! - {estado.estrategia} ({estado.confianca:g}%)"
+
+    def _linha(self, alvo: AlvoRadar, historico: List[str], seguro: bool, motivo: str, estado: EstadoAlvo) -> Dict:
+        losses_10, wins_5, accuracy = _estatisticas(historico)
+        linha = {
+            'bot_name': alvo.bot_name,
+            'is_safe_to_operate': seguro,
+            'reason': motivo,
+            'operations_after_pattern': estado.operacoes_apos,
+            'losses_in_last_10_ops': losses_10,
+            'wins_in_last_5_ops': wins_5,
+            'historical_accuracy': accuracy,
+            'auto_disable_after_ops': self.persistencia_operacoes,
+            'strategy_used': estado.estrategia if seguro else 'NONE',
+            'strategy_confidence': estado.confianca if seguro else 0.0,
+            'last_pattern_found': estado.estrategia if seguro else 'Aguardando',
+        }
+        if seguro and estado.pattern_found_at:
+            linha['pattern_found_at'] = estado.pattern_found_at
+        return linha
+
+    # ===== CICLO =====
+
+    async def executar_ciclo(self, cliente) -> ResultadoCiclo:
+        """Busca, avalia e grava todos os alvos uma vez"""
+        inicio = time.perf_counter()
+        self.ciclos += 1
+        resultado = ResultadoCiclo(alvos=len(self.alvos))
+        buscas = await self.buscar_historicos(cliente)
+
+        # Só reavalia alvos livres com operação nova (ou com estratégia temporal)
+        pendentes = []
+        for alvo, busca in zip(self.alvos, buscas):
+            if isinstance(busca, Exception):
+                resultado.erros.append(f"{alvo.bot_name}: {busca}")
+                continue
+            resultado.buscados += 1
+            estado = self.estados[alvo.bot_name]
+            novo = bool(busca.ids) and (busca.ids[0] != estado.ultimo_id or alvo.temporal)
+            if novo and not estado.travado and len(busca.historico) >= OPERACOES_MINIMAS:
+                pendentes.append((alvo, busca))
+
+        agora = time.time()
+        avaliacoes = await self._avaliar(pendentes, agora)
+        por_alvo = {}
+        for (alvo, _), avaliacao in zip(pendentes, avaliacoes):
+            if isinstance(avaliacao, Exception):
+                resultado.erros.append(f"{alvo.bot_name}: {avaliacao}")
+                continue
+            por_alvo[alvo.bot_name] = avaliacao
+        resultado.avaliados = len(por_alvo)
+
+        lote = []
+        for alvo, busca in zip(self.alvos, buscas):
+            if isinstance(busca, Exception):
+                continue
+            historico, ids = busca.historico, busca.ids
+            estado = self.estados[alvo.bot_name]
+            if alvo.bot_name not in por_alvo and ids and ids[0] == estado.ultimo_id and not estado.travado \
+                    and estado.linha_enviada is not None:
+                linha = estado.linha_enviada
+            else:
+                linha = self._decidir(alvo, estado, historico, ids, por_alvo.get(alvo.bot_name), agora)
+            estado.ultimo_id = ids[0] if ids else None
+            if linha['is_safe_to_operate']:
+                resultado.sinais += 1
+            if linha != estado.linha_enviada or agora - estado.enviada_em >= self.intervalo_heartbeat:
+                lote.append((estado, linha))
+
+        if lote:
+            resultado.gravados = await self.enviar_lote(cliente, lote, agora)
+        resultado.duracao_s = time.perf_counter() - inicio
+        return resultado
+
+    async def _avaliar(self, pendentes: List[Tuple[AlvoRadar, HistoricoAlvo]], agora: float) -> List[Any]:
+        """Avaliações na ordem de pendentes: no loop, ou em lotes num pool de processos"""
+        if self.workers <= 1 or len(pendentes) < self.avaliacao_em_processos:
+            return avaliar_lote(pendentes, agora)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        loop = asyncio.get_running_loop()
+        tamanho = -(-len(pendentes) // self.workers)
+        lotes = [pendentes[i:i + tamanho] for i in range(0, len(pendentes), tamanho)]
+        resultados = await asyncio.gather(*(
+            loop.run_in_executor(self._executor, avaliar_lote, lote, agora) for lote in lotes
+        ), return_exceptions=True)
+        avaliacoes = []
+        for lote, resultado in zip(lotes, resultados):
+            avaliacoes.extend([resultado] * len(lote) if isinstance(resultado, Exception) else resultado)
+        return avaliacoes
+
+    async def enviar_lote(self, cliente, lote: List[Tuple[EstadoAlvo, Dict]], agora: float) -> int:
+        """Grava todas as linhas alteradas com um único upsert"""
+        criado_em = datetime.now().isoformat()
+        linhas = [{**linha, 'created_at': criado_em} for _, linha in lote]
+        try:
+            await cliente.table(TABELA_SINAIS).upsert(linhas, on_conflict='bot_name').execute()
+        except Exception as e:
+            logger.error(f"[FANOUT] Falha no upsert em lote de {len(linhas)} sinais: {e}")
+            return 0
+        for estado, linha in lote:
+            estado.linha_enviada = linha
+            estado.enviada_em = agora
+        return len(linhas)
+
+    async def executar(self, cliente, intervalo: float = ANALISE_INTERVALO, ciclos: Optional[int] = None):
+        """Loop principal do radar multi-bot"""
+        try:
+            while ciclos is None or self.ciclos < ciclos:
+                r = await self.executar_ciclo(cliente)
+                logger.info(f"[FANOUT] Ciclo {self.ciclos}: {r.buscados}/{r.alvos} buscados, {r.avaliados} avaliados, "
+                            f"{r.sinais} sinais ativos, {r.gravados} gravados em {r.duracao_s * 1000:.1f}ms")
+                for erro in r.erros:
+                    logger.warning(f"[FANOUT] {erro}")
+                await asyncio.sleep(intervalo)
+        finally:
+            self.fechar()
+
+    def fechar(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+async def _main_async(alvos: List[AlvoRadar], workers: Optional[int], intervalo: float):
+    from supabase import acreate_client
+
+    url, chave = os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_KEY')
+    if not url or not chave:
+        raise ValueError("Credenciais do Supabase nao encontradas no arquivo .env")
+    cliente = await acreate_client(url, chave)
+    await RadarFanout(alvos, workers=workers).executar(cliente, intervalo)
+
+def main():
+    parser = argparse.ArgumentParser(description="Radar único para vários bots")
+    parser.add_argument('--alvo', action='append', default=[],
+                        help="bot_name:tabela:EST1,EST2 (repetível)")
+    parser.add_argument('--config', help="Arquivo JSON com a lista de alvos")
+    parser.add_argument('--workers', type=int, default=None, help="Processos de avaliação para ciclos com muitos alvos (0: sempre no loop)")
+    parser.add_argument('--intervalo', type=float, default=ANALISE_INTERVALO, help="Segundos entre ciclos")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    for lib in ['httpx', 'httpcore', 'supabase', 'postgrest']:
+        logging.getLogger(lib).setLevel(logging.WARNING)
+    load_dotenv()
+
+    alvos = carregar_alvos(args.config) if args.config else []
+    alvos += [AlvoRadar.de_texto(texto) for texto in args.alvo]
+    if not alvos:
+        parser.error("informe --alvo ou --config")
+
+    print(f"RADAR FANOUT - {len(alvos)} bots: {', '.join(a.bot_name for a in alvos)}")
+    try:
+        asyncio.run(_main_async(alvos, args.workers, args.intervalo))
+    except KeyboardInterrupt:
+        print("\n! Radar Fanout interrompido pelo usuario")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Radar Memo - Memorização da decisão de estratégia por impressão do histórico
+
+Os radares consultam o Supabase a cada ANALISE_INTERVALO segundos, mas uma
+nova operação só chega a cada 30-120 s. Na maioria dos ciclos o histórico é
+idêntico ao do ciclo anterior e toda a análise (estratégias, logs e upsert no
+Supabase) é refeita para chegar exatamente na mesma decisão.
+
+A impressão do histórico é formada pelo id da operação mais recente, pela
+quantidade de operações retornadas e pelo estado de persistência do radar.
+Enquanto a impressão não muda, a decisão memorizada é devolvida e o ciclo
+pode pular análise, logs e envio.
+
+Uso:
+    memo = MemoAnaliseRadar('radar_analyzer')
+    impressao = memo.impressao(ultimo_id, len(historico), estado)
+    decisao = memo.consultar(impressao)
+    if decisao is None:
+        decisao = analisar(historico)
+        memo.armazenar(impressao, decisao, duracao_s)
+"""
+
+import copy
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A cada quantas consultas o resumo de acertos é registrado no log
+INTERVALO_RELATORIO = 60
+
+class MemoAnaliseRadar:
+    """
+    Memória de uma única entrada para a última decisão de análise.
+
+    Como o id das operações só cresce, apenas a impressão mais recente pode
+    voltar a ser consultada: guardar uma entrada basta e mantém tudo O(1).
+    """
+
+    def __init__(self, nome: str, intervalo_relatorio: int = INTERVALO_RELATORIO):
+        self.nome = nome
+        self.intervalo_relatorio = intervalo_relatorio
+        self._impressao: Optional[Tuple] = None
+        self._decisao: Any = None
+        self.acertos = 0
+        self.falhas = 0
+        self.invalidacoes = 0
+        self.tempo_analise_total = 0.0
+        self.analises_medidas = 0
+
+    @staticmethod
+    def impressao(ultimo_id: Any, total_operacoes: int, *estado: Any) -> Optional[Tuple]:
+        """Monta a impressão do histórico; sem id da última operação não há impressão"""
+        if ultimo_id is None:
+            return None
+        return (ultimo_id, total_operacoes) + estado
+
+    def consultar(self, impressao: Optional[Tuple]) -> Any:
+        """Retorna uma cópia da decisão memorizada ou None se a impressão mudou"""
+        if impressao is not None and impressao == self._impressao:
+            self.acertos += 1
+            return copy.deepcopy(self._decisao)
+        self.falhas += 1
+        return None
+
+    def armazenar(self, impressao: Optional[Tuple], decisao: Any, duracao_s: float = 0.0):
+        """Memoriza a decisão tomada para a impressão e o custo da análise"""
+        if duracao_s > 0:
+            self.tempo_analise_total += duracao_s
+            self.analises_medidas += 1
+        if impressao is None:
+            return
+        self._impressao = impressao
+        self._decisao = copy.deepcopy(decisao)
+
+    def invalidar(self):
+        """Descarta a decisão memorizada (mudança de estado do radar)"""
+        if self._impressao is not None:
+            self.invalidacoes += 1
+        self._impressao = None
+        self._decisao = None
+
+    @property
+    def consultas(self) -> int:
+        return self.acertos + self.falhas
+
+    @property
+    def taxa_acerto(self) -> float:
+        return self.acertos / self.consultas * 100 if self.consultas else 0.0
+
+    @property
+    def tempo_medio_analise(self) -> float:
+        return self.tempo_analise_total / self.analises_medidas if self.analises_medidas else 0.0
+
+    def obter_estatisticas(self) -> Dict[str, Any]:
+        """Métricas de acerto da memória e tempo de análise economizado"""
+        return {
+            'radar': self.nome,
+            'consultas': self.consultas,
+            'acertos': self.acertos,
+            'falhas': self.falhas,
+            'invalidacoes': self.invalidacoes,
+            'taxa_acerto': round(self.taxa_acerto, 2),
+            'tempo_medio_analise_ms': round(self.tempo_medio_analise * 1000, 3),
+            'tempo_economizado_s': round(self.acertos * self.tempo_medio_analise, 3),
+        }
+
+    def registrar_resumo(self, log: Optional[logging.Logger] = None, forcar: bool = False):
+        """Registra o resumo de acertos a cada intervalo_relatorio consultas"""
+        if not self.consultas:
+            return
+        if not forcar and self.consultas % self.intervalo_relatorio:
+            return
+        e = self.obter_estatisticas()
+        (log or logger).info(
+            f"[MEMO] {e['radar']}: {e['acertos']}/{e['consultas']} ciclos reaproveitados "
+            f"({e['taxa_acerto']:.1f}%), análise média {e['tempo_medio_analise_ms']:.1f}ms, "
+            f"economizado {e['tempo_economizado_s']:.2f}s"
+        )
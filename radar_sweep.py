@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Radar Sweep - Varredura de parâmetros dos filtros das estratégias
+
+Executa o motor de radar_backtest.py sobre uma grade (ou amostra aleatória) de
+parâmetros e grava uma tabela ranqueada com as combinações.
+
+O histórico é carregado uma única vez em memória compartilhada
+(multiprocessing.shared_memory) e as combinações são divididas em lotes entre
+os processos de um ProcessPoolExecutor, que apenas mapeiam os arrays.
+
+Parâmetros aceitos:
+- parâmetros do kernel (ex.: ``max_losses_15``)
+- parâmetros de uma estratégia do portfólio (ex.: ``CYCLE_TRANSITION.tamanho_ciclo``)
+- parâmetros do motor: ``operacoes_historico``, ``persistencia_operacoes``,
+  ``persistencia_timeout``
+
+Uso:
+    python radar_sweep.py logs.csv --estrategia STABILITY_BREAK \\
+        --grade max_losses_15=0,1,2 --grade min_wins_5=3,4,5 \\
+        --grade operacoes_historico=20,30,35 --saida sweep.csv
+    python radar_sweep.py logs.csv --estrategia PRECISION_SURGE \\
+        --intervalo max_losses_15=0:4 --intervalo persistencia_timeout=60:600 --amostras 500
+"""
+
+import os
+import sys
+import csv
+import time
+import random
+import logging
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from radar_backtest import ESTRATEGIAS, BacktestEngine, ler_operacoes_em_blocos
+
+logger = logging.getLogger(__name__)
+
+PARAMETROS_MOTOR = ('operacoes_historico', 'persistencia_operacoes', 'persistencia_timeout')
+METRICAS_RANKING = ('taxa_acerto', 'lucro_total', 'taxa_vitoria_trades', 'sinais_por_hora')
+TAMANHO_LOTE = 8  # combinações por tarefa enviada aos processos
+
+# ===== ESPAÇO DE BUSCA =====
+
+def gerar_grade(grade: Dict[str, Sequence]) -> List[Dict]:
+    """Produto cartesiano de ``{parametro: [valores]}``"""
+    if not grade:
+        return [{}]
+    nomes = list(grade)
+    return [dict(zip(nomes, valores)) for valores in itertools.product(*(grade[n] for n in nomes))]
+
+def gerar_aleatorio(intervalos: Dict[str, Tuple], amostras: int, semente: int = 42) -> List[Dict]:
+    """
+    Amostra aleatória de ``{parametro: (minimo, maximo)}``.
+
+    Intervalos com limites inteiros geram inteiros; caso contrário, floats.
+    Combinações repetidas são descartadas.
+    """
+    rng = random.Random(semente)
+    combinacoes, vistas = [], set()
+    for _ in range(amostras * 10):
+        if len(combinacoes) >= amostras:
+            break
+        combinacao = {}
+        for nome, (minimo, maximo) in intervalos.items():
+            if isinstance(minimo, int) and isinstance(maximo, int):
+                combinacao[nome] = rng.randint(minimo, maximo)
+            else:
+                combinacao[nome] = round(rng.uniform(minimo, maximo), 4)
+        chave = tuple(sorted(combinacao.items()))
+        if chave not in vistas:
+            vistas.add(chave)
+            combinacoes.append(combinacao)
+    return combinacoes
+
+def separar_parametros(combinacao: Dict) -> Tuple[Dict, Dict]:
+    """Separa uma combinação em (parâmetros do kernel, opções do motor)"""
+    parametros, opcoes = {}, {}
+    for nome, valor in combinacao.items():
+        if nome in PARAMETROS_MOTOR:
+            opcoes[nome] = valor
+        elif '.' in nome:
+            estrategia, parametro = nome.split('.', 1)
+            parametros.setdefault(estrategia, {})[parametro] = valor
+        else:
+            parametros[nome] = valor
+    return parametros, opcoes
+
+# ===== HISTÓRICO EM MEMÓRIA COMPARTILHADA =====
+
+class HistoricoCompartilhado:
+    """Arrays de resultados, lucros e timestamps num único bloco de memória compartilhada"""
+
+    def __init__(self, resultados: np.ndarray, lucros: np.ndarray, timestamps: np.ndarray):
+        self.tamanho = len(resultados)
+        bytes_totais = max(1, self.tamanho * (1 + 8 + 8))
+        self.memoria = shared_memory.SharedMemory(create=True, size=bytes_totais)
+        r, l, t = self.mapear(self.memoria.buf, self.tamanho)
+        r[:] = resultados
+        l[:] = lucros
+        t[:] = timestamps
+
+    @staticmethod
+    def mapear(buffer, tamanho: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # float64 primeiro para manter o alinhamento
+        lucros = np.ndarray((tamanho,), dtype=np.float64, buffer=buffer, offset=0)
+        timestamps = np.ndarray((tamanho,), dtype=np.float64, buffer=buffer, offset=tamanho * 8)
+        resultados = np.ndarray((tamanho,), dtype=np.uint8, buffer=buffer, offset=tamanho * 16)
+        return resultados, lucros, timestamps
+
+    @property
+    def nome(self) -> str:
+        return self.memoria.name
+
+    def fechar(self):
+        self.memoria.close()
+        self.memoria.unlink()
+
+# Estado de cada processo trabalhador
+_memoria_worker = None
+_arrays_worker: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+def _inicializar_worker(nome_memoria: str, tamanho: int):
+    global _memoria_worker, _arrays_worker
+    _memoria_worker = shared_memory.SharedMemory(name=nome_memoria)
+    _arrays_worker = HistoricoCompartilhado.mapear(_memoria_worker.buf, tamanho)
+
+def avaliar_combinacao(estrategia: str, combinacao: Dict, resultados: np.ndarray,
+                       lucros: np.ndarray, timestamps: np.ndarray) -> Dict:
+    """Roda o backtest de uma combinação e devolve uma linha da tabela"""
+    parametros, opcoes = separar_parametros(combinacao)
+    motor = BacktestEngine(estrategia, parametros, **opcoes)
+    motor.processar_bloco(resultados, lucros, timestamps)
+    metricas = motor.finalizar().to_dict()
+    metricas.pop('sinais_por_estrategia', None)
+    return {'estrategia': estrategia, **combinacao, **{k: v for k, v in metricas.items() if k != 'estrategia'}}
+
+def _avaliar_lote(estrategia: str, lote: List[Dict]) -> List[Dict]:
+    resultados, lucros, timestamps = _arrays_worker
+    return [avaliar_combinacao(estrategia, combinacao, resultados, lucros, timestamps) for combinacao in lote]
+
+# ===== VARREDURA =====
+
+def ranquear(linhas: List[Dict], metrica: str = 'taxa_acerto', min_sinais: int = 1) -> List[Dict]:
+    """Ordena pela métrica (desc), desempatando por número de sinais; linhas com poucos sinais vão ao fim"""
+    def chave(linha):
+        return (linha['sinais'] >= min_sinais, linha.get(metrica, 0), linha['sinais'])
+    ordenadas = sorted(linhas, key=chave, reverse=True)
+    for posicao, linha in enumerate(ordenadas, 1):
+        linha['rank'] = posicao
+    return ordenadas
+
+def executar_sweep(estrategia: str, combinacoes: List[Dict], resultados: np.ndarray, lucros: np.ndarray,
+                   timestamps: np.ndarray, workers: Optional[int] = None, tamanho_lote: int = TAMANHO_LOTE,
+                   metrica: str = 'taxa_acerto', min_sinais: int = 1) -> List[Dict]:
+    """
+    Avalia todas as combinações em paralelo e devolve a tabela ranqueada.
+
+    Com ``workers=1`` roda no processo atual (útil para depuração).
+    """
+    if estrategia not in ESTRATEGIAS:
+        raise ValueError(f"Estratégia desconhecida: {estrategia}")
+    if metrica not in METRICAS_RANKING:
+        raise ValueError(f"Métrica de ranking inválida: {metrica}. Use: {', '.join(METRICAS_RANKING)}")
+
+    workers = workers or os.cpu_count() or 1
+    inicio = time.time()
+    linhas: List[Dict] = []
+
+    if workers == 1:
+        for combinacao in combinacoes:
+            linhas.append(avaliar_combinacao(estrategia, combinacao, resultados, lucros, timestamps))
+    else:
+        historico = HistoricoCompartilhado(resultados, lucros, timestamps)
+        try:
+            lotes = [combinacoes[i:i + tamanho_lote] for i in range(0, len(combinacoes), tamanho_lote)]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_inicializar_worker,
+                                     initargs=(historico.nome, historico.tamanho)) as executor:
+                futuros = [executor.submit(_avaliar_lote, estrategia, lote) for lote in lotes]
+                for concluidos, futuro in enumerate(as_completed(futuros), 1):
+                    linhas.extend(futuro.result())
+                    if concluidos % max(1, len(lotes) // 10) == 0:
+                        logger.info(f"[SWEEP] {len(linhas)}/{len(combinacoes)} combinações avaliadas")
+        finally:
+            historico.fechar()
+
+    duracao = time.time() - inicio
+    logger.info(f"[SWEEP] {len(combinacoes)} combinações em {duracao:.1f}s com {workers} processo(s)")
+    return ranquear(linhas, metrica, min_sinais)
+
+def salvar_tabela(linhas: List[Dict], caminho: str) -> None:
+    """Grava a tabela ranqueada em CSV"""
+    if not linhas:
+        return
+    colunas = ['rank'] + [c for c in linhas[0] if c != 'rank']
+    for linha in linhas:
+        colunas.extend(c for c in linha if c not in colunas)
+    with open(caminho, 'w', newline='', encoding='utf-8') as f:
+        escritor = csv.DictWriter(f, fieldnames=colunas)
+        escritor.writeheader()
+        escritor.writerows(linhas)
+
+def _interpretar_valor(texto: str):
+    for conversor in (int, float):
+        try:
+            return conversor(texto)
+        except ValueError:
+            pass
+    return texto
+
+def _interpretar_grade(itens: List[str]) -> Dict[str, List]:
+    grade = {}
+    for item in itens or []:
+        nome, valores = item.split('=', 1)
+        grade[nome] = [_interpretar_valor(v) for v in valores.split(',')]
+    return grade
+
+def _interpretar_intervalos(itens: List[str]) -> Dict[str, Tuple]:
+    intervalos = {}
+    for item in itens or []:
+        nome, faixa = item.split('=', 1)
+        minimo, maximo = faixa.split(':', 1)
+        intervalos[nome] = (_interpretar_valor(minimo), _interpretar_valor(maximo))
+    return intervalos
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='Varredura de parâmetros das estratégias dos radares')
+    parser.add_argument('arquivo', help='Export da tabela de logs (CSV ou Parquet)')
+    parser.add_argument('--estrategia', required=True, help=f"Uma de: {', '.join(ESTRATEGIAS)}")
+    parser.add_argument('--grade', action='append', help='nome=v1,v2,v3 (pode repetir)')
+    parser.add_argument('--intervalo', action='append', help='nome=min:max para busca aleatória')
+    parser.add_argument('--amostras', type=int, default=200, help='Combinações da busca aleatória')
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--metrica', default='taxa_acerto', choices=METRICAS_RANKING)
+    parser.add_argument('--min-sinais', type=int, default=30, help='Sinais mínimos para entrar no ranking')
+    parser.add_argument('--saida', default='sweep_resultados.csv')
+    args = parser.parse_args()
+
+    grade = _interpretar_grade(args.grade)
+    intervalos = _interpretar_intervalos(args.intervalo)
+    combinacoes = gerar_grade(grade)
+    if intervalos:
+        aleatorias = gerar_aleatorio(intervalos, args.amostras, args.semente)
+        combinacoes = [{**g, **a} for g in combinacoes for a in aleatorias]
+
+    blocos = list(ler_operacoes_em_blocos(args.arquivo))
+    resultados = np.concatenate([b[0] for b in blocos])
+    lucros = np.concatenate([b[1] for b in blocos])
+    timestamps = np.concatenate([b[2] for b in blocos])
+    print(f"* {len(resultados)} operações carregadas, {len(combinacoes)} combinações para {args.estrategia}")
+
+    linhas = executar_sweep(args.estrategia, combinacoes, resultados, lucros, timestamps,
+                            workers=args.workers, metrica=args.metrica, min_sinais=args.min_sinais)
+    salvar_tabela(linhas, args.saida)
+
+    print(f"\n* Top 10 por {args.metrica} (mínimo {args.min_sinais} sinais):")
+    for linha in linhas[:10]:
+        parametros = {k: linha[k] for k in combinacoes[0]} if combinacoes and combinacoes[0] else {}
+        print(f"  #{linha['rank']:<3} {linha[args.metrica]:>8} | sinais={linha['sinais']:<6} "
+              f"lucro={linha['lucro_total']:.1f} dd={linha['max_drawdown']:.1f} | {parametros}")
+    print(f"* Tabela completa salva em {args.saida}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
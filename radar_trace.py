@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Radar Trace - Rastro estruturado e preguiçoso para os caminhos quentes dos radares
+
+A análise do portfólio montava dezenas de f-strings por ciclo (sequências com
+' '.join(historico), resultados de filtros, cálculos de ciclo) e as gravava no
+log mesmo quando ninguém iria lê-las. Aqui cada linha vira um registro com o
+modelo (str.format) e os argumentos crus, guardado num buffer circular em
+memória. A formatação só acontece quando o buffer é descarregado:
+
+- automaticamente quando o logger do radar registra um ERROR/CRITICAL
+  (o rastro do ciclo que falhou vai junto para o log);
+- sob demanda via HTTP (GET /trace) ou chamando descarregar().
+
+Argumentos caros podem ser adiados com Adiado(funcao, *args), que só é
+executado na formatação. Com RADAR_TRACE=quiet o radar usa um TraceNulo e
+nenhum registro, formatação ou print acontece no caminho de análise. Chamadas
+com argumentos já calculados vão direto (no TraceNulo custam uma chamada
+vazia); cada seção de log que monta argumentos (fatias do histórico, objetos
+Adiado) fica sob um ``if trace.ativo:``, então em modo silencioso eles nem são
+construídos.
+
+Variáveis de ambiente:
+    RADAR_TRACE=quiet           desliga rastro e saída de console da análise
+    RADAR_TRACE_CAPACIDADE=N    tamanho do buffer circular (padrão 5000)
+    RADAR_TRACE_PORTA=P         porta do endpoint HTTP /trace (desligado se vazio)
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+# Chave "de compilação": lida uma única vez na importação
+SILENCIOSO = os.getenv('RADAR_TRACE', '').strip().lower() in ('quiet', 'silencioso', 'off', '0')
+CAPACIDADE_PADRAO = int(os.getenv('RADAR_TRACE_CAPACIDADE', '5000'))
+
+class Adiado:
+    """Valor calculado apenas quando o registro é formatado"""
+
+    __slots__ = ('funcao', 'args')
+
+    def __init__(self, funcao, *args):
+        self.funcao = funcao
+        self.args = args
+
+    def resolver(self) -> Any:
+        return self.funcao(*self.args)
+
+def _resolver(valor: Any) -> Any:
+    return valor.resolver() if isinstance(valor, Adiado) else valor
+
+class RadarTrace:
+    """
+    Buffer circular de registros (instante, nível, modelo, args).
+
+    registrar() guarda linhas de depuração; saida() também ecoa no console
+    quando o logger do radar está em DEBUG, substituindo os prints da análise.
+    """
+
+    ativo = True
+
+    def __init__(self, nome: str, log: Optional[logging.Logger] = None,
+                 capacidade: int = CAPACIDADE_PADRAO):
+        self.nome = nome
+        self.log = log or logger
+        self.capacidade = capacidade
+        self._registros = deque(maxlen=capacidade)
+        self._lock = threading.Lock()
+        self.total_registros = 0
+        self.descarregamentos = 0
+
+    def registrar(self, modelo: str, *args: Any):
+        """Guarda uma linha de depuração sem formatá-la"""
+        with self._lock:
+            self._registros.append((time.time(), 'DEBUG', modelo, args))
+            self.total_registros += 1
+
+    def saida(self, modelo: str, *args: Any):
+        """Linha de console da análise: guardada no rastro e impressa só em DEBUG"""
+        with self._lock:
+            self._registros.append((time.time(), 'CONSOLE', modelo, args))
+            self.total_registros += 1
+        if self.log.isEnabledFor(logging.DEBUG):
+            print(self._formatar_mensagem(modelo, args))
+
+    @staticmethod
+    def _formatar_mensagem(modelo: str, args: tuple) -> str:
+        if not args:
+            return modelo
+        try:
+            return modelo.format(*[_resolver(a) for a in args])
+        except Exception as e:
+            return f"{modelo} {args!r} (falha ao formatar: {e})"
+
+    def _copiar(self, limpar: bool) -> List[tuple]:
+        with self._lock:
+            registros = list(self._registros)
+            if limpar:
+                self._registros.clear()
+        return registros
+
+    def formatar(self, limpar: bool = False) -> List[Dict[str, Any]]:
+        """Formata os registros do buffer (opcionalmente esvaziando-o)"""
+        return [
+            {
+                'instante': datetime.fromtimestamp(instante).isoformat(timespec='milliseconds'),
+                'nivel': nivel,
+                'mensagem': self._formatar_mensagem(modelo, args),
+            }
+            for instante, nivel, modelo, args in self._copiar(limpar)
+        ]
+
+    def descarregar(self, motivo: str = 'sob demanda') -> int:
+        """Escreve o rastro acumulado no log e esvazia o buffer"""
+        registros = self.formatar(limpar=True)
+        if not registros:
+            return 0
+        self.descarregamentos += 1
+        logger.info(f"[TRACE] {self.nome}: descarregando {len(registros)} registros ({motivo})")
+        for r in registros:
+            logger.info(f"[TRACE] {r['instante']} {r['mensagem']}")
+        return len(registros)
+
+    def obter_estatisticas(self) -> Dict[str, Any]:
+        return {
+            'radar': self.nome,
+            'ativo': self.ativo,
+            'capacidade': self.capacidade,
+            'em_buffer': len(self._registros),
+            'total_registros': self.total_registros,
+            'descarregamentos': self.descarregamentos,
+        }
+
+class TraceNulo:
+    """Substituto do RadarTrace em modo silencioso: nada é guardado nem formatado"""
+
+    ativo = False
+    nome = ''
+
+    def registrar(self, modelo: str, *args: Any):
+        pass
+
+    def saida(self, modelo: str, *args: Any):
+        pass
+
+    def formatar(self, limpar: bool = False) -> List[Dict[str, Any]]:
+        return []
+
+    def descarregar(self, motivo: str = 'sob demanda') -> int:
+        return 0
+
+    def obter_estatisticas(self) -> Dict[str, Any]:
+        return {'radar': self.nome, 'ativo': False}
+
+class _DescarregarEmErro(logging.Handler):
+    """Handler que descarrega o rastro quando o radar registra um erro"""
+
+    def __init__(self, trace: RadarTrace):
+        super().__init__(level=logging.ERROR)
+        self.trace = trace
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self.trace.descarregar(f"erro: {record.getMessage()[:80]}")
+        except Exception:
+            self.handleError(record)
+
+def criar_trace(nome: str, log: Optional[logging.Logger] = None):
+    """
+    Cria o rastro do radar conforme RADAR_TRACE.
+
+    Em modo normal o rastro é descarregado automaticamente nos erros do
+    logger informado; em modo silencioso retorna um TraceNulo.
+    """
+    if SILENCIOSO:
+        trace = TraceNulo()
+        trace.nome = nome
+        return trace
+    trace = RadarTrace(nome, log)
+    if log is not None:
+        log.addHandler(_DescarregarEmErro(trace))
+    return trace
+
+def iniciar_servidor_trace(trace, porta: Optional[int] = None) -> Optional[ThreadingHTTPServer]:
+    """
+    Sobe o endpoint HTTP do rastro numa thread daemon.
+
+    GET /trace               registros formatados em JSON
+    GET /trace?descarregar=1 além disso grava no log e esvazia o buffer
+    """
+    if porta is None:
+        valor = os.getenv('RADAR_TRACE_PORTA', '').strip()
+        if not valor:
+            return None
+        porta = int(valor)
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path != '/trace':
+                self.send_error(404)
+                return
+            descarregar = parse_qs(url.query).get('descarregar', ['0'])[0] == '1'
+            corpo = {
+                'estatisticas': trace.obter_estatisticas(),
+                'registros': trace.formatar(limpar=False),
+            }
+            if descarregar:
+                trace.descarregar('endpoint HTTP')
+            dados = json.dumps(corpo, ensure_ascii=False).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(dados)))
+            self.end_headers()
+            self.wfile.write(dados)
+
+        def log_message(self, format, *args):
+            pass
+
+    servidor = ThreadingHTTPServer(('127.0.0.1', porta), _Handler)
+    threading.Thread(target=servidor.serve_forever, name=f"trace-{trace.nome}", daemon=True).start()
+    logger.info(f"[TRACE] Endpoint disponível em http://localhost:{servidor.server_address[1]}/trace")
+    return servidor
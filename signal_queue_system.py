@@ -1,28 +1,42 @@
+"""
+Fila de sinais de trading com circuit breaker
+
+Roda inteira no event loop do bot: sem locks (só a thread do loop toca a
+fila e os contadores) e idades medidas com time.monotonic().
+"""
+
 import asyncio
 import time
-import threading
-from dataclasses import dataclass
+import itertools
 from typing import Optional, List, Any, Callable
 from enum import Enum
 import logging
 from collections import deque
-import uuid
 
 class CircuitBreakerState(Enum):
     CLOSED = "closed"    # Funcionando normalmente
     OPEN = "open"        # Bloqueado por falhas
     HALF_OPEN = "half_open"  # Testando recuperação
 
-@dataclass
 class QueuedSignal:
     """Estrutura para sinal enfileirado"""
-    ticks_data: List[float]
-    pattern_detected: bool
-    timestamp: float
-    signal_id: str
-    priority: int = 0
-    retry_count: int = 0
-    max_retries: int = 3
+    
+    __slots__ = ('ticks_data', 'pattern_detected', 'timestamp', 'signal_id',
+                 'priority', 'retry_count', 'max_retries')
+    
+    def __init__(self, ticks_data: List[float], pattern_detected: bool, timestamp: float, signal_id: str,
+                 priority: int = 0, retry_count: int = 0, max_retries: int = 3):
+        self.ticks_data = ticks_data
+        self.pattern_detected = pattern_detected
+        self.timestamp = timestamp  # time.monotonic() do (re)enfileiramento
+        self.signal_id = signal_id
+        self.priority = priority
+        self.retry_count = retry_count
+        self.max_retries = max_retries
+    
+    def __repr__(self):
+        return (f"QueuedSignal(signal_id={self.signal_id!r}, pattern_detected={self.pattern_detected}, "
+                f"priority={self.priority}, retry_count={self.retry_count})")
 
 class CircuitBreaker:
     """Circuit breaker para proteção contra falhas consecutivas"""
@@ -46,7 +60,7 @@ class CircuitBreaker:
     def record_failure(self):
         """Registra falha de operação"""
         self.failure_count += 1
-        self.last_failure_time = time.time()
+        self.last_failure_time = time.monotonic()
         
         if self.failure_count >= self.failure_threshold and self.state == CircuitBreakerState.CLOSED:
             self.state = CircuitBreakerState.OPEN
@@ -58,7 +72,7 @@ class CircuitBreaker:
             return True
         
         if self.state == CircuitBreakerState.OPEN:
-            if time.time() - self.last_failure_time > self.recovery_timeout:
+            if time.monotonic() - self.last_failure_time > self.recovery_timeout:
                 self.state = CircuitBreakerState.HALF_OPEN
                 self.logger.info("Circuit breaker: Tentando recuperação")
                 return True
@@ -83,20 +97,21 @@ class CircuitBreaker:
             "state": self.state.value,
             "failure_count": self.failure_count,
             "failure_threshold": self.failure_threshold,
-            "last_failure_age": time.time() - self.last_failure_time if self.last_failure_time > 0 else None,
+            "last_failure_age": time.monotonic() - self.last_failure_time if self.last_failure_time > 0 else None,
             "recovery_timeout": self.recovery_timeout
         }
 
 class ThreadSafeSignalQueue:
-    """Fila thread-safe para processamento de sinais de trading"""
+    """Fila de sinais de trading do event loop (nome mantido por compatibilidade)"""
     
     def __init__(self, max_size: int = 10, max_concurrent: int = 2):
         self.max_size = max_size
         self.max_concurrent = max_concurrent
         self.queue = deque(maxlen=max_size)
         self.processing_count = 0
-        self.lock = threading.Lock()
         self.semaphore = asyncio.Semaphore(max_concurrent)
+        self._sinal_disponivel = asyncio.Event()
+        self._ids = itertools.count(1)
         self.circuit_breaker = CircuitBreaker()
         self.logger = logging.getLogger(__name__)
         
@@ -124,71 +139,71 @@ class ThreadSafeSignalQueue:
     def queue_signal(self, ticks_data: List[float], pattern_detected: bool) -> bool:
         """Adiciona sinal à fila com controle de fluxo"""
         try:
-            with self.lock:
-                # Verificar circuit breaker
-                if not self.circuit_breaker.can_execute():
-                    self.logger.warning("Sinal rejeitado - Circuit breaker aberto")
-                    return False
-                
-                # Verificar tamanho da fila
-                if len(self.queue) >= self.max_size:
-                    self.logger.warning("Sinal rejeitado - Fila cheia")
-                    if self.on_queue_full:
-                        try:
-                            self.on_queue_full(len(self.queue))
-                        except Exception as e:
-                            self.logger.error(f"Erro no callback queue_full: {e}")
-                    return False
-                
-                # Criar sinal
-                signal = QueuedSignal(
-                    ticks_data=ticks_data.copy(),
-                    pattern_detected=pattern_detected,
-                    timestamp=time.time(),
-                    signal_id=f"signal_{uuid.uuid4().hex[:8]}",
-                    priority=1 if pattern_detected else 0
-                )
-                
-                # Adicionar à fila (prioridade para padrões detectados)
-                if pattern_detected:
-                    # Inserir no início para prioridade
-                    self.queue.appendleft(signal)
-                else:
-                    self.queue.append(signal)
-                
-                self.total_signals += 1
-                self.last_signal_time = time.time()
-                
-                self.logger.debug(f"Sinal enfileirado: {signal.signal_id}, pattern={pattern_detected}")
-                return True
-                
+            # Verificar circuit breaker
+            if not self.circuit_breaker.can_execute():
+                self.logger.warning("Sinal rejeitado - Circuit breaker aberto")
+                return False
+            
+            # Verificar tamanho da fila
+            if len(self.queue) >= self.max_size:
+                self.logger.warning("Sinal rejeitado - Fila cheia")
+                if self.on_queue_full:
+                    try:
+                        resultado = self.on_queue_full(len(self.queue))
+                        if asyncio.iscoroutine(resultado):
+                            asyncio.ensure_future(resultado)
+                    except Exception as e:
+                        self.logger.error(f"Erro no callback queue_full: {e}")
+                return False
+            
+            agora = time.monotonic()
+            signal = QueuedSignal(list(ticks_data), pattern_detected, agora,
+                                  f"signal_{next(self._ids):08x}", 1 if pattern_detected else 0)
+            
+            # Adicionar à fila (prioridade para padrões detectados)
+            if pattern_detected:
+                # Inserir no início para prioridade
+                self.queue.appendleft(signal)
+            else:
+                self.queue.append(signal)
+            self._sinal_disponivel.set()
+            
+            self.total_signals += 1
+            self.last_signal_time = agora
+            
+            self.logger.debug(f"Sinal enfileirado: {signal.signal_id}, pattern={pattern_detected}")
+            return True
+            
         except Exception as e:
             self.logger.error(f"Erro ao enfileirar sinal: {e}")
             return False
     
     def get_next_signal(self) -> Optional[QueuedSignal]:
         """Obtém próximo sinal da fila (não bloqueante)"""
-        try:
-            with self.lock:
-                if not self.queue:
-                    return None
-                
-                signal = self.queue.popleft()
-                self.processed_signals += 1
-                
-                self.logger.debug(f"Sinal desenfileirado: {signal.signal_id}")
-                return signal
-                
-        except Exception as e:
-            self.logger.error(f"Erro ao obter sinal: {e}")
+        if not self.queue:
+            self._sinal_disponivel.clear()
             return None
+        
+        signal = self.queue.popleft()
+        if not self.queue:
+            self._sinal_disponivel.clear()
+        self.processed_signals += 1
+        
+        self.logger.debug(f"Sinal desenfileirado: {signal.signal_id}")
+        return signal
+    
+    async def aguardar_sinal(self) -> QueuedSignal:
+        """Aguarda o próximo sinal, acordando no enfileiramento (sem poll)"""
+        while not self.queue:
+            await self._sinal_disponivel.wait()
+            self._sinal_disponivel.clear()
+        return self.get_next_signal()
     
     async def process_signal_async(self, signal: QueuedSignal, processor_func: Callable) -> bool:
         """Processa sinal de forma assíncrona com controle de concorrência"""
         async with self.semaphore:
             try:
-                with self.lock:
-                    self.processing_count += 1
+                self.processing_count += 1
                 
                 self.logger.info(f"Processando sinal: {signal.signal_id}")
                 
@@ -234,8 +249,7 @@ class ThreadSafeSignalQueue:
                 return False
                 
             finally:
-                with self.lock:
-                    self.processing_count -= 1
+                self.processing_count -= 1
     
     def retry_signal(self, signal: QueuedSignal) -> bool:
         """Recoloca sinal na fila para retry"""
@@ -244,30 +258,27 @@ class ThreadSafeSignalQueue:
             return False
         
         signal.retry_count += 1
-        signal.timestamp = time.time()  # Atualizar timestamp
+        signal.timestamp = time.monotonic()  # Atualizar timestamp
+        
+        # Adicionar no final da fila para retry
+        self.queue.append(signal)
+        self._sinal_disponivel.set()
         
-        with self.lock:
-            # Adicionar no final da fila para retry
-            self.queue.append(signal)
-            
         self.logger.info(f"Sinal {signal.signal_id} recolocado na fila (tentativa {signal.retry_count})")
         return True
     
     def clear_queue(self):
         """Limpa toda a fila"""
-        with self.lock:
-            cleared_count = len(self.queue)
-            self.queue.clear()
-            
+        cleared_count = len(self.queue)
+        self.queue.clear()
+        self._sinal_disponivel.clear()
+        
         self.logger.info(f"Fila limpa - {cleared_count} sinais removidos")
     
     def get_queue_stats(self) -> dict:
         """Retorna estatísticas da fila"""
-        with self.lock:
-            current_size = len(self.queue)
-            
         return {
-            "current_size": current_size,
+            "current_size": len(self.queue),
             "max_size": self.max_size,
             "processing_count": self.processing_count,
             "max_concurrent": self.max_concurrent,
@@ -276,7 +287,7 @@ class ThreadSafeSignalQueue:
             "failed_signals": self.failed_signals,
             "successful_operations": self.successful_operations,
             "failed_operations": self.failed_operations,
-            "last_signal_age": time.time() - self.last_signal_time if self.last_signal_time > 0 else None,
+            "last_signal_age": time.monotonic() - self.last_signal_time if self.last_signal_time > 0 else None,
             "circuit_breaker": self.circuit_breaker.get_stats()
         }
     
@@ -313,47 +324,41 @@ class ThreadSafeSignalQueue:
     
     def reset_stats(self):
         """Reseta estatísticas da fila"""
-        with self.lock:
-            self.total_signals = 0
-            self.processed_signals = 0
-            self.failed_signals = 0
-            self.successful_operations = 0
-            self.failed_operations = 0
-            
+        self.total_signals = 0
+        self.processed_signals = 0
+        self.failed_signals = 0
+        self.successful_operations = 0
+        self.failed_operations = 0
+        
         self.circuit_breaker.reset()
         self.logger.info("Estatísticas da fila resetadas")
     
     def get_pending_signals(self) -> List[dict]:
         """Retorna lista de sinais pendentes na fila"""
-        with self.lock:
-            return [
-                {
-                    "signal_id": signal.signal_id,
-                    "pattern_detected": signal.pattern_detected,
-                    "timestamp": signal.timestamp,
-                    "priority": signal.priority,
-                    "retry_count": signal.retry_count,
-                    "age": time.time() - signal.timestamp
-                }
-                for signal in self.queue
-            ]
+        agora = time.monotonic()
+        return [
+            {
+                "signal_id": signal.signal_id,
+                "pattern_detected": signal.pattern_detected,
+                "timestamp": signal.timestamp,
+                "priority": signal.priority,
+                "retry_count": signal.retry_count,
+                "age": agora - signal.timestamp
+            }
+            for signal in self.queue
+        ]
     
     def remove_old_signals(self, max_age: float = 300.0) -> int:
         """Remove sinais antigos da fila (mais de max_age segundos)"""
-        current_time = time.time()
-        removed_count = 0
+        current_time = time.monotonic()
+        tamanho_anterior = len(self.queue)
         
-        with self.lock:
-            # Criar nova deque sem sinais antigos
-            new_queue = deque(maxlen=self.max_size)
-            
-            for signal in self.queue:
-                if current_time - signal.timestamp <= max_age:
-                    new_queue.append(signal)
-                else:
-                    removed_count += 1
-            
-            self.queue = new_queue
+        # Criar nova deque sem sinais antigos
+        self.queue = deque((signal for signal in self.queue if current_time - signal.timestamp <= max_age),
+                           maxlen=self.max_size)
+        removed_count = tamanho_anterior - len(self.queue)
+        if not self.queue:
+            self._sinal_disponivel.clear()
         
         if removed_count > 0:
             self.logger.info(f"Removidos {removed_count} sinais antigos da fila")
@@ -430,14 +435,9 @@ class SignalQueueManager:
         """Loop principal de processamento"""
         while self.running:
             try:
-                signal = self.queue.get_next_signal()
+                signal = await self.queue.aguardar_sinal()
+                await self.queue.process_signal_async(signal, processor_func)
                 
-                if signal:
-                    await self.queue.process_signal_async(signal, processor_func)
-                else:
-                    # Aguardar um pouco se não há sinais
-                    await asyncio.sleep(0.1)
-                    
             except asyncio.CancelledError:
                 break
             except Exception as e:
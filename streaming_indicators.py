@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Indicadores Técnicos em Streaming (O(1) por tick)
+=================================================
+
+Motor incremental para a estratégia RESET CALL/PUT:
+- SMA (Simple Moving Average): 5, 12, 40, 50 períodos
+- RSI (Relative Strength Index): 3, 7, 10 períodos (média simples e Wilder)
+
+Todos os indicadores compartilham um único anel de preços. O anel guarda,
+para cada posição, o preço, o ganho/perda em relação ao tick anterior e as
+somas acumuladas de preços, ganhos e perdas. Assim:
+
+    SMA(p) = (acum_preco[i] - acum_preco[i - p]) / p
+    RSI(n) usa (acum_ganho[i] - acum_ganho[i - n]) / n e o mesmo para perdas
+
+e o custo por tick não depende do tamanho das janelas.
+
+Para não perder precisão com somas acumuladas crescendo indefinidamente, as
+somas são rebaseadas a cada REBASE_TICKS ticks (recalculadas a partir dos
+últimos preços do anel). A API em lote (calculate_batch) replica exatamente
+essa sequência de operações com np.cumsum por segmento, então os dois
+caminhos produzem os mesmos bits.
+"""
+
+import logging
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SMA_PERIODOS = (5, 12, 40, 50)
+RSI_PERIODOS = (3, 7, 10)
+REBASE_TICKS = 4096  # ticks entre recálculos das somas acumuladas
+
+def rsi_de_medias(avg_gain: float, avg_loss: float) -> float:
+    """RSI a partir das médias de ganho e perda (mesma fórmula de TechnicalIndicators)"""
+    if avg_loss == 0:
+        return 100.0
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+def classificar_sinal_reset(sma5: float, sma12: float, sma40: float, sma50: float, rsi3: float,
+                            current_price: float, previous_price: float) -> Optional[str]:
+    """
+    Regra RESETCALL/RESETPUT de TechnicalAnalysis.analyze_entry_signal
+
+    Returns:
+        "RESETCALL", "RESETPUT" ou None
+    """
+    # Condição principal: SMA40 > SMA50 AND SMA5 > SMA12 AND 55 < RSI3 < 75
+    if sma40 > sma50 and sma5 > sma12 and 55 < rsi3 < 75:
+        return "RESETCALL"
+    # Condição principal: SMA40 < SMA50 AND SMA5 < SMA12 AND 25 < RSI3 < 45
+    if sma40 < sma50 and sma5 < sma12 and 25 < rsi3 < 45:
+        return "RESETPUT"
+    # Sinais especiais: RSI3 > 85 e preço caindo / RSI3 < 15 e preço subindo
+    if rsi3 > 85 and current_price < previous_price:
+        return "RESETPUT"
+    if rsi3 < 15 and current_price > previous_price:
+        return "RESETCALL"
+    return None
+
+class StreamingIndicators:
+    """Indicadores SMA/RSI incrementais sobre um anel de preços compartilhado"""
+
+    def __init__(self, sma_periods: Sequence[int] = SMA_PERIODOS,
+                 rsi_periods: Sequence[int] = RSI_PERIODOS,
+                 rebase_ticks: int = REBASE_TICKS):
+        self.sma_periods = tuple(sma_periods)
+        self.rsi_periods = tuple(rsi_periods)
+        # Maior distância consultada no anel
+        self.janela = max(self.sma_periods + self.rsi_periods)
+        if rebase_ticks <= self.janela:
+            raise ValueError(f"rebase_ticks ({rebase_ticks}) deve ser maior que a maior janela ({self.janela})")
+        self.rebase_ticks = rebase_ticks
+        self._tamanho = self.janela + 1
+        self._precos = [0.0] * self._tamanho
+        self._ganhos = [0.0] * self._tamanho
+        self._perdas = [0.0] * self._tamanho
+        self._acum_preco = [0.0] * self._tamanho
+        self._acum_ganho = [0.0] * self._tamanho
+        self._acum_perda = [0.0] * self._tamanho
+        # Médias de Wilder por período: [avg_gain, avg_loss] após a semente
+        self._wilder: Dict[int, Optional[list]] = {n: None for n in self.rsi_periods}
+        self.count = 0
+
+    @classmethod
+    def from_prices(cls, prices: Iterable[float], **kwargs) -> 'StreamingIndicators':
+        """Cria o motor já alimentado com uma sequência de preços"""
+        engine = cls(**kwargs)
+        for price in prices:
+            engine.add_price(price)
+        return engine
+
+    @classmethod
+    def from_array(cls, prices, **kwargs) -> 'StreamingIndicators':
+        """
+        Aquece o motor a partir de um array (ex.: resposta de ticks_history).
+
+        O anel é preenchido com as somas acumuladas vetorizadas do último
+        segmento entre rebases; o estado final é idêntico ao de chamar
+        add_price() para cada preço.
+        """
+        engine = cls(**kwargs)
+        prices = np.ascontiguousarray(prices, dtype=np.float64)
+        total = len(prices)
+        if not total:
+            return engine
+        ganhos, perdas = _variacoes(prices)
+        inicio = (total - 1) // engine.rebase_ticks * engine.rebase_ticks
+        origem = max(0, inicio - engine.janela)
+        acumulados = [_acumulado(serie, origem, total) for serie in (prices, ganhos, perdas)]
+        for indice in range(max(0, total - engine._tamanho), total):
+            pos = indice % engine._tamanho
+            engine._precos[pos] = float(prices[indice])
+            engine._ganhos[pos] = float(ganhos[indice])
+            engine._perdas[pos] = float(perdas[indice])
+            local = indice - origem + 1
+            engine._acum_preco[pos] = float(acumulados[0][local])
+            engine._acum_ganho[pos] = float(acumulados[1][local])
+            engine._acum_perda[pos] = float(acumulados[2][local])
+
+        for n in engine.rsi_periods:
+            if total <= n:
+                continue
+            # Semente: média simples das n primeiras variações (ganhos[0] é 0.0)
+            semente_ganho = (float(np.cumsum(ganhos[:n + 1])[-1]) - float(ganhos[0])) / n
+            semente_perda = (float(np.cumsum(perdas[:n + 1])[-1]) - float(perdas[0])) / n
+            media_ganho, media_perda = _medias_wilder(ganhos, perdas, semente_ganho, semente_perda, n)
+            engine._wilder[n] = [float(media_ganho[-1]), float(media_perda[-1])]
+        engine.count = total
+        return engine
+
+    def _rebase(self):
+        """Recalcula as somas acumuladas a partir das últimas `janela` posições"""
+        tamanho = self._tamanho
+        acum_preco = acum_ganho = acum_perda = 0.0
+        for indice in range(self.count - self.janela, self.count):
+            pos = indice % tamanho
+            acum_preco += self._precos[pos]
+            acum_ganho += self._ganhos[pos]
+            acum_perda += self._perdas[pos]
+            self._acum_preco[pos] = acum_preco
+            self._acum_ganho[pos] = acum_ganho
+            self._acum_perda[pos] = acum_perda
+
+    def add_price(self, price: float) -> None:
+        """Adiciona um tick: O(1) para todos os indicadores"""
+        price = float(price)
+        indice = self.count
+        tamanho = self._tamanho
+        if indice and indice % self.rebase_ticks == 0:
+            self._rebase()
+
+        pos = indice % tamanho
+        if indice:
+            anterior = (indice - 1) % tamanho
+            change = price - self._precos[anterior]
+            gain = change if change > 0 else 0.0
+            loss = -change if change < 0 else 0.0
+            self._acum_preco[pos] = self._acum_preco[anterior] + price
+            self._acum_ganho[pos] = self._acum_ganho[anterior] + gain
+            self._acum_perda[pos] = self._acum_perda[anterior] + loss
+        else:
+            gain = loss = 0.0
+            self._acum_preco[pos] = price
+            self._acum_ganho[pos] = 0.0
+            self._acum_perda[pos] = 0.0
+        self._precos[pos] = price
+        self._ganhos[pos] = gain
+        self._perdas[pos] = loss
+        self.count = indice + 1
+
+        # Wilder: semente com a média simples quando há n variações, depois suavização
+        for n, medias in self._wilder.items():
+            if medias is not None:
+                medias[0] = (medias[0] * (n - 1) + gain) / n
+                medias[1] = (medias[1] * (n - 1) + loss) / n
+            elif indice == n:
+                self._wilder[n] = [self._media(self._acum_ganho, n), self._media(self._acum_perda, n)]
+
+    def _media(self, acumulado: list, periodo: int) -> float:
+        """Média das últimas `periodo` posições de uma série acumulada"""
+        ultimo = self.count - 1
+        inicio = ultimo - periodo
+        base = acumulado[inicio % self._tamanho] if inicio >= 0 else 0.0
+        return (acumulado[ultimo % self._tamanho] - base) / periodo
+
+    @property
+    def last_price(self) -> Optional[float]:
+        return self._precos[(self.count - 1) % self._tamanho] if self.count else None
+
+    @property
+    def previous_price(self) -> Optional[float]:
+        return self._precos[(self.count - 2) % self._tamanho] if self.count >= 2 else None
+
+    def sma(self, period: int) -> Optional[float]:
+        """SMA dos últimos `period` preços ou None se dados insuficientes"""
+        if period > self.janela:
+            raise ValueError(f"Período SMA {period} maior que a janela do anel ({self.janela})")
+        if self.count < period:
+            return None
+        return self._media(self._acum_preco, period)
+
+    def rsi(self, period: int) -> Optional[float]:
+        """RSI com médias simples das últimas `period` variações"""
+        if period > self.janela:
+            raise ValueError(f"Período RSI {period} maior que a janela do anel ({self.janela})")
+        if self.count < period + 1:
+            return None
+        return rsi_de_medias(self._media(self._acum_ganho, period), self._media(self._acum_perda, period))
+
+    def rsi_wilder(self, period: int) -> Optional[float]:
+        """RSI com suavização de Wilder (semente = média simples das primeiras `period` variações)"""
+        if period not in self._wilder:
+            raise ValueError(f"Período RSI não configurado: {period}")
+        medias = self._wilder[period]
+        if medias is None:
+            return None
+        return rsi_de_medias(medias[0], medias[1])
+
+    def is_ready(self) -> bool:
+        """Verifica se todas as SMAs já têm dados suficientes"""
+        return self.count >= max(self.sma_periods)
+
+    def get_all(self) -> Dict[str, Optional[float]]:
+        """Retorna todos os indicadores no formato de TechnicalIndicators.get_all_indicators"""
+        indicators = {f'sma_{p}': self.sma(p) for p in self.sma_periods}
+        indicators.update({f'rsi_{p}': self.rsi(p) for p in self.rsi_periods})
+        return indicators
+
+    def reset_signal(self) -> Optional[str]:
+        """Aplica a regra RESETCALL/RESETPUT sobre o estado atual"""
+        if not self.is_ready():
+            return None
+        return classificar_sinal_reset(self.sma(5), self.sma(12), self.sma(40), self.sma(50), self.rsi(3),
+                                       self.last_price, self.previous_price)
+
+# ============================================================================
+# API EM LOTE (NumPy)
+# ============================================================================
+
+# Códigos do array 'sinal' de calcular_indicadores_lote
+SINAL_RESETCALL = 1
+SINAL_RESETPUT = -1
+NOMES_SINAIS = {SINAL_RESETCALL: "RESETCALL", SINAL_RESETPUT: "RESETPUT"}
+
+def _variacoes(prices: np.ndarray):
+    """Ganhos e perdas tick a tick (0.0 no primeiro tick), como em add_price"""
+    changes = np.zeros(len(prices), dtype=np.float64)
+    changes[1:] = prices[1:] - prices[:-1]
+    return np.where(changes > 0, changes, 0.0), np.where(changes < 0, -changes, 0.0)
+
+def _acumulado(serie: np.ndarray, origem: int, fim: int) -> np.ndarray:
+    """
+    Soma acumulada de serie[origem:fim] com um zero à esquerda.
+
+    np.cumsum soma sequencialmente, na mesma ordem do anel, então cada
+    posição tem exatamente o valor que o motor guardaria.
+    """
+    return np.concatenate(([0.0], np.cumsum(serie[origem:fim])))
+
+def _medias_moveis(serie: np.ndarray, periodos: Sequence[int], janela: int,
+                   rebase_ticks: int) -> Dict[int, np.ndarray]:
+    """Médias móveis por diferença de somas acumuladas, segmento a segmento entre rebases"""
+    total = len(serie)
+    medias = {p: np.full(total, np.nan) for p in periodos}
+    for inicio in range(0, total, rebase_ticks):
+        fim = min(inicio + rebase_ticks, total)
+        # Após um rebase o anel soma a partir de `janela` posições antes do segmento
+        origem = max(0, inicio - janela)
+        acumulado = _acumulado(serie, origem, fim)
+        topo = np.arange(inicio - origem + 1, fim - origem + 1)
+        for periodo in periodos:
+            base = topo - periodo
+            valores = (acumulado[topo] - acumulado[np.maximum(base, 0)]) / periodo
+            medias[periodo][inicio:fim] = np.where(base >= 0, valores, np.nan)
+    return medias
+
+def _rsi_lote(avg_gain: np.ndarray, avg_loss: np.ndarray) -> np.ndarray:
+    """Versão vetorizada de rsi_de_medias"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+    return np.where(avg_loss == 0, 100.0, rsi)
+
+def _medias_wilder(ganhos: np.ndarray, perdas: np.ndarray, semente_ganho: float,
+                   semente_perda: float, n: int):
+    """
+    Médias de Wilder a partir da semente no índice n.
+
+    A recorrência depende do valor anterior e não tem forma vetorizada com os
+    mesmos arredondamentos, por isso é um laço sequencial sobre floats.
+    """
+    total = len(ganhos)
+    media_ganho = np.full(total, np.nan)
+    media_perda = np.full(total, np.nan)
+    if total <= n:
+        return media_ganho, media_perda
+    g, l = float(semente_ganho), float(semente_perda)
+    media_ganho[n], media_perda[n] = g, l
+    for indice, (gain, loss) in enumerate(zip(ganhos[n + 1:].tolist(), perdas[n + 1:].tolist()), n + 1):
+        g = (g * (n - 1) + gain) / n
+        l = (l * (n - 1) + loss) / n
+        media_ganho[indice] = g
+        media_perda[indice] = l
+    return media_ganho, media_perda
+
+def _sinais_lote(prices: np.ndarray, sma5: np.ndarray, sma12: np.ndarray, sma40: np.ndarray,
+                 sma50: np.ndarray, rsi3: np.ndarray, pronto: int) -> np.ndarray:
+    """Versão vetorizada de classificar_sinal_reset (mesma ordem de prioridade)"""
+    anterior = np.empty_like(prices)
+    anterior[:1] = np.nan
+    anterior[1:] = prices[:-1]
+    condicoes = [
+        (sma40 > sma50) & (sma5 > sma12) & (rsi3 > 55) & (rsi3 < 75),
+        (sma40 < sma50) & (sma5 < sma12) & (rsi3 > 25) & (rsi3 < 45),
+        (rsi3 > 85) & (prices < anterior),
+        (rsi3 < 15) & (prices > anterior),
+    ]
+    escolhas = [SINAL_RESETCALL, SINAL_RESETPUT, SINAL_RESETPUT, SINAL_RESETCALL]
+    sinal = np.select(condicoes, escolhas, 0).astype(np.int8)
+    sinal[:pronto - 1] = 0
+    return sinal
+
+def calcular_indicadores_lote(prices, sma_periods: Sequence[int] = SMA_PERIODOS,
+                              rsi_periods: Sequence[int] = RSI_PERIODOS,
+                              rebase_ticks: int = REBASE_TICKS,
+                              wilder: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Calcula SMA, RSI e o sinal RESETCALL/RESETPUT para um array de preços.
+
+    Para backtests e aquecimento: cada saída é alinhada a `prices` (NaN onde
+    o indicador ainda não existe) e o valor no índice i é bit a bit igual ao
+    que StreamingIndicators retornaria após receber prices[:i + 1].
+
+    Returns:
+        {'sma_5': ..., 'rsi_3': ..., 'rsi_wilder_3': ... (se wilder), 'sinal': int8}
+        'sinal' usa SINAL_RESETCALL / SINAL_RESETPUT / 0 e só existe quando
+        os períodos da regra (SMA 5/12/40/50 e RSI 3) estão configurados.
+    """
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    sma_periods, rsi_periods = tuple(sma_periods), tuple(rsi_periods)
+    janela = max(sma_periods + rsi_periods)
+    if rebase_ticks <= janela:
+        raise ValueError(f"rebase_ticks ({rebase_ticks}) deve ser maior que a maior janela ({janela})")
+    indices = np.arange(len(prices))
+    ganhos, perdas = _variacoes(prices)
+
+    resultado: Dict[str, np.ndarray] = {}
+    for p, media in _medias_moveis(prices, sma_periods, janela, rebase_ticks).items():
+        resultado[f'sma_{p}'] = media
+    medias_ganho = _medias_moveis(ganhos, rsi_periods, janela, rebase_ticks)
+    medias_perda = _medias_moveis(perdas, rsi_periods, janela, rebase_ticks)
+    for n in rsi_periods:
+        resultado[f'rsi_{n}'] = np.where(indices >= n, _rsi_lote(medias_ganho[n], medias_perda[n]), np.nan)
+        if wilder:
+            semente = (medias_ganho[n][n], medias_perda[n][n]) if len(prices) > n else (0.0, 0.0)
+            media_ganho, media_perda = _medias_wilder(ganhos, perdas, *semente, n)
+            resultado[f'rsi_wilder_{n}'] = _rsi_lote(media_ganho, media_perda)
+
+    if {5, 12, 40, 50} <= set(sma_periods) and 3 in rsi_periods:
+        resultado['sinal'] = _sinais_lote(prices, resultado['sma_5'], resultado['sma_12'], resultado['sma_40'],
+                                          resultado['sma_50'], resultado['rsi_3'], max(sma_periods))
+    return resultado
@@ -7,7 +7,8 @@ from datetime import datetime
 
 # Configurações
 script_a_rodar = "bot_trading_system.py"
-tempo_de_execucao_segundos = 3600  # 1 hora
+# Sem reinício programado do processo: o bot_trading_system faz reinícios
+# rolling, um bot por vez. O supervisor só reinicia o processo se ele morrer.
 pausa_entre_reinicios_segundos = 15
 
 # Estatísticas do supervisor
@@ -116,9 +117,9 @@ def main():
     log_message("🚀 SUPERVISOR ROBUSTO INICIADO")
     log_message("=" * 50)
     log_message(f"📄 Script a executar: {script_a_rodar}")
-    log_message(f"⏱️  Tempo de execução: {tempo_de_execucao_segundos} segundos ({tempo_de_execucao_segundos//60} minutos)")
+    log_message("⏱️  Reinícios programados: rolling dentro do sistema de bots")
     log_message(f"⏸️  Pausa entre reinícios: {pausa_entre_reinicios_segundos} segundos")
-    log_message("🔧 Funcionalidades: Reinício por tempo + Detecção de falhas")
+    log_message("🔧 Funcionalidades: Detecção de falhas do processo")
     log_message("=" * 50)
     
     # Obter o executável Python
@@ -149,40 +150,21 @@ def main():
             processo = subprocess.Popen([python_executable, script_a_rodar])
             log_message(f"✅ Processo iniciado com PID: {processo.pid} às {inicio_processo.strftime('%H:%M:%S')}")
             
-            # Aguardar pelo tempo especificado ou até o processo terminar
-            try:
-                # Esta é a chave: wait() com timeout detecta ambas as situações
-                processo.wait(timeout=tempo_de_execucao_segundos)
-                # Se chegou aqui, o processo dos bots parou inesperadamente
-                tempo_execucao = datetime.now() - inicio_processo
-                log_message("⚠️ O script dos bots parou inesperadamente. Reiniciando...")
-                log_message(f"🔍 Código de saída do processo: {processo.returncode}")
-                log_message(f"⏱️ Tempo de execução antes da falha: {str(tempo_execucao).split('.')[0]}")
-                stats.registrar_reinicio_falha()
-                
-            except subprocess.TimeoutExpired:
-                # Reinício programado - processo ainda estava rodando após 1 hora
-                log_message(f"⏰ Tempo limite atingido ({tempo_de_execucao_segundos}s) - Reinício programado")
-                log_message("🔄 Encerrando processo para reinício programado...")
-                stats.registrar_reinicio_programado()
-                
-                # Encerrar o processo graciosamente
-                processo.terminate()
-                try:
-                    processo.wait(timeout=10)
-                    log_message("✅ Processo encerrado graciosamente")
-                except subprocess.TimeoutExpired:
-                    log_message("⚠️ Forçando encerramento do processo...")
-                    processo.kill()
-                    processo.wait()
-                    log_message("✅ Processo encerrado forçadamente")
+            # Aguardar até o processo terminar (falhas de bots isolados são tratadas lá dentro)
+            processo.wait()
+            # Se chegou aqui, o processo dos bots parou inesperadamente
+            tempo_execucao = datetime.now() - inicio_processo
+            log_message("⚠️ O script dos bots parou inesperadamente. Reiniciando...")
+            log_message(f"🔍 Código de saída do processo: {processo.returncode}")
+            log_message(f"⏱️ Tempo de execução antes da falha: {str(tempo_execucao).split('.')[0]}")
+            stats.registrar_reinicio_falha()
             
-        # Pausa entre reinícios (essencial para evitar reinícios frenéticos)
-        if pausa_entre_reinicios_segundos > 0:
-            log_message(f"⏸️ Aguardando {pausa_entre_reinicios_segundos} segundos antes do próximo ciclo...")
-            time.sleep(pausa_entre_reinicios_segundos)
-        
-        ciclo += 1
+            # Pausa entre reinícios (essencial para evitar reinícios frenéticos)
+            if pausa_entre_reinicios_segundos > 0:
+                log_message(f"⏸️ Aguardando {pausa_entre_reinicios_segundos} segundos antes do próximo ciclo...")
+                time.sleep(pausa_entre_reinicios_segundos)
+            
+            ciclo += 1
             
         except KeyboardInterrupt:
             log_message("🛑 INTERRUPÇÃO MANUAL DETECTADA (Ctrl+C)")
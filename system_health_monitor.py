@@ -2,7 +2,6 @@ import asyncio
 import time
 import logging
 import os
-import psutil
 from datetime import datetime
 from typing import Dict, Callable, Optional, Any, List
 from dataclasses import dataclass
@@ -10,6 +9,10 @@ from enum import Enum
 import threading
 import json
 
+from cold_start import ModuloTardio
+
+psutil = ModuloTardio('psutil')  # só a leitura de memória usa; importado no primeiro check
+
 class HealthStatus(Enum):
     HEALTHY = "healthy"
     WARNING = "warning"
@@ -7,6 +7,8 @@ Implementa análise técnica com SMA (5,12,40,50) + RSI (3,7,10) para sinais de
 import logging
 from typing import List, Optional, Dict, Any
 
+from streaming_indicators import StreamingIndicators
+
 logger = logging.getLogger(__name__)
 
 class TechnicalAnalysis:
@@ -17,8 +19,14 @@ class TechnicalAnalysis:
     
     def __init__(self):
         """Inicializa o analisador técnico"""
+        # Motor incremental alimentado tick a tick via update()
+        self.engine = StreamingIndicators()
         logger.info("🔧 TechnicalAnalysis inicializado")
     
+    def update(self, price: float) -> None:
+        """Adiciona um tick ao motor incremental (custo constante por tick)"""
+        self.engine.add_price(price)
+    
     def calculate_sma(self, prices: List[float], period: int) -> Optional[float]:
         """
         Calcula Simple Moving Average (SMA)
@@ -54,10 +62,11 @@ class TechnicalAnalysis:
         if not prices or len(prices) < period + 1:
             return None
         
-        # Calcular mudanças de preço
+        # Calcular mudanças de preço (apenas as últimas 'period' são usadas)
+        recent_prices = prices[-(period + 1):]
         price_changes = []
-        for i in range(1, len(prices)):
-            change = prices[i] - prices[i-1]
+        for i in range(1, len(recent_prices)):
+            change = recent_prices[i] - recent_prices[i-1]
             price_changes.append(change)
         
         if len(price_changes) < period:
@@ -84,46 +93,56 @@ class TechnicalAnalysis:
         logger.debug(f"📊 RSI({period}): {rsi:.2f} (avg_gain: {avg_gain:.5f}, avg_loss: {avg_loss:.5f})")
         return rsi
     
-    def analyze_entry_signal(self, tick_history: List[float]) -> Optional[str]:
+    def analyze_entry_signal(self, tick_history: Optional[List[float]] = None) -> Optional[str]:
         """
         Analisa sinais de entrada baseado em SMA + RSI
         
         Args:
-            tick_history: Histórico de ticks (preços)
+            tick_history: Histórico de ticks (preços). Se omitido, usa o motor
+                incremental alimentado por update() - O(1) por tick
             
         Returns:
             "RESETCALL", "RESETPUT" ou None
         """
-        if not tick_history or len(tick_history) < 50:
-            logger.debug(f"📊 Histórico insuficiente: {len(tick_history) if tick_history else 0}/50 ticks")
+        total = self.engine.count if tick_history is None else len(tick_history)
+        if total < 50:
+            logger.debug(f"📊 Histórico insuficiente: {total}/50 ticks")
             return None
         
         try:
-            # Calcular SMAs
-            sma5 = self.calculate_sma(tick_history, 5)
-            sma12 = self.calculate_sma(tick_history, 12)
-            sma40 = self.calculate_sma(tick_history, 40)
-            sma50 = self.calculate_sma(tick_history, 50)
-            
-            # Calcular RSIs
-            rsi3 = self.calculate_rsi(tick_history, 3)
-            rsi7 = self.calculate_rsi(tick_history, 7)
-            rsi10 = self.calculate_rsi(tick_history, 10)
+            if tick_history is None:
+                engine = self.engine
+                sma5, sma12, sma40, sma50 = engine.sma(5), engine.sma(12), engine.sma(40), engine.sma(50)
+                rsi3, rsi7, rsi10 = engine.rsi(3), engine.rsi(7), engine.rsi(10)
+                current_price = engine.last_price
+                previous_price = engine.previous_price
+            else:
+                # Calcular SMAs
+                sma5 = self.calculate_sma(tick_history, 5)
+                sma12 = self.calculate_sma(tick_history, 12)
+                sma40 = self.calculate_sma(tick_history, 40)
+                sma50 = self.calculate_sma(tick_history, 50)
+                
+                # Calcular RSIs
+                rsi3 = self.calculate_rsi(tick_history, 3)
+                rsi7 = self.calculate_rsi(tick_history, 7)
+                rsi10 = self.calculate_rsi(tick_history, 10)
+                
+                # Preços atuais para análise de tendência
+                current_price = tick_history[-1]
+                previous_price = tick_history[-2] if len(tick_history) >= 2 else current_price
             
             # Verificar se todos os indicadores foram calculados
             if None in [sma5, sma12, sma40, sma50, rsi3]:
                 logger.debug("📊 Alguns indicadores não puderam ser calculados")
                 return None
             
-            # Preços atuais para análise de tendência
-            current_price = tick_history[-1]
-            previous_price = tick_history[-2] if len(tick_history) >= 2 else current_price
-            
-            logger.debug(f"📊 Indicadores calculados:")
-            logger.debug(f"   SMA5: {sma5:.5f}, SMA12: {sma12:.5f}")
-            logger.debug(f"   SMA40: {sma40:.5f}, SMA50: {sma50:.5f}")
-            logger.debug(f"   RSI3: {rsi3:.2f}, RSI7: {rsi7:.2f}, RSI10: {rsi10:.2f}")
-            logger.debug(f"   Preço atual: {current_price:.5f}, anterior: {previous_price:.5f}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"📊 Indicadores calculados:")
+                logger.debug(f"   SMA5: {sma5:.5f}, SMA12: {sma12:.5f}")
+                logger.debug(f"   SMA40: {sma40:.5f}, SMA50: {sma50:.5f}")
+                logger.debug(f"   RSI3: {rsi3:.2f}, RSI7: {rsi7:.2f}, RSI10: {rsi10:.2f}")
+                logger.debug(f"   Preço atual: {current_price:.5f}, anterior: {previous_price:.5f}")
             
             # === LÓGICA RESETCALL (Sinal de Alta) ===
             # Condição principal: SMA40 > SMA50 AND SMA5 > SMA12 AND 55 < RSI3 < 75
@@ -15,6 +15,8 @@ from typing import List, Dict, Optional
 from collections import deque
 import numpy as np
 
+from streaming_indicators import StreamingIndicators
+
 logger = logging.getLogger(__name__)
 
 class TechnicalIndicators:
@@ -22,21 +24,15 @@ class TechnicalIndicators:
     
     def __init__(self):
         """Inicializa os buffers para os indicadores"""
-        # Buffer principal de preços (mantém até 100 valores para cálculos)
+        # Buffer principal de preços (mantém até 100 valores para consulta)
         self.price_buffer = deque(maxlen=100)
         
         # Configurações dos indicadores
         self.sma_periods = [5, 12, 40, 50]
         self.rsi_periods = [3, 7, 10]
         
-        # Buffers para RSI (armazenar ganhos e perdas)
-        self.rsi_buffers = {}
-        for period in self.rsi_periods:
-            self.rsi_buffers[period] = {
-                'gains': deque(maxlen=period),
-                'losses': deque(maxlen=period),
-                'last_price': None
-            }
+        # Motor incremental: somas acumuladas num anel compartilhado, O(1) por tick
+        self.engine = StreamingIndicators(self.sma_periods, self.rsi_periods)
     
     def add_price(self, price: float) -> None:
         """Adiciona novo preço ao buffer"""
@@ -45,67 +41,40 @@ class TechnicalIndicators:
             return
             
         self.price_buffer.append(price)
-        self._update_rsi_buffers(price)
+        self.engine.add_price(price)
         
-        logger.debug(f"📊 Preço adicionado: {price:.5f} (Buffer: {len(self.price_buffer)} valores)")
-    
-    def _update_rsi_buffers(self, current_price: float) -> None:
-        """Atualiza buffers específicos do RSI"""
-        for period in self.rsi_periods:
-            buffer = self.rsi_buffers[period]
-            
-            if buffer['last_price'] is not None:
-                change = current_price - buffer['last_price']
-                
-                if change > 0:
-                    buffer['gains'].append(change)
-                    buffer['losses'].append(0)
-                elif change < 0:
-                    buffer['gains'].append(0)
-                    buffer['losses'].append(abs(change))
-                else:
-                    buffer['gains'].append(0)
-                    buffer['losses'].append(0)
-            
-            buffer['last_price'] = current_price
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"📊 Preço adicionado: {price:.5f} (Buffer: {len(self.price_buffer)} valores)")
     
     def calculate_sma(self, period: int) -> Optional[float]:
         """Calcula Simple Moving Average para o período especificado"""
-        if len(self.price_buffer) < period:
+        if period > self.engine.janela:
+            logger.error(f"❌ Período SMA não configurado: {period}")
             return None
         
-        # Pegar os últimos 'period' valores
-        recent_prices = list(self.price_buffer)[-period:]
-        sma = sum(recent_prices) / len(recent_prices)
-        
-        logger.debug(f"📈 SMA({period}): {sma:.5f}")
+        sma = self.engine.sma(period)
+        if sma is not None and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"📈 SMA({period}): {sma:.5f}")
         return sma
     
     def calculate_rsi(self, period: int) -> Optional[float]:
         """Calcula Relative Strength Index para o período especificado"""
-        if period not in self.rsi_buffers:
+        if period not in self.rsi_periods:
             logger.error(f"❌ Período RSI não configurado: {period}")
             return None
         
-        buffer = self.rsi_buffers[period]
-        
-        if len(buffer['gains']) < period:
-            return None
-        
-        # Calcular médias de ganhos e perdas
-        avg_gain = sum(buffer['gains']) / len(buffer['gains'])
-        avg_loss = sum(buffer['losses']) / len(buffer['losses'])
-        
-        # Evitar divisão por zero
-        if avg_loss == 0:
-            rsi = 100.0
-        else:
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-        
-        logger.debug(f"📊 RSI({period}): {rsi:.2f}")
+        rsi = self.engine.rsi(period)
+        if rsi is not None and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"📊 RSI({period}): {rsi:.2f}")
         return rsi
     
+    def calculate_rsi_wilder(self, period: int) -> Optional[float]:
+        """Calcula RSI com suavização de Wilder para o período especificado"""
+        if period not in self.rsi_periods:
+            logger.error(f"❌ Período RSI não configurado: {period}")
+            return None
+        return self.engine.rsi_wilder(period)
+    
     def get_all_indicators(self) -> Dict[str, Optional[float]]:
         """Retorna todos os indicadores calculados"""
         indicators = {}
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Teste do runtime assíncrono compartilhado (async_runtime)
+Amostrador de atraso do loop com atribuição de travamentos à tarefa e à linha
+responsáveis, e bootstrap com fallback quando o uvloop não está instalado
+"""
+
+import sys
+import os
+import time
+import asyncio
+import importlib.util
+
+# Adicionar o diretório atual ao path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import async_runtime
+from async_runtime import AmostradorAtrasoLoop, executar, estatisticas_loop
+
+def _gravacao_bloqueante():
+    time.sleep(0.3)  # como uma chamada síncrona ao Supabase dentro do loop
+
+def test_travamento_atribuido_a_tarefa():
+    async def gravador():
+        await asyncio.sleep(0.1)
+        _gravacao_bloqueante()
+
+    async def cenario():
+        amostrador = AmostradorAtrasoLoop(intervalo=0.01, limiar_ms=50)
+        amostrador.iniciar()
+        try:
+            await asyncio.create_task(gravador(), name="gravador")
+            await asyncio.sleep(0.1)
+            return amostrador.obter_estatisticas()
+        finally:
+            amostrador.parar()
+
+    estatisticas = asyncio.run(cenario())
+    assert estatisticas['travamentos'] == 1, estatisticas['ultimos_travamentos']
+    travamento = estatisticas['ultimos_travamentos'][0]
+    assert travamento['tarefa'] == 'gravador' and travamento['corrotina'].endswith('gravador')
+    assert travamento['local'].startswith('test_async_runtime.py') and '_gravacao_bloqueante' in travamento['local']
+    assert travamento['duracao_ms'] >= 250 and estatisticas['atraso_max_ms'] >= 250
+    # Um travamento entre dezenas de amostras não desloca a mediana
+    assert estatisticas['amostras'] >= 10 and estatisticas['atraso_p50_ms'] < 50
+    assert estatisticas['atraso_p99_ms'] >= estatisticas['atraso_p50_ms']
+
+def test_executar_com_fallback_de_runtime():
+    esperado = 'uvloop' if importlib.util.find_spec('uvloop') else 'asyncio'
+
+    async def main():
+        await asyncio.sleep(0.2)
+        return estatisticas_loop()
+
+    try:
+        estatisticas = executar(main(), runtime='uvloop')
+    finally:
+        asyncio.set_event_loop_policy(None)
+    assert estatisticas['runtime'] == esperado and estatisticas['amostras'] >= 2
+    assert async_runtime.instalar_runtime('trio') == 'asyncio'
+
+def run_all_tests():
+    testes = [
+        test_travamento_atribuido_a_tarefa,
+        test_executar_com_fallback_de_runtime,
+    ]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+    return falhas == 0
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
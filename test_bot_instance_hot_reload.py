@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Teste da recarga de parâmetros a quente do BotInstance
+Mudanças em bot_configurations chegam pelo heartbeat, são validadas e só
+valem na próxima fronteira de operação, todas de uma vez; o consumidor de
+sinais acorda no sinal ou no shutdown, sem polling
+"""
+
+import sys
+import os
+import json
+import asyncio
+import logging
+
+# Adicionar o diretório atual ao path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bot_instance import BotInstance
+
+class _Consulta:
+    def __init__(self, banco):
+        self.banco = banco
+
+    def __getattr__(self, nome):
+        # select/eq/single/update: a linha do bot é a única da tabela falsa
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        return type('Resposta', (), {'data': dict(self.banco.linha)})()
+
+class SupabaseFalso:
+    def __init__(self, linha):
+        self.linha = linha
+
+    def table(self, nome):
+        return _Consulta(self)
+
+class ApiFalsa:
+    def __init__(self):
+        self.propostas = []
+
+    async def proposal(self, parametros):
+        self.propostas.append(parametros)
+        return {'proposal': {'id': f"p{len(self.propostas)}", 'ask_price': parametros['amount']}}
+
+    async def buy(self, parametros):
+        return {'buy': {'contract_id': len(self.propostas)}}
+
+def _criar_bot(bot_id, **colunas):
+    # Logger sem arquivo: _setup_logging só configura loggers sem handlers
+    logging.getLogger(f"bot_instance_{bot_id}").addHandler(logging.NullHandler())
+    linha = {
+        'id': bot_id, 'bot_name': 'Teste_Reload', 'is_active': True, 'status': 'running',
+        'param_stake_inicial': 10.0, 'param_take_profit': 20.0, 'param_growth_rate': 2.0,
+        'param_max_operations': 10, 'param_overrides': None, 'config_json': {'ativo': 'R_50'},
+    }
+    linha.update(colunas)
+    supabase = SupabaseFalso(linha)
+    bot = BotInstance(bot_id, api_manager=ApiFalsa(), supabase=supabase)
+    bot.log_operation = lambda *args, **kwargs: asyncio.sleep(0)
+    return bot, supabase
+
+def test_recarga_na_fronteira_de_operacao():
+    bot, supabase = _criar_bot('reload_1')
+    bot.stake = 10.2  # progressão do growth rate em andamento
+
+    # Take profit e growth rate novos: o stake corrente segue
+    supabase.linha.update(param_take_profit=30.0, param_growth_rate=3.0)
+    assert asyncio.run(bot.check_shutdown_signal()) is False
+    assert bot._parametros_pendentes is not None
+    assert bot.growth_rate == 0.02 and bot._modelo_proposta['growth_rate'] == 0.02  # nada muda no meio da operação
+
+    assert bot._aplicar_parametros_pendentes() and not bot._aplicar_parametros_pendentes()
+    assert bot.take_profit_percentual == 0.3 and bot.growth_rate == 0.03 and bot.stake == 10.2
+    assert bot._modelo_proposta['growth_rate'] == 0.03 and bot.config['growth_rate'] == 3.0
+
+    # Stake inicial novo (via param_overrides) reinicia a progressão e vai para a próxima proposta
+    supabase.linha['param_overrides'] = json.dumps({'stake_inicial': 4.0})
+    asyncio.run(bot.check_shutdown_signal())
+    bot._aplicar_parametros_pendentes()
+    assert bot.stake == 4.0 and bot.initial_stake == 4.0
+    assert asyncio.run(bot.executar_compra()) == 1
+    proposta = bot.api_manager.propostas[-1]
+    assert proposta['growth_rate'] == 0.03 and proposta['amount'] == 4.0 and proposta['symbol'] == 'R_50'
+    assert proposta['limit_order'] == {'take_profit': 1.2}
+
+def test_configuracao_invalida_rejeitada():
+    bot, supabase = _criar_bot('reload_2')
+
+    supabase.linha.update(param_growth_rate=9.0, param_stake_inicial=20.0)
+    asyncio.run(bot.check_shutdown_signal())
+    assert bot._parametros_pendentes is None and bot.growth_rate == 0.02 and bot.stake == 10.0
+
+    # Ativo só muda com reinício; o restante da mudança vale
+    supabase.linha.update(param_growth_rate=1.0, config_json={'ativo': 'R_100'})
+    asyncio.run(bot.check_shutdown_signal())
+    bot._aplicar_parametros_pendentes()
+    assert bot.growth_rate == 0.01 and bot.stake == 20.0
+    assert bot.ativo == 'R_50' and bot._modelo_proposta['symbol'] == 'R_50'
+
+    # Pedido de parada não aplica parâmetros
+    supabase.linha.update(status='stopped', param_take_profit=50.0)
+    assert asyncio.run(bot.check_shutdown_signal()) is True and bot._parametros_pendentes is None
+
+def test_override_ilegivel_nao_reverte_o_override_em_vigor():
+    bot, supabase = _criar_bot('reload_4')
+    supabase.linha['param_overrides'] = json.dumps({'stake_inicial': 4.0, 'growth_rate': 3})
+    asyncio.run(bot.check_shutdown_signal())
+    bot._aplicar_parametros_pendentes()
+    assert bot.stake == 4.0 and bot.growth_rate == 0.03
+
+    # JSON quebrado junto com outra mudança: antes valia a coluna param_* (stake 10, growth 2%)
+    supabase.linha.update(param_overrides='{"stake_inicial": 4.0,', param_take_profit=30.0)
+    asyncio.run(bot.check_shutdown_signal())
+    assert bot._parametros_pendentes is None
+    assert bot.stake == 4.0 and bot.growth_rate == 0.03 and bot.take_profit_percentual == 0.2
+
+    # Na partida o override ilegível continua só registrado: o bot sobe com as colunas param_*
+    nova, _ = _criar_bot('reload_5', param_overrides=supabase.linha['param_overrides'])
+    assert nova.stake == 10.0 and nova.growth_rate == 0.02
+
+def test_consumidor_aplica_na_fronteira_e_para_sem_perder_sinal():
+    bot, supabase = _criar_bot('reload_3')
+    bot.monitorar_contrato = lambda contract_id: asyncio.sleep(0, result=1.0)
+    ticks = [1000.1, 1000.2, 1000.3, 1000.2, 1000.1]
+
+    async def cenario():
+        consumidor = asyncio.create_task(bot._process_signals_from_queue())
+        await asyncio.sleep(0.05)
+        supabase.linha.update(param_growth_rate=3.0)
+        await bot.check_shutdown_signal()
+        assert bot._parametros_pendentes is not None and bot.growth_rate == 0.02
+
+        # O sinal acorda o consumidor, que aplica a configuração antes da compra
+        bot.sync_system.queue_signal(ticks, True, bot.ativo)
+        while not bot.api_manager.propostas:
+            await asyncio.sleep(0.001)
+        assert bot.api_manager.propostas[-1]['growth_rate'] == 0.03
+
+        # Parada (como bot_worker.parar_bot) libera o consumidor na hora, sem timeout de polling
+        await asyncio.sleep(0.01)
+        bot.shutdown_requested = True
+        await asyncio.wait_for(consumidor, timeout=0.1)
+        bot.sync_system.queue_signal(ticks, True, bot.ativo)
+        assert bot.sync_system.signal_queue.qsize() == 1  # não foi consumido e descartado
+
+    asyncio.run(cenario())
+    assert len(bot.api_manager.propostas) == 1
+
+def run_all_tests():
+    testes = [
+        test_recarga_na_fronteira_de_operacao,
+        test_configuracao_invalida_rejeitada,
+        test_override_ilegivel_nao_reverte_o_override_em_vigor,
+        test_consumidor_aplica_na_fronteira_e_para_sem_perder_sinal,
+    ]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+    return falhas == 0
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Teste do modo worker (vários BotInstance por processo)
+Conexão Deriv compartilhada com subscriptions por referência, distribuição
+de ticks por ativo, criação dos bots fora do loop com saídas reportadas ao
+orchestrator e distribuição de bots entre workers no orchestrator
+"""
+
+import sys
+import os
+import io
+import asyncio
+import logging
+import threading
+import contextlib
+
+# Adicionar o diretório atual ao path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bot_worker import ConexaoCompartilhada, ConexaoBot, WorkerBots
+import orchestrator
+
+class ApiFalsa:
+    """Mesma interface da DerivWebSocketNativo do bot_instance, sem rede"""
+
+    def __init__(self):
+        self.connected = False
+        self.conexoes = 0
+        self.chamadas = []
+        self.bot_instance = None
+
+    def set_bot_instance(self, bot_instance):
+        self.bot_instance = bot_instance
+
+    async def connect(self):
+        self.conexoes += 1
+        self.connected = True
+
+    async def subscribe_ticks(self, symbol):
+        self.chamadas.append(('subscribe', symbol))
+
+    async def unsubscribe_ticks(self, symbol):
+        self.chamadas.append(('forget', symbol))
+
+    async def buy(self, parametros):
+        return {'buy': {'contract_id': 1}}
+
+class BotFalso:
+    def __init__(self, bot_id, falhar=False):
+        self.bot_id = bot_id
+        self.falhar = falhar
+        self.ticks = []
+
+    async def _handle_new_tick(self, tick):
+        if self.falhar:
+            raise RuntimeError("bot quebrado")
+        self.ticks.append(tick['quote'])
+
+def _bot_com_conexao(compartilhada, bot_id, falhar=False):
+    conexao = ConexaoBot(compartilhada)
+    bot = BotFalso(bot_id, falhar)
+    conexao.set_bot_instance(bot)
+    return bot, conexao
+
+def test_conexao_compartilhada():
+    async def cenario():
+        api = ApiFalsa()
+        compartilhada = ConexaoCompartilhada(logging.getLogger('teste_worker'), api)
+        assert api.bot_instance is compartilhada
+        a, conexao_a = _bot_com_conexao(compartilhada, '1')
+        b, conexao_b = _bot_com_conexao(compartilhada, '2')
+        c, conexao_c = _bot_com_conexao(compartilhada, '3', falhar=True)
+        for conexao, symbol in [(conexao_a, 'R_100'), (conexao_b, 'R_100'), (conexao_c, 'R_50')]:
+            await conexao.connect()
+            await conexao.subscribe_ticks(symbol)
+        # Um socket e uma subscription por ativo
+        assert api.conexoes == 1
+        assert api.chamadas == [('subscribe', 'R_100'), ('subscribe', 'R_50')]
+        assert (await conexao_a.buy({}))['buy']['contract_id'] == 1 and conexao_b.connected
+
+        await api.bot_instance._handle_new_tick({'symbol': 'R_100', 'quote': 1.0})
+        await api.bot_instance._handle_new_tick({'symbol': 'R_50', 'quote': 2.0})  # erro isolado
+        assert a.ticks == [1.0] and b.ticks == [1.0] and c.ticks == []
+
+        # O último bot do ativo cancela a subscription
+        await conexao_a.disconnect()
+        assert ('forget', 'R_100') not in api.chamadas
+        await api.bot_instance._handle_new_tick({'symbol': 'R_100', 'quote': 3.0})
+        assert a.ticks == [1.0] and b.ticks == [1.0, 3.0]
+        await conexao_b.disconnect()
+        assert api.chamadas[-1] == ('forget', 'R_100') and list(compartilhada.inscritos) == ['R_50']
+
+        # Queda da conexão: reconecta e refaz as subscriptions em uso
+        api.connected = False
+        await compartilhada.conectar()
+        assert api.conexoes == 2 and api.chamadas[-1] == ('subscribe', 'R_50')
+
+    asyncio.run(cenario())
+
+class BotRodando:
+    def __init__(self, bot_id, falhar):
+        self.bot_id = bot_id
+        self.falhar = falhar
+        self.shutdown_requested = False
+        self.criado_em = threading.current_thread()
+
+    async def run(self):
+        await asyncio.sleep(0.01)
+        if self.falhar:
+            raise RuntimeError("bot quebrado")
+        await asyncio.Event().wait()
+
+def test_worker_cria_fora_do_loop_e_reporta_saidas():
+    """Construtor do bot (I/O síncrono) roda no pool; só saídas sem stop vão para a saída padrão"""
+    async def cenario():
+        worker = WorkerBots(0, supabase=object(), api=ApiFalsa())
+        worker._criar_bot = lambda bot_id: BotRodando(bot_id, falhar=bot_id == '2')
+        assert worker.iniciar_bot('1') and worker.iniciar_bot('2') and worker.iniciar_bot('3')
+        await asyncio.sleep(0.1)
+        assert sorted(worker.bots) == ['1', '3'] and '2' not in worker.tarefas
+        assert all(bot.criado_em is not threading.main_thread() for bot in worker.bots.values())
+        await worker.executar_comando('stop 3')
+        assert list(worker.tarefas) == ['1']
+
+    saida = io.StringIO()
+    logging.disable(logging.CRITICAL)
+    try:
+        with contextlib.redirect_stdout(saida):
+            asyncio.run(cenario())
+    finally:
+        logging.disable(logging.NOTSET)
+    assert saida.getvalue() == 'exited 2 erro\n', saida.getvalue()
+
+class ProcessoFalso:
+    def __init__(self, pid):
+        self.pid = pid
+        self.codigo = None
+        self.comandos = []
+
+    def poll(self):
+        return self.codigo
+
+def test_distribuicao_entre_workers():
+    orq = orchestrator.BotOrchestrator.__new__(orchestrator.BotOrchestrator)
+    orq.worker_count = 2
+    orq.workers = {}
+    orq.bot_worker = {}
+    orq._spawn_worker = lambda index: ProcessoFalso(100 + index)
+    orq._send_worker_command = lambda index, comando: orq.workers[index].comandos.append(comando)
+
+    processos = [orq._start_bot_in_worker(str(bot_id)) for bot_id in range(1, 6)]
+    assert len(orq.workers) == 2 and sorted(orq.bot_worker.values()) == [0, 0, 0, 1, 1]
+    assert processos[0] is orq.workers[0] and processos[1] is orq.workers[1]
+    assert orq.workers[0].comandos == ['start 1', 'start 3', 'start 5']
+
+    orq._stop_bot_in_worker('3')
+    assert orq.workers[0].comandos[-1] == 'stop 3' and '3' not in orq.bot_worker
+
+    # Worker 1 morre: um substituto é criado e, por ser o menos carregado, recebe os órfãos
+    morto = orq.workers[1]
+    morto.codigo = -9
+    orq._start_bot_in_worker('2')
+    orq._start_bot_in_worker('4')
+    assert orq.workers[1] is not morto and orq.workers[1].comandos == ['start 2', 'start 4']
+    assert orq.bot_worker == {'1': 0, '5': 0, '2': 1, '4': 1}
+
+def run_all_tests():
+    testes = [
+        test_conexao_compartilhada,
+        test_worker_cria_fora_do_loop_e_reporta_saidas,
+        test_distribuicao_entre_workers,
+    ]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+    return falhas == 0
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
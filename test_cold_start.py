@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Teste da partida a frio do tunderbot (cold_start)
+Pacotes pesados ficam fora da importação do tunderbot. Os orçamentos de tempo
+(importação e primeiro tick) dependem da máquina e ficam no CLI:
+    python cold_start.py
+"""
+
+import sys
+import os
+
+# Adicionar o diretório atual ao path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import cold_start
+from cold_start import ModuloTardio
+
+def test_modulo_tardio_importa_no_primeiro_acesso():
+    sys.modules.pop('colorsys', None)
+    colorsys = ModuloTardio('colorsys')
+    assert 'colorsys' not in sys.modules and 'não carregado' in repr(colorsys)
+    assert colorsys.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert 'colorsys' in sys.modules and "(carregado)" in repr(colorsys)
+
+def test_importacao_do_tunderbot_sem_pacotes_tardios():
+    tempos = cold_start.medir_importacao('tunderbot')
+    assert cold_start.importacoes_indevidas(tempos) == [], cold_start.importacoes_indevidas(tempos)[:5]
+    # Dependências do caminho crítico continuam na partida
+    assert 'websockets' in tempos and 'numpy' in tempos
+
+def run_all_tests():
+    testes = [
+        test_modulo_tardio_importa_no_primeiro_acesso,
+        test_importacao_do_tunderbot_sem_pacotes_tardios,
+    ]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+    return falhas == 0
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Teste do motor local de liquidação de contratos (ACCU, dígitos, CALL/PUT, RESET)
+Séries de ticks determinísticas contra as regras esperadas, e um replay
+completo com o motor plugado no ExecutorSimulado
+"""
+
+import sys
+import os
+import asyncio
+
+import numpy as np
+
+# Adicionar o diretório atual ao path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from contract_engine import (MotorContratos, ErroContrato, ContratoSimulado, ExecutorPapel, ExecutorSimulado,
+                             barreira_accu_relativa)
+from tick_replay import executar_replay
+import cold_start
+
+def _liquidar(motor, contrato, quotes, inicio=1_700_000_000, passo=2):
+    """Avança o contrato tick a tick como o ExecutorSimulado; devolve (lucro, ticks consumidos)"""
+    for i, quote in enumerate(quotes):
+        contrato.ticks += 1
+        lucro = motor(contrato, {'symbol': contrato.symbol, 'epoch': inicio + passo * i,
+                                 'quote': quote, 'pip_size': 2})
+        if lucro is not None:
+            return round(lucro, 2), contrato.ticks
+    return None, contrato.ticks
+
+def _contrato(tipo, stake=10.0, symbol='R_100', **parametros):
+    return ContratoSimulado(contract_id=1, contract_type=tipo, symbol=symbol, stake=stake,
+                            parametros=dict(parametros, contract_type=tipo, amount=stake, symbol=symbol))
+
+def test_accu_barreira_e_take_profit():
+    motor = MotorContratos(tick_size_barrier={('R_100', 0.05): 0.001})  # ±0,1% do tick anterior
+    # Quarto tick sai da faixa: perde o stake
+    contrato = _contrato('ACCU', growth_rate=0.05)
+    assert _liquidar(motor, contrato, [1000.0, 1000.5, 1000.2, 1002.0]) == (-10.0, 4)
+    # Take profit: 10 × 1,05^n - 10 >= 1,5 com n = 3 ticks de crescimento
+    contrato = _contrato('ACCU', growth_rate=0.05, limit_order={'take_profit': 1.5})
+    lucro, ticks = _liquidar(motor, contrato, [1000.0, 1000.1, 1000.2, 1000.3, 1000.4])
+    assert ticks == 4 and lucro == round(10 * 1.05 ** 3 - 10, 2)
+    assert contrato.dados['tick_count'] == 3 and contrato.entry_spot == 1000.0
+    # Sem take profit: encerra no máximo de ticks do growth rate
+    contrato = _contrato('ACCU', growth_rate=0.05)
+    lucro, ticks = _liquidar(motor, contrato, [1000.0 + 0.01 * i for i in range(100)])
+    assert ticks == 51 and lucro == round(10 * 1.05 ** 50 - 10, 2)
+    # Faixa estimada: chance de nocaute por tick p = g / (1 + g) num passeio gaussiano
+    largura = barreira_accu_relativa('R_100', 0.01)
+    sigma = 1.0 * np.sqrt(2 / (365 * 24 * 3600))
+    saltos = np.random.default_rng(1).normal(0, sigma, 200_000)
+    assert abs(np.mean(np.abs(saltos) >= largura) - 0.01 / 1.01) < 0.002
+
+def test_digitos_call_put_e_reset():
+    motor = MotorContratos(comissao=0.0)
+    # Dígito do 2º tick após a compra: 1000.37 -> 7
+    for tipo, barreira, esperado in [('DIGITMATCH', 7, 90.0), ('DIGITDIFF', 7, -10.0),
+                                     ('DIGITOVER', 6, 23.33), ('DIGITUNDER', 7, -10.0),
+                                     ('DIGITODD', None, 10.0), ('DIGITEVEN', None, -10.0)]:
+        parametros = {'duration': 2, 'duration_unit': 't'}
+        if barreira is not None:
+            parametros['barrier'] = barreira
+        contrato = _contrato(tipo, **parametros)
+        assert _liquidar(motor, contrato, [1000.12, 1000.37, 1000.50]) == (esperado, 2), tipo
+    assert motor.cotar({'contract_type': 'DIGITOVER', 'amount': 10, 'duration': 1,
+                        'barrier': 6})['payout'] == 33.33
+    for parametros in [{'contract_type': 'DIGITOVER', 'barrier': 9}, {'contract_type': 'DIGITMATCH'},
+                       {'contract_type': 'ACCU', 'growth_rate': 0.2}, {'contract_type': 'MULTUP'}]:
+        try:
+            motor.cotar(dict(parametros, amount=10, duration=1))
+            assert False, parametros
+        except ErroContrato as e:
+            assert e.code in ('InvalidBarrier', 'ContractBuyValidationError', 'InvalidContractType')
+
+    # CALL em 3 ticks: entrada no 1º tick após a compra, saída no 4º; empate perde
+    assert _liquidar(motor, _contrato('CALL', duration=3, duration_unit='t'), [100, 99, 98, 101]) == (10.0, 4)
+    assert _liquidar(motor, _contrato('PUT', duration=3, duration_unit='t'), [100, 99, 98, 100]) == (-10.0, 4)
+    # RESETCALL 20 s com ticks de 2 s: perdendo na metade, a barreira desce para o spot de 10 s
+    contrato = _contrato('RESETCALL', duration=20, duration_unit='s')
+    quotes = [100, 99, 98, 97, 96, 95, 96, 97, 98, 97, 96.5, 96]
+    lucro, ticks = _liquidar(motor, contrato, quotes)
+    assert ticks == 11 and contrato.dados['barrier'] == 95 and lucro == round(10 / 0.625 - 10, 2)
+    contrato = _contrato('CALL', duration=20, duration_unit='s')
+    assert _liquidar(motor, contrato, quotes)[0] == -10.0
+
+class BotDigitos:
+    """Compra DIGITEVEN de 1 tick a cada 10 ticks com compra direta (parameters), como o bot_scale"""
+
+    def __init__(self):
+        self.api_manager = object()
+        self.contador = 0
+        self.pendentes = []
+        self._shutdown_event = asyncio.Event()
+
+    async def _handle_new_tick(self, tick):
+        self.contador += 1
+        if self.contador % 10 == 5:
+            compra = await self.api_manager.buy({'buy': '1', 'price': 2, 'parameters': {
+                'amount': 2, 'basis': 'stake', 'contract_type': 'DIGITEVEN', 'currency': 'USD',
+                'duration': 1, 'duration_unit': 't', 'symbol': tick['symbol']}})
+            self.pendentes.append(compra['buy']['contract_id'])
+
+def test_replay_com_motor():
+    epochs = 1_700_000_000 + 2 * np.arange(500, dtype=np.int64)
+    quotes = np.round(1000 + np.cumsum(np.random.default_rng(3).normal(0, 0.4, 500)), 2)
+    executor = ExecutorSimulado(liquidar=MotorContratos())
+    bot = BotDigitos()
+    relatorio = executar_replay(bot, (epochs, quotes), symbol='R_50', executor=executor, tarefas=(), pip_size=2)
+    assert relatorio.executor['contratos'] == 50 and relatorio.executor['abertos'] == 0
+    for contrato_id in bot.pendentes:
+        estado = asyncio.run(executor.proposal_open_contract(contrato_id))['proposal_open_contract']
+        digito = int(round(estado['exit_tick'] * 100)) % 10
+        assert estado['last_digit'] == digito
+        assert estado['profit'] == (round(2 / 0.5 * 0.97 - 2, 2) if digito % 2 == 0 else -2.0)
+    erro = asyncio.run(executor.proposal({'contract_type': 'DIGITOVER', 'barrier': 9, 'amount': 1,
+                                          'duration': 1, 'duration_unit': 't', 'symbol': 'R_50'}))
+    assert erro['error']['code'] == 'InvalidBarrier'
+
+def test_modo_papel_sem_supabase_nem_replay():
+    """Paper trading não grava no Supabase de produção nem carrega o driver de replay"""
+    tempos = cold_start.medir_importacao('tunderbot')
+    assert 'contract_engine' in tempos and 'tick_replay' not in tempos
+
+    import tunderbot
+    clientes = []
+    create_client = tunderbot.create_client
+    tunderbot.create_client = lambda *args: clientes.append(args)
+    try:
+        bot = tunderbot.AccumulatorScalpingBot({'name': 'Teste_Papel', 'token': 'TESTE' * 6, 'app_id': '1',
+                                                'paper_trading': True})
+        assert isinstance(bot.api_manager, ExecutorPapel) and bot.api_manager is bot.executor_papel
+        asyncio.run(bot.log_to_supabase('WIN', 12.5, 1.0))
+        assert asyncio.run(bot.get_signal_from_radar()) is None
+    finally:
+        tunderbot.create_client = create_client
+    assert clientes == []
+    chamadas = bot.executor_papel.chamadas
+    assert chamadas['supabase.log_to_supabase'] == 1 and chamadas['supabase.get_signal_from_radar'] == 1
+
+def run_all_tests():
+    testes = [
+        test_accu_barreira_e_take_profit,
+        test_digitos_call_put_e_reset,
+        test_replay_com_motor,
+        test_modo_papel_sem_supabase_nem_replay,
+    ]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+    return falhas == 0
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
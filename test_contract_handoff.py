@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Teste do handoff de contratos abertos entre instâncias do tunderbot
+Snapshot atômico com dono (em cache, por conta), reanexação do contrato aberto pela instância nova
+(com o estado de risco restaurado) e aposentadoria da instância antiga
+"""
+
+import sys
+import os
+import time
+import json
+import asyncio
+import logging
+import tempfile
+
+# Adicionar o diretório atual ao path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from contract_handoff import SnapshotHandoff
+from io_offload import descarregador
+import tunderbot
+
+class _ApiContratos:
+    """Conexão falsa: o contrato assinado liquida após um atraso"""
+
+    def __init__(self, lucro):
+        self.lucro = lucro
+        self.assinados = []
+
+    async def aguardar_contrato(self, contract_id):
+        self.assinados.append(contract_id)
+        await asyncio.sleep(0.05)
+        return {'contract_id': contract_id, 'is_sold': 1, 'status': 'won', 'profit': self.lucro}
+
+async def _sem_supabase(*args):
+    pass
+
+def _criar_bot(diretorio):
+    bot = tunderbot.AccumulatorScalpingBot({'name': 'Teste_Handoff', 'token': 'TESTE' * 6, 'app_id': '1'})
+    bot._debug_log_file = os.path.join(diretorio, 'debug_signals.json')
+    bot.handoff = SnapshotHandoff(bot._chave_handoff(), diretorio)
+    bot.log_to_supabase = _sem_supabase
+    return bot
+
+def test_snapshot_atomico_dono_e_expiracao():
+    with tempfile.TemporaryDirectory() as diretorio:
+        antiga = SnapshotHandoff('Conta', diretorio)
+        nova = SnapshotHandoff('Conta', diretorio)
+        assert nova.carregar() is None and antiga.sou_dono()
+
+        antiga.salvar({'contratos': {'123': 'R_10'}})
+        assert antiga.carregar() is None  # o próprio snapshot não é "anterior"
+        assert nova.carregar()['contratos'] == {'123': 'R_10'}
+        assert [f for f in os.listdir(diretorio)] == ['handoff_Conta.json']  # sem temporário
+
+        nova.salvar({'contratos': {}})
+        assert nova.sou_dono() and not antiga.sou_dono()
+
+        # Arquivo corrompido ou antigo demais não é herdado
+        with open(nova.caminho, 'w') as f:
+            f.write('{"versao": 1, "contra')
+        assert antiga.carregar() is None
+        with open(nova.caminho, 'w') as f:
+            json.dump({'versao': 1, 'instancia': 'x', 'timestamp': time.time() - 13 * 3600}, f)
+        assert antiga.carregar() is None and nova.dono() == 'x'
+        nova.descartar()
+        assert nova.dono() is None
+
+def test_dono_em_cache_e_nome_por_conta():
+    with tempfile.TemporaryDirectory() as diretorio:
+        antiga = SnapshotHandoff('Conta', diretorio)
+        nova = SnapshotHandoff('Conta', diretorio)
+        antiga.salvar({'contratos': {}})
+        leituras = []
+        ler = nova._ler
+        nova._ler = lambda: leituras.append(1) or ler()
+        assert not any(nova.sou_dono() for _ in range(100))
+        assert len(leituras) == 1  # um stat por sinal; o JSON só é relido quando o arquivo muda
+        nova.salvar({'contratos': {}})
+        assert nova.sou_dono() and len(leituras) == 1  # a própria gravação atualiza o cache
+        antiga.salvar({'contratos': {}})
+        assert not nova.sou_dono() and len(leituras) == 2
+
+    # Bots com o nome padrão não dividem o snapshot; a mesma conta reencontra o seu
+    def chave(config):
+        return tunderbot.AccumulatorScalpingBot(dict(config, app_id='1', handoff=False))._chave_handoff()
+    logging.disable(logging.CRITICAL)
+    try:
+        a, b, a2 = chave({'token': 'A' * 30}), chave({'token': 'B' * 30}), chave({'token': 'A' * 30})
+        com_id = chave({'token': 'A' * 30, 'bot_id': 42})
+    finally:
+        logging.disable(logging.NOTSET)
+    assert a.startswith('Bot_Principal_') and a != b and a == a2
+    assert com_id == 'Bot_Principal_42' and 'A' * 30 not in a
+
+def test_reinicio_reanexa_contrato_aberto():
+    logging.disable(logging.CRITICAL)
+    try:
+        with tempfile.TemporaryDirectory() as diretorio:
+            async def cenario():
+                antiga = _criar_bot(diretorio)
+                estado = antiga.estados[antiga.ativo]
+                estado.total_profit = antiga.total_profit = 7.5
+                estado.operacoes = 4
+                estado.em_operacao = True
+                antiga._registrar_contrato_aberto(estado, 'C1')
+
+                # Reinício: a instância nova assume antes de a antiga ver a liquidação
+                nova = _criar_bot(diretorio)
+                api = _ApiContratos(lucro=2.0)
+                nova.api_manager = api
+                await nova._restaurar_handoff()
+                estado_novo = nova.estados[nova.ativo]
+                em_operacao_durante = estado_novo.em_operacao
+                await asyncio.gather(*list(nova._running_tasks))
+
+                # A antiga recebe a mesma liquidação, mas não aplica a gestão de novo
+                await descarregador().aguardar()  # snapshots são gravados fora do loop
+                antiga._finalizar_contrato(estado, 'C1', 2.0)
+                antiga._liberar_ativo(estado, 'C1')
+                await descarregador().aguardar()
+                snapshot = nova.handoff._ler()
+                return antiga, nova, api, em_operacao_durante, snapshot
+
+            antiga, nova, api, em_operacao_durante, snapshot = asyncio.run(cenario())
+    finally:
+        logging.disable(logging.NOTSET)
+
+    estado_novo = nova.estados[nova.ativo]
+    assert api.assinados == ['C1'] and em_operacao_durante and not estado_novo.em_operacao
+    # Estado de risco herdado e o resultado do contrato aplicado uma única vez
+    assert nova.total_profit == 9.5 and estado_novo.total_profit == 9.5 and estado_novo.operacoes == 5
+    assert nova.contratos_abertos == {} and snapshot['contratos'] == {}
+    assert snapshot['instancia'] == nova.handoff.instancia
+    assert antiga._aposentado and antiga._shutdown_event.is_set()
+    assert antiga.total_profit == 7.5 and antiga.estados[antiga.ativo].operacoes == 4
+
+def run_all_tests():
+    testes = [
+        test_snapshot_atomico_dono_e_expiracao,
+        test_dono_em_cache_e_nome_por_conta,
+        test_reinicio_reanexa_contrato_aberto,
+    ]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+    return falhas == 0
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Teste do motor de estatísticas de último dígito
+Compara histogramas deslizantes, paridade e sequências com o cálculo direto
+"""
+
+import sys
+import os
+import random
+import asyncio
+
+# Adicionar o diretório atual ao path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from trading_system.utils.digit_stats import MotorDigitos, CentralDigitos, extrair_digito
+
+def test_extracao_por_pip_size():
+    """Dígito numérico respeita o pip_size (zeros finais contam)"""
+    assert extrair_digito(123.40, 2) == 0
+    assert extrair_digito(123.47, 2) == 7
+    assert extrair_digito(6543.219, 3) == 9
+    assert extrair_digito(1234.5670, 4) == 0
+    assert extrair_digito(0.1 + 0.2, 2) == 0  # 0.30000000000000004
+    motor = MotorDigitos('R_50')
+    assert motor.pip_size == 4 and motor.adicionar_preco(1234.5678) == 8
+
+def test_janelas_iguais_ao_calculo_direto():
+    """Frequências, proporções e sequências batem com recontagem sobre a lista"""
+    rng = random.Random(21)
+    motor = MotorDigitos('R_100', janelas=(10, 37))
+    digitos = []
+    for i in range(500):
+        preco = round(1000 + rng.randint(0, 3000) / 100, 2)
+        digitos.append(motor.adicionar_preco(preco))
+        assert digitos[-1] == int(round(preco * 100)) % 10
+        for janela in (10, 37):
+            recentes = digitos[-janela:]
+            assert motor.frequencias(janela) == [recentes.count(d) for d in range(10)], f"janela {janela} em {i}"
+            assert abs(motor.proporcao_par(janela) - sum(d % 2 == 0 for d in recentes) / len(recentes)) < 1e-12
+            assert abs(motor.proporcao_over(5, janela) - sum(d > 5 for d in recentes) / len(recentes)) < 1e-12
+            assert abs(motor.proporcao_under(3, janela) - sum(d < 3 for d in recentes) / len(recentes)) < 1e-12
+        sequencia = 1
+        while sequencia < len(digitos) and digitos[-sequencia - 1] == digitos[-1]:
+            sequencia += 1
+        assert motor.sequencia_digito == sequencia
+    assert motor.obter_estatisticas()['janelas'][37]['amostras'] == 37
+
+def test_central_alimentada_pelo_stream():
+    """Mensagens 'tick' alimentam o motor do ativo e acordam quem aguarda o próximo dígito"""
+    central = CentralDigitos(janelas=(5,))
+
+    async def cenario():
+        motor = central.motor('1HZ100V')
+        espera = asyncio.ensure_future(motor.proximo_digito(timeout=1.0))
+        await asyncio.sleep(0)
+        central.alimentar_tick({'tick': {'symbol': '1HZ100V', 'quote': 812.3, 'pip_size': 2}})
+        assert await espera == 0
+        assert await motor.proximo_digito(timeout=0.01) is None
+
+    asyncio.run(cenario())
+    assert central.alimentar_tick({'echo_req': {}}) is None
+    assert central.obter_estatisticas()['1HZ100V']['ultimo_digito'] == 0
+
+def test_stream_parado_cai_para_ultimo_tick():
+    """Stream ativo sem ticks recentes não devolve dígito congelado: consulta o último tick"""
+    os.makedirs('trading_system/logs', exist_ok=True)  # helpers registra em trading_system/logs/bot_logs.log
+    from trading_system.utils.helpers import obter_ultimo_digito
+    from trading_system.utils.digit_stats import central_digitos
+
+    class ApiFalsa:
+        chamadas = 0
+
+        async def ticks_history(self, pedido):
+            ApiFalsa.chamadas += 1
+            return {'history': {'prices': [812.37]}}
+
+    motor = central_digitos.motor('1HZ10V')
+    motor.stream_ativo = True
+    motor.intervalo_tick = 0.01  # mantém a espera pelo próximo tick curta
+    motor.adicionar_preco(812.34)
+    assert asyncio.run(obter_ultimo_digito(ApiFalsa(), '1HZ10V', 'teste')) == 4
+    assert ApiFalsa.chamadas == 0
+
+    motor.ultima_atualizacao -= 10  # socket meio aberto: assinatura ativa, sem ticks
+    assert motor.defasado()
+    assert asyncio.run(obter_ultimo_digito(ApiFalsa(), '1HZ10V', 'teste')) == 7
+    assert ApiFalsa.chamadas == 1
+
+def run_all_tests():
+    testes = [
+        test_extracao_por_pip_size,
+        test_janelas_iguais_ao_calculo_direto,
+        test_central_alimentada_pelo_stream,
+        test_stream_parado_cai_para_ultimo_tick,
+    ]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+    return falhas == 0
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Teste do EnhancedSyncSystem e da fila de sinais em um único event loop
+Registros com __slots__, contadores sem lock com a mesma API de estatísticas,
+e a fila de sinais acordando o consumidor sem poll
+"""
+
+import sys
+import os
+import time
+import asyncio
+import logging
+
+# Adicionar o diretório atual ao path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from enhanced_sync_system import EnhancedSyncSystem, SignalData, SystemStats
+from signal_queue_system import QueuedSignal, SignalQueueManager
+
+TICKS = [1000.1, 1000.2, 1000.3, 1000.2, 1000.1]
+
+CHAVES_ESTATISTICAS = {
+    'active_operations', 'queue_size', 'total_signals_processed', 'successful_operations',
+    'failed_operations', 'last_signal_time', 'circuit_breaker_state', 'average_processing_time',
+    'cache_hits', 'cache_misses', 'statistics_signals',
+}
+
+def test_estatisticas_sem_lock_e_registros_com_slots():
+    sync = EnhancedSyncSystem(max_concurrent_operations=2, max_queue_size=2)
+    assert not any('lock' in nome or 'thread' in nome for nome in vars(sync))
+
+    for symbol in ('R_10', 'R_50', 'R_100'):  # terceiro descarta o mais antigo
+        assert sync.queue_signal(TICKS, True, symbol)
+    sync.queue_signal(TICKS, False)
+    sync.record_operation_success()
+    sync.record_operation_failure()
+
+    estatisticas = sync.get_statistics()
+    assert set(estatisticas) == CHAVES_ESTATISTICAS
+    assert estatisticas['queue_size'] == 2 and estatisticas['statistics_signals'] == 1
+    assert estatisticas['successful_operations'] == 1 and estatisticas['failed_operations'] == 1
+    assert abs(estatisticas['last_signal_time'] - time.time()) < 5  # epoch, não relógio monotônico
+    assert isinstance(sync.get_stats(), SystemStats) and sync.get_stats().queue_size == 2
+
+    sinal = sync.get_next_signal()
+    assert isinstance(sinal, SignalData) and sinal.symbol == 'R_50'
+    assert not hasattr(sinal, '__dict__') and not hasattr(QueuedSignal(TICKS, True, 0.0, 's'), '__dict__')
+    assert sync.get_statistics()['queue_size'] == 1
+
+    asyncio.run(sync.clear_signal_queue())
+    assert sync.get_next_signal() is None and sync.get_statistics()['queue_size'] == 0
+
+def test_fila_de_sinais_acorda_consumidor():
+    logging.getLogger('signal_queue_system').setLevel(logging.WARNING)
+    processados = []
+
+    async def processar(sinal):
+        processados.append(sinal.pattern_detected)
+        return len(processados) > 1  # primeiro falha
+
+    async def cenario():
+        gerente = SignalQueueManager(max_size=5, max_concurrent=1)
+        fila = gerente.queue
+        await gerente.start_processing(processar)
+        await asyncio.sleep(0.01)
+
+        enfileirado = time.perf_counter()
+        fila.queue_signal(TICKS, True)
+        while not processados:
+            await asyncio.sleep(0)
+        latencia = time.perf_counter() - enfileirado
+
+        # O primeiro falhou e voltou para o fim (retry); sem padrão vai para o fim, padrão passa na frente
+        fila.queue_signal(TICKS, False)
+        fila.queue_signal(TICKS, True)
+        while len(processados) < 4:
+            await asyncio.sleep(0.001)
+        await gerente.stop_processing()
+        return latencia, fila.get_queue_stats()
+
+    latencia, estatisticas = asyncio.run(cenario())
+    assert latencia < 0.005, latencia  # com o poll antigo: até 100 ms
+    assert processados == [True, True, True, False], processados
+    assert estatisticas['successful_operations'] == 3 and estatisticas['failed_operations'] == 1
+    assert estatisticas['circuit_breaker']['state'] == 'closed' and estatisticas['last_signal_age'] < 1
+
+def run_all_tests():
+    testes = [
+        test_estatisticas_sem_lock_e_registros_com_slots,
+        test_fila_de_sinais_acorda_consumidor,
+    ]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+    return falhas == 0
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
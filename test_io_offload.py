@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Teste da camada de I/O fora do event loop (io_offload)
+Filas por alvo em ordem e em paralelo entre alvos, backpressure/substituição,
+e a guarda que aponta conexões de rede síncronas feitas na thread do loop
+"""
+
+import sys
+import os
+import time
+import socket
+import asyncio
+import threading
+
+# Adicionar o diretório atual ao path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import io_offload
+from io_offload import DescarregadorIO, instalar_guarda
+
+def test_ordem_por_alvo_sem_travar_o_loop():
+    gravados = {'a': [], 'b': []}
+
+    def gravar(alvo, valor):
+        time.sleep(0.02)  # como um insert no Supabase
+        gravados[alvo].append(valor)
+        return valor
+
+    async def cenario():
+        io = DescarregadorIO(max_threads=4)
+        batidas = 0
+
+        async def batimento():
+            nonlocal batidas
+            while True:
+                await asyncio.sleep(0.005)
+                batidas += 1
+
+        relogio = asyncio.create_task(batimento())
+        inicio = time.monotonic()
+        resultados = await asyncio.gather(*(io.executar(alvo, gravar, alvo, i) for i in range(10) for alvo in 'ab'))
+        duracao = time.monotonic() - inicio
+        relogio.cancel()
+        return resultados, duracao, batidas, io.obter_estatisticas()
+
+    resultados, duracao, batidas, estatisticas = asyncio.run(cenario())
+    assert gravados == {'a': list(range(10)), 'b': list(range(10))}  # ordem de chegada por alvo
+    assert resultados[:2] == [0, 0] and resultados[-2:] == [9, 9]
+    assert duracao < 0.35, duracao  # 'a' e 'b' em paralelo (sequencial seriam ~0.4 s)
+    assert batidas >= 20, batidas  # o loop seguiu rodando durante o I/O
+    assert estatisticas['a']['concluidas'] == 10 and estatisticas['a']['pendentes'] == 0
+
+def test_enviar_substitui_e_descarta_sem_esperar():
+    liberar = threading.Event()
+    iniciados = threading.Semaphore(0)
+    gravados = []
+
+    def gravar(valor):
+        iniciados.release()
+        liberar.wait(1)
+        gravados.append(valor)
+
+    io = DescarregadorIO(max_threads=2, max_pendentes=3)
+    # Snapshot: com a primeira gravação em andamento, só a última versão pendente sobrevive
+    io.enviar('arquivo', gravar, 0, substituir=True)
+    assert iniciados.acquire(timeout=1)
+    for versao in range(1, 5):
+        io.enviar('arquivo', gravar, versao, substituir=True)
+    # Fila cheia: enviar nunca bloqueia, descarta a pendente mais antiga
+    io.enviar('logs', gravar, 'log0')
+    assert iniciados.acquire(timeout=1)
+    inicio = time.monotonic()
+    for i in range(1, 6):
+        io.enviar('logs', gravar, f"log{i}")
+    assert time.monotonic() - inicio < 0.05
+    liberar.set()
+    asyncio.run(io.aguardar())
+
+    estatisticas = io.obter_estatisticas()
+    assert [v for v in gravados if isinstance(v, int)] == [0, 4], gravados
+    assert estatisticas['arquivo']['substituidas'] == 3
+    logs = [v for v in gravados if isinstance(v, str)]
+    assert logs == ['log0', 'log3', 'log4', 'log5'], logs
+    assert estatisticas['logs']['descartadas'] == 2
+
+def test_guarda_aponta_conexao_sincrona_no_loop():
+    servidor = socket.socket()
+    servidor.bind(('127.0.0.1', 0))
+    servidor.listen(4)
+    endereco = servidor.getsockname()
+    io_offload.violacoes.clear()
+
+    def conectar():
+        with socket.create_connection(endereco, timeout=1):
+            pass
+
+    async def cenario():
+        conectar()  # no loop: apontada
+        await io_offload.executar_io('teste_guarda', conectar)  # no pool: permitida
+        leitor, escritor = await asyncio.open_connection(*endereco)  # socket não bloqueante do asyncio
+        escritor.close()
+
+    try:
+        instalar_guarda('warn')
+        asyncio.run(cenario())
+        # Resolução de nome e connect, ambos atribuídos à linha de conectar()
+        assert sorted(chave.split()[-1] for chave in io_offload.violacoes) == ['socket.connect', 'socket.getaddrinfo']
+        assert all(chave.startswith('test_io_offload.py:') and '(conectar)' in chave for chave in io_offload.violacoes)
+
+        instalar_guarda('raise')
+        try:
+            asyncio.run(cenario())
+            assert False, "conexão síncrona no loop deveria falhar com IO_GUARD=raise"
+        except io_offload.ChamadaBloqueanteNoLoop:
+            pass
+    finally:
+        instalar_guarda('off')
+        servidor.close()
+
+def run_all_tests():
+    testes = [
+        test_ordem_por_alvo_sem_travar_o_loop,
+        test_enviar_substitui_e_descarta_sem_esperar,
+        test_guarda_aponta_conexao_sincrona_no_loop,
+    ]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+    return falhas == 0
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
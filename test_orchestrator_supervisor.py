@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Teste do supervisor de processos do BotOrchestrator
+Detecção de quedas por pidfd/SIGCHLD com restart imediato e backoff por bot,
+partida de frota pelo lançador concorrente (sem sleep bloqueante), término
+sem process.wait no loop e restart de bots que caem dentro de um worker
+"""
+
+import sys
+import os
+import time
+import signal
+import asyncio
+import threading
+
+# Adicionar o diretório atual ao path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import orchestrator
+from io_offload import descarregador
+
+def _orquestrador(comando):
+    handlers = {sig: signal.getsignal(sig) for sig in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        orq = orchestrator.BotOrchestrator(supabase=object())
+    finally:
+        for sig, handler in handlers.items():
+            signal.signal(sig, handler)
+    orq.worker_count = 0
+    orq._bot_command = lambda bot_id: [sys.executable, '-c', comando]
+    orq._update_bot_status = lambda bot_id, status, pid: None
+    inicios = []
+    iniciar = orq._start_bot_process
+    def registrar(bot_id, bot_name):
+        inicios.append((bot_id, time.monotonic()))
+        iniciar(bot_id, bot_name)
+    orq._start_bot_process = registrar
+    return orq, inicios
+
+def _encerrar(orq):
+    for process in orq.active_processes.values():
+        process.kill()
+        process.wait()
+
+def test_restart_imediato_com_backoff():
+    orq, inicios = _orquestrador('import sys; sys.exit(3)')
+    orq.restart_backoff_base = 0.2
+    orq.startup_stagger = 0.0
+    orq.bot_configs = {'7': {'bot_name': 'Crash', 'status': 'running'}}
+
+    async def cenario():
+        orq._start_supervisor()
+        try:
+            orq._schedule_start('7', 'Crash')
+            await asyncio.sleep(1.6)
+        finally:
+            orq._stop_supervisor()
+
+    asyncio.run(cenario())
+    _encerrar(orq)
+    tempos = [t for _, t in inicios]
+    intervalos = [b - a for a, b in zip(tempos, tempos[1:])]
+    # Restart imediato após a 1ª queda; depois 0,2 s, 0,4 s, 0,8 s (+ vida do processo)
+    assert 4 <= len(tempos) <= 5, intervalos
+    assert intervalos[0] < 0.5, intervalos
+    assert intervalos[1] >= 0.2 and intervalos[2] >= 0.4 and intervalos[2] > intervalos[1], intervalos
+    assert orq.crash_history['7'][0] >= 3 and orq.bot_health_status['7'] in ('dead', 'starting')
+
+def test_partida_da_frota_com_lancador():
+    orq, inicios = _orquestrador('import time; time.sleep(30)')
+    orq.startup_concurrency = 5
+    orq.startup_stagger = 0.1
+    orq.bot_configs = {str(i): {'bot_name': f'Bot_{i}', 'status': 'running'} for i in range(30)}
+    orq.bot_health_status = {bot_id: 'stopped' for bot_id in orq.bot_configs}
+
+    async def cenario():
+        orq._start_supervisor()
+        try:
+            inicio = time.monotonic()
+            orq.manage_bot_processes()
+            orq.manage_bot_processes()  # ciclo repetido não duplica inícios pendentes
+            while len(orq.active_processes) < 30 and time.monotonic() - inicio < 10:
+                await asyncio.sleep(0.01)
+            return time.monotonic() - inicio
+        finally:
+            orq._stop_supervisor()
+
+    decorrido = asyncio.run(cenario())
+    _encerrar(orq)
+    assert len(inicios) == 30 and len(orq.active_processes) == 30
+    # 30 bots, 5 vagas, 0,1 s por vaga: ~0,5 s em vez de 30 × startup_delay
+    assert 0.4 <= decorrido < 5, decorrido
+
+def test_terminar_sem_travar_o_loop():
+    orq, _ = _orquestrador('import signal, time; signal.signal(signal.SIGTERM, signal.SIG_IGN); time.sleep(30)')
+    orq.terminate_grace = 0.3
+    orq.bot_configs = {'5': {'bot_name': 'Teimoso', 'status': 'stopped'}}
+
+    async def cenario():
+        orq._start_supervisor()
+        try:
+            orq._start_bot_process('5', 'Teimoso')
+            process = orq.active_processes['5']
+            await asyncio.sleep(0.3)  # tempo para o filho ignorar o SIGTERM
+            inicio = time.monotonic()
+            orq._terminate_bot_process('5', 'Teimoso')
+            retorno = time.monotonic() - inicio
+            while process.poll() is None and time.monotonic() - inicio < 3:
+                await asyncio.sleep(0.01)
+            return retorno, time.monotonic() - inicio, process.returncode
+        finally:
+            orq._stop_supervisor()
+
+    retorno, morte, codigo = asyncio.run(cenario())
+    assert retorno < 0.05, retorno  # antes: process.wait(timeout=10) dentro do loop
+    assert 0.3 <= morte < 2 and codigo == -signal.SIGKILL, (morte, codigo)
+    assert '5' not in orq.active_processes and orq.bot_health_status['5'] == 'stopped'
+
+def test_status_no_banco_fora_do_loop():
+    orq, _ = _orquestrador('import time; time.sleep(30)')
+    orq.bot_configs = {'9': {'bot_name': 'Lento', 'status': 'stopped'}}
+    gravados = []
+    def supabase_lento(bot_id, status, pid):
+        time.sleep(0.3)  # requisição HTTP síncrona
+        gravados.append((bot_id, status, threading.current_thread()))
+    orq._update_bot_status = supabase_lento
+
+    async def cenario():
+        orq._start_supervisor()
+        try:
+            inicio = time.monotonic()
+            orq._start_bot_process('9', 'Lento')
+            orq._terminate_bot_process('9', 'Lento')
+            retorno = time.monotonic() - inicio
+            await descarregador().aguardar()
+            return retorno
+        finally:
+            orq._stop_supervisor()
+
+    retorno = asyncio.run(cenario())
+    assert retorno < 0.2, retorno  # antes: 2 x 0,3 s de Supabase dentro do loop
+    assert [(bot_id, status) for bot_id, status, _ in gravados] == [('9', 'starting'), ('9', 'stopped')]
+    assert all(thread is not threading.main_thread() for _, _, thread in gravados)
+
+def test_bot_que_cai_dentro_do_worker_reinicia():
+    # Worker falso: o primeiro start de cada bot termina em erro e é reportado na saída padrão
+    worker = ("import sys\n"
+              "vistos = set()\n"
+              "for linha in sys.stdin:\n"
+              "    comando, bot_id = linha.split()\n"
+              "    print(f'worker: {comando} {bot_id}', flush=True)\n"
+              "    if comando == 'start' and bot_id not in vistos:\n"
+              "        vistos.add(bot_id)\n"
+              "        print(f'exited {bot_id} erro', flush=True)\n")
+    orq, inicios = _orquestrador('')
+    orq.worker_count = 1
+    orq.startup_stagger = 0.0
+    orq._worker_command = lambda index: [sys.executable, '-c', worker]
+    orq.bot_configs = {'7': {'bot_name': 'Crash', 'status': 'running'}}
+    comandos = []
+    enviar = orq._send_worker_command
+    def registrar(index, comando):
+        comandos.append((index, comando))
+        enviar(index, comando)
+    orq._send_worker_command = registrar
+
+    async def cenario():
+        orq._start_supervisor()
+        try:
+            orq._schedule_start('7', 'Crash')
+            inicio = time.monotonic()
+            while len(inicios) < 2 and time.monotonic() - inicio < 3:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.2)  # um segundo start não gera outro 'exited'
+        finally:
+            orq._stop_supervisor()
+
+    try:
+        asyncio.run(cenario())
+        assert comandos == [(0, 'start 7'), (0, 'start 7')], comandos
+        assert orq.bot_worker == {'7': 0} and orq.active_processes['7'] is orq.workers[0]
+        assert orq.crash_history['7'][0] == 1 and orq.bot_health_status['7'] == 'starting'
+    finally:
+        for process in orq.workers.values():
+            process.kill()
+            process.wait()
+
+def run_all_tests():
+    testes = [
+        test_restart_imediato_com_backoff,
+        test_partida_da_frota_com_lancador,
+        test_terminar_sem_travar_o_loop,
+        test_status_no_banco_fora_do_loop,
+        test_bot_que_cai_dentro_do_worker_reinicia,
+    ]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+    return falhas == 0
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
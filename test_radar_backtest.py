@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do motor de backtest dos radares
+Compara os kernels vetorizados com as funções originais e valida a trava de 2 operações
+"""
+
+import sys
+import os
+import io
+import time
+import random
+import logging
+import contextlib
+
+import numpy as np
+
+# Adicionar o diretório atual ao path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import radar_backtest
+from radar_backtest import BacktestEngine, avaliar_estrategia, avaliar_historico, executar_backtest
+
+def _historico_aleatorio(rng, tamanho, taxa_win):
+    return ['V' if rng.random() < taxa_win else 'D' for _ in range(tamanho)]
+
+def _historicos_de_teste(quantidade=400, tamanho=30):
+    rng = random.Random(42)
+    historicos = []
+    for i in range(quantidade):
+        historico = _historico_aleatorio(rng, tamanho, 0.6 + 0.35 * (i % 4) / 3)
+        # Forçar os gatilhos mais comuns (LOSS isolada / dupla LOSS)
+        if i % 3 == 0:
+            historico[0], historico[1] = 'D', 'V'
+        elif i % 3 == 1:
+            historico[0], historico[1] = 'D', 'D'
+        historicos.append(historico)
+    return historicos
+
+def test_portfolio_igual_radar_analyzer():
+    """Kernels do portfólio devem decidir igual a analisar_estrategias_portfolio"""
+    import radar_analyzer
+    logging.disable(logging.CRITICAL)
+    try:
+        for historico in _historicos_de_teste():
+            radar_analyzer.reset_persistence_state_safe()
+            with contextlib.redirect_stdout(io.StringIO()):
+                original = radar_analyzer.analisar_estrategias_portfolio(historico)
+            dispara, confianca = avaliar_historico('PORTFOLIO_8', historico)
+            assert dispara == original['should_operate'], f"Divergência em {''.join(historico)}"
+            if dispara:
+                assert confianca == original['melhor_estrategia']['confidence']
+                vencedora, _ = avaliar_estrategia('PORTFOLIO_8', historico)
+                assert vencedora == original['melhor_estrategia']['strategy'], f"Vencedora divergente em {''.join(historico)}"
+            for nome in radar_backtest.ESTRATEGIAS_PORTFOLIO:
+                esperado = any(e.get('strategy') == nome for e in original['estrategias_disponiveis'])
+                if original['should_operate']:
+                    assert avaliar_historico(nome, historico)[0] == esperado, f"{nome} divergente em {''.join(historico)}"
+    finally:
+        radar_analyzer.reset_persistence_state_safe()
+        logging.disable(logging.NOTSET)
+
+def test_precision_surge_igual_radar_scalping():
+    """Kernel PRECISION_SURGE deve reproduzir analisar_precision_surge_CORRIGIDO"""
+    import radar_analisis_scalping_bot as radar
+    logging.disable(logging.CRITICAL)
+    try:
+        rng = random.Random(7)
+        for i in range(400):
+            historico = _historico_aleatorio(rng, 30, 0.85)
+            original = radar.analisar_precision_surge_CORRIGIDO(historico)
+            dispara, confianca = avaliar_historico('PRECISION_SURGE', historico)
+            assert dispara == original['should_operate'], f"Divergência em {''.join(historico)}"
+            if dispara:
+                assert confianca == original['confidence']
+    finally:
+        logging.disable(logging.NOTSET)
+
+def test_trava_duas_operacoes():
+    """Após o sinal, as 2 operações seguintes são executadas e a análise só volta depois"""
+    # Dupla LOSS dispara MOMENTUM_CALMO_LL
+    historico = ['V', 'V', 'D', 'D', 'V', 'V', 'D', 'D', 'D', 'V']
+    resultados = np.array([1 if r == 'V' else 0 for r in historico], dtype=np.uint8)
+    lucros = np.where(resultados == 1, 10.0, -100.0)
+    timestamps = np.arange(len(resultados), dtype=np.float64) * 60
+
+    motor = BacktestEngine('MOMENTUM_CALMO_LL', operacoes_historico=2)
+    motor.processar_bloco(resultados, lucros, timestamps)
+    r = motor.finalizar()
+
+    # Sinal 1 na op 3 (D D) -> trades 4, 5 (V V) = acerto
+    # Sinal 2 na op 7 (D D) -> trades 8, 9 (D V) = erro; op 8 (D D) fica travada
+    assert r.sinais == 2, f"Esperado 2 sinais, obtido {r.sinais}"
+    assert r.acertos == 1
+    assert r.trades == 4 and r.trades_vencedores == 3
+    assert r.max_drawdown == 100.0
+    assert r.taxa_acerto == 50.0
+
+def test_timeout_persistencia():
+    """Sinal expira se as operações não chegarem dentro do timeout"""
+    resultados = np.array([1, 0, 0, 1, 1], dtype=np.uint8)
+    lucros = np.where(resultados == 1, 10.0, -100.0)
+    timestamps = np.array([0, 60, 120, 1000, 1060], dtype=np.float64)
+
+    motor = BacktestEngine('MOMENTUM_CALMO_LL', operacoes_historico=2)
+    motor.processar_bloco(resultados, lucros, timestamps)
+    r = motor.finalizar()
+    assert r.sinais == 1 and r.sinais_expirados == 1 and r.trades == 0
+
+def test_blocos_equivalem_a_fluxo_unico():
+    """Processar em blocos deve dar o mesmo resultado que um bloco único"""
+    rng = np.random.default_rng(1)
+    n = 20000
+    resultados = (rng.random(n) < 0.8).astype(np.uint8)
+    lucros = np.where(resultados == 1, rng.uniform(5, 30, n), -100.0)
+    timestamps = np.cumsum(rng.uniform(10, 200, n))
+
+    unico = executar_backtest([(resultados, lucros, timestamps)], list(radar_backtest.ESTRATEGIAS))
+    blocos = [(resultados[i:i + 777], lucros[i:i + 777], timestamps[i:i + 777]) for i in range(0, n, 777)]
+    em_blocos = executar_backtest(blocos, list(radar_backtest.ESTRATEGIAS))
+
+    for nome in unico:
+        a, b = unico[nome].to_dict(), em_blocos[nome].to_dict()
+        for chave in ('operacoes', 'sinais', 'acertos', 'trades', 'trades_vencedores', 'sinais_expirados'):
+            assert a[chave] == b[chave], f"{nome}.{chave}: {a[chave]} != {b[chave]}"
+
+def test_portfolio_credita_estrategia_vencedora():
+    """Sinais do portfólio vão para a estratégia que venceu, mesmo com confianças empatadas"""
+    rng = np.random.default_rng(1)
+    n = 20000
+    resultados = (rng.random(n) < 0.8).astype(np.uint8)
+    lucros = np.where(resultados == 1, rng.uniform(5, 30, n), -100.0)
+    timestamps = np.cumsum(rng.uniform(10, 200, n))
+
+    r = executar_backtest([(resultados, lucros, timestamps)], ['PORTFOLIO_8'])['PORTFOLIO_8']
+    # FIBONACCI_RECOVERY e MOMENTUM_SHIFT têm a mesma confiança (87.5)
+    assert r.sinais_por_estrategia.get('FIBONACCI_RECOVERY', 0) > 0
+    assert r.sinais_por_estrategia.get('MOMENTUM_SHIFT', 0) > 0, r.sinais_por_estrategia
+    assert 'DESCONHECIDA' not in r.sinais_por_estrategia
+    assert sum(r.sinais_por_estrategia.values()) == r.sinais
+
+def test_leitura_csv(tmp_path=None):
+    """Export CSV da tabela de logs (ordem decrescente de id) é lido em ordem cronológica"""
+    import tempfile
+    pasta = str(tmp_path) if tmp_path else tempfile.mkdtemp()
+    caminho = os.path.join(pasta, 'scalping_accumulator_bot_logs.csv')
+    with open(caminho, 'w') as f:
+        f.write("id,profit_percentage,created_at\n")
+        f.write("3,12.5,2025-01-01T00:02:00+00:00\n")
+        f.write("2,-100,2025-01-01T00:01:00+00:00\n")
+        f.write("1,8.0,2025-01-01T00:00:00Z\n")
+
+    resultados, lucros, timestamps = next(radar_backtest.ler_operacoes_em_blocos(caminho))
+    assert resultados.tolist() == [1, 0, 1]
+    assert lucros.tolist() == [8.0, -100.0, 12.5]
+    assert np.diff(timestamps).tolist() == [60.0, 60.0]
+
+def test_throughput():
+    """Portfólio completo deve processar pelo menos 1M de operações por segundo"""
+    rng = np.random.default_rng(2)
+    n = 2_000_000
+    resultados = (rng.random(n) < 0.85).astype(np.uint8)
+    lucros = np.where(resultados == 1, 10.0, -100.0)
+    timestamps = np.arange(n, dtype=np.float64) * 30
+
+    inicio = time.perf_counter()
+    r = executar_backtest([(resultados, lucros, timestamps)], ['PORTFOLIO_8'])['PORTFOLIO_8']
+    duracao = time.perf_counter() - inicio
+    print(f"PORTFOLIO_8: {n / duracao:,.0f} ops/s, {r.sinais} sinais")
+    assert n / duracao > 1_000_000
+
+def run_all_tests():
+    testes = [
+        test_portfolio_igual_radar_analyzer,
+        test_precision_surge_igual_radar_scalping,
+        test_trava_duas_operacoes,
+        test_timeout_persistencia,
+        test_blocos_equivalem_a_fluxo_unico,
+        test_portfolio_credita_estrategia_vencedora,
+        test_leitura_csv,
+        test_throughput,
+    ]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+    return falhas == 0
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do radar multi-bot
+Valida busca concorrente, upsert único em lote, reaproveitamento sem operações novas, trava de 2 operações
+e o filtro de frequência (lucro e created_at chegam à avaliação)
+"""
+
+import sys
+import os
+import time
+import asyncio
+from datetime import datetime, timezone
+
+# Adicionar o diretório atual ao path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from concurrent.futures import ProcessPoolExecutor
+
+from radar_fanout import AlvoRadar, RadarFanout
+
+class _Resposta:
+    def __init__(self, data):
+        self.data = data
+
+class _Consulta:
+    def __init__(self, cliente, tabela):
+        self.cliente, self.tabela, self.limite, self.linhas = cliente, tabela, None, None
+
+    def select(self, colunas):
+        return self
+
+    def order(self, coluna, desc=False):
+        return self
+
+    def limit(self, n):
+        self.limite = n
+        return self
+
+    def upsert(self, linhas, on_conflict=None):
+        self.linhas = linhas
+        return self
+
+    async def execute(self):
+        if self.linhas is not None:
+            self.cliente.upserts.append(self.linhas)
+            return _Resposta(self.linhas)
+        await asyncio.sleep(self.cliente.latencia)
+        historico = self.cliente.tabelas[self.tabela][:self.limite]
+        topo = historico[0][0] if historico else 0
+        # Uma operação a cada 30 s, a mais recente em ultima_operacao_em
+        return _Resposta([{'id': i, 'profit_percentage': 10 if r == 'V' else -100,
+                           'created_at': datetime.fromtimestamp(self.cliente.ultima_operacao_em - (topo - i) * 30,
+                                                                timezone.utc).isoformat()}
+                          for i, r in historico])
+
+class _ClienteFalso:
+    """Imita o AsyncClient do Supabase: tabelas com (id, 'V'/'D'), mais recente primeiro"""
+
+    def __init__(self, tabelas, latencia=0.05):
+        self.tabelas, self.latencia, self.upserts = tabelas, latencia, []
+        self.ultima_operacao_em = time.time()
+
+    def table(self, nome):
+        return _Consulta(self, nome)
+
+    def adicionar(self, tabela, resultado):
+        proximo = self.tabelas[tabela][0][0] + 1
+        self.tabelas[tabela].insert(0, (proximo, resultado))
+
+def _tabela(sequencia):
+    # sequencia em ordem cronológica; armazenada mais recente primeiro
+    return [(i + 1, r) for i, r in reversed(list(enumerate(sequencia)))]
+
+def test_busca_concorrente_e_lote_unico():
+    """10 alvos são buscados em paralelo e gravados com um único upsert"""
+    tabelas = {f"logs_{i}": _tabela(['V'] * 25 + ['D', 'V'] * 3) for i in range(10)}
+    cliente = _ClienteFalso(tabelas, latencia=0.05)
+    radar = RadarFanout([AlvoRadar(f"Bot {i}", f"logs_{i}", ('PRECISION_SURGE',)) for i in range(10)])
+    try:
+        inicio = time.perf_counter()
+        r = asyncio.run(radar.executar_ciclo(cliente))
+        duracao = time.perf_counter() - inicio
+        assert r.buscados == 10 and r.avaliados == 10 and not r.erros
+        assert duracao < 0.3, f"Buscas não foram concorrentes ({duracao:.2f}s)"
+        assert len(cliente.upserts) == 1 and len(cliente.upserts[0]) == 10
+        assert {l['bot_name'] for l in cliente.upserts[0]} == {f"Bot {i}" for i in range(10)}
+
+        # Sem operações novas: nada é reavaliado nem regravado
+        r = asyncio.run(radar.executar_ciclo(cliente))
+        assert r.avaliados == 0 and r.gravados == 0 and len(cliente.upserts) == 1
+    finally:
+        radar.fechar()
+
+def test_trava_persistencia_por_alvo():
+    """Sinal fica ativo até 2 operações novas e só o alvo alterado é regravado"""
+    # Dupla LOSS dispara MOMENTUM_CALMO_LL
+    cliente = _ClienteFalso({
+        'a': _tabela(['V'] * 33 + ['D', 'D']),
+        'b': _tabela(['V'] * 34 + ['D']),
+    }, latencia=0)
+    radar = RadarFanout([AlvoRadar('A', 'a', ('MOMENTUM_CALMO_LL',)), AlvoRadar('B', 'b', ('MOMENTUM_CALMO_LL',))])
+    try:
+        asyncio.run(radar.executar_ciclo(cliente))
+        linhas = {l['bot_name']: l for l in cliente.upserts[-1]}
+        assert linhas['A']['is_safe_to_operate'] and linhas['A']['strategy_used'] == 'MOMENTUM_CALMO_LL'
+        assert not linhas['B']['is_safe_to_operate']
+
+        cliente.adicionar('a', 'V')
+        asyncio.run(radar.executar_ciclo(cliente))
+        linhas = {l['bot_name']: l for l in cliente.upserts[-1]}
+        assert list(linhas) == ['A'] and linhas['A']['operations_after_pattern'] == 1
+        assert linhas['A']['is_safe_to_operate']
+
+        cliente.adicionar('a', 'V')
+        asyncio.run(radar.executar_ciclo(cliente))
+        linha = cliente.upserts[-1][0]
+        assert not linha['is_safe_to_operate'] and 'Desligado' in linha['reason']
+    finally:
+        radar.fechar()
+
+def test_filtro_de_frequencia_dispara_sem_operacoes_novas():
+    """MAX_FREQUENCY_FILTER: última WIN com lucro >= 10% e 120 s sem operações"""
+    cliente = _ClienteFalso({'a': _tabela(['V', 'D', 'V', 'V'] * 5)}, latencia=0)
+    radar = RadarFanout([AlvoRadar('A', 'a', ('MAX_FREQUENCY_FILTER',))])
+    try:
+        asyncio.run(radar.executar_ciclo(cliente))
+        assert not cliente.upserts[-1][0]['is_safe_to_operate']  # operação de agora há pouco
+
+        # Nenhuma operação nova, mas a última já tem 3 minutos: o sinal sai
+        cliente.ultima_operacao_em -= 180
+        r = asyncio.run(radar.executar_ciclo(cliente))
+        linha = cliente.upserts[-1][0]
+        assert r.avaliados == 1 and r.sinais == 1
+        assert linha['is_safe_to_operate'] and linha['strategy_used'] == 'MAX_FREQUENCY_FILTER'
+    finally:
+        radar.fechar()
+
+def test_avaliacao_em_processos_igual_a_no_loop():
+    """Poucos alvos são avaliados no loop; muitos vão em lotes a processos, com o mesmo resultado"""
+    sequencias = [['V'] * 33 + ['D', 'D'], ['V'] * 34 + ['D'], ['V'] * 25 + ['D', 'V'] * 5]
+    tabelas = {f"logs_{i}": _tabela(sequencias[i % 3]) for i in range(12)}
+    alvos = [AlvoRadar(f"Bot {i}", f"logs_{i}", ('MOMENTUM_CALMO_LL', 'PRECISION_SURGE')) for i in range(12)]
+    linhas = {}
+    for workers in (0, 3):
+        cliente = _ClienteFalso(tabelas, latencia=0)
+        radar = RadarFanout(alvos, workers=workers, avaliacao_em_processos=5)
+        try:
+            r = asyncio.run(radar.executar_ciclo(cliente))
+            assert r.avaliados == 12 and not r.erros, r.erros
+            assert isinstance(radar._executor, ProcessPoolExecutor) == (workers > 1)
+            linhas[workers] = [{k: v for k, v in l.items() if k not in ('created_at', 'pattern_found_at')}
+                               for l in cliente.upserts[-1]]
+        finally:
+            radar.fechar()
+    assert linhas[0] == linhas[3] and sum(l['is_safe_to_operate'] for l in linhas[0]) >= 4
+
+def run_all_tests():
+    testes = [
+        test_busca_concorrente_e_lote_unico,
+        test_trava_persistencia_por_alvo,
+        test_filtro_de_frequencia_dispara_sem_operacoes_novas,
+        test_avaliacao_em_processos_igual_a_no_loop,
+    ]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+    return falhas == 0
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
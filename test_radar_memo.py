@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste da memorização da análise dos radares
+Valida que ciclos com histórico inalterado reaproveitam a decisão sem reanalisar nem reenviar
+"""
+
+import sys
+import os
+import io
+import logging
+import contextlib
+from unittest.mock import patch
+
+# Adicionar o diretório atual ao path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from radar_memo import MemoAnaliseRadar
+
+HISTORICO = ['V'] * 25 + ['D'] * 5
+
+def test_memo_impressao_e_metricas():
+    """Mesma impressão acerta, impressão nova ou invalidação falham"""
+    memo = MemoAnaliseRadar('teste')
+    impressao = memo.impressao(100, 30, 'ANALYZING')
+    assert memo.consultar(impressao) is None
+
+    decisao = {'should_operate': False, 'reason': 'Esperando'}
+    memo.armazenar(impressao, decisao, 0.01)
+    decisao['reason'] = 'alterado'
+    assert memo.consultar(impressao) == {'should_operate': False, 'reason': 'Esperando'}
+    assert memo.consultar(memo.impressao(101, 30, 'ANALYZING')) is None
+    assert memo.consultar(memo.impressao(None, 30)) is None
+
+    memo.invalidar()
+    assert memo.consultar(impressao) is None
+
+    e = memo.obter_estatisticas()
+    assert e['acertos'] == 1 and e['falhas'] == 4 and e['invalidacoes'] == 1
+    assert e['taxa_acerto'] == 20.0 and e['tempo_economizado_s'] == 0.01
+
+def test_radar_scalping_pula_analise_e_envio():
+    """executar_ciclo_FINAL_CORRIGIDO reaproveita a decisão e main_loop não reenvia"""
+    import radar_analisis_scalping_bot as radar
+    ultimo_id = {'valor': 500}
+    analises = []
+
+    def buscar(_supabase):
+        return list(HISTORICO), [None] * 30, ultimo_id['valor']
+
+    def analisar(historico):
+        analises.append(1)
+        return {'should_operate': False, 'strategy': 'PRECISION_SURGE', 'confidence': 0, 'reason': 'Esperando'}
+
+    logging.disable(logging.CRITICAL)
+    try:
+        radar.reset_bot_state()
+        with patch.object(radar, 'buscar_operacoes_historico', buscar), \
+             patch.object(radar, 'executar_analise_precision_surge_unico', analisar):
+            primeiro = radar.executar_ciclo_FINAL_CORRIGIDO(object())
+            segundo = radar.executar_ciclo_FINAL_CORRIGIDO(object())
+            assert len(analises) == 1
+            assert not primeiro.get('memo_hit') and segundo.get('memo_hit')
+            assert segundo['resultado'] == primeiro['resultado']
+
+            ultimo_id['valor'] = 501
+            terceiro = radar.executar_ciclo_FINAL_CORRIGIDO(object())
+            assert len(analises) == 2 and not terceiro.get('memo_hit')
+    finally:
+        radar.reset_bot_state()
+        logging.disable(logging.NOTSET)
+
+def test_radar_analyzer_pula_portfolio_e_upsert():
+    """analisar_e_enviar_sinal não reanalisa nem faz upsert com histórico inalterado"""
+    import radar_analyzer
+
+    def buscar(_supabase):
+        radar_analyzer.ultimo_id_operacao = 900
+        return list(HISTORICO), [None] * 30
+
+    envios = []
+    analises = []
+
+    def portfolio(historico):
+        analises.append(1)
+        return {'should_operate': False, 'reason': 'Aguardando padrão', 'estrategias_disponiveis': []}
+
+    logging.disable(logging.CRITICAL)
+    try:
+        radar_analyzer.reset_persistence_state_safe()
+        radar_analyzer.memo_analise.invalidar()
+        with patch.object(radar_analyzer, 'buscar_ultimo_sinal', lambda s: None), \
+             patch.object(radar_analyzer, 'buscar_operacoes_historico', buscar), \
+             patch.object(radar_analyzer, 'analisar_estrategias_portfolio', portfolio), \
+             patch.object(radar_analyzer, 'enviar_sinal_para_supabase', lambda *a, **k: envios.append(a) or True), \
+             contextlib.redirect_stdout(io.StringIO()):
+            primeiro = radar_analyzer.analisar_e_enviar_sinal(object())
+            segundo = radar_analyzer.analisar_e_enviar_sinal(object())
+        assert primeiro == segundo == (False, 'Aguardando padrão')
+        assert len(analises) == 1 and len(envios) == 1
+    finally:
+        radar_analyzer.memo_analise.invalidar()
+        radar_analyzer.reset_persistence_state_safe()
+        logging.disable(logging.NOTSET)
+
+def run_all_tests():
+    testes = [
+        test_memo_impressao_e_metricas,
+        test_radar_scalping_pula_analise_e_envio,
+        test_radar_analyzer_pula_portfolio_e_upsert,
+    ]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+    return falhas == 0
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
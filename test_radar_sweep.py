@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste da varredura de parâmetros dos radares
+Valida geração do espaço de busca, execução paralela em memória compartilhada e ranking
+"""
+
+import sys
+import os
+
+import numpy as np
+
+# Adicionar o diretório atual ao path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from radar_backtest import BacktestEngine
+from radar_sweep import (
+    gerar_grade, gerar_aleatorio, separar_parametros, executar_sweep, salvar_tabela
+)
+
+def _dados(n=30000, semente=3):
+    rng = np.random.default_rng(semente)
+    resultados = (rng.random(n) < 0.8).astype(np.uint8)
+    lucros = np.where(resultados == 1, 10.0, -100.0)
+    timestamps = np.cumsum(rng.uniform(10, 120, n))
+    return resultados, lucros, timestamps
+
+def test_espaco_de_busca():
+    """Grade gera o produto cartesiano e a busca aleatória respeita os intervalos"""
+    grade = gerar_grade({'a': [1, 2], 'b': [3, 4, 5]})
+    assert len(grade) == 6 and {'a': 2, 'b': 5} in grade
+
+    aleatorio = gerar_aleatorio({'x': (0, 3), 'y': (0.5, 1.0)}, 20)
+    assert all(0 <= c['x'] <= 3 and isinstance(c['x'], int) for c in aleatorio)
+    assert all(0.5 <= c['y'] <= 1.0 for c in aleatorio)
+    assert len({tuple(sorted(c.items())) for c in aleatorio}) == len(aleatorio)
+
+def test_separar_parametros():
+    """Parâmetros do motor e do portfólio são roteados corretamente"""
+    parametros, opcoes = separar_parametros({
+        'max_losses_15': 2, 'CYCLE_TRANSITION.tamanho_ciclo': 15, 'persistencia_timeout': 120
+    })
+    assert parametros == {'max_losses_15': 2, 'CYCLE_TRANSITION': {'tamanho_ciclo': 15}}
+    assert opcoes == {'persistencia_timeout': 120}
+
+def test_sweep_paralelo_igual_sequencial():
+    """Resultados dos processos (memória compartilhada) batem com o backtest direto"""
+    resultados, lucros, timestamps = _dados()
+    combinacoes = gerar_grade({'max_losses_15': [0, 1, 2], 'operacoes_historico': [16, 30]})
+
+    linhas = executar_sweep('STABILITY_BREAK', combinacoes, resultados, lucros, timestamps,
+                            workers=2, tamanho_lote=2)
+    assert len(linhas) == len(combinacoes)
+    assert [l['rank'] for l in linhas] == list(range(1, len(combinacoes) + 1))
+
+    for linha in linhas:
+        motor = BacktestEngine('STABILITY_BREAK', {'max_losses_15': linha['max_losses_15']},
+                               operacoes_historico=linha['operacoes_historico'])
+        motor.processar_bloco(resultados, lucros, timestamps)
+        esperado = motor.finalizar()
+        assert linha['sinais'] == esperado.sinais
+        assert linha['acertos'] == esperado.acertos
+
+    taxas = [l['taxa_acerto'] for l in linhas if l['sinais'] >= 1]
+    assert taxas == sorted(taxas, reverse=True)
+
+def test_sweep_portfolio_e_tabela(tmp_path=None):
+    """Parâmetros aninhados do portfólio e gravação do CSV ranqueado"""
+    import tempfile
+    resultados, lucros, timestamps = _dados(5000)
+    combinacoes = gerar_grade({'CYCLE_TRANSITION.tamanho_ciclo': [20, 29], 'operacoes_historico': [30]})
+    linhas = executar_sweep('PORTFOLIO_8', combinacoes, resultados, lucros, timestamps, workers=1)
+
+    # Com ciclo 29, a janela de 30 cai na posição 2 do ciclo e CYCLE_TRANSITION volta a disparar
+    por_ciclo = {l['CYCLE_TRANSITION.tamanho_ciclo']: l for l in linhas}
+    assert por_ciclo[29]['sinais'] >= por_ciclo[20]['sinais']
+
+    caminho = os.path.join(str(tmp_path) if tmp_path else tempfile.mkdtemp(), 'sweep.csv')
+    salvar_tabela(linhas, caminho)
+    with open(caminho, encoding='utf-8') as f:
+        cabecalho = f.readline().strip().split(',')
+    assert cabecalho[0] == 'rank' and 'taxa_acerto' in cabecalho
+
+def run_all_tests():
+    testes = [
+        test_espaco_de_busca,
+        test_separar_parametros,
+        test_sweep_paralelo_igual_sequencial,
+        test_sweep_portfolio_e_tabela,
+    ]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+    return falhas == 0
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do rastro preguiçoso dos radares
+Valida buffer circular, formatação adiada, descarregamento em erro, endpoint HTTP e modo silencioso
+"""
+
+import sys
+import os
+import io
+import json
+import logging
+import subprocess
+import contextlib
+import urllib.request
+
+# Adicionar o diretório atual ao path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from radar_trace import Adiado, RadarTrace, criar_trace, iniciar_servidor_trace
+
+def test_formatacao_adiada_e_buffer_circular():
+    """Argumentos Adiado só são avaliados ao formatar e o buffer respeita a capacidade"""
+    chamadas = []
+
+    def caro(historico):
+        chamadas.append(1)
+        return ' '.join(historico)
+
+    log = logging.getLogger('teste_trace_buffer')
+    log.setLevel(logging.INFO)
+    trace = RadarTrace('teste', log, capacidade=3)
+    for i in range(5):
+        trace.registrar("[SEQ_{}] {} ({:.1f}%)", i, Adiado(caro, ['V', 'D']), 50)
+    assert chamadas == []
+
+    registros = trace.formatar()
+    assert [r['mensagem'] for r in registros] == [f"[SEQ_{i}] V D (50.0%)" for i in (2, 3, 4)]
+    assert len(chamadas) == 3 and trace.total_registros == 5
+
+    # saida() não imprime com o logger fora de DEBUG
+    saida = io.StringIO()
+    with contextlib.redirect_stdout(saida):
+        trace.saida("* Historico: {}", 'V V')
+    assert saida.getvalue() == ''
+    assert trace.formatar()[-1]['nivel'] == 'CONSOLE'
+
+def test_descarrega_quando_radar_registra_erro():
+    """Um logger.error do radar grava o rastro acumulado e esvazia o buffer"""
+    log = logging.getLogger('teste_trace_erro')
+    log.propagate = False
+    trace = criar_trace('teste_erro', log)
+    trace.registrar("[FILTRO] {} -> {}", 'F1', 'REJEITADO')
+
+    capturados = []
+    handler = logging.Handler()
+    handler.emit = lambda record: capturados.append(record.getMessage())
+    logging.getLogger('radar_trace').addHandler(handler)
+    logging.getLogger('radar_trace').setLevel(logging.INFO)
+    try:
+        log.error("falha na estratégia")
+    finally:
+        logging.getLogger('radar_trace').removeHandler(handler)
+
+    assert any('[FILTRO] F1 -> REJEITADO' in m for m in capturados)
+    assert trace.formatar() == [] and trace.descarregamentos == 1
+
+def test_endpoint_http():
+    """GET /trace devolve os registros formatados em JSON"""
+    trace = RadarTrace('teste_http')
+    trace.registrar("[CYCLE_TRANSITION_CALC] Total operações: {}", 30)
+    servidor = iniciar_servidor_trace(trace, porta=0)
+    try:
+        porta = servidor.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{porta}/trace", timeout=5) as resposta:
+            corpo = json.loads(resposta.read().decode('utf-8'))
+    finally:
+        servidor.shutdown()
+    assert corpo['registros'][0]['mensagem'] == "[CYCLE_TRANSITION_CALC] Total operações: 30"
+    assert corpo['estatisticas']['total_registros'] == 1
+
+def test_modo_silencioso():
+    """Com RADAR_TRACE=quiet o radar recebe um TraceNulo"""
+    codigo = (
+        "from radar_trace import criar_trace, TraceNulo;"
+        "t = criar_trace('x');"
+        "t.registrar('{}', 1); t.saida('nada');"
+        "print(isinstance(t, TraceNulo), t.formatar())"
+    )
+    saida = subprocess.run([sys.executable, '-c', codigo], capture_output=True, text=True,
+                           cwd=os.path.dirname(os.path.abspath(__file__)),
+                           env={**os.environ, 'RADAR_TRACE': 'quiet'})
+    assert saida.stdout.strip() == 'True []', saida.stderr
+
+def test_modo_silencioso_nao_avalia_argumentos():
+    """Em modo silencioso os radares nem montam os argumentos do rastro (Adiado, fatias do histórico)"""
+    codigo = (
+        "import radar_analyzer, radar_analyzer_tunder\n"
+        "criados = []\n"
+        "class Contador(radar_analyzer.Adiado):\n"
+        "    def __init__(self, *args):\n"
+        "        criados.append(1)\n"
+        "        super().__init__(*args)\n"
+        "radar_analyzer.Adiado = radar_analyzer_tunder.Adiado = Contador\n"
+        "radar_analyzer.analisar_estrategias_portfolio(['D', 'D'] + ['V'] * 28)\n"
+        "radar_analyzer_tunder.analisar_padroes(['V', 'D', 'V'] + ['V'] * 27)\n"
+        "print('ADIADOS', len(criados))\n"
+    )
+
+    def executar(modo):
+        saida = subprocess.run([sys.executable, '-c', codigo], capture_output=True, text=True,
+                               cwd=os.path.dirname(os.path.abspath(__file__)),
+                               env={**os.environ, 'RADAR_TRACE': modo})
+        linhas = saida.stdout.strip().splitlines()
+        assert linhas and linhas[-1].startswith('ADIADOS'), saida.stderr[-500:]
+        return int(linhas[-1].split()[1]), linhas[:-1]
+
+    adiados, console = executar('quiet')
+    assert adiados == 0 and console == [], (adiados, console[:3])
+    adiados, console = executar('')
+    assert adiados > 0 and any('Tunder Bot' in linha for linha in console)
+
+def run_all_tests():
+    testes = [
+        test_formatacao_adiada_e_buffer_circular,
+        test_descarrega_quando_radar_registra_erro,
+        test_endpoint_http,
+        test_modo_silencioso,
+        test_modo_silencioso_nao_avalia_argumentos,
+    ]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+    return falhas == 0
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
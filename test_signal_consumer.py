@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Teste do consumidor de sinais orientado a eventos (EnhancedSyncSystem)
+O consumidor acorda no enfileiramento de um padrão, sem poll; sinais sem
+padrão só incrementam o contador de estatísticas
+"""
+
+import sys
+import os
+import time
+import asyncio
+import logging
+import tempfile
+
+# Adicionar o diretório atual ao path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from enhanced_sync_system import EnhancedSyncSystem
+import tunderbot
+
+TICKS = [1000.1, 1000.2, 1000.3, 1000.2, 1000.1]
+
+def test_consumidor_acorda_no_enfileiramento():
+    sync = EnhancedSyncSystem(max_concurrent_operations=2, max_queue_size=3)
+
+    async def cenario():
+        acordou = []
+
+        async def consumidor():
+            sinal = await sync.aguardar_sinal()
+            acordou.append((time.perf_counter(), sinal))
+
+        tarefa = asyncio.create_task(consumidor())
+        await asyncio.sleep(0.05)
+
+        # Estatística: não entra na fila nem acorda o consumidor
+        for _ in range(5):
+            assert sync.queue_signal(TICKS, False, 'R_10')
+        await asyncio.sleep(0.01)
+        assert not acordou and sync.signal_queue.qsize() == 0
+
+        enfileirado = time.perf_counter()
+        assert sync.queue_signal(TICKS, True, 'R_10')
+        await tarefa
+        return acordou[0][0] - enfileirado, acordou[0][1]
+
+    latencia, sinal = asyncio.run(cenario())
+    assert sinal.pattern_detected and sinal.symbol == 'R_10' and sinal.ticks == TICKS
+    assert latencia < 0.005, latencia  # com o poll antigo: até 50 ms
+    estatisticas = sync.get_statistics()
+    assert estatisticas['statistics_signals'] == 5 and estatisticas['queue_size'] == 0
+
+def test_shutdown_libera_consumidor_do_tunderbot():
+    logging.disable(logging.CRITICAL)
+    try:
+        with tempfile.TemporaryDirectory() as diretorio:
+            bot = tunderbot.AccumulatorScalpingBot({'name': 'Teste_Consumidor', 'token': 'TESTE' * 6,
+                                                    'app_id': '1', 'handoff': False})
+            bot._debug_log_file = os.path.join(diretorio, 'debug_signals.json')
+
+            async def cenario():
+                consumidor = asyncio.create_task(bot._process_signals_from_queue())
+                await asyncio.sleep(0.05)
+                assert not consumidor.done()  # ocioso: aguardando, sem acordar
+                bot._shutdown_event.set()
+                await asyncio.wait_for(consumidor, timeout=0.1)
+                # Sinal enfileirado depois da parada continua na fila (não é consumido e perdido)
+                bot.sync_system.queue_signal(TICKS, True, bot.ativo)
+                assert await bot.sync_system.aguardar_sinal(bot._shutdown_event) is not None
+
+            asyncio.run(cenario())
+    finally:
+        logging.disable(logging.NOTSET)
+
+def run_all_tests():
+    testes = [
+        test_consumidor_acorda_no_enfileiramento,
+        test_shutdown_libera_consumidor_do_tunderbot,
+    ]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+    return falhas == 0
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
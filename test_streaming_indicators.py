@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Teste do motor de indicadores em streaming
+Compara SMA/RSI incrementais com o cálculo direto e a análise RESET CALL/PUT por lista
+"""
+
+import sys
+import os
+import random
+
+import numpy as np
+
+# Adicionar o diretório atual ao path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from streaming_indicators import (StreamingIndicators, rsi_de_medias, calcular_indicadores_lote,
+                                  NOMES_SINAIS)
+from technical_indicators import TechnicalIndicators
+from technical_analysis_new import TechnicalAnalysis
+
+def _precos(n=12000, semente=5):
+    rng = random.Random(semente)
+    preco = 1000.0
+    precos = []
+    for _ in range(n):
+        preco = round(preco + rng.choice([-1, 1]) * rng.random() * 0.5, 2)
+        # Repetições forçam variações nulas (perdas ou ganhos zerados)
+        precos.append(preco if rng.random() > 0.1 or not precos else precos[-1])
+    return precos
+
+def _rsi_direto(precos, n):
+    variacoes = [precos[i] - precos[i - 1] for i in range(len(precos) - n, len(precos))]
+    return rsi_de_medias(sum(max(v, 0.0) for v in variacoes) / n, sum(max(-v, 0.0) for v in variacoes) / n)
+
+def test_sma_rsi_iguais_ao_calculo_direto():
+    """Indicadores incrementais batem com o cálculo direto, inclusive após rebases"""
+    precos = _precos()
+    engine = StreamingIndicators(rebase_ticks=997)
+    for i, preco in enumerate(precos):
+        engine.add_price(preco)
+        if i < 60 or i % 37 == 0:
+            historico = precos[:i + 1]
+            for p in (5, 12, 40, 50):
+                esperado = sum(historico[-p:]) / p if len(historico) >= p else None
+                obtido = engine.sma(p)
+                assert (obtido is None) == (esperado is None), f"SMA{p} em {i}"
+                if esperado is not None:
+                    assert abs(obtido - esperado) < 1e-8, f"SMA{p} em {i}: {obtido} != {esperado}"
+            for n in (3, 7, 10):
+                obtido = engine.rsi(n)
+                if len(historico) < n + 1:
+                    assert obtido is None
+                    continue
+                assert abs(obtido - _rsi_direto(historico, n)) < 1e-6, f"RSI{n} em {i}"
+
+def test_rsi_wilder():
+    """Wilder: semente com média simples e suavização (n-1)/n"""
+    precos = _precos(500, semente=9)
+    engine = StreamingIndicators.from_prices(precos)
+    n = 7
+    variacoes = [precos[i] - precos[i - 1] for i in range(1, len(precos))]
+    ganho = sum(max(v, 0.0) for v in variacoes[:n]) / n
+    perda = sum(max(-v, 0.0) for v in variacoes[:n]) / n
+    for v in variacoes[n:]:
+        ganho = (ganho * (n - 1) + max(v, 0.0)) / n
+        perda = (perda * (n - 1) + max(-v, 0.0)) / n
+    assert abs(engine.rsi_wilder(n) - rsi_de_medias(ganho, perda)) < 1e-6
+    assert StreamingIndicators.from_prices(precos[:n]).rsi_wilder(n) is None
+
+def test_technical_indicators_usa_motor():
+    """TechnicalIndicators mantém a API e os valores do cálculo direto"""
+    precos = _precos(300, semente=11)
+    indicadores = TechnicalIndicators()
+    for preco in precos:
+        indicadores.add_price(preco)
+    todos = indicadores.get_all_indicators()
+    assert abs(todos['sma_50'] - sum(precos[-50:]) / 50) < 1e-8
+    assert abs(todos['rsi_7'] - _rsi_direto(precos, 7)) < 1e-6
+    assert indicadores.calculate_rsi(4) is None
+    assert indicadores.is_ready_for_analysis()
+
+def test_analise_streaming_igual_lista():
+    """analyze_entry_signal() incremental dá o mesmo sinal que a versão por lista de 50 ticks"""
+    precos = _precos(6000, semente=13)
+    incremental = TechnicalAnalysis()
+    por_lista = TechnicalAnalysis()
+    janela = []
+    sinais = empates = 0
+    for preco in precos:
+        incremental.update(preco)
+        janela.append(preco)
+        if len(janela) > 50:
+            janela.pop(0)
+        esperado = por_lista.analyze_entry_signal(janela)
+        sinais += esperado is not None
+        if _empate(incremental.engine):
+            # Empate exato (ex.: SMA5 == SMA12) é decidido pelo arredondamento de cada caminho
+            empates += 1
+            continue
+        assert incremental.analyze_entry_signal() == esperado
+    assert sinais > 0 and empates < len(precos) * 0.05
+
+def _empate(engine, tolerancia=1e-9):
+    if not engine.is_ready():
+        return False
+    rsi3 = engine.rsi(3)
+    return (abs(engine.sma(5) - engine.sma(12)) < tolerancia
+            or abs(engine.sma(40) - engine.sma(50)) < tolerancia
+            or any(abs(rsi3 - limite) < 1e-6 for limite in (15, 25, 45, 55, 75, 85)))
+
+def _mesmos_bits(obtido, esperado):
+    esperado = np.nan if esperado is None else esperado
+    return np.float64(obtido).tobytes() == np.float64(esperado).tobytes()
+
+def test_lote_bit_a_bit_igual_streaming():
+    """calcular_indicadores_lote reproduz o streaming tick a tick, inclusive nos rebases"""
+    precos = _precos(5000, semente=17)
+    lote = calcular_indicadores_lote(np.array(precos), rebase_ticks=613, wilder=True)
+    engine = StreamingIndicators(rebase_ticks=613)
+    for i, preco in enumerate(precos):
+        engine.add_price(preco)
+        for p in (5, 12, 40, 50):
+            assert _mesmos_bits(lote[f'sma_{p}'][i], engine.sma(p)), f"SMA{p} em {i}"
+        for n in (3, 7, 10):
+            assert _mesmos_bits(lote[f'rsi_{n}'][i], engine.rsi(n)), f"RSI{n} em {i}"
+            assert _mesmos_bits(lote[f'rsi_wilder_{n}'][i], engine.rsi_wilder(n)), f"Wilder{n} em {i}"
+        assert NOMES_SINAIS.get(int(lote['sinal'][i])) == engine.reset_signal(), f"sinal em {i}"
+    assert np.count_nonzero(lote['sinal']) > 0
+
+def test_aquecimento_por_array():
+    """from_array deixa o motor no mesmo estado que add_price() preço a preço"""
+    precos = _precos(2000, semente=19)
+    for total in (0, 2, 30, 613, 614, 1226, 1227, 2000):
+        aquecido = StreamingIndicators.from_array(np.array(precos[:total]), rebase_ticks=613)
+        incremental = StreamingIndicators.from_prices(precos[:total], rebase_ticks=613)
+        for seguinte in precos[total:total + 700]:
+            aquecido.add_price(seguinte)
+            incremental.add_price(seguinte)
+        assert aquecido.count == incremental.count
+        for campo in ('_precos', '_acum_preco', '_acum_ganho', '_acum_perda', '_wilder'):
+            assert getattr(aquecido, campo) == getattr(incremental, campo), f"{campo} com {total} preços"
+
+def run_all_tests():
+    testes = [
+        test_sma_rsi_iguais_ao_calculo_direto,
+        test_rsi_wilder,
+        test_technical_indicators_usa_motor,
+        test_analise_streaming_igual_lista,
+        test_lote_bit_a_bit_igual_streaming,
+        test_aquecimento_por_array,
+    ]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+    return falhas == 0
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Teste do supervisor de tarefas por bot (trading_system.utils.task_supervisor)
+Falha de um bot reinicia só aquele bot, com backoff; reinício rolling
+reinicia um bot por vez, sem derrubar os demais
+"""
+
+import sys
+import os
+import asyncio
+
+# Adicionar o diretório atual ao path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from trading_system.utils.task_supervisor import SupervisorBots, PoliticaReinicio
+
+def test_falha_isolada_com_backoff():
+    contagem = {'estavel': 0, 'instavel': 0, 'termina': 0}
+
+    async def bot_estavel():
+        while True:
+            contagem['estavel'] += 1
+            await asyncio.sleep(0.01)
+
+    async def bot_instavel():
+        contagem['instavel'] += 1
+        await asyncio.sleep(0.01)
+        raise ConnectionError("no close frame received")
+
+    async def bot_termina():
+        contagem['termina'] += 1
+
+    async def cenario():
+        supervisor = SupervisorBots(PoliticaReinicio(backoff_base=0.05, backoff_max=0.2))
+        supervisor.adicionar('estavel', bot_estavel)
+        supervisor.adicionar('instavel', bot_instavel)
+        supervisor.adicionar('termina', bot_termina, politica=PoliticaReinicio(PoliticaReinicio.EM_FALHA))
+        supervisor.iniciar()
+        await asyncio.sleep(1.0)
+        execucao_estavel = supervisor.bots['estavel'].execucao
+        estatisticas = supervisor.obter_estatisticas()
+        await supervisor.parar()
+        return estatisticas, execucao_estavel
+
+    estatisticas, execucao_estavel = asyncio.run(cenario())
+    # 0,05 + 0,1 + 0,2 + 0,2 ... (+0,01 por execução): ~6 execuções em 1 s, sem rajada
+    assert 4 <= contagem['instavel'] <= 8, contagem
+    assert estatisticas['instavel']['falhas'] >= 3
+    assert estatisticas['instavel']['ultimo_erro'].startswith('ConnectionError')
+    # O bot estável nunca foi reiniciado, e o que terminou sem erro não volta
+    assert estatisticas['estavel']['execucoes'] == 1 and contagem['estavel'] > 50
+    assert execucao_estavel.cancelled()
+    assert contagem['termina'] == 1 and not estatisticas['termina']['rodando']
+    try:
+        PoliticaReinicio('as_vezes')
+        assert False
+    except ValueError:
+        pass
+
+def test_reinicio_rolling_um_bot_por_vez():
+    nomes = [f'bot_{i}' for i in range(4)]
+    rodando = set()
+    inicios = {nome: 0 for nome in nomes}
+    minimo_rodando = []
+
+    def criar(nome):
+        async def bot():
+            inicios[nome] += 1
+            rodando.add(nome)
+            try:
+                while True:
+                    await asyncio.sleep(0.005)
+            finally:
+                rodando.discard(nome)
+                minimo_rodando.append(len(rodando))
+        return bot
+
+    async def cenario():
+        supervisor = SupervisorBots()
+        for nome in nomes:
+            supervisor.adicionar(nome, criar(nome))
+        supervisor.iniciar()
+        rolling = asyncio.create_task(supervisor.reinicio_rolling(0.1, pausa=0.05))
+        await asyncio.sleep(0.37)
+        rolling.cancel()
+        estatisticas = supervisor.obter_estatisticas()
+        await supervisor.parar()
+        return estatisticas
+
+    estatisticas = asyncio.run(cenario())
+    # Um ciclo completo (0,1 s + 4 × 0,05 s): cada bot reiniciado uma vez, imediatamente
+    assert all(inicios[nome] == 2 for nome in nomes), inicios
+    assert all(e['reinicios_programados'] == 1 and e['falhas'] == 0 for e in estatisticas.values())
+    # Durante o rolling, nunca mais de um bot fora do ar (os últimos registros são do encerramento)
+    assert all(n >= len(nomes) - 1 for n in minimo_rodando[:len(nomes)]), minimo_rodando
+
+def run_all_tests():
+    testes = [
+        test_falha_isolada_com_backoff,
+        test_reinicio_rolling_um_bot_por_vez,
+    ]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+    return falhas == 0
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
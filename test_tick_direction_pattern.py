@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Teste do detector de padrão de direção por máscara de bits
+Compara com a lógica original de rótulos Red/Blue dos bots Accumulator
+"""
+
+import sys
+import os
+import random
+
+# Adicionar o diretório atual ao path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from tick_direction_pattern import (TickDirectionDetector, compile_pattern, XML_ACCU_PATTERN,
+                                    RISE_FALL_PATTERN)
+
+def _xml_original(ticks):
+    """Lógica de analisar_padrao_entrada antes do detector (tunderbot/accumulator_standalone)"""
+    tick4, tick3, tick2, tick1, tick_atual = ticks[-5:]
+    single4 = "Red" if tick4 > tick3 else "Blue"
+    single3 = "Red" if tick3 > tick2 else "Blue"
+    single2 = "Red" if tick2 > tick1 else "Blue"
+    single1 = "Red" if tick1 > tick_atual else "Blue"
+    return single1 == "Red" and single2 == "Red" and single3 == "Red" and single4 == "Blue"
+
+def _alta_queda_original(ticks):
+    """Lógica de BotInstance.analisar_padrao_entrada antes do detector"""
+    tick1, tick2, tick3, tick4, tick5 = ticks[-5:]
+    return tick2 > tick1 and tick3 > tick2 and tick4 > tick3 and tick5 < tick4
+
+def _ticks(n=20000, semente=3):
+    rng = random.Random(semente)
+    # Poucos níveis de preço: muitos ticks repetidos (variação nula)
+    return [100 + rng.randint(-2, 2) * 0.01 for _ in range(n)]
+
+def test_stream_igual_logica_original():
+    """add_tick casa exatamente nos mesmos ticks que a lógica por rótulos"""
+    for padrao, original in ((XML_ACCU_PATTERN, _xml_original), (RISE_FALL_PATTERN, _alta_queda_original)):
+        detector = TickDirectionDetector(padrao)
+        ticks = _ticks()
+        casos = 0
+        for i, tick in enumerate(ticks):
+            obtido = detector.add_tick(tick) is not None
+            if i < 4:
+                assert not obtido
+                continue
+            esperado = original(ticks[i - 4:i + 1])
+            assert obtido == esperado, f"{padrao} em {i}: {ticks[i - 4:i + 1]}"
+            assert (detector.evaluate(ticks[:i + 1]) is not None) == esperado
+            casos += esperado
+        assert casos > 0
+
+def test_multiplos_padroes_e_reset():
+    """Padrões de tamanhos diferentes, curinga e reset do registrador"""
+    detector = TickDirectionDetector([compile_pattern("RR", "duas_quedas"), "U.U"])
+    assert detector.required_ticks == 4
+    assert detector.add_tick(5.0) is None
+    assert detector.add_tick(4.0) is None
+    assert detector.add_tick(3.0).name == "duas_quedas"
+    assert detector.describe() == "Red-Red"
+    detector.reset()
+    for tick in (1.0, 2.0, 1.5):
+        assert detector.add_tick(tick) is None
+    assert detector.add_tick(2.5).sequence == "U.U"
+    assert detector.evaluate([3.0, 2.0, 1.0]).name == "duas_quedas"
+
+def test_padrao_invalido():
+    for sequencia in ("", "RXB"):
+        try:
+            compile_pattern(sequencia)
+        except ValueError:
+            continue
+        assert False, f"padrão {sequencia!r} deveria ser rejeitado"
+
+def run_all_tests():
+    testes = [
+        test_stream_igual_logica_original,
+        test_multiplos_padroes_e_reset,
+        test_padrao_invalido,
+    ]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+    return falhas == 0
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Teste do downloader de histórico de ticks com conexões simuladas
+Valida janelas paralelas, respostas truncadas, retomada, detecção de lacunas
+e reconexão após queda do WebSocket no meio do download
+"""
+
+import sys
+import os
+import json
+import asyncio
+import tempfile
+
+import numpy as np
+
+# Adicionar o diretório atual ao path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from tick_store import TickStore
+from tick_downloader import BaixadorTicks, ConexaoHistorico, planejar_janelas, para_epoch
+
+class ConexaoSimulada:
+    """ticks_history sobre uma série fixa, devolvendo os últimos count ticks do intervalo como a Deriv"""
+
+    def __init__(self, epochs, quotes, falhar_primeiras=0):
+        self.epochs = epochs
+        self.quotes = quotes
+        self.falhas_restantes = falhar_primeiras
+        self.requisicoes = 0
+        self.em_voo = 0
+        self.max_em_voo = 0
+
+    async def ticks_history(self, symbol, count=5, start=None, end="latest"):
+        self.requisicoes += 1
+        self.em_voo += 1
+        self.max_em_voo = max(self.max_em_voo, self.em_voo)
+        try:
+            await asyncio.sleep(0)
+            if self.falhas_restantes:
+                self.falhas_restantes -= 1
+                return {'error': {'code': 'RateLimit', 'message': 'limite de requisições'}}
+            filtro = (self.epochs >= start) & (self.epochs <= end)
+            times, prices = self.epochs[filtro][-count:], self.quotes[filtro][-count:]
+            return {'history': {'times': times.tolist(), 'prices': prices.tolist()}}
+        finally:
+            self.em_voo -= 1
+
+def _serie(inicio, fim, passo, lacuna=None):
+    epochs = np.arange(inicio, fim + 1, passo, dtype=np.int64)
+    if lacuna:
+        epochs = epochs[(epochs < lacuna[0]) | (epochs > lacuna[1])]
+    return epochs, 1000 + np.cumsum(np.cos(epochs) * 0.05)
+
+def test_planejamento():
+    janelas = planejar_janelas(0, 99_999, 2, count=5000)
+    assert janelas[0] == (0, 8999) and janelas[-1][1] == 99_999
+    assert all(b + 1 == a for (_, b), (a, _) in zip(janelas, janelas[1:]))
+    assert para_epoch('1970-01-02') == 86_400 and para_epoch('86400') == 86_400
+
+def test_download_paralelo_truncado_e_retomado():
+    """Janelas truncadas são completadas; o arquivo é o checkpoint da retomada"""
+    # Um tick por segundo num ativo planejado a 2 s: cada janela tem o dobro do count e vem truncada
+    epochs, quotes = _serie(1_000, 60_999, 1, lacuna=(30_000, 30_100))
+    with tempfile.TemporaryDirectory() as base:
+        store = TickStore(base, segment_ticks=4096)
+        conexoes = [ConexaoSimulada(epochs, quotes, falhar_primeiras=1) for _ in range(3)]
+        baixador = BaixadorTicks(store, conexoes, requisicoes_por_segundo=0, count=500)
+        relatorio = asyncio.run(baixador.baixar('R_75', 1_000, 40_000))
+        assert all(c.requisicoes > 0 for c in conexoes)
+        assert relatorio.requisicoes >= 2 * relatorio.janelas
+        gravados = store.read_range('R_75')
+        esperado = epochs[epochs <= 40_000]
+        assert np.array_equal(gravados['epoch'], esperado)
+        assert np.array_equal(gravados['quote'], quotes[:len(esperado)])
+        assert relatorio.lacunas == [(29_999, 30_101)]
+
+        retomada = asyncio.run(baixador.baixar('R_75', 1_000, 60_999))
+        assert retomada.retomado_de == 40_000 and retomada.lacunas == []
+        assert np.array_equal(store.read_range('R_75')['epoch'], epochs)
+        assert asyncio.run(baixador.baixar('R_75', 1_000, 60_999)).ticks_gravados == 0
+        store.close()
+
+def test_conexao_cai_no_meio_e_reconecta():
+    """A queda do WebSocket no meio do download vira uma nova tentativa numa conexão nova"""
+    import websockets
+    epochs, quotes = _serie(1_000, 20_999, 2)
+    conexoes_servidor = []
+
+    async def servidor(ws, *args):
+        conexoes_servidor.append(ws)
+        respondidas = 0
+        async for mensagem in ws:
+            pedido = json.loads(mensagem)
+            if len(conexoes_servidor) == 1 and respondidas == 2:
+                await ws.close()  # a primeira conexão cai com a 3ª requisição em voo
+                return
+            filtro = (epochs >= pedido['start']) & (epochs <= pedido['end'])
+            await ws.send(json.dumps({'req_id': pedido['req_id'], 'history': {
+                'times': epochs[filtro][-pedido['count']:].tolist(),
+                'prices': quotes[filtro][-pedido['count']:].tolist()}}))
+            respondidas += 1
+
+    async def cenario(store):
+        async with websockets.serve(servidor, '127.0.0.1', 0) as ws_servidor:
+            porta = ws_servidor.sockets[0].getsockname()[1]
+            conexao = ConexaoHistorico(timeout=5)
+            conexao.url = f"ws://127.0.0.1:{porta}"
+            baixador = BaixadorTicks(store, [conexao], requisicoes_por_segundo=0, count=500)
+            try:
+                return await asyncio.wait_for(baixador.baixar('R_75', 1_000, 20_999), 10)
+            finally:
+                await conexao.disconnect()
+
+    with tempfile.TemporaryDirectory() as base:
+        store = TickStore(base, segment_ticks=4096)
+        relatorio = asyncio.run(cenario(store))
+        assert len(conexoes_servidor) == 2, len(conexoes_servidor)
+        assert relatorio.requisicoes == relatorio.janelas + 1  # só a requisição perdida foi repetida
+        assert np.array_equal(store.read_range('R_75')['epoch'], epochs) and relatorio.lacunas == []
+        store.close()
+
+def run_all_tests():
+    testes = [
+        test_planejamento,
+        test_download_paralelo_truncado_e_retomado,
+        test_conexao_cai_no_meio_e_reconecta,
+    ]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+    return falhas == 0
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Teste do driver de replay de ticks com executor simulado e relógio virtual
+Usa um bot mínimo com a mesma estrutura do AccumulatorScalpingBot
+(_handle_new_tick -> fila -> consumidor com poll de 50 ms -> proposal/buy -> monitoramento)
+e o próprio AccumulatorScalpingBot, com o Supabase desligado
+"""
+
+import sys
+import os
+import time
+import asyncio
+import logging
+import tempfile
+
+import numpy as np
+
+# Adicionar o diretório atual ao path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from tick_replay import executar_replay, criar_bot
+from contract_engine import ExecutorSimulado, MotorContratos, liquidar_apos_ticks
+from io_offload import descarregador
+import tunderbot
+
+class _Ordens:
+    """Subsistema que guarda a conexão, como o RobustOrderSystem"""
+    def __init__(self, api_manager):
+        self.api_manager = api_manager
+
+class BotMinimo:
+    def __init__(self):
+        self.ativo = 'R_75'
+        self.api_manager = object()  # conexão "real" que o replay precisa substituir
+        self.ordens = _Ordens(self.api_manager)
+        self.fila = []
+        self.ultimos = []
+        self.resultados = []
+        self.tempos_handler = []
+        self._shutdown_event = asyncio.Event()
+
+    async def _handle_new_tick(self, tick):
+        self.tempos_handler.append(asyncio.get_running_loop().time())
+        self.ultimos = (self.ultimos + [tick['quote']])[-4:]
+        if len(self.ultimos) == 4 and self.ultimos[0] > self.ultimos[1] > self.ultimos[2] > self.ultimos[3]:
+            self.fila.append(tick['epoch'])
+
+    async def _process_signals_from_queue(self):
+        while not self._shutdown_event.is_set():
+            if self.fila:
+                self.fila.clear()
+                proposta = await self.ordens.api_manager.proposal({'amount': 5, 'contract_type': 'ACCU'})
+                compra = await self.api_manager.buy({'buy': proposta['proposal']['id'],
+                                                     'price': proposta['proposal']['ask_price']})
+                contrato_id = compra['buy']['contract_id']
+                while True:
+                    estado = (await self.api_manager.proposal_open_contract(contrato_id))['proposal_open_contract']
+                    if estado['status'] in ('won', 'lost'):
+                        self.resultados.append(estado['profit'])
+                        break
+                    await asyncio.sleep(2)
+            await asyncio.sleep(0.05)
+
+def _ticks(n, passo=2, semente=5):
+    rng = np.random.default_rng(semente)
+    epochs = 1_700_000_000 + passo * np.arange(n, dtype=np.int64)
+    return epochs, np.round(1000 + np.cumsum(rng.normal(0, 0.3, n)), 2)
+
+def test_replay_maximo_com_relogio_virtual():
+    """Horas de mercado em segundos reais; timers do bot seguem o tempo dos ticks"""
+    bot = BotMinimo()
+    epochs, quotes = _ticks(2000)
+    executor = ExecutorSimulado(liquidar=liquidar_apos_ticks(ticks=3, lucro=1.25))
+    inicio = time.perf_counter()
+    relatorio = executar_replay(bot, (epochs, quotes), executor=executor)
+    assert time.perf_counter() - inicio < 30
+    assert bot.ordens.api_manager is executor and bot.api_manager is executor
+    assert relatorio.ticks == 2000 and relatorio.duracao_replay == 3998
+    assert np.allclose(np.diff(bot.tempos_handler), 2.0)
+    estatisticas = relatorio.executor
+    assert estatisticas['contratos'] == len(bot.resultados) > 10
+    assert estatisticas['abertos'] == 0 and estatisticas['ganhos'] == len(bot.resultados)
+    assert abs(estatisticas['lucro_total'] - 1.25 * len(bot.resultados)) < 1e-9
+    assert estatisticas['chamadas']['buy'] == estatisticas['contratos']
+
+def test_replay_acelerado_em_tempo_real():
+    bot = BotMinimo()
+    epochs, quotes = _ticks(40, passo=1)
+    inicio = time.perf_counter()
+    relatorio = executar_replay(bot, (epochs, quotes), velocidade=200.0, tarefas=())
+    decorrido = time.perf_counter() - inicio
+    assert relatorio.ticks == 40 and 0.15 < decorrido < 5
+    assert relatorio.executor['contratos'] == 0
+
+def test_drenagem_no_relogio_virtual():
+    """Contrato que nunca encerra não prende o replay em velocidade real por tempo_drenagem"""
+    bot = BotMinimo()
+    epochs, quotes = _ticks(40, passo=1)
+    executor = ExecutorSimulado(liquidar=liquidar_apos_ticks(ticks=10**9))
+    inicio = time.perf_counter()
+    relatorio = executar_replay(bot, (epochs, quotes), velocidade=200.0, executor=executor)
+    assert time.perf_counter() - inicio < 5
+    assert relatorio.ticks == 40 and relatorio.executor['abertos'] == 1
+
+class _PoliticaSemSeletor(asyncio.DefaultEventLoopPolicy):
+    """Como o Proactor do Windows ou o uvloop: loops da política não têm _selector"""
+
+    def new_event_loop(self):
+        raise RuntimeError("loop da política não tem seletor")
+
+def test_replay_com_outra_politica_de_event_loop():
+    politica = asyncio.get_event_loop_policy()
+    asyncio.set_event_loop_policy(_PoliticaSemSeletor())
+    try:
+        bot = BotMinimo()
+        epochs, quotes = _ticks(200)
+        executor = ExecutorSimulado(liquidar=liquidar_apos_ticks(ticks=3, lucro=1.0))
+        relatorio = executar_replay(bot, (epochs, quotes), executor=executor)
+    finally:
+        asyncio.set_event_loop_policy(politica)
+    assert relatorio.ticks == 200 and relatorio.duracao_replay == 398
+    assert relatorio.executor['contratos'] > 0
+
+def test_replay_do_tunderbot_sem_supabase():
+    """Bot real: ticks chegam ao _handle_new_tick, contratos liquidam e nada vai para o Supabase"""
+    clientes = []
+    create_client = tunderbot.create_client
+    tunderbot.create_client = lambda *args: clientes.append(args)
+    logging.disable(logging.CRITICAL)
+    try:
+        rng = np.random.default_rng(3)
+        n = 600
+        epochs = 1_700_000_000 + 2 * np.arange(n, dtype=np.int64)
+        quotes = np.round(1000 + np.cumsum(rng.normal(0, 0.01, n)), 3)
+        with tempfile.TemporaryDirectory() as diretorio:
+            bot = criar_bot('tunderbot')
+            bot._debug_log_file = os.path.join(diretorio, 'debug_signals.json')
+            executor = ExecutorSimulado(liquidar=MotorContratos(tick_size_barrier={('R_75', 0.02): 0.0005}))
+            relatorio = executar_replay(bot, (epochs, quotes), symbol='R_75', executor=executor, pip_size=3)
+            asyncio.run(descarregador().aguardar())  # gravações de arquivo do bot antes de apagar o diretório
+    finally:
+        tunderbot.create_client = create_client
+        logging.disable(logging.NOTSET)
+
+    assert relatorio.ticks == n and len(bot.estados['R_75'].tick_buffer) > 0
+    estatisticas = relatorio.executor
+    assert estatisticas['ganhos'] + estatisticas['perdas'] > 0
+    assert estatisticas['chamadas'].get('supabase.log_to_supabase', 0) >= bot.estados['R_75'].operacoes > 0
+    assert clientes == []
+
+def run_all_tests():
+    testes = [
+        test_replay_maximo_com_relogio_virtual,
+        test_replay_acelerado_em_tempo_real,
+        test_drenagem_no_relogio_virtual,
+        test_replay_com_outra_politica_de_event_loop,
+        test_replay_do_tunderbot_sem_supabase,
+    ]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+    return falhas == 0
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
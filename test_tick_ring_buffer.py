@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Teste do anel de ticks NumPy (TickRingBuffer / EnhancedTickBuffer)
+Valida janelas sem cópia, descarte de obsoletos e janela de sincronização
+"""
+
+import sys
+import os
+
+import numpy as np
+
+# Adicionar o diretório atual ao path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from enhanced_tick_buffer import TickRingBuffer, EnhancedTickBuffer
+
+def test_janela_contigua_sem_copia():
+    """window() é uma view dos últimos N valores em ordem, inclusive após dar a volta"""
+    anel = TickRingBuffer(max_size=5, max_age_seconds=None)
+    referencia = []
+    for i in range(23):
+        assert anel.add_tick(100.0 + i, 1000.0 + i)
+        referencia = (referencia + [100.0 + i])[-5:]
+        assert anel.to_list() == referencia
+        assert anel.to_list(3) == referencia[-3:]
+        assert anel.last == referencia[-1]
+    janela = anel.window()
+    assert janela.base is not None and not janela.flags.writeable
+    assert np.shares_memory(janela, anel.window(2))
+    assert list(anel.timestamps()) == [1018.0, 1019.0, 1020.0, 1021.0, 1022.0]
+    assert anel.is_full() and len(anel) == 5 and list(anel) == referencia
+
+    anel.clear()
+    assert len(anel) == 0 and anel.to_list() == [] and anel.last is None
+
+def test_sincronizacao_e_obsoletos():
+    """Ordem temporal, descarte > max_age_seconds e validação O(1) da janela"""
+    anel = EnhancedTickBuffer(max_size=10, tolerance_seconds=1.0)
+    for i in range(5):
+        anel.add_tick(1.0 + i, 50.0 + i * 0.2)
+    assert anel.get_last_n_ticks(5) == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert anel.get_last_n_ticks(6) == []
+    assert not anel.add_tick(9.0, 49.0)  # fora de ordem
+
+    anel.add_tick(6.0, 51.5)  # amplitude 1.5s > tolerância
+    assert anel.get_last_n_ticks(5) == []
+    assert not anel.get_buffer_stats()['synced']
+
+    anel.add_tick(7.0, 55.5)  # ticks com mais de 5s são descartados
+    assert anel.to_list() == [4.0, 5.0, 6.0, 7.0]
+    stats = anel.get_buffer_stats()
+    assert stats['size'] == 4 and abs(stats['time_span'] - 4.9) < 1e-9
+
+    assert not anel.add_tick("invalido")
+
+def run_all_tests():
+    testes = [
+        test_janela_contigua_sem_copia,
+        test_sincronizacao_e_obsoletos,
+    ]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+    return falhas == 0
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
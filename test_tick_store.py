@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Teste do arquivo de ticks memory-mapped (tick_store)
+Valida append por tick e em lote, leitura por intervalo, reabertura e recuperação
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+import numpy as np
+
+# Adicionar o diretório atual ao path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from tick_store import TickStore, SymbolTickLog, TICK_DTYPE
+
+def test_intervalos_entre_segmentos():
+    """read_range bate com filtro direto, inclusive cruzando segmentos; views sem cópia"""
+    with tempfile.TemporaryDirectory() as base:
+        store = TickStore(base, segment_ticks=100)
+        epochs = np.arange(1_000, 1_000 + 2 * 350, 2, dtype=np.int64)  # R_75: um tick a cada 2s
+        quotes = 500 + np.cumsum(np.sin(epochs) * 0.1)
+        for epoch, quote in zip(epochs[:120], quotes[:120]):
+            assert store.append('R_75', epoch, quote)
+        assert store.append_many('R_75', epochs[100:], quotes[100:]) == 230  # sobreposição ignorada
+        assert not store.append('R_75', epochs[-1], 1.0)
+        log = store.log('R_75')
+        assert len(log) == 350 and log.get_stats()['segments'] == 4
+
+        for inicio, fim in ((None, None), (1_001, 1_199), (1_150, 1_450), (900, 1_000), (1_698, 5_000), (2_000, 3_000)):
+            obtido = store.read_range('R_75', inicio, fim)
+            filtro = (epochs >= (inicio or 0)) & (epochs <= (fim or 10**9))
+            assert np.array_equal(obtido['epoch'], epochs[filtro]), (inicio, fim)
+            assert np.array_equal(obtido['quote'], quotes[filtro])
+
+        dentro = store.read_range('R_75', 1_210, 1_300)
+        assert isinstance(dentro, np.memmap) and not dentro.flags.writeable
+        assert np.array_equal(store.last_ticks('R_75', 130)['epoch'], epochs[-130:])
+        store.close()
+
+def test_reabertura_e_recuperacao():
+    """Reabrir continua o log; sem índice atualizado a contagem vem dos dados"""
+    with tempfile.TemporaryDirectory() as base:
+        store = TickStore(base, segment_ticks=64)
+        for i in range(150):
+            store.record_tick({'symbol': '1HZ100V', 'epoch': 10_000 + i, 'quote': 800 + i * 0.01})
+        store.flush()
+        store.log('1HZ100V')._lock_file.close()  # simula processo encerrado sem close()
+        store.log('1HZ100V')._lock_file = None
+
+        # Índice desatualizado: ticks gravados depois do último flush
+        reaberto = SymbolTickLog(os.path.join(base, '1HZ100V'))
+        assert len(reaberto) == 150 and reaberto.last_epoch == 10_149
+        assert reaberto.append(10_150, 1.0) and reaberto.append_many([10_151, 10_152], [2.0, 3.0]) == 2
+        reaberto.close()
+
+        os.remove(os.path.join(base, '1HZ100V', 'index.json'))
+        leitura = TickStore(base, readonly=True)
+        assert leitura.symbols() == ['1HZ100V']
+        ticks = leitura.read_range('1HZ100V')
+        assert ticks.dtype == TICK_DTYPE and len(ticks) == 153 and ticks['epoch'][-1] == 10_152
+        assert not leitura.record_tick({'symbol': '1HZ100V', 'epoch': 10_153, 'quote': 1.0})
+
+def test_um_escritor_por_diretorio():
+    with tempfile.TemporaryDirectory() as base:
+        primeiro = TickStore(base)
+        assert primeiro.record_tick({'symbol': 'R_10', 'epoch': 1, 'quote': 1.0})
+        segundo = TickStore(base)
+        assert not segundo.record_tick({'symbol': 'R_10', 'epoch': 2, 'quote': 2.0})
+        assert not segundo.record_tick({'symbol': '../R_10', 'epoch': 2, 'quote': 2.0})
+        primeiro.close()
+        with open(os.path.join(base, 'R_10', 'index.json')) as f:
+            assert json.load(f)['segments'][0]['count'] == 1
+
+def run_all_tests():
+    testes = [
+        test_intervalos_entre_segmentos,
+        test_reabertura_e_recuperacao,
+        test_um_escritor_por_diretorio,
+    ]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+    return falhas == 0
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Teste do modo multi-ativo do AccumulatorScalpingBot (tunderbot)
+Vários ativos na mesma conexão, com anel, detector e gestão por ativo,
+rodando via replay com o motor de contratos local (sem tocar o Supabase)
+"""
+
+import sys
+import os
+import asyncio
+import logging
+import tempfile
+
+import numpy as np
+
+# Adicionar o diretório atual ao path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from tick_replay import executar_replay
+from contract_engine import ExecutorSimulado, MotorContratos
+from io_offload import descarregador
+import tunderbot
+
+ATIVOS = ['R_10', 'R_50', 'R_100']
+
+def _criar_bot(diretorio, ativos=None):
+    config = {'name': 'Teste_Multi', 'token': 'TESTE' * 6, 'app_id': '1', 'handoff': False}
+    if ativos:
+        config['ativos'] = ativos
+    bot = tunderbot.AccumulatorScalpingBot(config)
+    bot._debug_log_file = os.path.join(diretorio, 'debug_signals.json')
+    return bot
+
+def test_configuracao_padrao_e_multi_ativo():
+    with tempfile.TemporaryDirectory() as diretorio:
+        unico = _criar_bot(diretorio)
+        assert unico.ativos == tunderbot.ATIVOS and unico.ativo == tunderbot.ATIVO
+        assert unico.tick_buffer is unico.estados[unico.ativo].tick_buffer
+
+        bot = _criar_bot(diretorio, ATIVOS)
+        assert bot.ativo == 'R_10' and list(bot.estados) == ATIVOS
+        assert len({id(e.detector_padrao) for e in bot.estados.values()}) == 3
+        assert bot.sync_system.signal_queue.maxsize == 9
+
+def test_replay_multi_ativo_em_uma_conexao():
+    """Padrões de um ativo não contaminam os outros; contratos de ativos diferentes ficam abertos juntos"""
+    clientes = []
+    create_client = tunderbot.create_client
+    tunderbot.create_client = lambda *args: clientes.append(args)
+    logging.disable(logging.CRITICAL)
+    try:
+        rng = np.random.default_rng(11)
+        n = 300
+        epochs = 1_700_000_000 + 2 * np.arange(n, dtype=np.int64)
+        ticks = {s: (epochs, np.round(1000 + np.cumsum(rng.normal(0, 0.01, n)), 3)) for s in ATIVOS}
+        with tempfile.TemporaryDirectory() as diretorio:
+            bot = _criar_bot(diretorio, ATIVOS)
+            executor = ExecutorSimulado(liquidar=MotorContratos(tick_size_barrier={(s, 0.02): 0.0005 for s in ATIVOS}))
+            relatorio = executar_replay(bot, ticks, executor=executor, pip_size=3)
+            asyncio.run(descarregador().aguardar())
+    finally:
+        tunderbot.create_client = create_client
+        logging.disable(logging.NOTSET)
+
+    # Resultados da gestão de risco não vão para tunder_bot_logs: nenhum cliente Supabase criado
+    assert clientes == []
+    assert relatorio.executor['chamadas'].get('supabase.log_to_supabase', 0) == sum(e.operacoes for e in bot.estados.values())
+
+    # ACCU só encerra com tick: contratos comprados no fim da série ficam abertos (um por ativo no máximo)
+    assert relatorio.ticks == 3 * n and relatorio.executor['abertos'] <= len(ATIVOS)
+    contratos = [c for c in executor.contratos.values() if c.is_sold]
+    assert {c.symbol for c in contratos} == set(ATIVOS)
+    for symbol, estado in bot.estados.items():
+        liquidados = sum(c.symbol == symbol for c in contratos)
+        assert liquidados - 1 <= estado.operacoes <= liquidados  # o último pode não ter sido lido pelo monitor
+    # No máximo um contrato por ativo, mas ativos diferentes em paralelo
+    eventos = sorted([(c.entry_epoch, 1, c.symbol) for c in contratos] + [(c.sell_epoch, -1, c.symbol) for c in contratos])
+    abertos, simultaneos, maximo = {}, 0, 0
+    for _, delta, symbol in eventos:
+        abertos[symbol] = abertos.get(symbol, 0) + delta
+        assert abertos[symbol] <= 1
+        simultaneos += delta
+        maximo = max(maximo, simultaneos)
+    assert maximo >= 2
+    assert abs(bot.total_profit - sum(e.total_profit for e in bot.estados.values())) < 1e-6
+
+def run_all_tests():
+    testes = [
+        test_configuracao_padrao_e_multi_ativo,
+        test_replay_multi_ativo_em_uma_conexao,
+    ]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+    return falhas == 0
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
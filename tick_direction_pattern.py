@@ -0,0 +1,138 @@
+"""
+Detector de padrão de direção de ticks por máscara de bits
+
+Os bots Accumulator verificam a cada tick se as últimas variações formam o
+padrão de entrada (ex.: Blue-Red-Red-Red do XML). Em vez de reconstruir
+rótulos "Red"/"Blue" a partir de uma cópia do buffer, cada variação vira
+2 bits num registrador inteiro:
+
+    bit 1 = queda estrita (Red)     bit 0 = alta estrita
+    (00 = preço igual, que no XML conta como Blue)
+
+A variação mais recente fica nos bits menos significativos. Um padrão é
+compilado para (máscara, valor) e a detecção por tick custa um shift e uma
+comparação por padrão configurado.
+
+Símbolos dos padrões (em ordem cronológica, do mais antigo ao mais recente):
+    R  Red  - queda (anterior > atual)
+    B  Blue - não caiu (anterior <= atual)
+    U  Up   - alta estrita (anterior < atual)
+    .  qualquer direção
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+# Padrão XML dos bots Accumulator: single4=Blue, single3=Red, single2=Red, single1=Red
+XML_ACCU_PATTERN = "BRRR"
+# Padrão do BotInstance: 3 altas seguidas de 1 queda
+RISE_FALL_PATTERN = "UUUR"
+
+_BIT_QUEDA = 0b10
+_BIT_ALTA = 0b01
+_BITS_POR_TICK = 2
+
+# símbolo -> (máscara, valor) dentro dos 2 bits da variação
+_SIMBOLOS = {
+    'R': (_BIT_QUEDA, _BIT_QUEDA),
+    'B': (_BIT_QUEDA, 0),
+    'U': (_BIT_ALTA, _BIT_ALTA),
+    '.': (0, 0),
+}
+
+@dataclass(frozen=True)
+class DirectionPattern:
+    """Padrão de entrada compilado para comparação por máscara"""
+    name: str
+    sequence: str
+    mask: int
+    value: int
+
+    @property
+    def length(self) -> int:
+        return len(self.sequence)
+
+def compile_pattern(sequence: str, name: Optional[str] = None) -> DirectionPattern:
+    """Compila uma sequência como "BRRR" em (máscara, valor)"""
+    sequence = sequence.strip().upper()
+    if not sequence:
+        raise ValueError("Padrão de direção vazio")
+    mask = value = 0
+    # O último símbolo é a variação mais recente (bits 0-1)
+    for deslocamento, simbolo in enumerate(reversed(sequence)):
+        if simbolo not in _SIMBOLOS:
+            raise ValueError(f"Símbolo inválido '{simbolo}' no padrão {sequence} (use R, B, U ou .)")
+        m, v = _SIMBOLOS[simbolo]
+        mask |= m << (deslocamento * _BITS_POR_TICK)
+        value |= v << (deslocamento * _BITS_POR_TICK)
+    return DirectionPattern(name or sequence, sequence, mask, value)
+
+def _codigo(anterior: float, atual: float) -> int:
+    if atual < anterior:
+        return _BIT_QUEDA
+    if atual > anterior:
+        return _BIT_ALTA
+    return 0
+
+class TickDirectionDetector:
+    """Registrador das últimas variações de preço testado contra padrões configuráveis"""
+
+    def __init__(self, patterns: Union[str, DirectionPattern, Sequence[Union[str, DirectionPattern]]] = XML_ACCU_PATTERN):
+        if isinstance(patterns, (str, DirectionPattern)):
+            patterns = [patterns]
+        self.patterns: List[DirectionPattern] = [
+            p if isinstance(p, DirectionPattern) else compile_pattern(p) for p in patterns
+        ]
+        if not self.patterns:
+            raise ValueError("Nenhum padrão de direção configurado")
+        self.length = max(p.length for p in self.patterns)
+        self._mascara_registro = (1 << (self.length * _BITS_POR_TICK)) - 1
+        self.reset()
+
+    @property
+    def required_ticks(self) -> int:
+        """Ticks necessários para o maior padrão (variações + 1)"""
+        return self.length + 1
+
+    def reset(self):
+        """Esvazia o registrador (reconexão ou limpeza do buffer)"""
+        self.register = 0
+        self.transitions = 0
+        self.last_price: Optional[float] = None
+
+    def add_tick(self, price: float) -> Optional[DirectionPattern]:
+        """Registra um tick e retorna o padrão casado ou None"""
+        anterior = self.last_price
+        self.last_price = price
+        if anterior is None:
+            return None
+        self.register = ((self.register << _BITS_POR_TICK) | _codigo(anterior, price)) & self._mascara_registro
+        self.transitions += 1
+        return self._casar(self.register, self.transitions)
+
+    def _casar(self, registro: int, transicoes: int) -> Optional[DirectionPattern]:
+        for padrao in self.patterns:
+            if transicoes >= padrao.length and (registro & padrao.mask) == padrao.value:
+                return padrao
+        return None
+
+    def evaluate(self, ticks: Sequence[float]) -> Optional[DirectionPattern]:
+        """Testa uma lista de ticks (mais antigo primeiro) sem alterar o registrador do stream"""
+        recentes = ticks[-self.required_ticks:]
+        registro = 0
+        for anterior, atual in zip(recentes, recentes[1:]):
+            registro = (registro << _BITS_POR_TICK) | _codigo(anterior, atual)
+        return self._casar(registro, len(recentes) - 1)
+
+    def describe(self, ticks: Optional[Sequence[float]] = None) -> str:
+        """Rótulos das últimas variações (ex.: "Blue-Red-Red-Red"); usado só nos logs de match"""
+        if ticks is not None:
+            recentes = ticks[-self.required_ticks:]
+            codigos = [_codigo(anterior, atual) for anterior, atual in zip(recentes, recentes[1:])]
+        else:
+            total = min(self.length, self.transitions)
+            codigos = [(self.register >> (d * _BITS_POR_TICK)) & 0b11 for d in range(total - 1, -1, -1)]
+        return "-".join("Red" if codigo & _BIT_QUEDA else "Blue" for codigo in codigos)
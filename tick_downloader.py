@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Download em massa de histórico de ticks da Deriv para o arquivo local (tick_store)
+
+O intervalo [inicio, fim] de cada ativo é dividido em janelas de
+ticks_history (start/end/count=5000) dimensionadas pelo ritmo do ativo
+(R_*: um tick a cada 2 s, 1HZ*: um por segundo). As janelas são baixadas em
+paralelo por várias conexões WebSocket, dentro de um orçamento global de
+requisições por segundo, e gravadas no arquivo em ordem assim que formam um
+prefixo contíguo.
+
+O próprio arquivo é o checkpoint: cada lote gravado é persistido com flush()
+e uma nova execução retoma a partir do último epoch arquivado. Ao gravar,
+o downloader confere a distância entre ticks consecutivos e reporta as
+lacunas maiores que o esperado.
+
+O arquivo é append-only: o download só avança a partir do último tick
+gravado. Para histórico anterior a ticks já gravados ao vivo, use outro
+diretório.
+
+Uso:
+    python tick_downloader.py --ativo R_75 --ativo 1HZ100V --inicio 2024-05-01 --fim 2024-05-15
+    python tick_downloader.py --ativo 1HZ10V --inicio 2024-05-01 --conexoes 6 --dir tick_archive
+"""
+
+import os
+import time
+import json
+import asyncio
+import logging
+import argparse
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from tick_store import TickStore
+
+logger = logging.getLogger(__name__)
+
+HISTORY_COUNT = 5000  # máximo de ticks por resposta de ticks_history
+MAX_CONEXOES = 4
+REQUISICOES_POR_SEGUNDO = 8.0  # orçamento somado de todas as conexões
+MAX_TENTATIVAS = 5
+OCUPACAO_JANELA = 0.9  # janelas com folga para raramente truncarem
+FATOR_LACUNA = 3  # distância > 3x o ritmo do ativo é lacuna
+DERIV_WS_URL = "wss://ws.derivws.com/websockets/v3?app_id={app_id}"
+APP_ID_PADRAO = "85515"
+
+def intervalo_tick(symbol: str) -> int:
+    """Segundos entre ticks do índice sintético"""
+    return 1 if symbol.startswith('1HZ') else 2
+
+def planejar_janelas(inicio: int, fim: int, passo: int, count: int = HISTORY_COUNT) -> List[Tuple[int, int]]:
+    """Divide [inicio, fim] em janelas que devem caber em uma resposta de count ticks"""
+    largura = max(1, int(count * passo * OCUPACAO_JANELA))
+    return [(a, min(a + largura - 1, fim)) for a in range(inicio, fim + 1, largura)]
+
+def para_epoch(valor) -> int:
+    """Aceita epoch em segundos ou data/hora ISO (UTC quando sem fuso)"""
+    if isinstance(valor, (int, float)):
+        return int(valor)
+    texto = str(valor).strip()
+    if texto.isdigit():
+        return int(texto)
+    data = datetime.fromisoformat(texto)
+    if data.tzinfo is None:
+        data = data.replace(tzinfo=timezone.utc)
+    return int(data.timestamp())
+
+class ErroHistorico(Exception):
+    """Resposta de erro da Deriv ou timeout em ticks_history"""
+
+class LimiteTaxa:
+    """Espaça requisições para respeitar um máximo por segundo entre todas as conexões"""
+
+    def __init__(self, por_segundo: float):
+        self.intervalo = 1.0 / por_segundo if por_segundo > 0 else 0.0
+        self._proximo = 0.0
+
+    async def aguardar(self):
+        if not self.intervalo:
+            return
+        agora = time.monotonic()
+        slot = max(agora, self._proximo)
+        self._proximo = slot + self.intervalo
+        if slot > agora:
+            await asyncio.sleep(slot - agora)
+
+class ConexaoHistorico:
+    """WebSocket público (sem autorização) que só faz ticks_history"""
+
+    def __init__(self, app_id: str = APP_ID_PADRAO, timeout: float = 30.0):
+        self.url = DERIV_WS_URL.format(app_id=app_id)
+        self.timeout = timeout
+        self.ws = None
+        self._req_id = 0
+        self._pendentes: Dict[int, asyncio.Future] = {}
+        self._leitor = None
+
+    async def connect(self):
+        import websockets
+        self.ws = await websockets.connect(self.url, ping_interval=20, max_size=2 ** 24)
+        self._leitor = asyncio.ensure_future(self._ler())
+
+    async def _ler(self):
+        ws = self.ws
+        try:
+            async for mensagem in ws:
+                dados = json.loads(mensagem)
+                futuro = self._pendentes.pop(dados.get('req_id'), None)
+                if futuro is not None and not futuro.done():
+                    futuro.set_result(dados)
+        except Exception as e:
+            erro = ErroHistorico(f"Conexão de histórico encerrada: {e}")
+        else:
+            erro = ErroHistorico("Conexão de histórico encerrada")
+        if self.ws is ws:
+            self.ws = None  # a próxima requisição (a nova tentativa do baixador) reconecta
+        for futuro in self._pendentes.values():
+            if not futuro.done():
+                futuro.set_exception(erro)
+        self._pendentes.clear()
+
+    async def ticks_history(self, symbol: str, count: int = 5, start: Optional[int] = None, end="latest"):
+        if self.ws is None:
+            await self.connect()
+        self._req_id += 1
+        mensagem = {"ticks_history": symbol, "count": count, "end": end, "style": "ticks",
+                    "req_id": self._req_id}
+        if start is not None:
+            mensagem["start"] = start
+        futuro = asyncio.get_running_loop().create_future()
+        self._pendentes[self._req_id] = futuro
+        try:
+            await self.ws.send(json.dumps(mensagem))
+        except Exception as e:  # caiu antes de o leitor perceber
+            self._pendentes.pop(mensagem['req_id'], None)
+            self.ws = None
+            raise ErroHistorico(f"Conexão de histórico encerrada: {e}")
+        try:
+            return await asyncio.wait_for(futuro, self.timeout)
+        except asyncio.TimeoutError:
+            self._pendentes.pop(mensagem['req_id'], None)
+            return None
+
+    async def disconnect(self):
+        if self._leitor is not None:
+            self._leitor.cancel()
+        if self.ws is not None:
+            await self.ws.close()
+            self.ws = None
+
+@dataclass
+class RelatorioDownload:
+    symbol: str
+    inicio: int
+    fim: int
+    janelas: int = 0
+    requisicoes: int = 0
+    ticks_gravados: int = 0
+    lacunas: List[Tuple[int, int]] = field(default_factory=list)
+    retomado_de: Optional[int] = None
+    duracao: float = 0.0
+
+    def resumo(self) -> str:
+        taxa = self.ticks_gravados / self.duracao if self.duracao else 0.0
+        return (f"{self.symbol}: {self.ticks_gravados} ticks em {self.janelas} janelas "
+                f"({self.requisicoes} requisições, {self.duracao:.1f}s, {taxa:.0f} ticks/s), "
+                f"{len(self.lacunas)} lacunas")
+
+class BaixadorTicks:
+    """
+    Baixa janelas de ticks_history em paralelo e grava no TickStore em ordem.
+
+    conexoes: objetos com `async ticks_history(symbol, count, start, end)`
+    (ConexaoHistorico ou DerivWebSocketNativo), um worker por conexão.
+    """
+
+    def __init__(self, store: TickStore, conexoes: Sequence[Any],
+                 requisicoes_por_segundo: float = REQUISICOES_POR_SEGUNDO,
+                 count: int = HISTORY_COUNT, max_tentativas: int = MAX_TENTATIVAS):
+        if not conexoes:
+            raise ValueError("Informe ao menos uma conexão")
+        self.store = store
+        self.conexoes = list(conexoes)
+        self.limite = LimiteTaxa(requisicoes_por_segundo)
+        self.count = count
+        self.max_tentativas = max_tentativas
+
+    async def _requisitar(self, conexao, symbol: str, start: int, end: int,
+                          relatorio: RelatorioDownload) -> Tuple[np.ndarray, np.ndarray]:
+        for tentativa in range(1, self.max_tentativas + 1):
+            await self.limite.aguardar()
+            relatorio.requisicoes += 1
+            try:
+                resposta = await conexao.ticks_history(symbol, count=self.count, start=start, end=end)
+                if resposta is None:
+                    raise ErroHistorico("timeout")
+                if 'error' in resposta:
+                    raise ErroHistorico(f"{resposta['error'].get('code')}: {resposta['error'].get('message')}")
+                historico = resposta.get('history') or {}
+                return (np.asarray(historico.get('times', []), dtype=np.int64),
+                        np.asarray(historico.get('prices', []), dtype=np.float64))
+            except Exception as e:  # ErroHistorico, queda de conexão ou erro do DerivWebSocketNativo
+                if tentativa == self.max_tentativas:
+                    raise ErroHistorico(f"{symbol} [{start}, {end}] falhou após {tentativa} tentativas: {e}")
+                espera = min(30.0, 0.5 * 2 ** tentativa)
+                logger.warning(f"⚠️ ticks_history {symbol} [{start}, {end}] tentativa {tentativa}: {e} - nova tentativa em {espera:.1f}s")
+                await asyncio.sleep(espera)
+
+    async def _baixar_janela(self, conexao, symbol: str, janela: Tuple[int, int],
+                             relatorio: RelatorioDownload) -> Tuple[np.ndarray, np.ndarray]:
+        """Uma janela; se a resposta vier truncada (count atingido) busca os trechos que ficaram de fora"""
+        pendentes = [janela]
+        partes = []
+        while pendentes:
+            inicio, fim = pendentes.pop()
+            epochs, quotes = await self._requisitar(conexao, symbol, inicio, fim, relatorio)
+            if not len(epochs):
+                continue
+            partes.append((epochs, quotes))
+            if len(epochs) >= self.count:
+                if epochs[0] > inicio:
+                    pendentes.append((inicio, int(epochs[0]) - 1))
+                if epochs[-1] < fim:
+                    pendentes.append((int(epochs[-1]) + 1, fim))
+        if not partes:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        partes.sort(key=lambda parte: parte[0][0])
+        return np.concatenate([p[0] for p in partes]), np.concatenate([p[1] for p in partes])
+
+    def _gravar(self, symbol: str, epochs: np.ndarray, quotes: np.ndarray, relatorio: RelatorioDownload):
+        """Grava um lote em ordem, registra lacunas e persiste o checkpoint"""
+        log = self.store.log(symbol)
+        anterior = log.last_epoch
+        novos = epochs > (anterior or 0)
+        epochs, quotes = epochs[novos], quotes[novos]
+        if not len(epochs):
+            return
+        limite = FATOR_LACUNA * intervalo_tick(symbol)
+        sequencia = epochs if anterior is None else np.concatenate(([anterior], epochs))
+        saltos = np.flatnonzero(np.diff(sequencia) > limite)
+        relatorio.lacunas.extend((int(sequencia[i]), int(sequencia[i + 1])) for i in saltos)
+        relatorio.ticks_gravados += log.append_many(epochs, quotes)
+        log.flush()
+
+    async def baixar(self, symbol: str, inicio, fim=None) -> RelatorioDownload:
+        inicio = para_epoch(inicio)
+        fim = para_epoch(fim) if fim is not None else int(time.time())
+        relatorio = RelatorioDownload(symbol, inicio, fim)
+        t0 = time.monotonic()
+
+        log = self.store.log(symbol)
+        if log.last_epoch is not None:
+            if log.first_epoch > inicio:
+                logger.warning(f"⚠️ {symbol}: arquivo começa em {log.first_epoch}; histórico anterior não pode ser inserido (append-only)")
+            if log.last_epoch >= inicio:
+                relatorio.retomado_de = log.last_epoch
+                inicio = log.last_epoch + 1
+        if inicio > fim:
+            relatorio.duracao = time.monotonic() - t0
+            return relatorio
+
+        janelas = planejar_janelas(inicio, fim, intervalo_tick(symbol), self.count)
+        relatorio.janelas = len(janelas)
+        fila: asyncio.Queue = asyncio.Queue()
+        for indice, janela in enumerate(janelas):
+            fila.put_nowait((indice, janela))
+        prontas: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        proxima = 0
+
+        async def worker(conexao):
+            nonlocal proxima
+            while True:
+                try:
+                    indice, janela = fila.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                prontas[indice] = await self._baixar_janela(conexao, symbol, janela, relatorio)
+                # Gravar o prefixo contíguo já disponível
+                while proxima in prontas:
+                    self._gravar(symbol, *prontas.pop(proxima), relatorio)
+                    proxima += 1
+
+        tarefas = [asyncio.ensure_future(worker(c)) for c in self.conexoes]
+        try:
+            await asyncio.gather(*tarefas)
+        finally:
+            for tarefa in tarefas:
+                tarefa.cancel()
+            relatorio.duracao = time.monotonic() - t0
+        logger.info(f"📥 {relatorio.resumo()}")
+        return relatorio
+
+async def _main_async(args) -> List[RelatorioDownload]:
+    store = TickStore(args.dir)
+    conexoes = [ConexaoHistorico(args.app_id) for _ in range(args.conexoes)]
+    baixador = BaixadorTicks(store, conexoes, requisicoes_por_segundo=args.taxa)
+    relatorios = []
+    try:
+        for symbol in args.ativo:
+            relatorios.append(await baixador.baixar(symbol, args.inicio, args.fim))
+    finally:
+        for conexao in conexoes:
+            await conexao.disconnect()
+        store.close()
+    return relatorios
+
+def main():
+    parser = argparse.ArgumentParser(description="Download em massa de ticks da Deriv para o arquivo local")
+    parser.add_argument('--ativo', action='append', required=True, help="Símbolo (repetível), ex.: R_75")
+    parser.add_argument('--inicio', required=True, help="Epoch ou data ISO (UTC)")
+    parser.add_argument('--fim', default=None, help="Epoch ou data ISO (UTC); padrão: agora")
+    parser.add_argument('--dir', default=os.getenv('TICK_STORE_DIR', 'tick_archive'), help="Diretório do arquivo de ticks")
+    parser.add_argument('--conexoes', type=int, default=MAX_CONEXOES, help="Conexões WebSocket em paralelo")
+    parser.add_argument('--taxa', type=float, default=REQUISICOES_POR_SEGUNDO, help="Requisições por segundo (total)")
+    parser.add_argument('--app-id', dest='app_id', default=os.getenv('DERIV_APP_ID', APP_ID_PADRAO))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    try:
+        relatorios = asyncio.run(_main_async(args))
+    except KeyboardInterrupt:
+        print("\n! Download interrompido; execute novamente para retomar")
+        return
+    for relatorio in relatorios:
+        print(relatorio.resumo())
+        for a, b in relatorio.lacunas[:20]:
+            print(f"   lacuna: {a} -> {b} ({b - a}s)")
+
+if __name__ == "__main__":
+    main()
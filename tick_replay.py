@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Replay de ticks gravados nas classes de bot reais
+
+Alimenta o ponto de entrada _process_tick do bot (o mesmo chamado pelo
+_handle_messages da conexão ao vivo) com ticks do arquivo local
+(tick_store) ou de arrays, trocando a conexão da Deriv por um executor
+simulado: proposal/buy/proposal_open_contract/portfolio respondem em
+memória e os contratos são liquidados contra os próprios ticks do replay.
+
+Velocidades:
+- velocidade=1.0 / N: o intervalo real entre ticks é respeitado (dividido por N);
+- velocidade=None ("max"): o event loop roda com relógio virtual. Cada
+  asyncio.sleep do bot (monitoramento de 2 s, timeouts) avança o
+  relógio instantaneamente, então milhões de ticks rodam em segundos
+  mantendo a mesma intercalação entre ticks e timers da execução ao vivo.
+
+A drenagem ao fim dos ticks (contratos ainda abertos) roda sempre no relógio
+virtual. O replay cria o próprio asyncio.SelectorEventLoop, seja qual for a
+política de event loop instalada (Proactor no Windows, uvloop). Os métodos Supabase do bot (logs de operação, radar) viram no-ops
+contados no executor: o replay nunca grava nas tabelas de produção.
+
+Uso:
+    relatorio = executar_replay(bot, ticks)                # ticks: array de TICK_DTYPE
+    relatorio = executar_replay(bot, {'R_10': t10, 'R_50': t50})   # multi-ativo, intercalado por epoch
+    python tick_replay.py --bot tunderbot --ativo R_75 --dir tick_archive --velocidade max
+    python tick_replay.py --bot tunderbot --ativo R_10,R_50,R_100 --velocidade max
+"""
+
+import os
+import time
+import asyncio
+import logging
+import argparse
+import itertools
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from tick_store import TickStore, TICK_DTYPE
+from contract_engine import ExecutorSimulado, instalar_executor
+
+logger = logging.getLogger(__name__)
+
+TEMPO_DRENAGEM = 600.0  # segundos (de replay) aguardando contratos abertos ao fim dos ticks
+TAREFAS_PADRAO = ('_process_signals_from_queue',)
+
+# ============================================================================
+# RELÓGIO VIRTUAL
+# ============================================================================
+
+class RelogioVirtual:
+    """
+    Relógio virtual para um event loop de seletor (padrão do asyncio).
+
+    loop.time() passa a devolver o tempo virtual e, quando o loop iria
+    dormir até o próximo timer, o relógio salta direto para ele. O relógio
+    começa em 0: com valores da ordem de epochs (1.7e9) a resolução do
+    float não distingue o timer do instante atual e o loop não avança.
+    """
+
+    def __init__(self, inicio: float = 0.0):
+        self.agora = float(inicio)
+
+    def instalar(self, loop: asyncio.AbstractEventLoop):
+        seletor = getattr(loop, '_selector', None)
+        if seletor is None:
+            raise RuntimeError("Relógio virtual requer um event loop baseado em seletor (asyncio padrão)")
+        select_original = seletor.select
+
+        def select(timeout=None):
+            if timeout is not None and timeout > 0:
+                self.agora += timeout
+                timeout = 0
+            return select_original(timeout)
+
+        loop.time = lambda: self.agora
+        seletor.select = select
+
+# ============================================================================
+# DRIVER DE REPLAY
+# ============================================================================
+
+@dataclass
+class RelatorioReplay:
+    ticks: int = 0
+    duracao_real: float = 0.0
+    duracao_replay: float = 0.0
+    latencia_media_ms: float = 0.0
+    latencia_max_ms: float = 0.0
+    executor: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def ticks_por_segundo(self) -> float:
+        return self.ticks / self.duracao_real if self.duracao_real else 0.0
+
+    def resumo(self) -> str:
+        return (f"{self.ticks} ticks ({self.duracao_replay / 3600:.1f}h de mercado) em {self.duracao_real:.2f}s "
+                f"- {self.ticks_por_segundo:,.0f} ticks/s, handler médio {self.latencia_media_ms:.3f}ms "
+                f"(máx {self.latencia_max_ms:.2f}ms), contratos {self.executor.get('contratos', 0)}, "
+                f"lucro {self.executor.get('lucro_total', 0.0)}")
+
+def carregar_ticks(diretorio: str, symbol: str, inicio: Optional[int] = None, fim: Optional[int] = None) -> np.ndarray:
+    """Ticks gravados pelo tick_store/tick_downloader"""
+    return TickStore(diretorio, readonly=True).read_range(symbol, inicio, fim)
+
+def _como_array(ticks) -> np.ndarray:
+    if isinstance(ticks, tuple):
+        epochs, quotes = ticks
+        arranjo = np.empty(len(epochs), dtype=TICK_DTYPE)
+        arranjo['epoch'], arranjo['quote'] = epochs, quotes
+        return arranjo
+    return ticks
+
+def intercalar_ativos(por_ativo: Dict[str, Any]):
+    """Une as séries de vários ativos num único stream ordenado por epoch (estável entre ativos)"""
+    simbolos = list(por_ativo)
+    series = [_como_array(por_ativo[s]) for s in simbolos]
+    unido = np.empty(sum(len(t) for t in series), dtype=TICK_DTYPE.descr + [('ativo', '<i2')])
+    inicio = 0
+    for indice, serie in enumerate(series):
+        trecho = unido[inicio:inicio + len(serie)]
+        trecho['epoch'], trecho['quote'], trecho['ativo'] = serie['epoch'], serie['quote'], indice
+        inicio += len(serie)
+    return unido[np.argsort(unido['epoch'], kind='stable')], simbolos
+
+def _mensagens(ticks: np.ndarray, simbolos: List[str], pip_size: Optional[int]):
+    epochs = ticks['epoch'].tolist()
+    quotes = ticks['quote'].tolist()
+    ativos = ticks['ativo'].tolist() if 'ativo' in ticks.dtype.names else itertools.repeat(0)
+    for i, (epoch, quote, ativo) in enumerate(zip(epochs, quotes, ativos)):
+        tick = {'symbol': simbolos[ativo], 'epoch': epoch, 'quote': quote, 'id': f'replay-{i}'}
+        if pip_size is not None:
+            tick['pip_size'] = pip_size
+        yield tick
+
+async def _replay(bot, executor: ExecutorSimulado, ticks: np.ndarray, simbolos: List[str],
+                  velocidade: Optional[float], tarefas, pip_size: Optional[int],
+                  tempo_drenagem: float) -> RelatorioReplay:
+    relatorio = RelatorioReplay()
+    em_execucao = [asyncio.ensure_future(getattr(bot, nome)()) for nome in tarefas if hasattr(bot, nome)]
+    processar = executor._process_tick
+    loop = asyncio.get_running_loop()
+    latencia_total = latencia_max = 0.0
+    anterior = None
+    inicio_real = time.perf_counter()
+    try:
+        for tick in _mensagens(ticks, simbolos, pip_size):
+            if anterior is not None:
+                intervalo = tick['epoch'] - anterior
+                if velocidade is None:
+                    await asyncio.sleep(intervalo)  # instantâneo no relógio virtual
+                elif velocidade > 0:
+                    await asyncio.sleep(intervalo / velocidade)
+            anterior = tick['epoch']
+            t0 = time.perf_counter()
+            await processar(tick)
+            decorrido = time.perf_counter() - t0
+            latencia_total += decorrido
+            latencia_max = max(latencia_max, decorrido)
+            relatorio.ticks += 1
+
+        # Drenagem: deixar a fila de sinais e o monitoramento encerrarem os contratos em aberto.
+        # Sempre no relógio virtual (partindo do instante atual, os timers pendentes
+        # continuam válidos): em velocidade real seriam até tempo_drenagem segundos de espera
+        if velocidade is not None:
+            RelogioVirtual(loop.time()).instalar(loop)
+        limite = loop.time() + tempo_drenagem
+        while executor.abertos and loop.time() < limite:
+            await asyncio.sleep(1.0)
+        await asyncio.sleep(0.1)
+    finally:
+        shutdown = getattr(bot, '_shutdown_event', None)
+        if isinstance(shutdown, asyncio.Event):
+            shutdown.set()
+        # Tarefas de fundo e as criadas pelo bot (ex.: monitoramento de contratos ainda abertos)
+        restantes = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for tarefa in restantes:
+            tarefa.cancel()
+        await asyncio.gather(*restantes, return_exceptions=True)
+
+    relatorio.duracao_real = time.perf_counter() - inicio_real
+    if relatorio.ticks:
+        relatorio.duracao_replay = float(ticks['epoch'][relatorio.ticks - 1] - ticks['epoch'][0])
+        relatorio.latencia_media_ms = latencia_total / relatorio.ticks * 1000
+        relatorio.latencia_max_ms = latencia_max * 1000
+    relatorio.executor = executor.obter_estatisticas()
+    return relatorio
+
+def executar_replay(bot, ticks: np.ndarray, symbol: Optional[str] = None, velocidade: Optional[float] = None,
+                    executor: Optional[ExecutorSimulado] = None, tarefas=TAREFAS_PADRAO,
+                    pip_size: Optional[int] = None, tempo_drenagem: float = TEMPO_DRENAGEM) -> RelatorioReplay:
+    """
+    Roda o replay em um event loop próprio e devolve o relatório.
+
+    ticks: array estruturado (TICK_DTYPE), tupla (epochs, quotes) ou dict
+           {symbol: ticks} para bots multi-ativo (symbol é ignorado).
+    tarefas: métodos assíncronos de fundo do bot a iniciar (ex.: consumidor da fila de sinais).
+    """
+    if isinstance(ticks, dict):
+        ticks, simbolos = intercalar_ativos(ticks)
+    else:
+        ticks = _como_array(ticks)
+        simbolos = [symbol or getattr(bot, 'ativo', None) or 'R_75']
+    executor = executor or ExecutorSimulado()
+    instalar_executor(bot, executor)
+
+    # Seletor explícito: a política ativa pode criar um ProactorEventLoop (Windows) ou
+    # um loop do uvloop (instalar_runtime), sem o _selector que o relógio virtual usa
+    loop = asyncio.SelectorEventLoop()
+    try:
+        if velocidade is None and len(ticks):
+            RelogioVirtual().instalar(loop)
+        return loop.run_until_complete(_replay(bot, executor, ticks, simbolos, velocidade, tarefas,
+                                               pip_size, tempo_drenagem))
+    finally:
+        loop.close()
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+# Bots construídos com account_config (token fictício: o replay nunca conecta)
+BOTS_REPLAY = {
+    'tunderbot': ('tunderbot', 'AccumulatorScalpingBot'),
+    'tunderbotalavanca': ('tunderbotalavanca', 'AccumulatorScalpingBot'),
+    'alavancstunderpro': ('alavancstunderpro', 'ResetScalpingBot'),
+}
+
+def criar_bot(nome: str, ativos: Optional[List[str]] = None):
+    import importlib
+    modulo, classe = BOTS_REPLAY[nome]
+    # Replay não grava nem herda snapshot de handoff de contratos
+    config = {'name': f'Replay_{nome}', 'token': 'REPLAY' * 6, 'app_id': '1', 'handoff': False}
+    if ativos:
+        config['ativos'] = ativos
+    return getattr(importlib.import_module(modulo), classe)(config)
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay de ticks gravados em um bot")
+    parser.add_argument('--bot', choices=sorted(BOTS_REPLAY), required=True)
+    parser.add_argument('--ativo', required=True, help="Ativo ou lista separada por vírgula (bot multi-ativo)")
+    parser.add_argument('--dir', default=os.getenv('TICK_STORE_DIR', 'tick_archive'))
+    parser.add_argument('--inicio', type=int, default=None, help="Epoch inicial")
+    parser.add_argument('--fim', type=int, default=None, help="Epoch final")
+    parser.add_argument('--velocidade', default='max', help="'max' ou multiplicador (1 = tempo real)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    ativos = args.ativo.split(',')
+    ticks = {symbol: carregar_ticks(args.dir, symbol, args.inicio, args.fim) for symbol in ativos}
+    for symbol, serie in ticks.items():
+        if not len(serie):
+            parser.error(f"nenhum tick de {symbol} em {args.dir}")
+    velocidade = None if args.velocidade == 'max' else float(args.velocidade)
+    from contract_engine import MotorContratos
+    bot = criar_bot(args.bot, ativos if len(ativos) > 1 else None)
+    executor = ExecutorSimulado(liquidar=MotorContratos())
+    print(executar_replay(bot, ticks, velocidade=velocidade, executor=executor).resumo())
+
+if __name__ == "__main__":
+    main()
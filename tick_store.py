@@ -0,0 +1,388 @@
+"""
+Arquivo de ticks append-only por ativo em segmentos memory-mapped
+
+Layout em disco (um diretório por ativo):
+    <base_dir>/<SYMBOL>/000000.ticks   registros fixos (epoch int64, quote float64)
+    <base_dir>/<SYMBOL>/000001.ticks
+    <base_dir>/<SYMBOL>/index.json     primeiro/último epoch e contagem de cada segmento
+
+Cada segmento é pré-alocado com segment_ticks registros de 16 bytes e
+mapeado com np.memmap: gravar um tick é uma atribuição em memória e ler um
+intervalo de tempo é um searchsorted no índice de segmentos seguido de outro
+dentro do segmento, devolvendo views NumPy sem cópia.
+
+O índice só é regravado ao fechar um segmento e em flush(); a contagem do
+segmento ativo é recuperada dos próprios dados ao abrir (slots livres têm
+epoch 0), então um processo interrompido não perde ticks já gravados.
+Cada diretório aceita um único escritor (lock por arquivo quando disponível).
+
+Uso:
+    store = TickStore('tick_archive')
+    store.record_tick({'symbol': 'R_75', 'epoch': 1718000000, 'quote': 1234.56})
+    ticks = store.read_range('R_75', inicio, fim)   # ticks['epoch'], ticks['quote']
+"""
+
+import os
+import re
+import json
+import logging
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem lock entre processos
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+TICK_DTYPE = np.dtype([('epoch', '<i8'), ('quote', '<f8')])
+SEGMENT_TICKS = 1 << 20  # 16 MB por segmento (~12 dias de um índice 1HZ)
+INDEX_FILE = 'index.json'
+_SIMBOLO_VALIDO = re.compile(r'^[A-Za-z0-9_]+$')
+
+def _somente_leitura(view: np.ndarray) -> np.ndarray:
+    view.flags.writeable = False
+    return view
+
+class SymbolTickLog:
+    """Log append-only de um ativo: lista de segmentos memory-mapped + índice de tempo"""
+
+    def __init__(self, directory: str, segment_ticks: int = SEGMENT_TICKS, readonly: bool = False):
+        if segment_ticks < 1:
+            raise ValueError(f"segment_ticks deve ser positivo: {segment_ticks}")
+        self.directory = directory
+        self.readonly = readonly
+        self._lock_file = None
+        if not readonly:
+            os.makedirs(directory, exist_ok=True)
+            self._adquirir_lock()
+
+        self.segment_ticks = segment_ticks
+        self._segmentos: List[np.memmap] = []
+        self._primeiros: List[int] = []
+        self._ultimos: List[int] = []
+        self._contagens: List[int] = []
+        self._carregar()
+
+    # ------------------------------------------------------------------
+    # Abertura e recuperação
+    # ------------------------------------------------------------------
+
+    def _adquirir_lock(self):
+        if fcntl is None:
+            return
+        self._lock_file = open(os.path.join(self.directory, '.lock'), 'a+')
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self._lock_file.close()
+            self._lock_file = None
+            raise RuntimeError(f"Arquivo de ticks já aberto para escrita por outro processo: {self.directory}")
+
+    def _arquivo(self, numero: int) -> str:
+        return os.path.join(self.directory, f"{numero:06d}.ticks")
+
+    def _carregar(self):
+        indice = {}
+        caminho_indice = os.path.join(self.directory, INDEX_FILE)
+        if os.path.exists(caminho_indice):
+            try:
+                with open(caminho_indice, 'r', encoding='utf-8') as f:
+                    indice = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ Índice de ticks ilegível em {self.directory}, reconstruindo: {e}")
+                indice = {}
+        if indice.get('segment_ticks'):
+            self.segment_ticks = int(indice['segment_ticks'])
+        elif os.path.exists(self._arquivo(0)):
+            # Sem índice: o tamanho do primeiro segmento define a capacidade
+            self.segment_ticks = os.path.getsize(self._arquivo(0)) // TICK_DTYPE.itemsize
+
+        conhecidos = indice.get('segments', [])
+        numero = 0
+        while os.path.exists(self._arquivo(numero)):
+            if numero < len(conhecidos) - 1:
+                # Segmento selado: confiar no índice sem tocar nas páginas
+                info = conhecidos[numero]
+                self._segmentos.append(np.memmap(self._arquivo(numero), dtype=TICK_DTYPE, mode='r',
+                                                 shape=(self.segment_ticks,)))
+                self._primeiros.append(int(info['first']))
+                self._ultimos.append(int(info['last']))
+                self._contagens.append(int(info['count']))
+            else:
+                self._abrir_segmento_existente(numero)
+            numero += 1
+
+        # Segmentos selados são somente leitura; apenas o último aceita escrita
+        if self._segmentos and not self.readonly:
+            self._segmentos[-1] = np.memmap(self._arquivo(numero - 1), dtype=TICK_DTYPE, mode='r+',
+                                            shape=(self.segment_ticks,))
+
+    def _abrir_segmento_existente(self, numero: int):
+        """Abre um segmento sem índice confiável e recupera a contagem pelos dados"""
+        segmento = np.memmap(self._arquivo(numero), dtype=TICK_DTYPE, mode='r', shape=(self.segment_ticks,))
+        epochs = segmento['epoch']
+        contagem = self.segment_ticks if epochs[-1] != 0 else int(np.argmin(epochs != 0))
+        self._segmentos.append(segmento)
+        self._contagens.append(contagem)
+        self._primeiros.append(int(epochs[0]) if contagem else 0)
+        self._ultimos.append(int(epochs[contagem - 1]) if contagem else 0)
+
+    # ------------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return sum(self._contagens)
+
+    def _segmentos_com_dados(self) -> int:
+        """Só o último segmento pode estar vazio (recém-criado)"""
+        n = len(self._segmentos)
+        return n - 1 if n and not self._contagens[-1] else n
+
+    @property
+    def first_epoch(self) -> Optional[int]:
+        return self._primeiros[0] if self._segmentos_com_dados() else None
+
+    @property
+    def last_epoch(self) -> Optional[int]:
+        n = self._segmentos_com_dados()
+        return self._ultimos[n - 1] if n else None
+
+    def _segmento_para_escrita(self) -> int:
+        """Número do segmento ativo, criando/selando segmentos conforme necessário"""
+        if self.readonly:
+            raise RuntimeError(f"Arquivo de ticks aberto somente para leitura: {self.directory}")
+        if self._segmentos and self._contagens[-1] < self.segment_ticks:
+            return len(self._segmentos) - 1
+
+        if self._segmentos:
+            # Selar o segmento cheio
+            self._segmentos[-1].flush()
+            self._segmentos[-1] = np.memmap(self._arquivo(len(self._segmentos) - 1), dtype=TICK_DTYPE,
+                                            mode='r', shape=(self.segment_ticks,))
+        numero = len(self._segmentos)
+        self._segmentos.append(np.memmap(self._arquivo(numero), dtype=TICK_DTYPE, mode='w+',
+                                         shape=(self.segment_ticks,)))
+        self._primeiros.append(0)
+        self._ultimos.append(0)
+        self._contagens.append(0)
+        if numero:
+            self._salvar_indice()
+        return numero
+
+    def append(self, epoch: int, quote: float) -> bool:
+        """Grava um tick; ignora epochs não crescentes (duplicados/fora de ordem)"""
+        epoch = int(epoch)
+        ultimo = self.last_epoch
+        if epoch <= 0 or (ultimo is not None and epoch <= ultimo):
+            return False
+        numero = self._segmento_para_escrita()
+        posicao = self._contagens[numero]
+        segmento = self._segmentos[numero]
+        segmento['epoch'][posicao] = epoch
+        segmento['quote'][posicao] = quote
+        if posicao == 0:
+            self._primeiros[numero] = epoch
+        self._ultimos[numero] = epoch
+        self._contagens[numero] = posicao + 1
+        return True
+
+    def append_many(self, epochs, quotes) -> int:
+        """
+        Grava um lote ordenado de ticks (ex.: página de ticks_history).
+
+        Epochs já arquivados são descartados, o que torna a gravação de
+        páginas sobrepostas idempotente. Retorna quantos ticks foram gravados.
+        """
+        epochs = np.asarray(epochs, dtype=np.int64)
+        quotes = np.asarray(quotes, dtype=np.float64)
+        if epochs.shape != quotes.shape or epochs.ndim != 1:
+            raise ValueError("epochs e quotes devem ser vetores do mesmo tamanho")
+        if len(epochs) > 1 and np.any(np.diff(epochs) <= 0):
+            raise ValueError("epochs do lote devem ser estritamente crescentes")
+        limite = max(self.last_epoch or 0, 0)
+        inicio = int(np.searchsorted(epochs, limite, side='right'))
+        epochs, quotes = epochs[inicio:], quotes[inicio:]
+
+        gravados = 0
+        while gravados < len(epochs):
+            numero = self._segmento_para_escrita()
+            posicao = self._contagens[numero]
+            n = min(self.segment_ticks - posicao, len(epochs) - gravados)
+            destino = self._segmentos[numero][posicao:posicao + n]
+            destino['epoch'] = epochs[gravados:gravados + n]
+            destino['quote'] = quotes[gravados:gravados + n]
+            if posicao == 0:
+                self._primeiros[numero] = int(epochs[gravados])
+            self._ultimos[numero] = int(epochs[gravados + n - 1])
+            self._contagens[numero] = posicao + n
+            gravados += n
+        return gravados
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+
+    def iter_range(self, start: Optional[int] = None, end: Optional[int] = None) -> Iterator[np.ndarray]:
+        """Views sem cópia, uma por segmento, dos ticks com start <= epoch <= end"""
+        n = self._segmentos_com_dados()
+        if not n:
+            return
+        ultimos = np.asarray(self._ultimos[:n], dtype=np.int64)
+        primeiros = np.asarray(self._primeiros[:n], dtype=np.int64)
+        primeiro_seg = 0 if start is None else int(np.searchsorted(ultimos, start, side='left'))
+        fim_seg = n if end is None else int(np.searchsorted(primeiros, end, side='right'))
+        for numero in range(primeiro_seg, fim_seg):
+            contagem = self._contagens[numero]
+            epochs = self._segmentos[numero]['epoch'][:contagem]
+            a = 0 if start is None else int(np.searchsorted(epochs, start, side='left'))
+            b = contagem if end is None else int(np.searchsorted(epochs, end, side='right'))
+            if b > a:
+                yield _somente_leitura(self._segmentos[numero][a:b])
+
+    def read_range(self, start: Optional[int] = None, end: Optional[int] = None) -> np.ndarray:
+        """Ticks do intervalo; view sem cópia quando cabe em um segmento, cópia concatenada se cruzar segmentos"""
+        partes = list(self.iter_range(start, end))
+        if not partes:
+            return np.empty(0, dtype=TICK_DTYPE)
+        return partes[0] if len(partes) == 1 else np.concatenate(partes)
+
+    def last_ticks(self, n: int) -> np.ndarray:
+        """Últimos n ticks (aquecimento de indicadores)"""
+        partes = []
+        restante = n
+        for numero in range(len(self._segmentos) - 1, -1, -1):
+            if restante <= 0:
+                break
+            contagem = self._contagens[numero]
+            k = min(restante, contagem)
+            if k:
+                partes.append(_somente_leitura(self._segmentos[numero][contagem - k:contagem]))
+                restante -= k
+        if not partes:
+            return np.empty(0, dtype=TICK_DTYPE)
+        return partes[0] if len(partes) == 1 else np.concatenate(partes[::-1])
+
+    # ------------------------------------------------------------------
+    # Persistência
+    # ------------------------------------------------------------------
+
+    def _salvar_indice(self):
+        indice = {
+            'segment_ticks': self.segment_ticks,
+            'segments': [
+                {'first': primeiro, 'last': ultimo, 'count': contagem}
+                for primeiro, ultimo, contagem in zip(self._primeiros, self._ultimos, self._contagens)
+            ],
+        }
+        caminho = os.path.join(self.directory, INDEX_FILE)
+        temporario = caminho + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(indice, f)
+        os.replace(temporario, caminho)
+
+    def flush(self):
+        if self.readonly or not self._segmentos:
+            return
+        self._segmentos[-1].flush()
+        self._salvar_indice()
+
+    def close(self):
+        self.flush()
+        self._segmentos.clear()
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'ticks': len(self),
+            'segments': len(self._segmentos),
+            'first_epoch': self.first_epoch,
+            'last_epoch': self.last_epoch,
+        }
+
+class TickStore:
+    """Arquivo de ticks de vários ativos sob um diretório base"""
+
+    def __init__(self, base_dir: str, segment_ticks: int = SEGMENT_TICKS, readonly: bool = False):
+        self.base_dir = base_dir
+        self.segment_ticks = segment_ticks
+        self.readonly = readonly
+        self._logs: Dict[str, SymbolTickLog] = {}
+        self._indisponiveis = set()
+
+    def log(self, symbol: str) -> SymbolTickLog:
+        tick_log = self._logs.get(symbol)
+        if tick_log is None:
+            if not _SIMBOLO_VALIDO.match(symbol or ''):
+                raise ValueError(f"Símbolo inválido para o arquivo de ticks: {symbol!r}")
+            tick_log = SymbolTickLog(os.path.join(self.base_dir, symbol), self.segment_ticks, self.readonly)
+            self._logs[symbol] = tick_log
+        return tick_log
+
+    def symbols(self) -> List[str]:
+        if not os.path.isdir(self.base_dir):
+            return []
+        return sorted(nome for nome in os.listdir(self.base_dir)
+                      if os.path.isdir(os.path.join(self.base_dir, nome)))
+
+    def append(self, symbol: str, epoch: int, quote: float) -> bool:
+        return self.log(symbol).append(epoch, quote)
+
+    def append_many(self, symbol: str, epochs, quotes) -> int:
+        return self.log(symbol).append_many(epochs, quotes)
+
+    def record_tick(self, tick: Dict[str, Any]) -> bool:
+        """
+        Grava um tick do stream da Deriv ({'symbol', 'epoch', 'quote'}).
+
+        Nunca levanta exceção: o gravador não pode derrubar o processamento
+        de ticks do bot. Um ativo cujo arquivo esteja preso por outro
+        processo é desativado com um único aviso.
+        """
+        symbol = tick.get('symbol')
+        if symbol in self._indisponiveis:
+            return False
+        try:
+            return self.log(symbol).append(tick['epoch'], float(tick['quote']))
+        except (RuntimeError, ValueError, OSError) as e:
+            self._indisponiveis.add(symbol)
+            logger.warning(f"⚠️ Gravação de ticks desativada para {symbol}: {e}")
+        except (KeyError, TypeError) as e:
+            logger.debug(f"Tick sem epoch/quote ignorado pelo arquivo: {tick} ({e})")
+        return False
+
+    def read_range(self, symbol: str, start: Optional[int] = None, end: Optional[int] = None) -> np.ndarray:
+        return self.log(symbol).read_range(start, end)
+
+    def iter_range(self, symbol: str, start: Optional[int] = None, end: Optional[int] = None) -> Iterator[np.ndarray]:
+        return self.log(symbol).iter_range(start, end)
+
+    def last_ticks(self, symbol: str, n: int) -> np.ndarray:
+        return self.log(symbol).last_ticks(n)
+
+    def flush(self):
+        for tick_log in self._logs.values():
+            tick_log.flush()
+
+    def close(self):
+        for tick_log in self._logs.values():
+            tick_log.close()
+        self._logs.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {symbol: tick_log.get_stats() for symbol, tick_log in self._logs.items()}
+
+_stores_compartilhados: Dict[str, TickStore] = {}
+
+def get_shared_store(base_dir: str) -> TickStore:
+    """Um TickStore por diretório no processo (vários bots, um único escritor)"""
+    chave = os.path.abspath(base_dir)
+    store = _stores_compartilhados.get(chave)
+    if store is None:
+        store = _stores_compartilhados[chave] = TickStore(base_dir)
+    return store
@@ -11,7 +11,7 @@ import asyncio
 from typing import Optional
 from ...utils.helpers import (
     salvar_operacao, aguardar_resultado_contrato, executar_compra,
-    verificar_stops, obter_ultimo_tick, extrair_ultimo_digito,
+    verificar_stops, obter_ultimo_digito,
     log_resultado_operacao, criar_parametros_compra,
     validar_e_ajustar_stake, handle_websocket_error, safe_api_call, is_websocket_error
 )
@@ -61,12 +61,12 @@ async def bot_ai_2_0(api) -> None:
             if resultado_stop != 'continue':
                 break
             
-            # Obter último tick do ativo para monitoramento com tratamento robusto de erro
-            success, ultimo_preco = await safe_api_call(
-                obter_ultimo_tick, nome_bot, "obter último tick", api, ativo, nome_bot
+            # Último dígito do ativo (motor de dígitos alimentado pelo stream de ticks)
+            success, ultimo_digito = await safe_api_call(
+                obter_ultimo_digito, nome_bot, "obter último dígito", api, ativo, nome_bot
             )
             
-            if not success or ultimo_preco is None:
+            if not success or ultimo_digito is None:
                 print(f"❌ {nome_bot}: Erro ao obter último tick. Tentando novamente...")
                 retry_count += 1
                 should_continue = await handle_websocket_error(
@@ -81,8 +81,6 @@ async def bot_ai_2_0(api) -> None:
             
             # Reset contador de retry após sucesso
             retry_count = 0
-                
-            ultimo_digito = extrair_ultimo_digito(ultimo_preco)
             
             print(f"🔄 {nome_bot}: Iniciando nova compra contínua | Profit: ${total_profit:.2f}")
             print(f"🔍 {nome_bot}: Último dígito {ativo}: {ultimo_digito} | Stake: ${stake_atual:.2f}")
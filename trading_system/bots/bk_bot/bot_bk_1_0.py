@@ -10,7 +10,7 @@ import asyncio
 from typing import Optional
 from ...utils.helpers import (
     salvar_operacao, aguardar_resultado_contrato, executar_compra,
-    verificar_stops, obter_ultimo_tick, extrair_ultimo_digito,
+    verificar_stops, obter_ultimo_digito,
     log_resultado_operacao, criar_parametros_compra,
     validar_e_ajustar_stake, handle_websocket_error, safe_api_call, is_websocket_error
 )
@@ -61,13 +61,13 @@ async def bot_bk_1_0(api) -> None:
             if resultado_stop != 'continue':
                 break
             
-            # Obter último tick do ativo usando safe_api_call
-            ultimo_preco = await safe_api_call(obter_ultimo_tick, api, ativo, nome_bot)
-            if ultimo_preco is None:
+            # Último dígito do ativo (motor de dígitos alimentado pelo stream de ticks)
+            success, ultimo_digito = await safe_api_call(
+                obter_ultimo_digito, nome_bot, "obter último dígito", api, ativo, nome_bot
+            )
+            if not success or ultimo_digito is None:
                 await asyncio.sleep(2)
                 continue
-                
-            ultimo_digito = extrair_ultimo_digito(ultimo_preco)
             
             print(f"🔍 {nome_bot}: Último dígito: {ultimo_digito} | Profit: ${total_profit:.2f} | Stake: ${stake_atual:.2f} | Perdas: {loss_seguidas}")
             
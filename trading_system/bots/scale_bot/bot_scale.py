@@ -10,8 +10,7 @@ from trading_system.utils.helpers import (
     salvar_operacao, 
     aguardar_resultado_contrato, 
     executar_compra, 
-    obter_ultimo_tick, 
-    extrair_ultimo_digito, 
+    obter_ultimo_digito, 
     log_resultado_operacao, 
     criar_parametros_compra, 
     verificar_stops,
@@ -63,13 +62,12 @@ async def bot_scale(api_manager) -> None:
         try:
             # 1. Obter dígito de predição
             print(f"🔍 {nome_bot}: Obtendo dígito de predição...")
-            ultimo_tick_predicao = await obter_ultimo_tick(api_manager, ativo, nome_bot)
-            if ultimo_tick_predicao is None:
+            predicao = await obter_ultimo_digito(api_manager, ativo, nome_bot)
+            if predicao is None:
                 print(f"❌ {nome_bot}: Erro ao obter tick de predição. Tentando novamente...")
                 await asyncio.sleep(5)
                 continue
             
-            predicao = extrair_ultimo_digito(ultimo_tick_predicao)
             print(f"🎯 {nome_bot}: Dígito de predição: {predicao}")
             
             # 2. Esperar 0.75 segundos
@@ -78,13 +76,12 @@ async def bot_scale(api_manager) -> None:
             
             # 3. Obter dígito atual
             print(f"🔍 {nome_bot}: Obtendo dígito atual...")
-            ultimo_tick_atual = await obter_ultimo_tick(api_manager, ativo, nome_bot)
-            if ultimo_tick_atual is None:
+            ultimo_digito_atual = await obter_ultimo_digito(api_manager, ativo, nome_bot)
+            if ultimo_digito_atual is None:
                 print(f"❌ {nome_bot}: Erro ao obter tick atual. Tentando novamente...")
                 await asyncio.sleep(5)
                 continue
             
-            ultimo_digito_atual = extrair_ultimo_digito(ultimo_tick_atual)
             print(f"🎯 {nome_bot}: Dígito atual: {ultimo_digito_atual}")
             
             # 4. Determinar condição de compra
@@ -10,7 +10,7 @@ import asyncio
 from typing import Optional
 from ...utils.helpers import (
     salvar_operacao, aguardar_resultado_contrato, executar_compra,
-    verificar_stops, obter_ultimo_tick, extrair_ultimo_digito,
+    verificar_stops, obter_ultimo_digito,
     log_resultado_operacao, criar_parametros_compra, calcular_martingale,
     validar_e_ajustar_stake, handle_websocket_error, safe_api_call, is_websocket_error
 )
@@ -62,11 +62,11 @@ async def wolf_bot_2_0(api) -> None:
                 break
             
             # Obter último dígito do R_100 com tratamento robusto de erro
-            success, ultimo_tick = await safe_api_call(
-                obter_ultimo_tick, nome_bot, "obter último tick", api, ativo, nome_bot
+            success, ultimo_digito = await safe_api_call(
+                obter_ultimo_digito, nome_bot, "obter último dígito", api, ativo, nome_bot
             )
             
-            if not success or ultimo_tick is None:
+            if not success or ultimo_digito is None:
                 print(f"❌ {nome_bot}: Erro ao obter último tick. Tentando novamente...")
                 retry_count += 1
                 should_continue = await handle_websocket_error(
@@ -82,8 +82,6 @@ async def wolf_bot_2_0(api) -> None:
             # Reset contador de retry após sucesso
             retry_count = 0
             
-            ultimo_digito = extrair_ultimo_digito(ultimo_tick)
-            
             # Lógica de Entrada (Duas Condições)
             entrada_valida = False
             contract_type = None
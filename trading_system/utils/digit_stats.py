@@ -0,0 +1,242 @@
+"""
+Motor de estatísticas de último dígito por ativo
+Alimentado pelo stream de ticks da Deriv e consultado pelos bots de dígitos
+
+O dígito é extraído numericamente a partir do pip_size do ativo
+(round(preco * 10**casas) % 10), sem conversão para string: 123.40 com
+2 casas dá 0, enquanto str(123.40) perderia o zero final.
+
+Para cada ativo o motor mantém, com custo O(1) por tick:
+- histogramas de dígitos em várias janelas deslizantes;
+- contagem de pares/ímpares por janela;
+- sequência atual do mesmo dígito e da mesma paridade.
+
+Uso:
+    motor = central_digitos.motor('R_100')
+    await central_digitos.iniciar_stream(api, 'R_100')
+    motor.ultimo_digito, motor.proporcao_over(5, 100), motor.frequencias(25)
+"""
+
+import asyncio
+import time
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Casas decimais das cotações (pip_size da Deriv) dos índices sintéticos
+PIP_SIZES = {
+    'R_10': 3, 'R_25': 3, 'R_50': 4, 'R_75': 4, 'R_100': 2,
+    '1HZ10V': 2, '1HZ25V': 2, '1HZ50V': 2, '1HZ75V': 2, '1HZ100V': 2,
+}
+PIP_SIZE_PADRAO = 2
+JANELAS_PADRAO = (25, 100, 1000)
+TICKS_SEM_ATUALIZACAO = 3  # intervalos de tick sem cotação nova: stream parado (socket meio aberto)
+
+def pip_size_do_ativo(symbol: Optional[str]) -> int:
+    """Casas decimais da cotação do ativo (padrão: 2)"""
+    return PIP_SIZES.get(symbol, PIP_SIZE_PADRAO)
+
+def extrair_digito(preco: float, pip_size: int = PIP_SIZE_PADRAO) -> int:
+    """Último dígito da cotação considerando pip_size casas decimais"""
+    return int(round(preco * 10 ** pip_size)) % 10
+
+class MotorDigitos:
+    """Estatísticas deslizantes de último dígito de um ativo"""
+
+    def __init__(self, symbol: str, pip_size: Optional[int] = None,
+                 janelas: Sequence[int] = JANELAS_PADRAO):
+        self.symbol = symbol
+        self.janelas = tuple(sorted(set(janelas)))
+        if not self.janelas or self.janelas[0] < 1:
+            raise ValueError(f"Janelas inválidas: {janelas}")
+        self._definir_pip_size(pip_size_do_ativo(symbol) if pip_size is None else pip_size)
+        self._capacidade = self.janelas[-1]
+        self._digitos = bytearray(self._capacidade)
+        self._contagens = {j: [0] * 10 for j in self.janelas}
+        self._pares = {j: 0 for j in self.janelas}
+        self.total = 0
+        self.ultimo_digito: Optional[int] = None
+        self.ultimo_preco: Optional[float] = None
+        self.ultima_atualizacao = 0.0
+        self.sequencia_digito = 0
+        self.sequencia_paridade = 0
+        self.stream_ativo = False
+        # R_*: um tick a cada 2 s, 1HZ*: um por segundo
+        self.intervalo_tick = 1.0 if symbol.startswith('1HZ') else 2.0
+        self._esperando: List[asyncio.Future] = []
+
+    def _definir_pip_size(self, pip_size: int):
+        self.pip_size = int(pip_size)
+        self._escala = 10 ** self.pip_size
+
+    def adicionar_preco(self, preco: float, pip_size: Optional[int] = None) -> int:
+        """Registra uma cotação e retorna seu último dígito"""
+        if pip_size is not None and pip_size != self.pip_size:
+            self._definir_pip_size(pip_size)
+        self.ultimo_preco = preco
+        digito = int(round(preco * self._escala)) % 10
+        self.adicionar_digito(digito)
+        return digito
+
+    def adicionar_digito(self, digito: int):
+        """Atualiza histogramas, paridade e sequências: O(número de janelas)"""
+        indice = self.total
+        par = digito % 2 == 0
+        for janela in self.janelas:
+            contagem = self._contagens[janela]
+            contagem[digito] += 1
+            self._pares[janela] += par
+            if indice >= janela:
+                saindo = self._digitos[(indice - janela) % self._capacidade]
+                contagem[saindo] -= 1
+                self._pares[janela] -= saindo % 2 == 0
+        self._digitos[indice % self._capacidade] = digito
+
+        anterior = self.ultimo_digito
+        if anterior is None:
+            self.sequencia_digito = self.sequencia_paridade = 1
+        else:
+            self.sequencia_digito = self.sequencia_digito + 1 if digito == anterior else 1
+            self.sequencia_paridade = self.sequencia_paridade + 1 if (digito - anterior) % 2 == 0 else 1
+        self.ultimo_digito = digito
+        self.total = indice + 1
+        self.ultima_atualizacao = time.time()
+
+        if self._esperando:
+            esperando, self._esperando = self._esperando, []
+            for futuro in esperando:
+                if not futuro.done():
+                    futuro.set_result(digito)
+
+    def defasado(self, intervalos: float = TICKS_SEM_ATUALIZACAO) -> bool:
+        """Sem tick há mais de `intervalos` intervalos do ativo: ultimo_digito não é confiável"""
+        return time.time() - self.ultima_atualizacao > intervalos * self.intervalo_tick
+
+    async def proximo_digito(self, timeout: Optional[float] = None) -> Optional[int]:
+        """Aguarda o próximo tick do stream (None em timeout)"""
+        futuro = asyncio.get_running_loop().create_future()
+        self._esperando.append(futuro)
+        try:
+            return await asyncio.wait_for(futuro, timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def _janela(self, janela: Optional[int]) -> int:
+        janela = janela or self.janelas[0]
+        if janela not in self._contagens:
+            raise ValueError(f"Janela {janela} não configurada para {self.symbol}: {self.janelas}")
+        return janela
+
+    def amostras(self, janela: Optional[int] = None) -> int:
+        """Quantidade de dígitos efetivamente dentro da janela"""
+        return min(self.total, self._janela(janela))
+
+    def frequencias(self, janela: Optional[int] = None) -> List[int]:
+        """Histograma (contagem por dígito 0-9) da janela"""
+        return list(self._contagens[self._janela(janela)])
+
+    def proporcao_over(self, barreira: int, janela: Optional[int] = None) -> float:
+        """Fração dos dígitos da janela acima da barreira (DIGITOVER)"""
+        janela = self._janela(janela)
+        n = self.amostras(janela)
+        return sum(self._contagens[janela][barreira + 1:]) / n if n else 0.0
+
+    def proporcao_under(self, barreira: int, janela: Optional[int] = None) -> float:
+        """Fração dos dígitos da janela abaixo da barreira (DIGITUNDER)"""
+        janela = self._janela(janela)
+        n = self.amostras(janela)
+        return sum(self._contagens[janela][:max(barreira, 0)]) / n if n else 0.0
+
+    def proporcao_par(self, janela: Optional[int] = None) -> float:
+        janela = self._janela(janela)
+        n = self.amostras(janela)
+        return self._pares[janela] / n if n else 0.0
+
+    def proporcao_impar(self, janela: Optional[int] = None) -> float:
+        n = self.amostras(janela)
+        return 1.0 - self.proporcao_par(janela) if n else 0.0
+
+    def obter_estatisticas(self) -> Dict[str, Any]:
+        """Resumo para logs e endpoints de status"""
+        return {
+            'symbol': self.symbol,
+            'pip_size': self.pip_size,
+            'total_ticks': self.total,
+            'ultimo_digito': self.ultimo_digito,
+            'sequencia_digito': self.sequencia_digito,
+            'sequencia_paridade': self.sequencia_paridade,
+            'stream_ativo': self.stream_ativo,
+            'janelas': {
+                janela: {
+                    'amostras': self.amostras(janela),
+                    'frequencias': self.frequencias(janela),
+                    'par': round(self.proporcao_par(janela), 4),
+                }
+                for janela in self.janelas
+            },
+        }
+
+class CentralDigitos:
+    """Registro de motores por ativo, compartilhado por todos os bots do processo"""
+
+    def __init__(self, janelas: Sequence[int] = JANELAS_PADRAO):
+        self.janelas = tuple(janelas)
+        self._motores: Dict[str, MotorDigitos] = {}
+        self._assinaturas: Dict[str, Any] = {}
+        self._lock = asyncio.Lock()
+
+    def motor(self, symbol: str) -> MotorDigitos:
+        motor = self._motores.get(symbol)
+        if motor is None:
+            motor = self._motores[symbol] = MotorDigitos(symbol, janelas=self.janelas)
+        return motor
+
+    def alimentar_tick(self, mensagem: Dict[str, Any]) -> Optional[int]:
+        """Consome uma mensagem 'tick' da Deriv ({'tick': {'symbol', 'quote', 'pip_size'}})"""
+        tick = mensagem.get('tick') if isinstance(mensagem, dict) else None
+        if not tick or 'quote' not in tick:
+            return None
+        return self.motor(tick['symbol']).adicionar_preco(float(tick['quote']), tick.get('pip_size'))
+
+    async def iniciar_stream(self, api, symbol: str) -> bool:
+        """
+        Assina o stream de ticks do ativo uma única vez por processo.
+
+        Aceita a DerivAPI ou um wrapper com o atributo .api (ApiManager).
+        Retorna False se a assinatura não for possível; o bot então continua
+        consultando o último tick pela API.
+        """
+        motor = self.motor(symbol)
+        if motor.stream_ativo:
+            return True
+        async with self._lock:
+            if motor.stream_ativo:
+                return True
+            deriv_api = getattr(api, 'api', api)
+            if not hasattr(deriv_api, 'subscribe'):
+                return False
+            try:
+                fonte = await deriv_api.subscribe({'ticks': symbol})
+                self._assinaturas[symbol] = fonte.subscribe(
+                    self.alimentar_tick,
+                    lambda erro: self._stream_encerrado(symbol, erro),
+                    lambda: self._stream_encerrado(symbol, None),
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ Stream de dígitos indisponível para {symbol}: {e}")
+                return False
+            motor.stream_ativo = True
+            logger.info(f"📡 Stream de dígitos ativo para {symbol} (pip_size {motor.pip_size})")
+            return True
+
+    def _stream_encerrado(self, symbol: str, erro: Optional[Exception]):
+        self.motor(symbol).stream_ativo = False
+        self._assinaturas.pop(symbol, None)
+        logger.warning(f"⚠️ Stream de dígitos encerrado para {symbol}: {erro or 'fim do stream'}")
+
+    def obter_estatisticas(self) -> Dict[str, Any]:
+        return {symbol: motor.obter_estatisticas() for symbol, motor in self._motores.items()}
+
+# Instância compartilhada pelos bots do processo
+central_digitos = CentralDigitos()
@@ -8,6 +8,7 @@ import logging
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional
 from trading_system.config.settings import get_supabase_client
+from trading_system.utils.digit_stats import central_digitos, extrair_digito, pip_size_do_ativo
 
 # Configurar logging
 logging.basicConfig(
@@ -352,17 +353,50 @@ async def obter_ultimo_tick(api_manager, symbol: str, nome_bot: str) -> Optional
         print(f"❌ {nome_bot}: Erro ao obter último tick: {e}")
         return None
 
-def extrair_ultimo_digito(preco: float) -> int:
+def extrair_ultimo_digito(preco: float, symbol: Optional[str] = None) -> int:
     """
     Extrai o último dígito de um preço
     
     Args:
         preco (float): Preço do ativo
+        symbol (str): Ativo, para usar seu pip_size (padrão: 2 casas)
         
     Returns:
         int: Último dígito do preço
     """
-    return int(str(preco).replace('.', '')[-1])
+    return extrair_digito(preco, pip_size_do_ativo(symbol))
+
+async def obter_ultimo_digito(api_manager, symbol: str, nome_bot: str) -> Optional[int]:
+    """
+    Obtém o último dígito do ativo pelo motor de dígitos compartilhado
+    
+    Na primeira chamada assina o stream de ticks do ativo; a partir daí o
+    dígito vem do motor, sem consultar a API. Stream parado (assinatura ativa
+    mas sem ticks há alguns intervalos, como num socket meio aberto) espera o
+    próximo tick e, sem ele, consulta o último tick pela API, como sem stream.
+    
+    Args:
+        api_manager: Instância da API da Deriv (ou ApiManager)
+        symbol (str): Símbolo do ativo
+        nome_bot (str): Nome do bot para logging
+        
+    Returns:
+        Optional[int]: Último dígito ou None se erro
+    """
+    motor = central_digitos.motor(symbol)
+    if motor.stream_ativo or await central_digitos.iniciar_stream(api_manager, symbol):
+        if motor.ultimo_digito is None:
+            await motor.proximo_digito(timeout=5.0)
+        elif motor.defasado():
+            await motor.proximo_digito(timeout=2 * motor.intervalo_tick)
+        if motor.ultimo_digito is not None and not motor.defasado():
+            return motor.ultimo_digito
+        logger.warning(f"⚠️ {nome_bot}: stream de dígitos de {symbol} sem ticks - consultando o último tick")
+    
+    ultimo_tick = await obter_ultimo_tick(api_manager, symbol, nome_bot)
+    if ultimo_tick is None:
+        return None
+    return extrair_digito(ultimo_tick, motor.pip_size)
 
 def log_resultado_operacao(nome_bot: str, lucro: float, total_profit: float, stake_usado: float, vitoria: bool):
     """
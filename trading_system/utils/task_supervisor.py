@@ -0,0 +1,164 @@
+"""
+Supervisor de tarefas por bot para o sistema de múltiplos bots
+
+Cada bot roda na sua própria tarefa, vigiada por um executor que aplica a
+política de reinício do bot: uma exceção (ou um retorno inesperado) reinicia
+só aquele bot, com backoff exponencial, sem derrubar os demais.
+
+Reinícios programados são rolling: um bot por vez é cancelado e reiniciado,
+com uma pausa entre eles, em vez de reiniciar o processo inteiro.
+
+Uso:
+    supervisor = SupervisorBots()
+    supervisor.adicionar('bot_alfa', lambda: bot_alfa(api_manager), atraso_inicial=2)
+    tarefas = supervisor.iniciar()
+    tarefas.append(asyncio.create_task(supervisor.reinicio_rolling(3600, pausa=5)))
+"""
+
+import asyncio
+import time
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class PoliticaReinicio:
+    """Quando e com que atraso reiniciar a tarefa de um bot"""
+
+    SEMPRE = 'sempre'      # reinicia após falha ou retorno
+    EM_FALHA = 'em_falha'  # reinicia só após exceção
+    NUNCA = 'nunca'
+
+    def __init__(self, modo: str = SEMPRE, backoff_base: float = 2.0,
+                 backoff_max: float = 60.0, estavel_apos: float = 300.0):
+        if modo not in (self.SEMPRE, self.EM_FALHA, self.NUNCA):
+            raise ValueError(f"Política de reinício inválida: {modo}")
+        self.modo = modo
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.estavel_apos = estavel_apos  # execução mais longa que isso zera as falhas seguidas
+
+    def deve_reiniciar(self, falhou: bool) -> bool:
+        return self.modo == self.SEMPRE or (self.modo == self.EM_FALHA and falhou)
+
+    def atraso(self, falhas_seguidas: int) -> float:
+        """base, 2*base, 4*base... limitado a backoff_max"""
+        return min(self.backoff_base * 2 ** max(falhas_seguidas - 1, 0), self.backoff_max)
+
+class _TarefaBot:
+    """Estado de supervisão de um bot"""
+
+    def __init__(self, nome: str, fabrica: Callable[[], Awaitable[Any]],
+                 politica: PoliticaReinicio, atraso_inicial: float):
+        self.nome = nome
+        self.fabrica = fabrica
+        self.politica = politica
+        self.atraso_inicial = atraso_inicial
+        self.executor: Optional[asyncio.Task] = None  # laço de supervisão
+        self.execucao: Optional[asyncio.Task] = None  # execução corrente do bot
+        self.reinicio_pedido = False
+        self.execucoes = 0
+        self.falhas = 0
+        self.falhas_seguidas = 0
+        self.reinicios_programados = 0
+        self.ultimo_erro: Optional[str] = None
+
+    @property
+    def rodando(self) -> bool:
+        return self.execucao is not None and not self.execucao.done()
+
+class SupervisorBots:
+    """Executa cada bot numa tarefa própria com política de reinício individual"""
+
+    def __init__(self, politica: Optional[PoliticaReinicio] = None):
+        self.politica = politica or PoliticaReinicio()
+        self.bots: Dict[str, _TarefaBot] = {}
+        self._parando = False
+
+    def adicionar(self, nome: str, fabrica: Callable[[], Awaitable[Any]],
+                  politica: Optional[PoliticaReinicio] = None, atraso_inicial: float = 0.0):
+        """fabrica() cria uma nova corrotina do bot a cada (re)início"""
+        self.bots[nome] = _TarefaBot(nome, fabrica, politica or self.politica, atraso_inicial)
+
+    def iniciar(self) -> List[asyncio.Task]:
+        for bot in self.bots.values():
+            bot.executor = asyncio.create_task(self._supervisionar(bot), name=f"supervisor_{bot.nome}")
+        return [bot.executor for bot in self.bots.values()]
+
+    async def _supervisionar(self, bot: _TarefaBot):
+        atraso = bot.atraso_inicial
+        while not self._parando:
+            if atraso > 0:
+                logger.info(f"⏰ {bot.nome} inicia em {atraso:.1f}s")
+                await asyncio.sleep(atraso)
+            inicio = time.monotonic()
+            bot.execucoes += 1
+            bot.execucao = asyncio.create_task(bot.fabrica(), name=bot.nome)
+            falhou = False
+            try:
+                await bot.execucao
+                logger.warning(f"⚠️ {bot.nome} terminou sem erro")
+            except asyncio.CancelledError:
+                # Reinício pedido cancela só a execução; cancelar o supervisor encerra o bot
+                if not (bot.reinicio_pedido and bot.execucao.cancelled()) or self._parando:
+                    raise
+                bot.reinicio_pedido = False
+                atraso = 0.0
+                continue
+            except Exception as e:
+                falhou = True
+                bot.falhas += 1
+                bot.ultimo_erro = f"{type(e).__name__}: {e}"
+                logger.error(f"❌ {bot.nome} falhou: {bot.ultimo_erro}")
+
+            if time.monotonic() - inicio >= bot.politica.estavel_apos:
+                bot.falhas_seguidas = 0
+            bot.falhas_seguidas += 1
+            if not bot.politica.deve_reiniciar(falhou):
+                logger.info(f"🛑 {bot.nome} não será reiniciado (política {bot.politica.modo})")
+                return
+            atraso = bot.politica.atraso(bot.falhas_seguidas)
+            logger.info(f"🔄 Reiniciando {bot.nome} em {atraso:.1f}s (falhas seguidas: {bot.falhas_seguidas})")
+
+    async def reiniciar(self, nome: str):
+        """Cancela a execução corrente do bot; o supervisor o reinicia imediatamente"""
+        bot = self.bots[nome]
+        if not bot.rodando:
+            return
+        execucao = bot.execucao
+        bot.reinicio_pedido = True
+        bot.reinicios_programados += 1
+        execucao.cancel()
+        await asyncio.wait({execucao})
+
+    async def reinicio_rolling(self, intervalo: float, pausa: float = 5.0):
+        """A cada intervalo, reinicia os bots um de cada vez"""
+        while not self._parando:
+            await asyncio.sleep(intervalo)
+            logger.info(f"🔄 Reinício rolling de {len(self.bots)} bots")
+            for nome in list(self.bots):
+                if self._parando:
+                    return
+                if self.bots[nome].rodando:
+                    await self.reiniciar(nome)
+                    await asyncio.sleep(pausa)
+
+    async def parar(self):
+        self._parando = True
+        executores = [bot.executor for bot in self.bots.values() if bot.executor]
+        for executor in executores:
+            executor.cancel()
+        await asyncio.gather(*executores, return_exceptions=True)
+
+    def obter_estatisticas(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            nome: {
+                'rodando': bot.rodando,
+                'execucoes': bot.execucoes,
+                'falhas': bot.falhas,
+                'falhas_seguidas': bot.falhas_seguidas,
+                'reinicios_programados': bot.reinicios_programados,
+                'ultimo_erro': bot.ultimo_erro,
+            }
+            for nome, bot in self.bots.items()
+        }
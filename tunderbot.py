@@ -14,21 +14,37 @@ import json
 import threading
 import websockets
 import uuid
+import hashlib
 import signal
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, TYPE_CHECKING
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from cold_start import ModuloTardio
 from robust_order_system import RobustOrderSystem, OperationType
 from enhanced_sync_system import EnhancedSyncSystem
-from aiohttp import web
 from error_handler import RobustErrorHandler, with_error_handling, ErrorType, ErrorSeverity
 
 # NOVOS IMPORTS - Sistema de Sincronia Aprimorado
-from enhanced_tick_buffer import EnhancedTickBuffer
+from enhanced_tick_buffer import EnhancedTickBuffer, TickRingBuffer
 from websocket_recovery import WebSocketRecoveryManager
 from signal_queue_system import ThreadSafeSignalQueue
 from system_health_monitor import SystemHealthMonitor
+from tick_direction_pattern import TickDirectionDetector, XML_ACCU_PATTERN
+from tick_store import get_shared_store
+from contract_engine import ativar_modo_papel, modo_papel_solicitado
+from contract_handoff import SnapshotHandoff
+from async_runtime import instalar_runtime, iniciar_monitor_loop, estatisticas_loop
+from io_offload import executar_io, enviar_io, gravar_json, instalar_guarda, descarregador
+
+# Fora do caminho até o primeiro tick: importados só no primeiro uso
+web = ModuloTardio('aiohttp.web')  # servidor /status
+if TYPE_CHECKING:
+    from supabase import Client
+
+def create_client(url: str, key: str) -> 'Client':
+    """Cliente Supabase (o pacote só é importado na primeira gravação)"""
+    from supabase import create_client as criar_cliente
+    return criar_cliente(url, key)
 
 # Carregar variáveis de ambiente
 load_dotenv()
@@ -55,10 +71,12 @@ STAKE_INICIAL = 5.0  # initial stake - alterado para 5
 STAKE_MAXIMO_DERIV = 1000.0  # Limite máximo de stake permitido pela Deriv API
 TAKE_PROFIT_PERCENTUAL = 0.25  # 25% (Return%) - Alterado conforme solicitado
 ATIVO = 'R_75'
+ATIVOS = [ATIVO]  # Ativos operados na mesma conexão; sobrescrito por 'ativos' da conta (ex.: R_10..R_100)
 GROWTH_RATE = 0.02  # 2% - Valor alterado para Tunder Bot
 WIN_STOP = 1000.0  # Meta de ganho diário
 LOSS_LIMIT = 1000.0  # Limite de perda diária
 KHIZZBOT = 50  # Valor khizzbot conforme XML original
+PADRAO_ENTRADA = XML_ACCU_PATTERN  # Padrão de direção (R/B/U/.); sobrescrito por 'padrao_entrada' da conta
 
 # ============================================================================
 # CONFIGURAÇÕES DE REINICIALIZAÇÃO AUTOMÁTICA
@@ -107,6 +125,7 @@ class DerivWebSocketNativo:
         self.req_id_counter = 0
         self.req_id_lock = threading.Lock()
         self.pending_requests = {}
+        self._contratos_aguardados: Dict[str, asyncio.Future] = {}  # contract_id -> liquidação (subscription)
         self.request_timeout = 30  # Aumentado para resolver timeouts de autenticação
         self.portfolio_timeout = 45  # Timeout específico para portfolio (operação mais lenta)
         
@@ -154,6 +173,10 @@ class DerivWebSocketNativo:
         # Error handler
         self.error_handler = RobustErrorHandler(f"DerivWebSocket_{self.account_name}")
         
+        # Arquivo de ticks (tick_store): grava (epoch, quote) de cada tick recebido quando TICK_STORE_DIR está definido
+        tick_store_dir = os.getenv('TICK_STORE_DIR')
+        self.tick_store = get_shared_store(tick_store_dir) if tick_store_dir else None
+        
         logger.info(f"🔧 DerivWebSocketNativo inicializado - Conta: {self.account_name}, App ID: {self.app_id}")
     
     async def _check_network_connectivity(self):
@@ -476,6 +499,10 @@ class DerivWebSocketNativo:
                     if 'tick' in data:
                         await self._process_tick(data['tick'])
                     
+                    # Atualizações de contratos assinados (reanexados após handoff)
+                    if data.get('msg_type') == 'proposal_open_contract' and self._contratos_aguardados:
+                        self._atualizar_contrato_aguardado(data.get('proposal_open_contract') or {})
+                    
                     # Resolver pending requests
                     if req_id and req_id in self.pending_requests:
                         future = self.pending_requests.pop(req_id)
@@ -725,8 +752,8 @@ class DerivWebSocketNativo:
             logger.error(f"❌ Erro na compra via WebSocket: {e}")
             raise e
     
-    async def ticks_history(self, symbol: str, count: int = 5):
-        """Obtém histórico de ticks usando WebSocket nativo"""
+    async def ticks_history(self, symbol: str, count: int = 5, start: Optional[int] = None, end="latest"):
+        """Obtém histórico de ticks usando WebSocket nativo (start/end em epoch para janelas do tick_downloader)"""
         await self.ensure_connection()
         
         try:
@@ -734,8 +761,10 @@ class DerivWebSocketNativo:
             ticks_message = {
                 "ticks_history": symbol,
                 "count": count,
-                "end": "latest"
+                "end": end
             }
+            if start is not None:
+                ticks_message["start"] = start
             
             logger.debug(f"📊 Solicitando histórico de ticks: {ticks_message}")
             
@@ -786,6 +815,35 @@ class DerivWebSocketNativo:
             logger.error(f"❌ Erro ao obter contrato via WebSocket: {e}")
             raise e
     
+    def _atualizar_contrato_aguardado(self, contrato: Dict[str, Any]):
+        future = self._contratos_aguardados.get(str(contrato.get('contract_id')))
+        if future is not None and not future.done() and \
+                (contrato.get('is_sold') or contrato.get('status') in ('won', 'lost')):
+            future.set_result(contrato)
+    
+    async def aguardar_contrato(self, contract_id) -> Dict[str, Any]:
+        """Assina o contrato (proposal_open_contract com subscribe) e aguarda a liquidação"""
+        await self.ensure_connection()
+        
+        chave = str(contract_id)
+        future = asyncio.get_running_loop().create_future()
+        self._contratos_aguardados[chave] = future
+        try:
+            response = await self._send_request({
+                "proposal_open_contract": 1,
+                "contract_id": contract_id,
+                "subscribe": 1
+            })
+            if response is None or not isinstance(response, dict):
+                raise Exception("Timeout na subscription do contrato - resposta None ou inválida")
+            if 'error' in response:
+                raise Exception(f"Deriv API Error: {response['error']['message']}")
+            # A primeira resposta já pode trazer o contrato liquidado
+            self._atualizar_contrato_aguardado(response.get('proposal_open_contract') or {})
+            return await future
+        finally:
+            self._contratos_aguardados.pop(chave, None)
+    
     async def proposal(self, params):
         """Executa proposta usando WebSocket nativo"""
         await self.ensure_connection()
@@ -832,6 +890,9 @@ class DerivWebSocketNativo:
         try:
             if hasattr(self, 'bot_instance') and self.bot_instance:
                 await self.bot_instance._handle_new_tick(tick_data)
+            # Gravação do histórico depois da análise (fora do caminho do sinal)
+            if self.tick_store is not None:
+                self.tick_store.record_tick(tick_data)
         except Exception as e:
             await self.error_handler.handle_error(e, "tick_processing")
             logger.error(f"❌ Erro ao processar tick: {e}")
@@ -922,11 +983,15 @@ class DerivWebSocketNativo:
         self._message_handler_task = None
         self._keepalive_task = None
         
-        # Limpar requests pendentes
+        # Limpar requests pendentes: falham com erro de conexão (cancelar a future
+        # cancelaria quem aguarda, como o monitor de um contrato ainda aberto)
         for req_id, future in self.pending_requests.items():
             if not future.done():
-                future.cancel()
+                future.set_exception(ConnectionError("Conexão encerrada antes da resposta"))
         self.pending_requests.clear()
+        for future in self._contratos_aguardados.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Conexão encerrada antes da liquidação"))
         
         if self.ws:
             try:
@@ -937,6 +1002,39 @@ class DerivWebSocketNativo:
         
         self.ws = None
         self.session_id = None
+        
+        if self.tick_store is not None:
+            self.tick_store.flush()
+
+# ============================================================================
+# ESTADO POR ATIVO (MODO MULTI-ATIVO)
+# ============================================================================
+class EstadoAtivo:
+    """Anel de ticks, detector de padrão e gestão de risco de um ativo"""
+
+    def __init__(self, symbol: str, padrao_entrada):
+        self.symbol = symbol
+        self.tick_buffer = TickRingBuffer(max_size=5, max_age_seconds=None)  # Últimos 5 ticks
+        self.detector_padrao = TickDirectionDetector(padrao_entrada)
+        self.stake = STAKE_INICIAL
+        self.total_lost = 0.0
+        self.dt = STAKE_INICIAL * TAKE_PROFIT_PERCENTUAL
+        self.total_profit = 0.0
+        self.operacoes = 0
+        self.em_operacao = False  # Um contrato por ativo, como no modo de ativo único
+
+    def limpar(self):
+        self.tick_buffer.clear()
+        self.detector_padrao.reset()
+
+    def resumo(self) -> Dict[str, Any]:
+        return {
+            'stake': self.stake,
+            'total_profit': round(self.total_profit, 2),
+            'operacoes': self.operacoes,
+            'em_operacao': self.em_operacao,
+            'tick_buffer_size': len(self.tick_buffer),
+        }
 
 # ============================================================================
 # CLASSE PRINCIPAL DO BOT ACCUMULATOR
@@ -953,7 +1051,10 @@ class AccumulatorScalpingBot:
         self.account_name = account_config.get('name', 'Bot_Principal') if account_config else 'Bot_Principal'
         
         self.api_manager = DerivWebSocketNativo(account_config)
-        self.ativo = ATIVO
+        
+        # Ativos: todos assinados na mesma conexão, cada um com seu estado
+        self.ativos = list((account_config or {}).get('ativos') or ATIVOS)
+        self.ativo = self.ativos[0]
         
         # VARIÁVEIS CONFORME XML ORIGINAL
         self.stake = STAKE_INICIAL  # Stake (variável)
@@ -971,15 +1072,19 @@ class AccumulatorScalpingBot:
         self.ticks_history = []
         self.ciclo = 0
         
-        # NOVO: Sistema de tick stream em tempo real
-        self.tick_buffer = []  # Buffer para manter últimos 5 ticks
+        # NOVO: Sistema de tick stream em tempo real (um anel e um detector por ativo)
+        padrao_entrada = account_config.get('padrao_entrada', PADRAO_ENTRADA) if account_config else PADRAO_ENTRADA
+        self.estados = {symbol: EstadoAtivo(symbol, padrao_entrada) for symbol in self.ativos}
+        self.tick_buffer = self.estados[self.ativo].tick_buffer
+        self.detector_padrao = self.estados[self.ativo].detector_padrao
         self.tick_subscription_active = False  # Flag para controlar subscription
         
         # NOVO: Sistema robusto de execução de ordens
         self.robust_order_system = RobustOrderSystem(self.api_manager)
         
         # SISTEMA ORIGINAL (mantido para compatibilidade)
-        self.sync_system = EnhancedSyncSystem(max_concurrent_operations=2, max_queue_size=3)
+        # operation_semaphore é o limitador compartilhado de compras em voo entre os ativos
+        self.sync_system = EnhancedSyncSystem(max_concurrent_operations=2, max_queue_size=3 * len(self.ativos))
         
         # NOVOS SISTEMAS APRIMORADOS
         self.enhanced_tick_buffer = EnhancedTickBuffer(max_size=10, tolerance_seconds=1.0)
@@ -1026,7 +1131,7 @@ class AccumulatorScalpingBot:
         
         logger.info(f"🤖 {NOME_BOT} inicializado")
         logger.info(f"📊 Configuração do Bot:")
-        logger.info(f"   • Ativo: {ATIVO}")
+        logger.info(f"   • Ativos: {', '.join(self.ativos)}")
         logger.info(f"   • Reinicialização Automática: {'Ativada' if AUTO_RESTART_ENABLED else 'Desativada'}")
         if AUTO_RESTART_ENABLED:
             logger.info(f"   • Intervalo de Reinicialização: {AUTO_RESTART_INTERVAL_MINUTES} minutos")
@@ -1039,6 +1144,18 @@ class AccumulatorScalpingBot:
         logger.info(f"   • Win Stop: ${self.win_stop}")
         logger.info(f"   • Loss Limit: ${self.loss_limit}")
         logger.info(f"   • Sistema de Sinais: Integrado com radar_de_apalancamiento_signals")
+        # Paper trading: ordens liquidadas localmente sobre o stream real
+        self.executor_papel = None
+        if modo_papel_solicitado(account_config):
+            ativar_modo_papel(self)
+        
+        # Handoff de contratos abertos entre reinícios (desligado em paper trading)
+        self.contratos_abertos: Dict[str, str] = {}  # contract_id -> ativo
+        self._monitores_contrato: Dict[str, asyncio.Task] = {}
+        self._aposentado = False  # outra instância assumiu o snapshot
+        usar_handoff = (account_config or {}).get('handoff', True) and self.executor_papel is None
+        self.handoff = SnapshotHandoff(self._chave_handoff()) if usar_handoff else None
+        self._snapshot_pendente = None  # gravação do snapshot ainda na fila de I/O
     
     async def create_tracked_task(self, coro, name: str = None):
         """Método centralizado para criação de tasks com tracking automático"""
@@ -1078,7 +1195,7 @@ class AccumulatorScalpingBot:
             # Primeiro, parar subscription de ticks para evitar novas tasks
             if self.tick_subscription_active:
                 try:
-                    await self.api_manager.unsubscribe_ticks(ATIVO)
+                    await self._cancelar_ativos()
                     self.tick_subscription_active = False
                     logger.info("📡 Subscription de ticks cancelada")
                 except Exception as e:
@@ -1285,15 +1402,15 @@ class AccumulatorScalpingBot:
             # Cancelar qualquer subscription ativa
             if self.tick_subscription_active:
                 try:
-                    await self.api_manager.unsubscribe_ticks(ATIVO)
+                    await self._cancelar_ativos()
                     logger.info("📡 Subscription de ticks cancelada")
                 except Exception as e:
                     logger.error(f"❌ Erro ao cancelar subscription: {e}")
             
             # Limpar buffers e filas
-            self.tick_buffer.clear()
+            self._limpar_estados_ativos()
             self.enhanced_tick_buffer.clear()
-            self.signal_queue.clear()
+            self.signal_queue.clear_queue()
             logger.info("🧹 Buffers e filas limpos")
             
             # Resetar circuit breaker
@@ -1354,7 +1471,8 @@ class AccumulatorScalpingBot:
     async def _on_deadlock_detected(self):
         """Callback chamado quando deadlock é detectado"""
         logger.error("🔄 Deadlock detectado - limpando queue de sinais")
-        await self.signal_queue.clear_queue()
+        self.signal_queue.clear_queue()
+        await self.sync_system.clear_signal_queue()
     
     async def _on_connection_issues(self):
         """Callback chamado para problemas de conexão"""
@@ -1369,7 +1487,19 @@ class AccumulatorScalpingBot:
     async def _on_inactivity_detected(self):
         """Callback chamado para inatividade detectada"""
         logger.error("🔄 Inatividade detectada - reiniciando subscription")
-        await self.api_manager.subscribe_ticks(ATIVO)
+        await self._inscrever_ativos()
+    
+    async def _inscrever_ativos(self):
+        """Assina os ticks de todos os ativos na mesma conexão"""
+        await asyncio.gather(*(self.api_manager.subscribe_ticks(symbol) for symbol in self.ativos))
+    
+    async def _cancelar_ativos(self):
+        for symbol in self.ativos:
+            await self.api_manager.unsubscribe_ticks(symbol)
+    
+    def _limpar_estados_ativos(self):
+        for estado in self.estados.values():
+            estado.limpar()
     
     @with_error_handling(ErrorType.DATA_PROCESSING, ErrorSeverity.MEDIUM)
     async def _handle_new_tick(self, tick_data):
@@ -1385,28 +1515,33 @@ class AccumulatorScalpingBot:
                 logger.warning(f"⚠️ Tick inválido recebido: {tick_data}")
                 return
             
-            # Log detalhado com timestamp preciso
-            logger.debug(f"📥 TICK_RECEIVED: {tick_value:.5f} at {tick_timestamp:.6f}")
+            # Rotear para o estado do ativo (ticks sem symbol vão para o ativo único)
+            estado = self.estados.get(tick_data.get('symbol'))
+            if estado is None:
+                if len(self.estados) > 1:
+                    logger.warning(f"⚠️ Tick de ativo não configurado: {tick_data.get('symbol')}")
+                    return
+                estado = self.estados[self.ativo]
             
-            # Adicionar ao buffer
-            self.tick_buffer.append(tick_value)
+            # Log detalhado com timestamp preciso
+            logger.debug(f"📥 TICK_RECEIVED: {estado.symbol} {tick_value:.5f} at {tick_timestamp:.6f}")
             
-            # Manter apenas os últimos 5 ticks
-            if len(self.tick_buffer) > 5:
-                self.tick_buffer.pop(0)  # Remove o mais antigo
+            # Adicionar ao anel (mantém apenas os últimos 5 ticks)
+            estado.tick_buffer.add_tick(tick_value, tick_timestamp)
+            padrao = estado.detector_padrao.add_tick(tick_value)
             
             # Executar análise quando tiver 5 ticks
-            if len(self.tick_buffer) == 5:
-                pattern_detected = self.analisar_padrao_entrada(self.tick_buffer.copy())
+            if estado.tick_buffer.is_full():
+                pattern_detected = padrao is not None
                 
                 if pattern_detected:
-                    logger.info(f"🎯 PATTERN_DETECTED at {tick_timestamp:.6f}")
+                    logger.info(f"🎯 PATTERN_DETECTED {estado.symbol} ({padrao.name}: {estado.detector_padrao.describe()}) at {tick_timestamp:.6f}")
                 
                 # Salvar sinal no histórico de debugging
-                self._save_signal_to_history(self.tick_buffer.copy(), pattern_detected)
+                self._save_signal_to_history(estado.tick_buffer.to_list(), pattern_detected)
                 
-                # Enviar sinal para queue (sempre, mesmo sem padrão para estatísticas)
-                success = self.sync_system.queue_signal(self.tick_buffer.copy(), pattern_detected)
+                # Padrão vai para a fila de operação; sem padrão só conta nas estatísticas
+                success = self.sync_system.queue_signal(estado.tick_buffer.to_list(), pattern_detected, estado.symbol)
                 
                 if success:
                     logger.debug(f"📤 SIGNAL_QUEUED: pattern={pattern_detected} at {tick_timestamp:.6f}")
@@ -1417,52 +1552,29 @@ class AccumulatorScalpingBot:
             logger.error(f"❌ Erro ao processar tick: {e}")
     
     async def _process_signals_from_queue(self):
-        """Processa sinais da queue de forma assíncrona"""
+        """Processa sinais da queue de forma assíncrona (acorda no enfileiramento de um padrão)"""
         while not self._shutdown_event.is_set():
             try:
-                # Verificar shutdown_event a cada iteração
-                if self._shutdown_event.is_set():
+                # Só sinais com padrão chegam aqui; None = shutdown solicitado
+                signal = await self.sync_system.aguardar_sinal(self._shutdown_event)
+                if signal is None:
                     logger.info("🛑 Parando processamento de sinais - shutdown solicitado")
                     break
                 
-                # Obter próximo sinal da queue (não bloqueante)
-                signal = self.sync_system.get_next_signal()
-                
-                if signal and signal.pattern_detected:
+                if signal.pattern_detected:
                     operation_timestamp = time.time()
-                    logger.info(f"🚀 OPERATION_QUEUED at {operation_timestamp:.6f}")
+                    estado = self.estados.get(signal.symbol) or self.estados[self.ativo]
+                    logger.info(f"🚀 OPERATION_QUEUED {estado.symbol} at {operation_timestamp:.6f}")
                     
-                    # Verificar se pode executar operação
-                    if self.sync_system.can_execute_operation():
-                        # Adquirir semáforo para operação
-                        async with self.sync_system.operation_semaphore:
-                            try:
-                                logger.info(f"⚡ OPERATION_EXECUTING at {time.time():.6f}")
-                                
-                                # Executar compra
-                                contract_id = await self.executar_compra_accu()
-                                
-                                if contract_id:
-                                    logger.info(f"✅ OPERATION_SUCCESS at {time.time():.6f}")
-                                    self.sync_system.record_operation_success()
-                                    
-                                    # Monitorar contrato
-                                    lucro = await self.monitorar_contrato(contract_id)
-                                    
-                                    # Aplicar gestão de risco
-                                    self.aplicar_gestao_risco(lucro)
-                                else:
-                                    logger.error(f"❌ OPERATION_FAILED at {time.time():.6f}")
-                                    self.sync_system.record_operation_failure()
-                                    
-                            except Exception as e:
-                                logger.error(f"❌ Erro durante execução da compra: {e}")
-                                self.sync_system.record_operation_failure()
+                    # Um contrato por ativo; ativos diferentes operam em paralelo
+                    if estado.em_operacao:
+                        logger.debug(f"⏭️ {estado.symbol} já em operação - sinal descartado")
+                    elif self._perdeu_handoff():
+                        break
                     else:
-                        logger.warning(f"⚠️ Operação rejeitada - limite de operações simultâneas atingido")
-                
-                # Pequeno delay para evitar loop intensivo - reduzido para resposta mais rápida ao shutdown
-                await asyncio.sleep(0.05)
+                        estado.em_operacao = True
+                        if await self.create_tracked_task(self._executar_operacao(estado), f"operacao_{estado.symbol}") is None:
+                            estado.em_operacao = False
                 
             except Exception as e:
                 logger.error(f"❌ Erro no processamento de sinais: {e}")
@@ -1471,6 +1583,170 @@ class AccumulatorScalpingBot:
         # Validar configuração inicial
         self._validar_configuracao_inicial()
     
+    async def _executar_operacao(self, estado: EstadoAtivo):
+        """Compra (sob o limitador compartilhado de compras em voo), monitora e aplica a gestão do ativo"""
+        contract_id = None
+        try:
+            async with self.sync_system.operation_semaphore:
+                logger.info(f"⚡ OPERATION_EXECUTING {estado.symbol} at {time.time():.6f}")
+                contract_id = await self.executar_compra_accu(estado)
+            
+            if contract_id:
+                logger.info(f"✅ OPERATION_SUCCESS {estado.symbol} at {time.time():.6f}")
+                self.sync_system.record_operation_success()
+                self._registrar_contrato_aberto(estado, contract_id)
+                
+                # Monitorar contrato (fora do limitador: não segura a compra dos outros ativos)
+                lucro = await self.monitorar_contrato(contract_id)
+                
+                # Aplicar gestão de risco
+                self._finalizar_contrato(estado, contract_id, lucro)
+            else:
+                logger.error(f"❌ OPERATION_FAILED {estado.symbol} at {time.time():.6f}")
+                self.sync_system.record_operation_failure()
+                
+        except Exception as e:
+            logger.error(f"❌ Erro durante execução da compra ({estado.symbol}): {e}")
+            self.sync_system.record_operation_failure()
+        finally:
+            self._liberar_ativo(estado, contract_id)
+    
+    # ------------------------------------------------------------------
+    # Handoff de contratos abertos (snapshot + reanexação)
+    # ------------------------------------------------------------------
+    def _estado_handoff(self) -> Dict[str, Any]:
+        return {
+            'conta': self.account_name,
+            'contratos': dict(self.contratos_abertos),
+            'stake': self.stake,
+            'total_lost': self.total_lost,
+            'dt': self.dt,
+            'total_profit': self.total_profit,
+            'ativos': {
+                symbol: {
+                    'stake': estado.stake,
+                    'total_lost': estado.total_lost,
+                    'dt': estado.dt,
+                    'total_profit': estado.total_profit,
+                    'operacoes': estado.operacoes,
+                }
+                for symbol, estado in self.estados.items()
+            },
+        }
+    
+    def _chave_handoff(self) -> str:
+        """Conta do snapshot: nome + id do bot (ou hash do token); o nome sozinho colide no padrão 'Bot_Principal'"""
+        config = self.account_config or {}
+        identificador = config.get('bot_id') or config.get('id')
+        if not identificador:
+            identificador = hashlib.sha256(self.api_manager.api_token.encode()).hexdigest()[:12]
+        return f"{self.account_name}_{identificador}"
+    
+    def _salvar_snapshot(self):
+        """Grava fora do loop (o fsync fica na thread de I/O); só a versão mais recente pendente é gravada"""
+        if self.handoff is None or self._aposentado:
+            return
+        self._snapshot_pendente = enviar_io(f"arquivo:{self.handoff.caminho}", self.handoff.salvar,
+                                            self._estado_handoff(), substituir=True)
+    
+    def _perdeu_handoff(self) -> bool:
+        """Outra instância assumiu o snapshot: esta para de operar e se aposenta"""
+        if self.handoff is None or self._aposentado:
+            return self._aposentado
+        if self._snapshot_pendente is not None and not self._snapshot_pendente.done():
+            return False  # nossa gravação ainda não chegou ao disco: o arquivo em disco é anterior a ela
+        if self.handoff.sou_dono():
+            return False
+        logger.warning("🔀 HANDOFF: outra instância assumiu os contratos - aposentando esta instância")
+        self._aposentado = True
+        self._shutdown_event.set()
+        return True
+    
+    def _registrar_contrato_aberto(self, estado: EstadoAtivo, contract_id):
+        self.contratos_abertos[str(contract_id)] = estado.symbol
+        self._monitores_contrato[str(contract_id)] = asyncio.current_task()
+        self._salvar_snapshot()
+    
+    def _finalizar_contrato(self, estado: EstadoAtivo, contract_id, lucro: float):
+        """Contrato liquidado: aplica a gestão do ativo e atualiza o snapshot"""
+        if self._perdeu_handoff():
+            logger.info(f"🔀 HANDOFF: liquidação do contrato {contract_id} fica com a nova instância")
+            return
+        self.contratos_abertos.pop(str(contract_id), None)
+        self.aplicar_gestao_risco(lucro, estado)
+        self._salvar_snapshot()
+    
+    def _liberar_ativo(self, estado: EstadoAtivo, contract_id):
+        # Contrato ainda aberto (monitor cancelado por um reinício): o ativo segue
+        # ocupado até a reanexação
+        self._monitores_contrato.pop(str(contract_id), None)
+        if contract_id is None or str(contract_id) not in self.contratos_abertos or self._aposentado:
+            estado.em_operacao = False
+    
+    async def _restaurar_handoff(self):
+        """Assume o snapshot da instância anterior: estado de risco e contratos abertos"""
+        if self.handoff is None:
+            return
+        anterior = await executar_io(f"arquivo:{self.handoff.caminho}", self.handoff.carregar)
+        if anterior:
+            self.stake = float(anterior.get('stake', self.stake))
+            self.total_lost = float(anterior.get('total_lost', self.total_lost))
+            self.dt = float(anterior.get('dt', self.dt))
+            self.total_profit = float(anterior.get('total_profit', self.total_profit))
+            for symbol, dados in (anterior.get('ativos') or {}).items():
+                estado = self.estados.get(symbol)
+                if estado is None:
+                    continue
+                estado.stake = float(dados.get('stake', estado.stake))
+                estado.total_lost = float(dados.get('total_lost', estado.total_lost))
+                estado.dt = float(dados.get('dt', estado.dt))
+                estado.total_profit = float(dados.get('total_profit', estado.total_profit))
+                estado.operacoes = int(dados.get('operacoes', estado.operacoes))
+            self.contratos_abertos.update({str(c): s for c, s in (anterior.get('contratos') or {}).items()})
+            logger.info(f"🔀 HANDOFF: estado restaurado da instância {anterior.get('instancia')} "
+                        f"({len(self.contratos_abertos)} contratos abertos, lucro total ${self.total_profit:.2f})")
+        # Gravar em nome desta instância sinaliza à anterior que ela deve se aposentar
+        self._salvar_snapshot()
+        await self._reanexar_contratos()
+    
+    async def _reanexar_contratos(self):
+        """Acompanha os contratos abertos que estão sem monitor"""
+        for contract_id, symbol in list(self.contratos_abertos.items()):
+            monitor = self._monitores_contrato.get(contract_id)
+            if monitor is not None and not monitor.done():
+                continue
+            estado = self.estados.get(symbol) or self.estados[self.ativo]
+            estado.em_operacao = True
+            task = await self.create_tracked_task(
+                self._acompanhar_contrato_reanexado(estado, contract_id), f"handoff_{contract_id}")
+            if task is None:
+                estado.em_operacao = False
+            else:
+                self._monitores_contrato[contract_id] = task
+    
+    async def _acompanhar_contrato_reanexado(self, estado: EstadoAtivo, contract_id: str):
+        logger.info(f"🔀 HANDOFF: reanexando contrato {contract_id} ({estado.symbol})")
+        try:
+            lucro = await self._aguardar_liquidacao(contract_id)
+            self._finalizar_contrato(estado, contract_id, lucro)
+        finally:
+            self._liberar_ativo(estado, contract_id)
+    
+    async def _aguardar_liquidacao(self, contract_id: str) -> float:
+        """Subscription do contrato quando a conexão oferece; senão, polling como monitorar_contrato"""
+        aguardar = getattr(self.api_manager, 'aguardar_contrato', None)
+        if aguardar is not None and self.executor_papel is None:
+            for tentativa in range(1, 4):
+                try:
+                    contrato = await aguardar(contract_id)
+                    profit = float(contrato.get('profit', 0))
+                    logger.info(f"🏁 Contrato {contract_id} finalizado - Status: {contrato.get('status')}, Lucro: ${profit:.2f}")
+                    return profit
+                except Exception as e:
+                    logger.warning(f"⚠️ Subscription do contrato {contract_id} falhou ({tentativa}/3): {e}")
+                    await asyncio.sleep(2)
+        return await self.monitorar_contrato(contract_id)
+    
     def _pre_validate_params(self):
         """Pré-valida parâmetros para otimização de latência"""
         current_time = time.time()
@@ -1484,7 +1760,7 @@ class AccumulatorScalpingBot:
             # Validar parâmetros ACCU
             params = {
                 'contract_type': 'ACCU',
-                'symbol': ATIVO,
+                'symbol': self.ativo,
                 'currency': 'USD',
                 'amount': float(STAKE_INICIAL),
                 'growth_rate': float(GROWTH_RATE),
@@ -1645,10 +1921,13 @@ class AccumulatorScalpingBot:
                 'successful_operations': stats.get('successful_operations', 0),
                 'failed_operations': stats.get('failed_operations', 0),
                 'tick_buffer_size': len(self.tick_buffer) if hasattr(self, 'tick_buffer') else 0,
+                'ativos': {symbol: estado.resumo() for symbol, estado in self.estados.items()},
                 'connection_status': self.api_manager.connected if hasattr(self, 'api_manager') else False,
                 'subscription_active': self.tick_subscription_active if hasattr(self, 'tick_subscription_active') else False,
                 'cached_params_valid': (time.time() - self._params_cache_time) < self._params_cache_ttl if hasattr(self, '_cached_params') and self._cached_params else False,
-                'auto_restart_config': self.get_auto_restart_config()
+                'auto_restart_config': self.get_auto_restart_config(),
+                'event_loop': estatisticas_loop(),
+                'io_offload': descarregador().obter_estatisticas()
             }
             
             return web.json_response(status_data)
@@ -1726,8 +2005,8 @@ class AccumulatorScalpingBot:
                 
                 # 4. Limpar buffers e resetar estados
                 logger.info("🧹 Limpando buffers e resetando estados...")
-                if hasattr(self, 'tick_buffer'):
-                    self.tick_buffer.clear()
+                if hasattr(self, 'estados'):
+                    self._limpar_estados_ativos()
                 if hasattr(self, 'enhanced_tick_buffer'):
                     try:
                         self.enhanced_tick_buffer.clear_buffer()
@@ -1784,7 +2063,7 @@ class AccumulatorScalpingBot:
                     self.api_manager.set_bot_instance(self)
 
                 # 8. Tentar se reinscrever com tratamento de erro robusto
-                logger.info(f"📡 Reinscrevendo nos ticks para o ativo {ATIVO}...")
+                logger.info(f"📡 Reinscrevendo nos ticks dos ativos {', '.join(self.ativos)}...")
                 subscription_attempts = 0
                 max_subscription_attempts = 3
                 
@@ -1794,7 +2073,7 @@ class AccumulatorScalpingBot:
                         logger.info(f"📡 Tentativa de subscription {subscription_attempts}/{max_subscription_attempts}")
                         
                         await asyncio.wait_for(
-                            self.api_manager.subscribe_ticks(ATIVO), 
+                            self._inscrever_ativos(), 
                             timeout=15.0
                         )
                         
@@ -1832,6 +2111,7 @@ class AccumulatorScalpingBot:
                 if final_validation:
                     restart_duration = time.time() - restart_start_time
                     logger.info(f"✅ Reinício completo bem-sucedido em {restart_duration:.1f}s")
+                    await self._reanexar_contratos()
                     
                     # Atualizar timestamps
                     if hasattr(self, 'last_activity_time'):
@@ -1979,6 +2259,7 @@ class AccumulatorScalpingBot:
         """Salva sinal no histórico para debugging"""
         try:
             timestamp_precise = time.time()
+            stats = self.sync_system.get_statistics()
             
             signal_record = {
                 'timestamp': timestamp_precise,
@@ -1986,8 +2267,8 @@ class AccumulatorScalpingBot:
                 'ticks': signal_data.copy() if signal_data else [],
                 'pattern_detected': pattern_detected,
                 'operation_result': operation_result,
-                'queue_size_at_time': self.sync_system.get_statistics()['queue_size'],
-                'active_operations_at_time': self.sync_system.get_statistics()['active_operations']
+                'queue_size_at_time': stats['queue_size'],
+                'active_operations_at_time': stats['active_operations']
             }
             
             # Adicionar ao histórico
@@ -2009,17 +2290,20 @@ class AccumulatorScalpingBot:
             logger.error(f"❌ Erro ao salvar sinal no histórico: {e}")
     
     def _save_history_to_file(self):
-        """Salva histórico de sinais em arquivo JSON"""
+        """Salva histórico de sinais em arquivo JSON (gravação fora do event loop)"""
         try:
-            with open(self._debug_log_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'bot_name': NOME_BOT,
-                    'created_at': datetime.now().isoformat(),
-                    'total_signals': len(self._signal_history),
-                    'signals': self._signal_history
-                }, f, indent=2, ensure_ascii=False)
+            # Cópia rasa no loop: a thread de I/O serializa uma foto, não a lista viva
+            snapshot = {
+                'bot_name': NOME_BOT,
+                'created_at': datetime.now().isoformat(),
+                'total_signals': len(self._signal_history),
+                'signals': list(self._signal_history)
+            }
+            # Só a foto mais recente interessa: uma gravação ainda pendente é substituída
+            enviar_io(f"arquivo:{self._debug_log_file}", gravar_json, self._debug_log_file, snapshot,
+                      substituir=True, indent=2, ensure_ascii=False)
             
-            logger.debug(f"💾 Histórico salvo: {len(self._signal_history)} sinais em {self._debug_log_file}")
+            logger.debug(f"💾 Histórico enviado para gravação: {len(self._signal_history)} sinais em {self._debug_log_file}")
             
         except Exception as e:
             logger.error(f"❌ Erro ao salvar histórico em arquivo: {e}")
@@ -2175,54 +2459,24 @@ class AccumulatorScalpingBot:
     def analisar_padrao_entrada(self, ticks: List[float]) -> bool:
         """ 
         Lógica de Padrão XML: single1=Red E single2=Red E single3=Red E single4=Blue 
-        Onde os sinais são atribuídos em ordem cronológica reversa mas verificados individualmente 
+        Verificada por máscara de bits (ver tick_direction_pattern); só registra log quando casa 
         """ 
         if len(ticks) < 5: 
             return False 
      
-        # Atribuições de tick do XML (indexação FROM_END) 
-        tick4 = ticks[-5]  # FROM_END 5 (mais antigo) 
-        tick3 = ticks[-4]  # FROM_END 4  
-        tick2 = ticks[-3]  # FROM_END 3 
-        tick1 = ticks[-2]  # FROM_END 2 
-        tick_atual = ticks[-1]  # FROM_END 1 (atual/mais novo) 
-     
-        # Cálculos de sinal do XML 
-        single4 = "Red" if tick4 > tick3 else "Blue" 
-        single3 = "Red" if tick3 > tick2 else "Blue"  
-        single2 = "Red" if tick2 > tick1 else "Blue" 
-        single1 = "Red" if tick1 > tick_atual else "Blue" 
-     
-        # Condição de entrada XML: todas as quatro condições devem ser True simultaneamente 
-        entrada_xml = (single1 == "Red" and 
-                       single2 == "Red" and 
-                       single3 == "Red" and 
-                       single4 == "Blue") 
-     
-        # Log detalhado para debug 
-        logger.info(f"📊 VERIFICAÇÃO DE PADRÃO XML:") 
-        logger.info(f"   • single1 (tick1 > atual): {single1} ({tick1:.5f} > {tick_atual:.5f})") 
-        logger.info(f"   • single2 (tick2 > tick1): {single2} ({tick2:.5f} > {tick1:.5f})") 
-        logger.info(f"   • single3 (tick3 > tick2): {single3} ({tick3:.5f} > {tick2:.5f})") 
-        logger.info(f"   • single4 (tick4 > tick3): {single4} ({tick4:.5f} > {tick3:.5f})") 
-        logger.info(f"   • Padrão esperado: single1=Red E single2=Red E single3=Red E single4=Blue") 
-        logger.info(f"   • Entrada detectada: {entrada_xml}") 
+        padrao = self.detector_padrao.evaluate(ticks)
+        if padrao is None:
+            return False
      
-        if entrada_xml:
-            logger.info("🎯 PADRÃO DE ENTRADA DETECTADO! (XML MATCH)")
-            logger.info("🚀 EXECUTANDO COMPRA DO CONTRATO ACCUMULATOR...")
-        else:
-            logger.info("⏳ Aguardando padrão correto...")
-            
-        return entrada_xml
+        logger.info(f"🎯 PADRÃO DE ENTRADA DETECTADO! (XML MATCH: {padrao.name} = {self.detector_padrao.describe(ticks)})")
+        logger.info("🚀 EXECUTANDO COMPRA DO CONTRATO ACCUMULATOR...")
+        return True
     
     async def log_to_supabase(self, operation_result: str, profit_percentage: float, stake_value: float):
         """Envia log de operação para Supabase"""
         try:
-            supabase: Client = create_client(
-                os.getenv('SUPABASE_URL'),
-                os.getenv('SUPABASE_KEY')
-            )
+            supabase: Client = await executar_io('supabase:tunder_bot_logs', create_client,
+                                                 os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_KEY'))
             
             # Adicionar timestamp fields obrigatórios
             current_time = datetime.now().isoformat()
@@ -2234,21 +2488,23 @@ class AccumulatorScalpingBot:
                 'created_at': current_time
             }
             
-            result = supabase.table('tunder_bot_logs').insert(data).execute()
+            await executar_io('supabase:tunder_bot_logs', supabase.table('tunder_bot_logs').insert(data).execute)
             logger.info(f"📊 Log enviado para Supabase: {operation_result} - {profit_percentage:.2f}% - ${stake_value}")
             
         except Exception as e:
             logger.error(f"❌ Erro ao enviar log para Supabase: {e}")
     
-    async def executar_compra_accu(self) -> Optional[str]:
+    async def executar_compra_accu(self, estado: Optional[EstadoAtivo] = None) -> Optional[str]:
         """Executa compra do contrato ACCU com parâmetros corretos e validação"""
+        estado = estado or self.estados[self.ativo]
+        symbol = estado.symbol
         
         # VALIDAÇÃO E LIMITAÇÃO DE STAKE (CORREÇÃO CRÍTICA)
         # Validar e limitar stake conforme limite da Deriv API
-        stake_para_usar = min(self.stake, STAKE_MAXIMO_DERIV)
+        stake_para_usar = min(estado.stake, STAKE_MAXIMO_DERIV)
         
-        if stake_para_usar < self.stake:
-            logger.warning(f"⚠️ Stake limitado: ${self.stake:.2f} -> ${stake_para_usar:.2f}")
+        if stake_para_usar < estado.stake:
+            logger.warning(f"⚠️ Stake limitado: ${estado.stake:.2f} -> ${stake_para_usar:.2f}")
         
         # VALIDAÇÃO DOS PARÂMETROS ANTES DO ENVIO
         # 1. Validar stake mínimo/máximo
@@ -2265,17 +2521,17 @@ class AccumulatorScalpingBot:
             return None
             
         # 3. Validar parâmetros obrigatórios para ACCU
-        if not ATIVO or not isinstance(ATIVO, str):
-            logger.error(f"❌ Símbolo inválido: {ATIVO}")
+        if not symbol or not isinstance(symbol, str):
+            logger.error(f"❌ Símbolo inválido: {symbol}")
             return None
             
         # 4. Validar take profit
-        if self.dt <= 0:
-            logger.error(f"❌ Take profit inválido: ${self.dt}")
+        if estado.dt <= 0:
+            logger.error(f"❌ Take profit inválido: ${estado.dt}")
             return None
             
         # 3. Take profit: 10% do stake atual ($0.50 se stake=$5)
-        take_profit_amount = self.stake * TAKE_PROFIT_PERCENTUAL
+        take_profit_amount = estado.stake * TAKE_PROFIT_PERCENTUAL
         
         # ESTRUTURA CORRETA BASEADA NA DOCUMENTAÇÃO OFICIAL DA DERIV API
         # Primeiro fazer proposal para obter o ID
@@ -2285,7 +2541,7 @@ class AccumulatorScalpingBot:
             required_params = {
                 "proposal": 1,
                 "contract_type": "ACCU",
-                "symbol": ATIVO,
+                "symbol": symbol,
                 "amount": float(stake_para_usar),  # USAR STAKE LIMITADO
                 "basis": "stake",
                 "currency": "USD",
@@ -2303,7 +2559,7 @@ class AccumulatorScalpingBot:
             required_params_final = {
                 "proposal": 1,
                 "contract_type": "ACCU",
-                "symbol": ATIVO,
+                "symbol": symbol,
                 "amount": float(stake_para_usar),  # USAR STAKE LIMITADO
                 "basis": "stake",
                 "currency": "USD",
@@ -2315,7 +2571,7 @@ class AccumulatorScalpingBot:
             required_params_simple = {
                 "proposal": 1,
                 "contract_type": "ACCU",
-                "symbol": ATIVO,
+                "symbol": symbol,
                 "amount": float(stake_para_usar),  # USAR STAKE LIMITADO
                 "basis": "stake",
                 "currency": "USD",
@@ -2334,7 +2590,7 @@ class AccumulatorScalpingBot:
             logger.info(f"📋 PARÂMETROS DA PROPOSTA ACCU:")
             logger.info(f"   • proposal: 1")
             logger.info(f"   • contract_type: ACCU")
-            logger.info(f"   • symbol: {ATIVO}")
+            logger.info(f"   • symbol: {symbol}")
             logger.info(f"   • amount: {stake_para_usar}")
             logger.info(f"   • basis: stake")
             logger.info(f"   • currency: USD")
@@ -2345,10 +2601,10 @@ class AccumulatorScalpingBot:
             logger.info(f"   • Stake: ${stake_para_usar}")
             logger.info(f"   • Take Profit (DT): ${take_profit_amount:.2f}")
             logger.info(f"   • Growth Rate: {GROWTH_RATE*100}%")
-            logger.info(f"   • Symbol: {ATIVO}")
+            logger.info(f"   • Symbol: {symbol}")
             logger.info(f"   • Currency: USD")
             logger.info(f"   • Basis: stake")
-            logger.info(f"   • Total Lost: ${self.total_lost}")
+            logger.info(f"   • Total Lost: ${estado.total_lost}")
             logger.info(f"   • Khizzbot: {self.khizzbot}")
             
             # EXECUÇÃO OTIMIZADA COM POOLING PERSISTENTE
@@ -2461,8 +2717,8 @@ class AccumulatorScalpingBot:
                 fallback_proposal = {
                     "proposal": 1,
                     "contract_type": "ACCU",
-                    "symbol": ATIVO,
-                    "amount": self.stake,
+                    "symbol": symbol,
+                    "amount": estado.stake,
                     "basis": "stake",
                     "currency": "USD",
                     "growth_rate": GROWTH_RATE
@@ -2562,37 +2818,41 @@ class AccumulatorScalpingBot:
                 logger.error(f"❌ Erro ao monitorar contrato: {e}")
                 await asyncio.sleep(5)
     
-    def aplicar_gestao_risco(self, lucro: float):
-        """Gestão SEM Martingale - stake sempre fixo"""
-        logger.info(f"💼 GESTÃO DE RISCO (STAKE FIXO) - Lucro: ${lucro:.2f}")
+    def aplicar_gestao_risco(self, lucro: float, estado: Optional[EstadoAtivo] = None):
+        """Gestão SEM Martingale - stake sempre fixo (por ativo; win stop sobre o total da conta)"""
+        estado = estado or self.estados[self.ativo]
+        logger.info(f"💼 GESTÃO DE RISCO (STAKE FIXO) {estado.symbol} - Lucro: ${lucro:.2f}")
         
         # Calcular percentual para log
-        profit_percentage = (lucro / self.stake) * 100 if self.stake > 0 else 0
+        profit_percentage = (lucro / estado.stake) * 100 if estado.stake > 0 else 0
         operation_result = "WIN" if lucro > 0 else "LOSS"
         
         # Enviar para Supabase
-        asyncio.create_task(self.log_to_supabase(operation_result, profit_percentage, self.stake))
+        asyncio.create_task(self.log_to_supabase(operation_result, profit_percentage, estado.stake))
         
         # SEMPRE manter stake fixo (SEM Martingale)
-        self.stake = STAKE_INICIAL  # Sempre fixo
+        estado.stake = STAKE_INICIAL  # Sempre fixo
+        self.stake = estado.stake
+        estado.operacoes += 1
         
         if lucro > 0:
+            estado.total_profit += lucro
             self.total_profit += lucro  # Acumular lucro total
-            logger.info(f"🎉 WIN - Stake mantido: ${self.stake:.2f}")
+            logger.info(f"🎉 WIN - Stake mantido: ${estado.stake:.2f}")
             
             # Verificar Win Stop
             if self.total_profit >= self.win_stop:
                 logger.info(f"🎯 WIN STOP ATINGIDO! Total: ${self.total_profit:.2f}")
                 return "STOP_WIN"
         else:
-            logger.info(f"💸 LOSS - Stake mantido: ${self.stake:.2f}")
+            logger.info(f"💸 LOSS - Stake mantido: ${estado.stake:.2f}")
             
             # Verificar Loss Limit (baseado em número de perdas consecutivas)
             if abs(lucro) * 200 >= self.loss_limit:  # Exemplo: 200 perdas de $5 = $1000
                 logger.info(f"🛑 LOSS LIMIT ATINGIDO!")
                 return "STOP_LOSS"
         
-        logger.info(f"📊 Estado atual: Stake=${self.stake:.2f} (FIXO), Total Profit=${self.total_profit:.2f}")
+        logger.info(f"📊 Estado atual {estado.symbol}: Stake=${estado.stake:.2f} (FIXO), Total Profit=${self.total_profit:.2f}")
     
     async def executar_ciclo_trading(self):
         """Executa um ciclo completo de trading"""
@@ -2631,7 +2891,7 @@ class AccumulatorScalpingBot:
         logger.info(f"🎯 Estratégia: Padrão Red-Red-Red-Blue (3 subidas + 1 queda)")
         logger.info(f"💰 Stake inicial: ${STAKE_INICIAL}")
         logger.info(f"📈 Take Profit: {TAKE_PROFIT_PERCENTUAL*100}%")
-        logger.info(f"📊 Ativo: {ATIVO}")
+        logger.info(f"📊 Ativos: {', '.join(self.ativos)}")
         logger.info(f"🔄 Growth Rate: {GROWTH_RATE*100}%")
         logger.info(f"⚖️ Gestão: Stake fixo (sem martingale)")
         logger.info(f"⚡ NOVO: Análise em tempo real via tick stream")
@@ -2691,10 +2951,13 @@ class AccumulatorScalpingBot:
                 return
             
             # Iniciar subscription de ticks em tempo real (só após validação completa)
-            logger.info(f"📡 Iniciando subscription de ticks para {ATIVO}...")
-            await self.api_manager.subscribe_ticks(ATIVO)
+            logger.info(f"📡 Iniciando subscription de ticks para {', '.join(self.ativos)}...")
+            await self._inscrever_ativos()
             self.tick_subscription_active = True
-            logger.info(f"✅ Subscription de ticks ativa para {ATIVO}")
+            logger.info(f"✅ Subscription de ticks ativa para {', '.join(self.ativos)}")
+            
+            # Assumir contratos abertos e estado de risco da instância anterior
+            await self._restaurar_handoff()
             
             # Iniciar processamento de sinais da queue
             logger.info("🚀 Iniciando processamento de sinais da queue...")
@@ -2727,18 +2990,22 @@ class AccumulatorScalpingBot:
                 "http_server"
             )
             
-            # Inicializar sinal no radar (bot seguro para operar inicialmente)
+            # Inicializar sinal no radar (bot seguro para operar inicialmente); em segundo
+            # plano, para a gravação no Supabase não atrasar o processamento dos ticks
             logger.info("📊 Inicializando sinal no sistema radar...")
-            await self.save_signal_to_radar(
-                is_safe_to_operate=True,
-                reason="Bot inicializado e pronto para operar",
-                last_pattern_found="Aguardando primeiro padrão",
-                losses_in_last_10_ops=0,
-                wins_in_last_5_ops=0,
-                historical_accuracy=0.0,
-                pattern_found_at=datetime.now().isoformat(),
-                operations_after_pattern=0,
-                auto_disable_after_ops=3
+            await self.create_tracked_task(
+                self.save_signal_to_radar(
+                    is_safe_to_operate=True,
+                    reason="Bot inicializado e pronto para operar",
+                    last_pattern_found="Aguardando primeiro padrão",
+                    losses_in_last_10_ops=0,
+                    wins_in_last_5_ops=0,
+                    historical_accuracy=0.0,
+                    pattern_found_at=datetime.now().isoformat(),
+                    operations_after_pattern=0,
+                    auto_disable_after_ops=3
+                ),
+                "radar_inicial"
             )
             
             logger.info("✅ Bot em modo tempo real - aguardando ticks...")
@@ -2971,7 +3238,7 @@ class AccumulatorScalpingBot:
                     self.robust_order_system.reset_circuit_breaker()
                 
                 # Limpar buffer de ticks para evitar dados obsoletos
-                self.tick_buffer.clear()
+                self._limpar_estados_ativos()
                 logger.debug("🧹 Buffer de ticks limpo")
                 
                 # Desconectar explicitamente antes de reconectar
@@ -3027,7 +3294,7 @@ class AccumulatorScalpingBot:
                 
                 # Reiniciar subscription com validação
                 try:
-                    await self.api_manager.subscribe_ticks(ATIVO)
+                    await self._inscrever_ativos()
                     self.tick_subscription_active = True
                     logger.info("📡 Subscription de ticks reestabelecida")
                 except Exception as sub_error:
@@ -3038,6 +3305,7 @@ class AccumulatorScalpingBot:
                 await asyncio.sleep(2)  # Aguardar estabilização
                 if self.api_manager.connected and self.tick_subscription_active:
                     logger.info("✅ Recuperação automática concluída com sucesso")
+                    await self._reanexar_contratos()
                     return True
                 else:
                     logger.error("❌ Falha na validação pós-recuperação")
@@ -3055,16 +3323,14 @@ class AccumulatorScalpingBot:
                                   auto_disable_after_ops: int = 3):
         """Salva ou atualiza sinal na tabela radar_de_apalancamiento_signals usando UPSERT"""
         try:
-            supabase: Client = create_client(
-                os.getenv('SUPABASE_URL'),
-                os.getenv('SUPABASE_KEY')
-            )
+            supabase: Client = await executar_io('supabase:radar', create_client,
+                                                 os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_KEY'))
             
             # Primeiro, verificar se já existe um registro para o Tunder Bot
-            existing_signal = supabase.table('radar_de_apalancamiento_signals') \
-                .select('*') \
-                .eq('bot_name', NOME_BOT) \
-                .execute()
+            existing_signal = await executar_io('supabase:radar', supabase.table('radar_de_apalancamiento_signals')
+                                                .select('*')
+                                                .eq('bot_name', NOME_BOT)
+                                                .execute)
             
             # Preparar dados do sinal
             signal_data = {
@@ -3082,16 +3348,16 @@ class AccumulatorScalpingBot:
             
             if existing_signal.data:
                 # Atualizar registro existente
-                result = supabase.table('radar_de_apalancamiento_signals') \
-                    .update(signal_data) \
-                    .eq('bot_name', NOME_BOT) \
-                    .execute()
+                result = await executar_io('supabase:radar', supabase.table('radar_de_apalancamiento_signals')
+                                           .update(signal_data)
+                                           .eq('bot_name', NOME_BOT)
+                                           .execute)
                 logger.info(f"📊 Sinal atualizado para {NOME_BOT}: safe_to_operate={is_safe_to_operate}")
             else:
                 # Inserir novo registro
-                result = supabase.table('radar_de_apalancamiento_signals') \
-                    .insert(signal_data) \
-                    .execute()
+                result = await executar_io('supabase:radar', supabase.table('radar_de_apalancamiento_signals')
+                                           .insert(signal_data)
+                                           .execute)
                 logger.info(f"📊 Novo sinal criado para {NOME_BOT}: safe_to_operate={is_safe_to_operate}")
             
             return result
@@ -3103,15 +3369,13 @@ class AccumulatorScalpingBot:
     async def get_signal_from_radar(self):
         """Obtém o sinal atual do Tunder Bot da tabela radar_de_apalancamiento_signals"""
         try:
-            supabase: Client = create_client(
-                os.getenv('SUPABASE_URL'),
-                os.getenv('SUPABASE_KEY')
-            )
+            supabase: Client = await executar_io('supabase:radar', create_client,
+                                                 os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_KEY'))
             
-            result = supabase.table('radar_de_apalancamiento_signals') \
-                .select('*') \
-                .eq('bot_name', NOME_BOT) \
-                .execute()
+            result = await executar_io('supabase:radar', supabase.table('radar_de_apalancamiento_signals')
+                                       .select('*')
+                                       .eq('bot_name', NOME_BOT)
+                                       .execute)
             
             if result.data:
                 signal = result.data[0]
@@ -3128,20 +3392,18 @@ class AccumulatorScalpingBot:
     async def update_signal_status(self, is_safe_to_operate: bool, reason: str = None):
         """Atualiza rapidamente apenas o status de segurança do sinal"""
         try:
-            supabase: Client = create_client(
-                os.getenv('SUPABASE_URL'),
-                os.getenv('SUPABASE_KEY')
-            )
+            supabase: Client = await executar_io('supabase:radar', create_client,
+                                                 os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_KEY'))
             
             update_data = {
                 'is_safe_to_operate': is_safe_to_operate,
                 'reason': reason
             }
             
-            result = supabase.table('radar_de_apalancamiento_signals') \
-                .update(update_data) \
-                .eq('bot_name', NOME_BOT) \
-                .execute()
+            result = await executar_io('supabase:radar', supabase.table('radar_de_apalancamiento_signals')
+                                       .update(update_data)
+                                       .eq('bot_name', NOME_BOT)
+                                       .execute)
             
             logger.info(f"📊 Status do sinal atualizado para {NOME_BOT}: {is_safe_to_operate}")
             return result
@@ -3283,6 +3545,8 @@ class MultiAccountManager:
 @with_error_handling(ErrorType.SYSTEM, ErrorSeverity.CRITICAL)
 async def main():
     """Função principal do bot"""
+    # Cada reinício roda em um loop novo: o amostrador de atraso acompanha o loop corrente
+    await iniciar_monitor_loop()
     try:
         # Verificar se há contas ativas
         if not ACTIVE_ACCOUNTS:
@@ -3587,6 +3851,10 @@ def reiniciar_bot_automaticamente():
 
 if __name__ == "__main__":
     try:
+        # uvloop (ASYNC_RUNTIME=uvloop) vale para todos os loops criados nos reinícios
+        instalar_runtime()
+        # Avisa (IO_GUARD=warn) sobre chamadas de rede síncronas feitas na thread do loop
+        instalar_guarda()
         # Iniciar o sistema de reinicialização automática
         reiniciar_bot_automaticamente()
     except KeyboardInterrupt:
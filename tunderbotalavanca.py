@@ -23,10 +23,13 @@ from robust_order_system import RobustOrderSystem, OperationType
 from enhanced_sync_system import EnhancedSyncSystem
 from aiohttp import web
 from error_handler import RobustErrorHandler, with_error_handling, ErrorType, ErrorSeverity
-from enhanced_tick_buffer import EnhancedTickBuffer
+from enhanced_tick_buffer import EnhancedTickBuffer, TickRingBuffer
 from websocket_recovery import WebSocketRecoveryManager
 from signal_queue_system import ThreadSafeSignalQueue
 from system_health_monitor import SystemHealthMonitor
+from tick_direction_pattern import TickDirectionDetector, XML_ACCU_PATTERN
+from contract_engine import ativar_modo_papel, modo_papel_solicitado
+from io_offload import executar_io
 
 # Carregar variáveis de ambiente
 load_dotenv()
@@ -57,6 +60,7 @@ GROWTH_RATE = 0.05  # 5% - Valor alterado conforme solicitação
 WIN_STOP = 1000.0  # Meta de ganho diário
 LOSS_LIMIT = 1000.0  # Limite de perda diária
 KHIZZBOT = 50  # Valor khizzbot conforme XML original
+PADRAO_ENTRADA = XML_ACCU_PATTERN  # Padrão de direção (R/B/U/.); sobrescrito por 'padrao_entrada' da conta
 
 # ============================================================================
 # CONFIGURAÇÃO DE MÚLTIPLAS CONTAS DERIV
@@ -684,7 +688,10 @@ class AccumulatorScalpingBot:
         self.ciclo = 0
         
         # NOVO: Sistema de tick stream em tempo real
-        self.tick_buffer = []  # Buffer para manter últimos 4 ticks
+        self.tick_buffer = TickRingBuffer(max_size=5, max_age_seconds=None)  # Últimos 5 ticks
+        self.detector_padrao = TickDirectionDetector(
+            account_config.get('padrao_entrada', PADRAO_ENTRADA) if account_config else PADRAO_ENTRADA
+        )
         self.tick_subscription_active = False  # Flag para controlar subscription
         
         # NOVO: Sistema robusto de execução de ordens
@@ -742,6 +749,10 @@ class AccumulatorScalpingBot:
         self.max_buffer_size = 10  # Máximo de 10 ticks no buffer
         self.pattern_detection_active = False  # Flag para detecção de padrões
         self.last_tick_time = 0  # Timestamp do último tick recebido
+        # Paper trading: ordens liquidadas localmente sobre o stream real
+        self.executor_papel = None
+        if modo_papel_solicitado(account_config):
+            ativar_modo_papel(self)
 
     # ============================================================================
     # SISTEMA DE ANÁLISE DE TICKS REATIVO - ALAVANCS PRO 2.0 (SIMPLIFICADO)
@@ -756,21 +767,18 @@ class AccumulatorScalpingBot:
             if tick_value <= 0:
                 return
             
-            # Adicionar ao buffer
-            self.tick_buffer.append(tick_value)
-            
-            # Manter apenas os últimos 5 ticks
-            if len(self.tick_buffer) > 5:
-                self.tick_buffer.pop(0)
+            # Adicionar ao anel (mantém apenas os últimos 5 ticks)
+            self.tick_buffer.add_tick(tick_value)
+            padrao = self.detector_padrao.add_tick(tick_value)
             
             # Executar análise quando tiver 5 ticks
-            if len(self.tick_buffer) == 5:
-                pattern_detected = self.analisar_padrao_entrada_accumulator(self.tick_buffer.copy())
+            if self.tick_buffer.is_full():
+                pattern_detected = padrao is not None
                 
                 if pattern_detected and not self.is_trading_locked:
                     # Bloquear operações simultâneas
                     self.is_trading_locked = True
-                    logger.info(f"🎯 PADRÃO ACCUMULATOR DETECTADO - EXECUTANDO COMPRA")
+                    logger.info(f"🎯 PADRÃO ACCUMULATOR DETECTADO ({padrao.name}: {self.detector_padrao.describe()}) - EXECUTANDO COMPRA")
                     # Executar ciclo completo da operação
                     asyncio.create_task(self._execute_trade_lifecycle_accumulator())
                     
@@ -780,39 +788,17 @@ class AccumulatorScalpingBot:
     def analisar_padrao_entrada_accumulator(self, ticks: List[float]) -> bool:
         """ 
         Lógica de Padrão ACCUMULATOR: Red-Red-Red-Blue (3 subidas + 1 queda) 
+        Verificada por máscara de bits (ver tick_direction_pattern); só registra log quando casa 
         """ 
         if len(ticks) < 5: 
             return False 
      
-        # Atribuições de tick (indexação FROM_END) 
-        tick4 = ticks[-5]  # FROM_END 5 (mais antigo) 
-        tick3 = ticks[-4]  # FROM_END 4  
-        tick2 = ticks[-3]  # FROM_END 3 
-        tick1 = ticks[-2]  # FROM_END 2 
-        tick_atual = ticks[-1]  # FROM_END 1 (atual/mais novo) 
-     
-        # Cálculos de sinal ACCUMULATOR 
-        single4 = "Red" if tick4 > tick3 else "Blue" 
-        single3 = "Red" if tick3 > tick2 else "Blue"  
-        single2 = "Red" if tick2 > tick1 else "Blue" 
-        single1 = "Red" if tick1 > tick_atual else "Blue" 
-     
-        # Condição ACCUMULATOR: single1=Red E single2=Red E single3=Red E single4=Blue 
-        entrada_accumulator = (single1 == "Red" and 
-                              single2 == "Red" and 
-                              single3 == "Red" and 
-                              single4 == "Blue") 
-     
-        # Log detalhado 
-        logger.info(f"📊 VERIFICAÇÃO DE PADRÃO ACCUMULATOR:") 
-        logger.info(f"   • single1: {single1}, single2: {single2}, single3: {single3}, single4: {single4}") 
-        logger.info(f"   • Padrão esperado: Red-Red-Red-Blue") 
-        logger.info(f"   • Entrada detectada: {entrada_accumulator}") 
+        padrao = self.detector_padrao.evaluate(ticks)
+        if padrao is None:
+            return False
      
-        if entrada_accumulator: 
-            logger.info("🎯 PADRÃO ACCUMULATOR DETECTADO! (Red-Red-Red-Blue)") 
-            
-        return entrada_accumulator
+        logger.info(f"🎯 PADRÃO ACCUMULATOR DETECTADO! ({padrao.name} = {self.detector_padrao.describe(ticks)})")
+        return True
 
     async def _execute_trade_lifecycle_accumulator(self):
         """Ciclo de vida completo para operação ACCUMULATOR"""
@@ -1217,6 +1203,8 @@ class AccumulatorScalpingBot:
             
             # 6. Reinicializar componentes
             self.api_manager = DerivWebSocketNativo()
+            if self.executor_papel:
+                self.api_manager = self.executor_papel.trocar_conexao(self.api_manager)
             self.api_manager.set_bot_instance(self)
             logger.info("✅ API Manager reinicializado")
             
@@ -1476,10 +1464,8 @@ class AccumulatorScalpingBot:
     async def log_to_supabase(self, operation_result: str, profit_percentage: float, stake_value: float):
         """Envia log de operação para Supabase"""
         try:
-            supabase: Client = create_client(
-                os.getenv('SUPABASE_URL'),
-                os.getenv('SUPABASE_KEY')
-            )
+            supabase: Client = await executar_io('supabase:tunder_bot_logs', create_client,
+                                                 os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_KEY'))
             
             # Adicionar timestamp fields obrigatórios
             current_time = datetime.now().isoformat()
@@ -1493,7 +1479,7 @@ class AccumulatorScalpingBot:
                 'created_at': current_time
             }
             
-            result = supabase.table('tunder_bot_logs').insert(data).execute()
+            await executar_io('supabase:tunder_bot_logs', supabase.table('tunder_bot_logs').insert(data).execute)
             logger.info(f"✅ Log salvo no Supabase [{self.account_name}]: {operation_result} - Profit: {profit_percentage:.2f}% - Stake: ${stake_value}")
             
         except Exception as e: